@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Codec Benchmark
+
+Reports bytes written and serialization time per incident for workflow
+checkpoints. A simulated incident runs through the triage nodes; after each
+node the accumulated state (messages, tool results, metrics, risk
+assessment and response plan) is checkpointed. The previous format wrote
+the whole state as JSON every time; the delta log writes a full snapshot
+every N checkpoints and changed fields otherwise, with msgpack, orjson or
+JSON as the codec. Replay time is the cost of reconstructing the final
+state from the log.
+
+Usage:
+    python benchmarks/checkpoint_codec_benchmark.py
+    python benchmarks/checkpoint_codec_benchmark.py --steps 20 --incidents 200 --full-every 5
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from security_triage_agent.core.state import (
+    IncidentCategory, IncidentMetadata, IncidentPriority, IncidentResponse, RiskAssessment
+)
+from security_triage_agent.memory import checkpoint_codec
+from security_triage_agent.memory.checkpoint_codec import DeltaCheckpointWriter, replay_checkpoints
+
+
+NODES = [
+    "initialize_incident", "safety_check", "classify_incident", "assess_risk",
+    "prioritize_incident", "select_playbook", "check_compliance", "generate_response",
+    "human_review", "finalize_incident",
+]
+
+ANALYSIS = (
+    "The access control logs show the key card was re-encoded at the front desk "
+    "after checkout and used twice on the twelfth floor. "
+)
+
+
+def _incident_states(incident_index: int, steps: int) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Accumulated workflow state after each node, as streamed to the checkpointer."""
+    state: Dict[str, Any] = {
+        "incident_id": f"inc_{incident_index:06d}",
+        "title": "Unauthorized room access after checkout",
+        "description": "Guest reported their old key card still opened room 1205. " * 4,
+        "created_at": datetime.utcnow(),
+        "messages": [HumanMessage(content="Triage incident")],
+        "metadata": IncidentMetadata(
+            property_code="HTL-001", location="Floor 12",
+            affected_systems=["key_card_system", "pms"], affected_guests=["guest-1", "guest-2"]
+        ),
+        "completed_steps": [],
+        "tool_results": {},
+        "processing_metrics": {},
+    }
+
+    for step in range(steps):
+        node = NODES[step % len(NODES)]
+        state = {
+            **state,
+            "current_step": node,
+            "updated_at": datetime.utcnow(),
+            "messages": state["messages"] + [AIMessage(content=f"[{node}] " + ANALYSIS * 8)],
+            "completed_steps": state["completed_steps"] + [node],
+            "tool_results": {
+                **state["tool_results"],
+                f"{node}_{step}": {
+                    "output": ANALYSIS * 4,
+                    "confidence": 0.8 + step / 100,
+                    "entities": ["room 1205", "key card", "front desk"],
+                },
+            },
+            "processing_metrics": {
+                **state["processing_metrics"],
+                f"{node}_duration": 0.4 + step / 10,
+                "total_steps": step + 1,
+            },
+        }
+        if node == "classify_incident":
+            state["category"] = IncidentCategory.GUEST_ACCESS
+        if node == "assess_risk":
+            state["risk_assessment"] = RiskAssessment(
+                risk_score=7.5, risk_factors=["guest_privacy", "access_control"],
+                mitigation_urgency=IncidentPriority.HIGH, potential_impact=ANALYSIS,
+                likelihood_score=6.0, confidence_score=0.85
+            )
+        if node == "generate_response":
+            state["incident_response"] = IncidentResponse(
+                immediate_actions=["Revoke key card", "Secure room"] * 3,
+                investigation_steps=["Review access logs", "Interview staff"] * 3,
+            )
+        yield node, state
+
+
+def _legacy(states: List[Tuple[str, Dict[str, Any]]]) -> Tuple[int, float]:
+    """Previous format: the whole checkpoint record as JSON after every node."""
+    written = 0
+    started = time.perf_counter()
+    for node, state in states:
+        written += len(json.dumps({
+            "incident_id": state["incident_id"],
+            "step_name": node,
+            "timestamp": datetime.utcnow().isoformat(),
+            "data": state,
+        }, default=str))
+    return written, time.perf_counter() - started
+
+
+def benchmark(incidents: int, steps: int, full_every: int) -> None:
+    """Print bytes and serialization time per incident for each format."""
+    runs = [(index, list(_incident_states(index, steps))) for index in range(incidents)]
+
+    codecs = [codec for codec, module in (("msgpack", checkpoint_codec.msgpack),
+                                          ("orjson", checkpoint_codec.orjson),
+                                          ("json", json)) if module is not None]
+    formats = [("legacy json, full", None, None)]
+    formats += [(f"{codec}, full", codec, 1) for codec in codecs]
+    formats += [(f"{codec}, delta/{full_every}", codec, full_every) for codec in codecs]
+
+    print(f"{incidents} incidents x {steps} checkpoints\n")
+    print(f"{'format':<22} {'KB/incident':>12} {'ms/incident':>12} {'replay ms':>10}")
+    for label, codec, every in formats:
+        written = 0
+        seconds = 0.0
+        replay_seconds = 0.0
+        for index, states in runs:
+            if codec is None:
+                incident_bytes, incident_seconds = _legacy(states)
+                written += incident_bytes
+                seconds += incident_seconds
+                continue
+
+            writer = DeltaCheckpointWriter(f"inc_{index}", full_snapshot_every=every, codec=codec)
+            log = [writer.encode(node, state) for node, state in states]
+            written += writer.stats["bytes_written"]
+            seconds += writer.stats["serialize_seconds"]
+
+            started = time.perf_counter()
+            replay_checkpoints(log)
+            replay_seconds += time.perf_counter() - started
+
+        replay = f"{replay_seconds / incidents * 1000:>10.2f}" if codec else f"{'-':>10}"
+        print(f"{label:<22} {written / incidents / 1024:>12.1f} "
+              f"{seconds / incidents * 1000:>12.2f} {replay}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=100,
+                        help="Incidents to simulate")
+    parser.add_argument("--steps", type=int, default=10,
+                        help="Checkpoints per incident")
+    parser.add_argument("--full-every", type=int, default=10,
+                        help="Checkpoints between full snapshots")
+    args = parser.parse_args()
+
+    benchmark(args.incidents, args.steps, args.full_every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Soak Benchmark
+
+Runs waves of concurrent incident workflows against the workflow checkpoint
+database and reports how it grows. The unpruned store keeps every checkpoint
+of every incident, as the previous SqliteSaver did; the pruning store keeps
+the newest checkpoints per incident, drops finished incidents at compaction
+(half of each wave finishes at once, the rest wait on approval until the
+next wave) and returns freed pages to the file system. Per wave the table
+shows stored checkpoints, database and WAL size, commits per checkpoint
+written and the traced Python memory.
+
+Usage:
+    python benchmarks/checkpoint_soak_benchmark.py
+    python benchmarks/checkpoint_soak_benchmark.py --waves 20 --incidents 200 --steps 9
+"""
+
+import argparse
+import asyncio
+import operator
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Annotated, List, TypedDict
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from langgraph.graph import END, StateGraph
+
+from security_triage_agent.memory.checkpoint_saver import PruningSqliteSaver
+
+
+class _TriageState(TypedDict):
+    incident_id: str
+    completed_steps: Annotated[List[str], operator.add]
+    tool_results: str
+
+
+def _compile_workflow(saver: PruningSqliteSaver, steps: int):
+    graph = StateGraph(_TriageState)
+    names = [f"step_{number}" for number in range(steps)]
+    for name in names:
+        # Roughly the size of a PMS lookup result carried through triage
+        graph.add_node(name, lambda state, name=name: {"completed_steps": [name], "tool_results": "x" * 4000})
+    graph.set_entry_point(names[0])
+    for current, following in zip(names, names[1:]):
+        graph.add_edge(current, following)
+    graph.add_edge(names[-1], END)
+    return graph.compile(checkpointer=saver)
+
+
+async def _soak(name: str, saver: PruningSqliteSaver, waves: int, incidents: int, steps: int, prune: bool) -> None:
+    workflow = _compile_workflow(saver, steps)
+    print(f"\n{name}")
+    print(f"{'wave':>5} {'seconds':>8} {'checkpoints':>12} {'db MB':>8} {'wal MB':>8} "
+          f"{'commits/put':>12} {'memory MB':>10}")
+
+    previously_parked: List[str] = []
+    tracemalloc.start()
+    for wave in range(waves):
+        started = time.perf_counter()
+        incident_ids = [f"inc_{wave}_{number}" for number in range(incidents)]
+        await asyncio.gather(*(
+            workflow.ainvoke(
+                {"incident_id": incident_id, "completed_steps": [], "tool_results": ""},
+                {"configurable": {"thread_id": incident_id}}
+            )
+            for incident_id in incident_ids
+        ))
+        if prune:
+            # Half finish now; the rest wait on approval until the next wave
+            parked = incident_ids[incidents // 2:]
+            await asyncio.gather(*(
+                saver.mark_finished(incident_id)
+                for incident_id in incident_ids[:incidents // 2] + previously_parked
+            ))
+            previously_parked = parked
+            await saver.compact()
+        elapsed = time.perf_counter() - started
+
+        usage = await saver.get_usage()
+        puts = saver.stats["checkpoints_written"] + saver.stats["write_batches_written"]
+        print(f"{wave + 1:>5} {elapsed:>8.2f} {usage['checkpoints']:>12} "
+              f"{usage['database_bytes'] / 1e6:>8.2f} {usage['wal_bytes'] / 1e6:>8.2f} "
+              f"{saver.stats['commits'] / max(puts, 1):>12.2f} "
+              f"{tracemalloc.get_traced_memory()[0] / 1e6:>10.1f}")
+    tracemalloc.stop()
+    await saver.close()
+
+
+async def benchmark(waves: int, incidents: int, steps: int, keep_last: int) -> None:
+    """Print checkpoint storage growth for the unpruned and pruning stores."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print(f"{waves} waves of {incidents} concurrent incidents, {steps} workflow steps each")
+        await _soak(
+            "unpruned", PruningSqliteSaver(Path(tmpdir) / "unpruned.db", keep_last=None),
+            waves, incidents, steps, prune=False
+        )
+        await _soak(
+            f"pruning (keep_last={keep_last}, finished incidents compacted)",
+            PruningSqliteSaver(Path(tmpdir) / "pruning.db", keep_last=keep_last, finished_grace_seconds=0),
+            waves, incidents, steps, prune=True
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--waves", type=int, default=10,
+                        help="Waves of incidents processed")
+    parser.add_argument("--incidents", type=int, default=100,
+                        help="Concurrent incidents per wave")
+    parser.add_argument("--steps", type=int, default=9,
+                        help="Workflow steps per incident")
+    parser.add_argument("--keep-last", type=int, default=5,
+                        help="Checkpoints kept per incident by the pruning store")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.waves, args.incidents, args.steps, args.keep_last))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Fused Triage Benchmark
+
+Compares the per-tool triage path of SecurityTriageWorkflow with fused mode,
+where classification, risk assessment and prioritization come from one LLM
+call. Each incident is driven through the workflow's LLM-bearing nodes in
+graph order (classify, assess risk, safety, prioritize, playbook, compliance,
+response) against a simulated model with fixed per-call latency, and the
+benchmark reports LLM calls, end-to-end latency and estimated token cost.
+
+Usage:
+    python benchmarks/fused_triage_benchmark.py
+    python benchmarks/fused_triage_benchmark.py --incidents 50 --latency 1.2 --invalid-rate 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from langchain_core.messages import AIMessage
+
+from security_triage_agent.core.state import IncidentState
+from security_triage_agent.core.workflow import SecurityTriageWorkflow
+from security_triage_agent.evaluation.metrics_tracker import MetricsTracker
+from security_triage_agent.memory.session_manager import SessionManager
+from security_triage_agent.tools import (
+    IncidentClassifier, IncidentPrioritizer, PlaybookSelector,
+    ResponseGenerator, ComplianceChecker, SafetyGuardrails, FusedTriageTool
+)
+
+
+CLASSIFICATION = {
+    "category": "guest_access",
+    "confidence": 0.88,
+    "reasoning": "Keycard used on a room after the guest checked out",
+    "alternative_categories": ["physical_security"],
+    "extracted_entities": {"rooms": ["1204"]},
+    "severity_indicators": ["after checkout"],
+}
+
+RISK_ASSESSMENT = {
+    "risk_score": 6.5,
+    "risk_factors": ["guest privacy", "access control gap"],
+    "potential_impact": "Guest belongings and privacy at risk",
+    "likelihood_score": 6.0,
+    "confidence_score": 0.8,
+}
+
+PRIORITIZATION = {
+    "priority": "high",
+    "reasoning": "Active unauthorized access to an occupied guest room",
+    "business_impact": "Guest trust",
+    "guest_impact": "Privacy exposure",
+    "financial_impact": "Low",
+    "reputation_impact": "Moderate",
+    "operational_impact": "Front office follow-up",
+    "time_sensitivity": "Urgent",
+    "escalation_triggers": ["repeat access"],
+    "recommended_sla": "1 hour",
+}
+
+# System prompt markers identifying which tool issued a request
+RESPONSES = [
+    ("In one response, classify", {
+        "classification": CLASSIFICATION,
+        "risk_assessment": RISK_ASSESSMENT,
+        "prioritization": PRIORITIZATION,
+    }),
+    ("INCIDENT CATEGORIES", CLASSIFICATION),
+    ("RISK ASSESSMENT FRAMEWORK", RISK_ASSESSMENT),
+    ("PRIORITIZATION FACTORS", PRIORITIZATION),
+]
+
+TRIAGE_NODES = [
+    "_classify_incident", "_assess_risk", "_safety_check", "_prioritize_incident",
+    "_select_playbook", "_compliance_check", "_generate_response",
+]
+
+
+class SimulatedLLM:
+    """Chat model stand-in with fixed latency and token accounting."""
+
+    def __init__(self, latency: float, invalid_rate: float, seed: int = 0):
+        self.latency = latency
+        self.invalid_rate = invalid_rate
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    async def ainvoke(self, prompt):
+        text = "\n".join(getattr(message, "content", str(message)) for message in prompt)
+        payload: Dict = {}
+        for marker, response in RESPONSES:
+            if marker in text:
+                payload = json.loads(json.dumps(response))
+                break
+
+        # Occasionally corrupt the fused risk section to exercise fallbacks
+        if "risk_assessment" in payload and self.rng.random() < self.invalid_rate:
+            payload["risk_assessment"] = {"risk_score": "unknown"}
+
+        content = json.dumps(payload)
+        self.calls += 1
+        self.input_tokens += len(text) // 4
+        self.output_tokens += len(content) // 4
+
+        await asyncio.sleep(self.latency)
+        return AIMessage(content=content)
+
+
+def _build_workflow(llm: SimulatedLLM, fused: bool) -> SecurityTriageWorkflow:
+    classifier = IncidentClassifier(llm)
+    prioritizer = IncidentPrioritizer(llm)
+    return SecurityTriageWorkflow(
+        classifier=classifier,
+        prioritizer=prioritizer,
+        playbook_selector=PlaybookSelector(llm),
+        response_generator=ResponseGenerator(llm),
+        compliance_checker=ComplianceChecker(llm),
+        safety_guardrails=SafetyGuardrails(llm),
+        session_manager=SessionManager(),
+        metrics_tracker=MetricsTracker(),
+        fused_triage=FusedTriageTool(classifier, prioritizer) if fused else None
+    )
+
+
+async def _triage(workflow: SecurityTriageWorkflow, index: int) -> float:
+    state = IncidentState(
+        incident_id=f"BENCH-{index:05d}",
+        title="Keycard access after checkout",
+        description="A guest room keycard opened the door two hours after the guest checked out."
+    )
+
+    start = time.perf_counter()
+    for node in TRIAGE_NODES:
+        try:
+            state = await getattr(workflow, node)(state)
+        except Exception:
+            # A failing node is routed to handle_error in the graph
+            break
+    return time.perf_counter() - start
+
+
+async def benchmark(
+    incidents: int,
+    latency: float,
+    invalid_rate: float,
+    input_price: float,
+    output_price: float
+) -> None:
+    """Run both modes and print per-incident calls, latency and cost."""
+    print(f"{incidents} incidents, {latency * 1000:.0f}ms per LLM call, "
+          f"{invalid_rate:.0%} invalid fused risk sections")
+    print(f"{'mode':<10} {'calls/inc':>10} {'p50 latency':>12} {'tokens/inc':>11} {'cost/inc':>10}")
+
+    for mode in ("per_tool", "fused"):
+        llm = SimulatedLLM(latency, invalid_rate)
+        workflow = _build_workflow(llm, fused=mode == "fused")
+
+        latencies: List[float] = []
+        for index in range(incidents):
+            latencies.append(await _triage(workflow, index))
+
+        latencies.sort()
+        tokens = (llm.input_tokens + llm.output_tokens) / incidents
+        cost = (llm.input_tokens * input_price + llm.output_tokens * output_price) / 1000 / incidents
+        print(
+            f"{mode:<10} {llm.calls / incidents:>10.2f} "
+            f"{latencies[len(latencies) // 2]:>11.2f}s {tokens:>11.0f} {cost:>9.4f}$"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=20,
+                        help="Incidents to triage per mode")
+    parser.add_argument("--latency", type=float, default=0.8,
+                        help="Simulated seconds per LLM call")
+    parser.add_argument("--invalid-rate", type=float, default=0.0,
+                        help="Fraction of fused responses with an invalid risk section")
+    parser.add_argument("--input-price", type=float, default=0.03,
+                        help="USD per 1k input tokens")
+    parser.add_argument("--output-price", type=float, default=0.06,
+                        help="USD per 1k output tokens")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(
+        args.incidents, args.latency, args.invalid_rate,
+        args.input_price, args.output_price
+    ))
+
+
+if __name__ == "__main__":
+    main()
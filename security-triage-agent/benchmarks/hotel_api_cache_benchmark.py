@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Hotel API Cache Benchmark
+
+Measures upstream requests and wall time for the room and keycard lookups a
+triage workflow makes per incident. A local stand-in for the PMS and access
+control APIs adds a fixed latency to every request. Each incident looks up
+its room's guest and occupancy history and the keycard's access logs from
+several workflow steps, some of them concurrently, and revokes the card
+half-way through.
+
+Usage:
+    python benchmarks/hotel_api_cache_benchmark.py
+    python benchmarks/hotel_api_cache_benchmark.py --incidents 50 --latency-ms 80
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from security_triage_agent.tools.api_cache import ReadThroughCache, close_shared_http_client
+from security_triage_agent.tools.hotel_management_tools import AccessControlTool, PropertyManagementTool
+
+
+GUEST = {
+    "guest_id": "G-1", "first_name": "Asha", "last_name": "Rao", "email": "asha@example.com",
+    "phone": "+91-90000-00000", "room_number": "1205", "check_in_date": "2024-01-01T12:00:00",
+    "check_out_date": "2024-01-04T11:00:00", "guest_type": "VIP",
+}
+
+
+class UncachedLookups(ReadThroughCache):
+    """Every lookup goes upstream, as before the cache."""
+
+    async def get_or_fetch(self, resource, scope, fetch, variant="", cache_if=None):
+        self.stats["misses"] += 1
+        return await fetch()
+
+
+def _start_server(latency: float):
+    requests = {"count": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, body):
+            requests["count"] += 1
+            time.sleep(latency)
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if "/guests/by-room/" in self.path:
+                self._reply(GUEST)
+            elif "occupancy-history" in self.path:
+                self._reply({"occupancy_records": [{"guest_id": "G-1"}] * 20})
+            else:
+                self._reply({"access_logs": [{"door": "1205", "result": "granted"}] * 50})
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self._reply({"affected_areas": ["floor_12"]})
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, requests
+
+
+async def _incident(pms: PropertyManagementTool, access: AccessControlTool, index: int) -> None:
+    room, card = str(1000 + index % 20), f"CARD-{index % 20}"
+    # Classification and risk assessment look at the room and card concurrently
+    await asyncio.gather(
+        pms.get_guest_info(room), pms.get_room_occupancy_history(room),
+        access.get_access_logs(card), pms.get_guest_info(room), access.get_access_logs(card)
+    )
+    # Playbook selection and response generation repeat the lookups
+    await pms.get_guest_info(room)
+    await access.get_access_logs(card)
+    await access.revoke_access(card, "suspicious use")
+    await access.get_access_logs(card)
+    await pms.get_room_occupancy_history(room)
+
+
+async def _run(url: str, cache_class, incidents: int):
+    pms = PropertyManagementTool(url, "key", cache=cache_class())
+    access = AccessControlTool(url, "key", cache=cache_class())
+    started = time.perf_counter()
+    await asyncio.gather(*(_incident(pms, access, index) for index in range(incidents)))
+    elapsed = time.perf_counter() - started
+    await close_shared_http_client()
+    return elapsed
+
+
+async def benchmark(incidents: int, latency: float) -> None:
+    """Print upstream requests and wall time with and without the cache."""
+    server, requests = _start_server(latency)
+    print(f"{incidents} incidents over 20 rooms, {latency * 1000:.0f}ms per API request\n")
+    print(f"{'lookups':<10} {'requests':>9} {'seconds':>9}")
+    try:
+        for name, cache_class in (("uncached", UncachedLookups), ("cached", ReadThroughCache)):
+            requests["count"] = 0
+            elapsed = await _run(f"http://127.0.0.1:{server.server_address[1]}", cache_class, incidents)
+            print(f"{name:<10} {requests['count']:>9} {elapsed:>9.2f}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=40,
+                        help="Concurrent incidents")
+    parser.add_argument("--latency-ms", type=float, default=50.0,
+                        help="Stand-in API latency per request in milliseconds")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.incidents, args.latency_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
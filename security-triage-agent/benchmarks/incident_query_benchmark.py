@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Incident Query Benchmark
+
+Compares the incident scans behind MemoryRetriever statistics: full
+IncidentRecord pages with SELECT * and LIMIT/OFFSET against projected,
+keyset-paginated streaming. Incidents carry tool result, response plan and
+quality score blobs of realistic size, which the statistics never read.
+
+Usage:
+    python benchmarks/incident_query_benchmark.py
+    python benchmarks/incident_query_benchmark.py --incidents 20000 --blob-kb 16
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from security_triage_agent.memory.persistent_storage import INCIDENT_COLUMNS, PersistentStorage
+
+
+STATISTICS_COLUMNS = ("status", "priority", "processing_time_seconds", "risk_score", "human_interventions")
+
+
+async def _populate(storage: PersistentStorage, incidents: int, blob_kb: int) -> None:
+    blob = json.dumps({"notes": "x" * (blob_kb * 1024)})
+    started = datetime.utcnow() - timedelta(days=30)
+    rows = [
+        {
+            "incident_id": f"inc_{number:06d}", "title": f"Incident {number}",
+            "description": "Key card used after checkout", "category": "guest_access",
+            "priority": ("low", "medium", "high")[number % 3],
+            "status": "resolved" if number % 2 else "active",
+            "created_at": started + timedelta(seconds=number * 60),
+            "updated_at": started + timedelta(seconds=number * 60 + 300),
+            "resolved_at": None, "risk_score": number % 10, "classification_confidence": 0.9,
+            "processing_time_seconds": 300.0, "human_interventions": number % 4 == 0,
+            "workflow_steps_completed": 9, "workflow_steps_failed": 0, "metadata_json": "{}",
+            "tool_results_json": blob, "response_plan_json": blob, "quality_scores_json": blob,
+            "compliance_frameworks": "dpdp", "safety_violations": 0, "requires_followup": False,
+        }
+        for number in range(incidents)
+    ]
+    async with storage.pool.writer() as db:
+        await db.executemany(
+            f"INSERT INTO incidents ({', '.join(INCIDENT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in INCIDENT_COLUMNS)})",
+            [tuple(row[column] for column in INCIDENT_COLUMNS) for row in rows]
+        )
+
+
+async def _full_records(storage: PersistentStorage, page_size: int) -> int:
+    seen, offset = 0, 0
+    while True:
+        records = await storage.search_incidents(limit=page_size, offset=offset)
+        seen += sum(1 for record in records if record.human_interventions > 0)
+        if len(records) < page_size:
+            return seen
+        offset += page_size
+
+
+async def _projected_stream(storage: PersistentStorage, page_size: int) -> int:
+    seen = 0
+    async for row in storage.stream_incidents(columns=STATISTICS_COLUMNS, batch_size=page_size):
+        seen += row.human_interventions > 0
+    return seen
+
+
+async def _measure(scan, storage: PersistentStorage, page_size: int):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = await scan(storage, page_size)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+async def benchmark(incidents: int, blob_kb: int, page_size: int) -> None:
+    """Print scan time and peak Python memory for both query paths."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = PersistentStorage(str(Path(tmpdir) / "incidents.db"))
+        await storage.initialize()
+        await _populate(storage, incidents, blob_kb)
+        print(f"{incidents} incidents, 3 x {blob_kb}KB JSON blobs each, pages of {page_size}\n")
+        print(f"{'scan':<20} {'seconds':>9} {'peak MB':>9}")
+
+        counts = []
+        for name, scan in (("SELECT * / OFFSET", _full_records), ("projected keyset", _projected_stream)):
+            count, elapsed, peak = await _measure(scan, storage, page_size)
+            counts.append(count)
+            print(f"{name:<20} {elapsed:>9.2f} {peak / 1e6:>9.1f}")
+
+        assert counts[0] == counts[1], counts
+        await storage.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=10000,
+                        help="Incidents stored before scanning")
+    parser.add_argument("--blob-kb", type=int, default=8,
+                        help="Size of each JSON blob column in KB")
+    parser.add_argument("--page-size", type=int, default=1000,
+                        help="Rows fetched per query")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.incidents, args.blob_kb, args.page_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Incident Text Search Benchmark
+
+Measures text search and similar-incident lookups over a large incident
+history. Text search through the FTS5 index is compared against a LIKE scan
+of titles and descriptions. Similar-incident lookups are compared with and
+without the BM25 candidate prefilter, which limits similarity scoring to the
+best few hundred full-text matches on the query's most selective words.
+Reports mention rooms, key cards and terminals by number, as real ones do;
+a query without such details falls back to scoring every incident. The
+"same top 5" column counts prefiltered results that exhaustive scoring also
+ranks in its top 5.
+
+Usage:
+    python benchmarks/incident_text_search_benchmark.py
+    python benchmarks/incident_text_search_benchmark.py --incidents 100000 --candidates 200
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from security_triage_agent.memory.memory_retriever import MemoryRetriever
+from security_triage_agent.memory.persistent_storage import INCIDENT_COLUMNS, PersistentStorage
+
+
+SUBJECTS = ["key card", "guest", "visitor", "employee", "contractor", "pos terminal", "wifi network",
+            "cctv camera", "minibar", "safe", "laptop", "parcel", "vehicle", "booking system"]
+EVENTS = ["used after checkout", "reported stolen", "accessed restricted floor", "found unattended",
+          "showed unusual transactions", "was tampered with", "stopped recording", "was cloned",
+          "triggered the alarm", "sent phishing email", "overcharged the guest", "went offline"]
+PLACES = ["lobby", "spa", "parking garage", "restaurant", "conference room", "pool deck",
+          "service corridor", "front desk", "data center", "staff entrance"]
+CATEGORIES = ["guest_access", "payment_fraud", "cyber_security", "physical_security", "operational_security"]
+
+SIMILAR_QUERIES = [
+    ("Key card used after checkout", "Key card 48213 still opened room 1205 after checkout at the front desk"),
+    ("Skimmer on pos terminal", "Terminal t0417 in the restaurant was tampered with and showed unusual transactions"),
+    ("Camera offline", "A cctv camera in the parking garage stopped recording overnight"),
+]
+
+TEXT_QUERIES = [("cloned", "spa"), ("1205", "cloned")]
+
+
+def _incident_rows(start: int, count: int, started: datetime, rng: random.Random):
+    for number in range(start, start + count):
+        title = f"{rng.choice(SUBJECTS).capitalize()} {rng.choice(EVENTS)}"
+        description = (
+            f"The {rng.choice(SUBJECTS)} in the {rng.choice(PLACES)} {rng.choice(EVENTS)}; "
+            f"room {rng.randint(100, 2500)} notified, key card {rng.randint(10000, 99999)} and "
+            f"terminal t{rng.randint(0, 9999):04d} checked near the {rng.choice(PLACES)}"
+        )
+        created_at = started + timedelta(seconds=number * 20)
+        values = {
+            "incident_id": f"inc_{number:07d}", "title": title, "description": description,
+            "category": rng.choice(CATEGORIES), "priority": "medium", "status": "resolved",
+            "created_at": created_at, "updated_at": created_at, "resolved_at": None,
+            "risk_score": None, "classification_confidence": None, "processing_time_seconds": None,
+            "human_interventions": 0, "workflow_steps_completed": 0, "workflow_steps_failed": 0,
+            "metadata_json": "{}", "tool_results_json": "{}", "response_plan_json": "{}",
+            "quality_scores_json": "{}", "compliance_frameworks": "", "safety_violations": 0,
+            "requires_followup": False,
+        }
+        yield tuple(values[column] for column in INCIDENT_COLUMNS)
+
+
+async def _populate(storage: PersistentStorage, incidents: int, batch_size: int = 50000) -> None:
+    rng = random.Random(7)
+    started = datetime.utcnow() - timedelta(seconds=incidents * 20)
+    insert_sql = (
+        f"INSERT INTO incidents ({', '.join(INCIDENT_COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in INCIDENT_COLUMNS)})"
+    )
+    for start in range(0, incidents, batch_size):
+        rows = list(_incident_rows(start, min(batch_size, incidents - start), started, rng))
+        async with storage.pool.writer() as db:
+            await db.executemany(insert_sql, rows)
+        storage.similarity_index.add_many(
+            (row[0], f"{row[1]} {row[2]}", row[3], row[6]) for row in rows
+        )
+
+
+async def _time(coroutine_function, repeats: int):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        result = await coroutine_function()
+    return (time.perf_counter() - started) / repeats * 1000, result
+
+
+async def benchmark(incidents: int, candidates: int, repeats: int) -> None:
+    """Print per-query latency of each search path."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = PersistentStorage(str(Path(tmpdir) / "incidents.db"))
+        await storage.initialize()
+
+        started = time.perf_counter()
+        await _populate(storage, incidents)
+        print(f"{incidents} incidents stored and indexed in {time.perf_counter() - started:.1f}s\n")
+
+        async def like_scan(words):
+            async with storage.pool.reader() as db:
+                cursor = await db.execute(
+                    "SELECT incident_id FROM incidents WHERE "
+                    + " AND ".join("(title LIKE ? OR description LIKE ?)" for _ in words)
+                    + " ORDER BY created_at DESC LIMIT 50",
+                    [f"%{word}%" for word in words for _ in range(2)]
+                )
+                return await cursor.fetchall()
+
+        async def fts_search(words):
+            return await storage.search_text(" ".join(words), limit=50)
+
+        print(f"{'text search':<28} {'LIKE ms':>9} {'FTS5 ms':>9}")
+        for words in TEXT_QUERIES:
+            like_ms, _ = await _time(lambda: like_scan(words), repeats)
+            fts_ms, _ = await _time(lambda: fts_search(words), repeats)
+            print(f"{' '.join(words):<28} {like_ms:>9.1f} {fts_ms:>9.1f}")
+
+        print(f"\n{'similar incidents':<28} {'all ms':>9} {'prefilter ms':>13} {'same top 5':>11}")
+        full = MemoryRetriever(storage, similarity_threshold=0.3, prefilter_candidates=0)
+        prefiltered = MemoryRetriever(storage, similarity_threshold=0.3, prefilter_candidates=candidates)
+        for title, description in SIMILAR_QUERIES:
+            full_ms, full_similar = await _time(
+                lambda: full.find_similar_incidents(title, description), repeats
+            )
+            prefilter_ms, prefiltered_similar = await _time(
+                lambda: prefiltered.find_similar_incidents(title, description), repeats
+            )
+            overlap = len(
+                {similar.incident_record.incident_id for similar in full_similar}
+                & {similar.incident_record.incident_id for similar in prefiltered_similar}
+            )
+            print(f"{title:<28} {full_ms:>9.1f} {prefilter_ms:>13.1f} {overlap:>9}/5")
+
+        await storage.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=1000000,
+                        help="Incidents stored before searching")
+    parser.add_argument("--candidates", type=int, default=300,
+                        help="Full-text candidates scored by the prefiltered lookup")
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="Runs averaged per query")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.incidents, args.candidates, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache Benchmark
+
+Replays a burst of repeated alarms through CachedLLM in front of a fake
+model with fixed API latency. Reports how many model calls were made,
+hit latency for the in-memory and SQLite tiers, and how concurrent
+duplicate requests are coalesced into one call.
+
+Usage:
+    python benchmarks/llm_cache_benchmark.py
+    python benchmarks/llm_cache_benchmark.py --requests 5000 --distinct 50 --latency 0.8
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from security_triage_agent.memory.llm_cache import CachedLLM, LLMResponseCache
+
+
+class FakeLLM:
+    """Chat model stand-in with a fixed response latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return AIMessage(content='{"category": "guest_access", "confidence": 0.9}')
+
+
+def _prompt(alarm: int) -> List:
+    return [
+        SystemMessage(content="You are an expert hospitality security analyst."),
+        HumanMessage(content=f"Door forced open alarm at service entrance {alarm}"),
+    ]
+
+
+def _summarise(name: str, samples: List[float]) -> None:
+    p50, p99 = np.percentile(np.asarray(samples) * 1e6, [50, 99])
+    print(f"  {name:<16} p50 {p50:>9.1f}us   p99 {p99:>9.1f}us")
+
+
+async def benchmark(requests: int, distinct: int, latency: float, concurrency: int) -> None:
+    """Run the replay and print call counts and latencies."""
+    rng = random.Random(0)
+    alarms = [rng.randrange(distinct) for _ in range(requests)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "llm_cache.db"
+        cache = LLMResponseCache(db_path)
+        await cache.initialize()
+        model = FakeLLM(latency)
+        llm = CachedLLM(model, cache, "gpt-4", 0.1)
+
+        # Concurrent burst: duplicates in flight share one model call
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(alarm: int) -> None:
+            async with semaphore:
+                await llm.ainvoke(_prompt(alarm))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(call(alarm) for alarm in alarms))
+        elapsed = time.perf_counter() - start
+        uncached = requests * latency / concurrency
+
+        print(f"{requests} requests over {distinct} distinct prompts, "
+              f"{latency * 1000:.0f}ms model latency, concurrency {concurrency}")
+        print(f"  model calls      {model.calls} (uncached: {requests})")
+        print(f"  wall time        {elapsed:.2f}s (uncached estimate: {uncached:.2f}s)")
+        print(f"  metrics          {cache.get_metrics()}")
+
+        # Hit latency, in-memory tier
+        samples = []
+        for alarm in alarms[:2000]:
+            start = time.perf_counter()
+            await llm.ainvoke(_prompt(alarm))
+            samples.append(time.perf_counter() - start)
+        _summarise("memory hit", samples)
+        await cache.close()
+
+        # Hit latency, SQLite tier (fresh process state over the same file)
+        cache = LLMResponseCache(db_path, memory_entries=1)
+        await cache.initialize()
+        llm = CachedLLM(model, cache, "gpt-4", 0.1)
+        samples = []
+        for alarm in range(distinct):
+            start = time.perf_counter()
+            await llm.ainvoke(_prompt(alarm))
+            samples.append(time.perf_counter() - start)
+        _summarise("sqlite hit", samples)
+        await cache.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="Total LLM requests to replay")
+    parser.add_argument("--distinct", type=int, default=100,
+                        help="Distinct alarms among the requests")
+    parser.add_argument("--latency", type=float, default=0.5,
+                        help="Simulated model latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="Concurrent requests")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.requests, args.distinct, args.latency, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
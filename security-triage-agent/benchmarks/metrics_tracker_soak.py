@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+MetricsTracker Soak Test
+
+Drives MetricsTracker through a long run of simulated incidents and samples
+process RSS and the tracker's memory gauge along the way. Each incident
+records the step, tool, quality and intervention telemetry of a workflow
+run, is marked processed and is then finished; a small share is abandoned
+without finishing to exercise the max_tracked_incidents bound. With the
+per-incident lifecycle RSS should stay flat once the aggregates and
+sketches are warm.
+
+Usage:
+    python benchmarks/metrics_tracker_soak.py
+    python benchmarks/metrics_tracker_soak.py --incidents 200000 --samples 10
+"""
+
+import argparse
+import asyncio
+import resource
+import sys
+import time
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from security_triage_agent.core.state import IncidentCategory, IncidentPriority
+from security_triage_agent.evaluation.metrics_tracker import MetricsTracker
+
+
+STEPS = ["classify_incident", "assess_risk", "prioritize_incident", "generate_response"]
+CATEGORIES = list(IncidentCategory)
+PRIORITIES = list(IncidentPriority)
+
+
+def _rss_mb() -> float:
+    """Current resident set size, falling back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _simulate_incident(tracker: MetricsTracker, index: int, abandon_every: int) -> None:
+    incident_id = f"soak_{index:08d}"
+    await tracker.start_incident_tracking(incident_id)
+
+    for step in STEPS:
+        await tracker.record_step_completion(incident_id, step, 0.05 + (index % 7) * 0.01)
+        await tracker.record_tool_performance(
+            incident_id, step, 0.04, True, output_quality=0.9, confidence_score=0.85
+        )
+    await tracker.record_quality_assessment(incident_id, "overall_quality", 0.8)
+    if index % 10 == 0:
+        await tracker.record_human_intervention(incident_id, "approval", "high risk")
+
+    await tracker.record_incident_processed(
+        CATEGORIES[index % len(CATEGORIES)], PRIORITIES[index % len(PRIORITIES)],
+        30.0 + index % 90, incident_id=incident_id
+    )
+
+    # Abandoned incidents are left for the max_tracked_incidents bound
+    if abandon_every and index % abandon_every == 0:
+        return
+    await tracker.finish_incident_tracking(incident_id)
+
+
+async def soak(incidents: int, samples: int, max_tracked: int, abandon_every: int) -> None:
+    """Run the soak and print RSS and gauge samples."""
+    tracker = MetricsTracker(max_tracked_incidents=max_tracked)
+    interval = max(1, incidents // samples)
+
+    print(f"{'incidents':>10} {'rss MB':>8} {'tracked':>8} {'tracked KB':>11} "
+          f"{'aggregate KB':>13} {'sketch bins':>12} {'inc/s':>8}")
+    start = time.perf_counter()
+    readings = []
+    for index in range(1, incidents + 1):
+        await _simulate_incident(tracker, index, abandon_every)
+
+        if index % interval == 0:
+            usage = tracker.get_memory_usage()
+            rss = _rss_mb()
+            readings.append(rss)
+            print(
+                f"{index:>10} {rss:>8.1f} {usage['tracked_incidents']:>8} "
+                f"{usage['tracked_bytes'] / 1024:>11.0f} {usage['aggregate_bytes'] / 1024:>13.0f} "
+                f"{usage['sketch_bins']:>12} {index / (time.perf_counter() - start):>8.0f}"
+            )
+
+    if len(readings) >= 2:
+        print(f"\nRSS change after the first sample: {readings[-1] - readings[0]:+.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=1_000_000,
+                        help="Incidents to simulate")
+    parser.add_argument("--samples", type=int, default=10,
+                        help="Number of memory samples to print")
+    parser.add_argument("--max-tracked", type=int, default=1000,
+                        help="MetricsTracker max_tracked_incidents")
+    parser.add_argument("--abandon-every", type=int, default=100,
+                        help="Leave every Nth incident unfinished (0 to finish all)")
+    args = parser.parse_args()
+
+    asyncio.run(soak(args.incidents, args.samples, args.max_tracked, args.abandon_every))
+
+
+if __name__ == "__main__":
+    main()
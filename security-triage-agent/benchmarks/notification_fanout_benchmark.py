@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Notification Fan-out Benchmark
+
+Measures how long a critical alert takes to reach every on-duty recipient
+over several channels. Provider clients are simulated with a fixed latency
+per call; email and Slack clients accept batches.
+
+Two strategies are compared:
+    sequential  one awaited send per recipient and channel, as
+                NotificationOrchestratorTool did before the dispatcher
+    dispatcher  NotificationDispatcher: concurrent sends under per-channel
+                token buckets, deduplicated addresses, batched email and Slack
+
+Usage:
+    python benchmarks/notification_fanout_benchmark.py
+    python benchmarks/notification_fanout_benchmark.py --recipients 50 --sms-rate 10
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from security_triage_agent.tools.notification_dispatch import NotificationDispatcher, NotificationRequest
+
+
+LATENCY = {"sms": 0.1, "email": 0.2, "slack": 0.1, "phone_call": 1.0, "whatsapp": 0.3}
+
+
+class SimulatedClient:
+    """Provider client with a fixed per-call latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def send(self, recipient: str, message: str, priority: str) -> bool:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return True
+
+
+class SimulatedBatchClient(SimulatedClient):
+    async def send_batch(self, recipients: List[str], message: str, priority: str) -> List[bool]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return [True] * len(recipients)
+
+
+def _clients() -> Dict[str, SimulatedClient]:
+    return {
+        channel: (SimulatedBatchClient if channel in ("email", "slack") else SimulatedClient)(latency)
+        for channel, latency in LATENCY.items()
+    }
+
+
+def _requests(recipients: int) -> List[NotificationRequest]:
+    """Critical alert: SMS, email, Slack and a phone call per recipient."""
+    requests = []
+    for index in range(recipients):
+        targets = [
+            ("sms", f"+91-98765-{index:05d}"),
+            ("email", f"staff{index}@hotel.com"),
+            ("slack", f"@staff{index}"),
+            ("phone_call", f"+91-98765-{index:05d}"),
+        ]
+        # Preferences often repeat a channel the priority rules add anyway
+        if index % 3 == 0:
+            targets.append(("phone_call", f"+91-98765-{index:05d}"))
+        requests.append(NotificationRequest(f"staff-{index}", targets, "SECURITY ALERT - CRITICAL", "critical"))
+    return requests
+
+
+async def _sequential(requests: List[NotificationRequest]) -> Dict[str, float]:
+    clients = _clients()
+    started = time.perf_counter()
+    for request in requests:
+        for channel, address in request.targets:
+            await clients[channel].send(address, request.message, request.priority)
+    return {"seconds": time.perf_counter() - started,
+            "calls": sum(client.calls for client in clients.values())}
+
+
+async def _dispatcher(requests: List[NotificationRequest], sms_rate: float, phone_rate: float) -> Dict[str, float]:
+    clients = _clients()
+    dispatcher = NotificationDispatcher(
+        clients,
+        rate_limits={"sms": (sms_rate, int(sms_rate)), "phone_call": (phone_rate, int(phone_rate)),
+                     "whatsapp": (5.0, 5)},
+        deadline_seconds=120.0
+    )
+    started = time.perf_counter()
+    deliveries = await dispatcher.dispatch(requests)
+    assert all(delivery.success for delivery in deliveries)
+    return {"seconds": time.perf_counter() - started,
+            "calls": sum(client.calls for client in clients.values())}
+
+
+async def benchmark(recipients: int, sms_rate: float, phone_rate: float) -> None:
+    """Print time to notify everyone and provider calls for each strategy."""
+    requests = _requests(recipients)
+    print(f"{recipients} recipients, critical alert, SMS {sms_rate:g}/s, phone {phone_rate:g}/s\n")
+    print(f"{'strategy':<11} {'seconds':>9} {'client calls':>13}")
+    for name, run in (("sequential", _sequential(requests)),
+                      ("dispatcher", _dispatcher(requests, sms_rate, phone_rate))):
+        result = await run
+        print(f"{name:<11} {result['seconds']:>9.2f} {result['calls']:>13}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--recipients", type=int, default=10,
+                        help="On-duty recipients to alert")
+    parser.add_argument("--sms-rate", type=float, default=10.0,
+                        help="SMS provider sends per second")
+    parser.add_argument("--phone-rate", type=float, default=5.0,
+                        help="Voice provider calls per second")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.recipients, args.sms_rate, args.phone_rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Retention Benchmark
+
+Measures how long incident writes stall while expired records are removed.
+The single-statement cleanup deletes every expired incident and its history,
+compliance events and metrics in one write transaction; batched retention
+archives and deletes a bounded batch per transaction and returns freed pages
+with incremental vacuum. A writer records a performance metric every few
+milliseconds throughout, and its worst and 99th percentile latencies are
+reported with the database file size afterwards.
+
+Usage:
+    python benchmarks/retention_benchmark.py
+    python benchmarks/retention_benchmark.py --incidents 50000 --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from security_triage_agent.memory.persistent_storage import INCIDENT_COLUMNS, PersistentStorage
+
+
+async def _populate(storage: PersistentStorage, incidents: int, batch_size: int = 10000) -> None:
+    started = datetime.utcnow() - timedelta(days=800)
+    insert_sql = (
+        f"INSERT INTO incidents ({', '.join(INCIDENT_COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in INCIDENT_COLUMNS)})"
+    )
+    for start in range(0, incidents, batch_size):
+        numbers = range(start, min(start + batch_size, incidents))
+        rows, history, metrics = [], [], []
+        for number in numbers:
+            incident_id = f"inc_{number:07d}"
+            # Two thirds expired, the rest inside retention
+            created_at = started + timedelta(days=(number % 3) * 300, seconds=number)
+            values = {
+                "incident_id": incident_id, "title": f"Key card used after checkout {number}",
+                "description": "Former guest key card opened a room after checkout " * 8,
+                "category": "guest_access", "priority": "medium", "status": "closed",
+                "created_at": created_at, "updated_at": created_at, "resolved_at": created_at,
+                "risk_score": 5.0, "classification_confidence": 0.9, "processing_time_seconds": 300.0,
+                "human_interventions": 0, "workflow_steps_completed": 9, "workflow_steps_failed": 0,
+                "metadata_json": "{}", "tool_results_json": '{"pms": "' + "x" * 2000 + '"}',
+                "response_plan_json": "{}", "quality_scores_json": "{}",
+                "compliance_frameworks": "dpdp", "safety_violations": 0, "requires_followup": False,
+            }
+            rows.append(tuple(values[column] for column in INCIDENT_COLUMNS))
+            history.extend((incident_id, created_at, change, "{}") for change in ("created", "status_changed"))
+            metrics.append((incident_id, "processing_time", 300.0, created_at))
+        async with storage.pool.writer() as db:
+            await db.executemany(insert_sql, rows)
+            await db.executemany(
+                "INSERT INTO incident_history (incident_id, timestamp, change_type, change_data) "
+                "VALUES (?, ?, ?, ?)", history
+            )
+            await db.executemany(
+                "INSERT INTO performance_metrics (incident_id, metric_name, metric_value, metric_timestamp) "
+                "VALUES (?, ?, ?, ?)", metrics
+            )
+
+
+async def _single_statement_cleanup(storage: PersistentStorage, retention_days: int) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    async with storage.pool.writer() as db:
+        cursor = await db.execute(
+            "DELETE FROM incidents WHERE created_at < ? AND status = 'closed'", (cutoff,)
+        )
+        count = cursor.rowcount
+        for table in ("incident_history", "compliance_events", "performance_metrics"):
+            await db.execute(
+                f"DELETE FROM {table} WHERE incident_id NOT IN (SELECT incident_id FROM incidents)"
+            )
+    return count
+
+
+async def _write_latencies(storage: PersistentStorage, stop: asyncio.Event, interval: float):
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await storage.record_performance_metric("inc_live", "queue_depth", 1.0)
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return sorted(latencies)
+
+
+async def _run(name: str, incidents: int, cleanup, tmpdir: str) -> None:
+    db_path = Path(tmpdir) / f"{name}.db"
+    storage = PersistentStorage(str(db_path), archive_dir=str(Path(tmpdir) / f"{name}_archive"))
+    await storage.initialize()
+    await _populate(storage, incidents)
+    size_before = os.path.getsize(db_path)
+
+    stop = asyncio.Event()
+    writer = asyncio.create_task(_write_latencies(storage, stop, 0.005))
+    await asyncio.sleep(0.1)
+    started = time.perf_counter()
+    removed = await cleanup(storage)
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0.1)
+    stop.set()
+    latencies = await writer
+
+    async with storage.pool.writer() as db:
+        await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    size_after = os.path.getsize(db_path)
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(f"{name:<18} {removed:>9} {elapsed:>8.2f} {latencies[-1] * 1000:>11.1f} {p99 * 1000:>9.1f} "
+          f"{size_before / 1e6:>9.1f} {size_after / 1e6:>9.1f}")
+    await storage.close()
+
+
+async def benchmark(incidents: int, batch_size: int, vacuum_pages: int) -> None:
+    """Print cleanup time, writer stalls and file size for both retention paths."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print(f"{incidents} incidents, two thirds past 365 day retention\n")
+        print(f"{'cleanup':<18} {'removed':>9} {'seconds':>8} {'max write ms':>11} {'p99 ms':>9} "
+              f"{'MB before':>9} {'MB after':>9}")
+        await _run("single statement", incidents,
+                   lambda storage: _single_statement_cleanup(storage, 365), tmpdir)
+        await _run("batched + archive", incidents,
+                   lambda storage: storage.apply_retention(
+                       365, batch_size=batch_size, vacuum_pages=vacuum_pages
+                   ), tmpdir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=100000,
+                        help="Incidents stored before retention runs")
+    parser.add_argument("--batch-size", type=int, default=500,
+                        help="Incidents archived and deleted per transaction")
+    parser.add_argument("--vacuum-pages", type=int, default=1000,
+                        help="Free pages returned after each batch")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.incidents, args.batch_size, args.vacuum_pages))
+
+
+if __name__ == "__main__":
+    main()
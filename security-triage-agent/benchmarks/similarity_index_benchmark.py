@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Incident Similarity Index Benchmark
+
+Measures similar-incident lookup latency with the IncidentSimilarityIndex
+against the previous approach of refitting a TF-IDF vectorizer over the
+most recent incidents and scoring them one by one. The legacy path only
+ever looked at 1000 incidents; the index searches the full history.
+
+Usage:
+    python benchmarks/similarity_index_benchmark.py
+    python benchmarks/similarity_index_benchmark.py --sizes 1000 10000 --queries 200
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Tuple
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from security_triage_agent.memory.similarity_index import IncidentSimilarityIndex
+
+
+CATEGORIES = [
+    "guest_access", "payment_fraud", "data_breach", "operational_security",
+    "physical_security", "cyber_security", "compliance_violation", "vendor_security",
+]
+
+VOCABULARY = (
+    "guest room keycard unauthorized access lobby floor suite elevator "
+    "payment card transaction chargeback refund pos terminal fraud "
+    "database export pii leak email phishing credential password reset "
+    "cctv camera door alarm badge staff vendor contractor laptop usb "
+    "malware ransomware network firewall vpn wifi login failed attempts "
+    "complaint theft missing luggage restaurant spa parking valet"
+).split()
+
+LEGACY_CANDIDATES = 1000
+
+
+def _generate_incidents(count: int, seed: int) -> List[Tuple[str, str, str, datetime]]:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    return [
+        (
+            f"INC-{i:08d}",
+            " ".join(rng.choices(VOCABULARY, k=rng.randint(12, 40))),
+            rng.choice(CATEGORIES),
+            now - timedelta(minutes=rng.randint(0, 60 * 24 * 300)),
+        )
+        for i in range(count)
+    ]
+
+
+def _legacy_query(incidents, query_text: str, category: str, threshold: float) -> int:
+    """Replicates the per-call TF-IDF refit and scoring loop."""
+    candidates = [inc for inc in incidents if inc[2] == category][:LEGACY_CANDIDATES]
+    vectorizer = TfidfVectorizer(max_features=1000, stop_words="english", ngram_range=(1, 2))
+    vectors = vectorizer.fit_transform([text for _, text, _, _ in candidates])
+    query_vector = vectorizer.transform([query_text])
+
+    matches = 0
+    for row in range(vectors.shape[0]):
+        if cosine_similarity(query_vector, vectors[row])[0][0] >= threshold:
+            matches += 1
+    return matches
+
+
+def _percentiles(samples: List[float]) -> str:
+    p50, p95 = np.percentile(np.asarray(samples) * 1000, [50, 95])
+    return f"{p50:>9.2f}ms {p95:>9.2f}ms"
+
+
+def benchmark(sizes: List[int], queries: int, legacy: bool) -> None:
+    """Build indexes of increasing size and time queries against them."""
+    print(f"{'mode':<8} {'incidents':>10} {'build':>10} {'p50':>11} {'p95':>11}")
+
+    for size in sizes:
+        incidents = _generate_incidents(size, seed=size)
+        rng = random.Random(0)
+        probes = [rng.choice(incidents) for _ in range(queries)]
+        created_after = datetime.utcnow() - timedelta(days=365)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = IncidentSimilarityIndex(Path(tmpdir) / "bench.similarity.npz")
+
+            start = time.perf_counter()
+            for offset in range(0, size, 1000):
+                index.add_many(incidents[offset:offset + 1000])
+            index.save()
+            build = time.perf_counter() - start
+
+            latencies = []
+            for _, text, category, _ in probes:
+                start = time.perf_counter()
+                index.query(text, top_k=5, category=category,
+                            created_after=created_after, min_score=0.7)
+                latencies.append(time.perf_counter() - start)
+
+        print(f"{'index':<8} {size:>10} {build:>9.2f}s {_percentiles(latencies)}")
+
+        if legacy:
+            latencies = []
+            for _, text, category, _ in probes[:max(1, queries // 10)]:
+                start = time.perf_counter()
+                _legacy_query(incidents, text, category, 0.7)
+                latencies.append(time.perf_counter() - start)
+
+            print(f"{'legacy':<8} {size:>10} {'-':>10} {_percentiles(latencies)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Index sizes to benchmark")
+    parser.add_argument("--queries", type=int, default=100,
+                        help="Queries per index size")
+    parser.add_argument("--no-legacy", action="store_true",
+                        help="Skip the TF-IDF refit baseline")
+    args = parser.parse_args()
+
+    benchmark(args.sizes, args.queries, not args.no_legacy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+PersistentStorage Connection Pool Benchmark
+
+Compares storage throughput with the pooled WAL connection manager against
+the previous open-a-connection-per-call behaviour, at 1, 8 and 64 concurrent
+incidents. Each simulated incident performs the storage traffic of one
+workflow run: store, step/tool metrics, a compliance event, a final store
+and a read-back.
+
+Usage:
+    python benchmarks/storage_pool_benchmark.py
+    python benchmarks/storage_pool_benchmark.py --incidents 2000 --concurrency 1 8 64
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, List
+
+import aiosqlite
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from security_triage_agent.core.state import IncidentState
+from security_triage_agent.memory.persistent_storage import PersistentStorage
+
+
+# Storage calls issued per simulated incident (see _simulate_incident)
+OPS_PER_INCIDENT = 9
+
+
+class PerCallConnections:
+    """Baseline that mirrors the old behaviour: one fresh connection per call."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @asynccontextmanager
+    async def writer(self):
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            yield db
+            await db.commit()
+
+    @asynccontextmanager
+    async def reader(self):
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            yield db
+
+
+async def _simulate_incident(storage: PersistentStorage, index: int) -> int:
+    """Run one incident's worth of storage calls, returning failed call count."""
+    state = IncidentState(
+        incident_id=f"bench_{index:08d}",
+        title=f"Benchmark incident {index}",
+        description="Guest reported key card still opening room after checkout"
+    )
+
+    results = [await storage.store_incident(state)]
+    for step in ("classify_incident", "assess_risk", "prioritize_incident"):
+        results.append(await storage.record_performance_metric(
+            state.incident_id, f"step_duration_{step}", 0.25, {"success": True}
+        ))
+    results.append(await storage.record_performance_metric(
+        state.incident_id, "tool_performance_incident_classifier", 0.8, {"success": True}
+    ))
+    results.append(await storage.record_compliance_event(
+        state.incident_id, "dpdp", "assessment_completed", {"notified": False}
+    ))
+    results.append(await storage.store_incident(state))
+    results.append(await storage.get_incident(state.incident_id) is not None)
+    results.append(bool(await storage.get_incident_history(state.incident_id)))
+
+    return sum(1 for ok in results if not ok)
+
+
+async def _run(storage: PersistentStorage, incidents: int, concurrency: int) -> Dict[str, float]:
+    """Process incidents with a fixed number of concurrent workers."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for index in range(incidents):
+        queue.put_nowait(index)
+
+    failures = 0
+
+    async def worker() -> None:
+        nonlocal failures
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            failures += await _simulate_incident(storage, index)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    total_ops = incidents * OPS_PER_INCIDENT
+    return {
+        "elapsed_seconds": elapsed,
+        "ops_per_second": total_ops / elapsed,
+        "incidents_per_second": incidents / elapsed,
+        "failed_ops": failures
+    }
+
+
+async def benchmark(incidents: int, concurrency_levels: List[int]) -> None:
+    """Run baseline and pooled storage at each concurrency level."""
+    print(f"{'mode':<10} {'concurrency':>11} {'ops/sec':>10} {'incidents/sec':>14} {'failed':>7}")
+
+    for concurrency in concurrency_levels:
+        for mode in ("per_call", "pooled"):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                storage = PersistentStorage(str(Path(tmpdir) / "bench.db"))
+                if mode == "per_call":
+                    storage.pool = PerCallConnections(storage.db_path)
+                await storage.initialize()
+
+                result = await _run(storage, incidents, concurrency)
+                await storage.close()
+
+            print(
+                f"{mode:<10} {concurrency:>11} {result['ops_per_second']:>10.0f} "
+                f"{result['incidents_per_second']:>14.1f} {result['failed_ops']:>7.0f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=500,
+                        help="Incidents to process per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64],
+                        help="Concurrent incident levels to measure")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.incidents, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Workflow Parallelism Benchmark
+
+Compares the sequential SecurityTriageWorkflow graph with parallel mode, where
+independent steps run concurrently inside join nodes. Each incident is driven
+through the workflow's own timed nodes along the approved path against a
+simulated model with fixed per-call latency and a simulated session store,
+and the benchmark reports end-to-end latency and the per-node timing report
+(sequential node time, critical path and the reduction between them).
+
+Usage:
+    python benchmarks/workflow_parallelism_benchmark.py
+    python benchmarks/workflow_parallelism_benchmark.py --incidents 50 --latency 0.5 --io-latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add the src directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from langchain_core.messages import AIMessage
+
+from security_triage_agent.core.state import IncidentState
+from security_triage_agent.core.workflow import SecurityTriageWorkflow, summarize_node_timings
+from security_triage_agent.evaluation.metrics_tracker import MetricsTracker
+from security_triage_agent.memory.session_manager import SessionManager
+from security_triage_agent.tools import (
+    IncidentClassifier, IncidentPrioritizer, PlaybookSelector,
+    ResponseGenerator, ComplianceChecker, SafetyGuardrails
+)
+
+
+# System prompt markers identifying which tool issued a request
+RESPONSES = [
+    ("INCIDENT CATEGORIES", {
+        "category": "guest_access",
+        "confidence": 0.88,
+        "reasoning": "Keycard used on a room after the guest checked out",
+        "alternative_categories": ["physical_security"],
+        "extracted_entities": {},
+        "severity_indicators": ["after checkout"],
+    }),
+    ("RISK ASSESSMENT FRAMEWORK", {
+        "risk_score": 5.0,
+        "risk_factors": ["access control gap"],
+        "potential_impact": "Guest privacy at risk",
+        "likelihood_score": 5.0,
+        "confidence_score": 0.8,
+    }),
+    ("PRIORITIZATION FACTORS", {
+        "priority": "medium",
+        "reasoning": "Access after checkout with no guest present",
+        "business_impact": "Low",
+        "guest_impact": "Low",
+        "financial_impact": "Low",
+        "reputation_impact": "Low",
+        "operational_impact": "Front office follow-up",
+        "time_sensitivity": "Same day",
+        "escalation_triggers": [],
+        "recommended_sla": "4 hours",
+    }),
+]
+
+# Approved path through the graph, per mode
+PATHS = {
+    "sequential": [
+        "validate_input", "classify_incident", "assess_risk", "safety_check",
+        "prioritize_incident", "select_playbook", "compliance_check",
+        "generate_response", "execute_immediate_actions", "document_incident",
+        "notify_stakeholders", "schedule_followup", "update_metrics",
+    ],
+    "parallel": [
+        "validate_input", "classify_incident", "assess_risk", "safety_check",
+        "prioritize_incident", "select_playbook", "compliance_check",
+        "generate_response", "execute_immediate_actions", "document_incident",
+        "schedule_followup", "update_metrics",
+    ],
+}
+
+
+class SimulatedLLM:
+    """Chat model stand-in with fixed latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        text = "\n".join(getattr(message, "content", str(message)) for message in prompt)
+        payload: Dict = {}
+        for marker, response in RESPONSES:
+            if marker in text:
+                payload = response
+                break
+
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return AIMessage(content=json.dumps(payload))
+
+
+class SimulatedSessionManager(SessionManager):
+    """In-memory session manager with a fixed storage round trip."""
+
+    def __init__(self, io_latency: float):
+        super().__init__()
+        self.io_latency = io_latency
+
+    async def store_incident(self, incident_state: IncidentState) -> bool:
+        await asyncio.sleep(self.io_latency)
+        return await super().store_incident(incident_state)
+
+
+def _build_workflow(latency: float, io_latency: float, parallel: bool) -> SecurityTriageWorkflow:
+    llm = SimulatedLLM(latency)
+    return SecurityTriageWorkflow(
+        classifier=IncidentClassifier(llm),
+        prioritizer=IncidentPrioritizer(llm),
+        playbook_selector=PlaybookSelector(llm),
+        response_generator=ResponseGenerator(llm),
+        compliance_checker=ComplianceChecker(llm),
+        safety_guardrails=SafetyGuardrails(llm),
+        session_manager=SimulatedSessionManager(io_latency),
+        metrics_tracker=MetricsTracker(),
+        parallel_nodes=parallel
+    )
+
+
+async def _triage(workflow: SecurityTriageWorkflow, path: List[str], index: int):
+    state = IncidentState(
+        incident_id=f"BENCH-{index:05d}",
+        title="Keycard access after checkout",
+        description="A guest room keycard opened the door two hours after the guest checked out."
+    )
+
+    start = time.perf_counter()
+    for node in path:
+        state = await workflow.nodes[node](state)
+    elapsed = time.perf_counter() - start
+
+    return elapsed, summarize_node_timings(state.processing_metrics["node_timings"])
+
+
+async def benchmark(incidents: int, latency: float, io_latency: float) -> None:
+    """Run both modes and print latency and critical-path figures."""
+    print(f"{incidents} incidents, {latency * 1000:.0f}ms per LLM call, "
+          f"{io_latency * 1000:.0f}ms per storage write")
+    print(f"{'mode':<11} {'p50 latency':>12} {'node time':>10} {'critical path':>14} {'reduction':>10}")
+
+    reports = {}
+    for mode, path in PATHS.items():
+        workflow = _build_workflow(latency, io_latency, parallel=mode == "parallel")
+        await workflow.session_manager.initialize()
+
+        latencies: List[float] = []
+        for index in range(incidents):
+            elapsed, report = await _triage(workflow, path, index)
+            latencies.append(elapsed)
+
+        latencies.sort()
+        reports[mode] = report
+        print(
+            f"{mode:<11} {latencies[len(latencies) // 2]:>11.2f}s "
+            f"{report['sequential_ms'] / 1000:>9.2f}s {report['critical_path_ms'] / 1000:>13.2f}s "
+            f"{report['critical_path_reduction_pct']:>9.1f}%"
+        )
+
+    print("\nPer-node timings of the last parallel incident (ms):")
+    for node, duration in reports["parallel"]["nodes_ms"].items():
+        print(f"  {node:<38} {duration:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--incidents", type=int, default=10,
+                        help="Incidents to triage per mode")
+    parser.add_argument("--latency", type=float, default=0.8,
+                        help="Simulated seconds per LLM call")
+    parser.add_argument("--io-latency", type=float, default=0.05,
+                        help="Simulated seconds per incident storage write")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.incidents, args.latency, args.io_latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,21 +7,27 @@ with proper error handling, monitoring, and hospitality industry best practices.
 
 import asyncio
 import logging
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Dict, Any, List, AsyncIterator, Awaitable, Callable, Iterable, Tuple
 from uuid import uuid4
 
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
-from langgraph.checkpoint.sqlite import SqliteSaver
 
 from .state import IncidentState, IncidentCategory, IncidentPriority
-from .workflow import create_triage_workflow
+from .workflow import APPROVAL_INTERRUPT_NODE, create_triage_workflow
+from .incident_queue import IncidentWorkQueue, pre_score
+from .approval_index import PendingApproval, PendingApprovalIndex, URGENCY_TIMEOUT_MINUTES, most_urgent
 from ..tools import (
     IncidentClassifier, IncidentPrioritizer, PlaybookSelector,
-    ResponseGenerator, ComplianceChecker, SafetyGuardrails
+    ResponseGenerator, ComplianceChecker, SafetyGuardrails, FusedTriageTool,
+    LocalIncidentClassifier
+)
+from ..memory import (
+    SessionManager, PersistentStorage, MemoryRetriever, WriteBehindMetricSink,
+    LLMResponseCache, CachedLLM, PruningSqliteSaver
 )
-from ..memory import SessionManager, PersistentStorage, MemoryRetriever
 from ..evaluation import MetricsTracker, IncidentEvaluator, HospitalityBenchmarks
 from ..utils.config import SecurityTriageConfig
 from ..utils.logger import setup_logger
@@ -53,38 +59,115 @@ class SecurityTriageAgent:
         self.config = config or SecurityTriageConfig()
         self.logger = setup_logger("security_triage_agent", self.config.log_level)
         
-        # Initialize LLM
+        # Initialize LLM, served through the response cache when enabled
         self.llm = self._initialize_llm(llm_model, temperature)
+        self.llm_cache = None
+        if self.config.llm_cache_enabled:
+            self.llm_cache = LLMResponseCache(
+                self.config.llm_cache_db_path,
+                ttl_seconds=self.config.llm_cache_ttl_hours * 3600,
+                max_entries=self.config.llm_cache_max_entries,
+                memory_entries=self.config.llm_cache_memory_entries
+            )
+            self.llm = CachedLLM(self.llm, self.llm_cache, llm_model, temperature)
         
         # Initialize storage systems
-        self.persistent_storage = PersistentStorage(self.config.database_path)
+        self.persistent_storage = PersistentStorage(
+            self.config.database_path,
+            reader_connections=self.config.database_reader_connections,
+            archive_dir=self.config.archive_path
+        )
         self.session_manager = SessionManager(
             redis_url=self.config.redis_url,
-            session_ttl_hours=self.config.session_ttl_hours
+            session_ttl_hours=self.config.session_ttl_hours,
+            max_sessions=self.config.max_sessions,
+            max_memory_entries=self.config.max_memory_session_entries,
+            checkpoint_full_snapshot_every=self.config.checkpoint_full_snapshot_every
         )
         
         # Initialize memory and evaluation systems
-        self.memory_retriever = MemoryRetriever(self.persistent_storage)
-        self.metrics_tracker = MetricsTracker(self.persistent_storage)
+        self.memory_retriever = MemoryRetriever(
+            self.persistent_storage,
+            prefilter_candidates=self.config.similarity_prefilter_candidates
+        )
+        self.metric_sink = WriteBehindMetricSink(
+            self.persistent_storage,
+            max_batch_size=self.config.metrics_flush_batch_size,
+            flush_interval_seconds=self.config.metrics_flush_interval_seconds,
+            max_buffered_events=self.config.metrics_buffer_max_events,
+            max_wait_seconds=self.config.metrics_buffer_max_wait_seconds
+        )
+        self.metrics_tracker = MetricsTracker(
+            self.persistent_storage,
+            metric_sink=self.metric_sink,
+            sketch_persist_interval_seconds=self.config.metrics_sketch_persist_interval_seconds
+        )
         self.evaluator = IncidentEvaluator(self.metrics_tracker)
         self.benchmarks = HospitalityBenchmarks()
         
         # Initialize tools
-        self.classifier = IncidentClassifier(self.llm, temperature=temperature)
+        self.classifier = IncidentClassifier(
+            self.llm,
+            temperature=temperature,
+            fast_path=self._load_local_classifier(),
+            fast_path_threshold=self.config.local_classifier_threshold
+        )
         self.prioritizer = IncidentPrioritizer(self.llm, temperature=temperature)
         self.playbook_selector = PlaybookSelector(self.llm, temperature=temperature)
         self.response_generator = ResponseGenerator(self.llm, temperature=temperature)
         self.compliance_checker = ComplianceChecker(self.llm, temperature=temperature)
         self.safety_guardrails = SafetyGuardrails(self.llm, temperature=temperature)
+        self.fused_triage = None
+        if self.config.fused_triage_enabled:
+            self.fused_triage = FusedTriageTool(self.classifier, self.prioritizer)
         
         # Initialize workflow
-        self.checkpointer = SqliteSaver.from_conn_string(f"sqlite:///{self.config.checkpoint_db_path}")
+        self.checkpointer = PruningSqliteSaver(
+            self.config.checkpoint_db_path,
+            keep_last=self.config.checkpoint_keep_last,
+            finished_grace_seconds=self.config.checkpoint_finished_grace_minutes * 60,
+            abandoned_after_seconds=self.config.checkpoint_abandoned_after_hours * 3600 or None
+        )
         self.workflow = None
         
+        # Admission queue for submitted and batched incidents
+        self.incident_queue = IncidentWorkQueue(
+            self.process_incident,
+            max_workers=self.config.incident_queue_workers,
+            max_pending=self.config.incident_queue_max_pending,
+            max_pending_per_property=self.config.incident_queue_max_pending_per_property
+        )
+        
+        # Incidents parked at the approval gate, escalated when nobody decides in time.
+        # Deployments can set on_approval_escalation to page the next approver.
+        self.approval_index = PendingApprovalIndex(
+            self._escalate_pending_approval,
+            max_escalations=self.config.approval_max_escalations
+        )
+        self.on_approval_escalation: Optional[Callable[[PendingApproval], Awaitable[None]]] = None
+        # Approval decisions on one parked incident are applied one at a time
+        self._approval_locks: Dict[str, asyncio.Lock] = {}
+        
         # Agent state
         self.is_initialized = False
         self.active_incidents = {}
     
+    def _load_local_classifier(self) -> Optional[LocalIncidentClassifier]:
+        """Load the trained fast-path classifier, if enabled and present."""
+        if not self.config.local_classifier_enabled:
+            return None
+        
+        model_path = Path(self.config.local_classifier_model_path)
+        if not model_path.exists():
+            self.logger.warning(f"Local classifier model not found at {model_path}; using LLM only")
+            return None
+        
+        try:
+            return LocalIncidentClassifier.load(model_path)
+        except Exception as e:
+            self.logger.error(f"Failed to load local classifier: {e}")
+            return None
+    
     async def initialize(self) -> None:
         """Initialize the agent and all subsystems."""
         try:
@@ -92,7 +175,15 @@ class SecurityTriageAgent:
             
             # Initialize storage systems
             await self.persistent_storage.initialize()
+            await self.metric_sink.start()
+            await self.metrics_tracker.load_sketches()
             await self.session_manager.initialize()
+            if self.llm_cache:
+                await self.llm_cache.initialize()
+            await self.checkpointer.setup()
+            self.checkpointer.start_compaction(
+                self.config.checkpoint_compaction_interval_minutes * 60
+            )
             
             # Create workflow
             self.workflow = create_triage_workflow(
@@ -104,8 +195,18 @@ class SecurityTriageAgent:
                 safety_guardrails=self.safety_guardrails,
                 session_manager=self.session_manager,
                 metrics_tracker=self.metrics_tracker,
-                checkpointer=self.checkpointer
+                checkpointer=self.checkpointer,
+                fused_triage=self.fused_triage,
+                parallel_nodes=self.config.parallel_workflow_nodes
             )
+            await self._restore_parked_incidents()
+            self.approval_index.start()
+            if self.config.retention_interval_minutes > 0:
+                self.persistent_storage.start_retention(
+                    self.config.data_retention_days,
+                    interval_seconds=self.config.retention_interval_minutes * 60,
+                    **self._retention_options()
+                )
             
             self.is_initialized = True
             self.logger.info("Security Triage Agent initialized successfully")
@@ -180,53 +281,7 @@ class SecurityTriageAgent:
             self.active_incidents[incident_id] = incident_state
             
             # Process through workflow
-            config = {"configurable": {"thread_id": incident_id}}
-            
-            final_state = None
-            async for state_update in self.workflow.astream(incident_state, config):
-                # Log workflow progress
-                if "messages" in state_update:
-                    latest_message = state_update["messages"][-1] if state_update["messages"] else None
-                    if latest_message:
-                        self.logger.debug(f"Workflow update for {incident_id}: {latest_message.content}")
-                
-                # Update stored state
-                final_state = state_update
-                self.active_incidents[incident_id] = final_state
-                
-                # Store workflow checkpoint
-                await self.session_manager.store_workflow_checkpoint(
-                    incident_id, final_state.get("current_step", "unknown"), state_update
-                )
-            
-            # Final evaluation
-            if final_state:
-                incident_state = final_state
-                
-                # Calculate quality scores
-                quality_scores = await self.metrics_tracker.calculate_quality_scores(incident_state)
-                incident_state.quality_scores = quality_scores
-                
-                # Perform comprehensive evaluation
-                evaluation_result = await self.evaluator.evaluate_incident(incident_state)
-                
-                # Store final incident state
-                await self.persistent_storage.store_incident(incident_state)
-                
-                # Generate response summary
-                response = self._generate_response_summary(
-                    incident_state, evaluation_result, historical_context
-                )
-                
-                self.logger.info(
-                    f"Successfully processed incident {incident_id}. "
-                    f"Quality score: {quality_scores.get('overall', 0):.2f}"
-                )
-                
-                return response
-            
-            else:
-                raise RuntimeError("Workflow did not produce final state")
+            return await self._execute_workflow(incident_id, incident_state, historical_context)
                 
         except Exception as e:
             self.logger.error(f"Error processing incident {incident_id}: {e}")
@@ -245,9 +300,342 @@ class SecurityTriageAgent:
             }
         
         finally:
-            # Clean up active incident
-            if incident_id in self.active_incidents:
-                del self.active_incidents[incident_id]
+            await self._release_incident(incident_id)
+    
+    async def _execute_workflow(
+        self,
+        incident_id: str,
+        workflow_input: Optional[IncidentState],
+        historical_context: Any
+    ) -> Dict[str, Any]:
+        """
+        Run the workflow until it finishes or stops for human approval.
+        
+        Args:
+            incident_id: Incident identifier, used as the workflow thread id
+            workflow_input: Initial state, or None to resume from the checkpoint
+            historical_context: Historical context for the response summary
+            
+        Returns:
+            Final response, or a parked response if approval is pending
+        """
+        config = {"configurable": {"thread_id": incident_id}}
+        
+        final_state = None
+        async for state_update in self.workflow.astream(workflow_input, config):
+            # Log workflow progress
+            if "messages" in state_update:
+                latest_message = state_update["messages"][-1] if state_update["messages"] else None
+                if latest_message:
+                    self.logger.debug(f"Workflow update for {incident_id}: {latest_message.content}")
+            
+            # Update stored state
+            final_state = state_update
+            self.active_incidents[incident_id] = final_state
+            
+            # Store workflow checkpoint
+            await self.session_manager.store_workflow_checkpoint(
+                incident_id, final_state.get("current_step", "unknown"), state_update
+            )
+        
+        # Stopped at the approval interrupt: park the incident until a decision arrives
+        snapshot = await self.workflow.aget_state(config)
+        if snapshot.next:
+            await self.checkpointer.mark_parked(incident_id)
+            return self._park_incident(incident_id, self._snapshot_state(snapshot), historical_context)
+        
+        # Final evaluation
+        if final_state:
+            incident_state = final_state
+            
+            # Calculate quality scores
+            quality_scores = await self.metrics_tracker.calculate_quality_scores(incident_state)
+            incident_state.quality_scores = quality_scores
+            
+            # Perform comprehensive evaluation
+            evaluation_result = await self.evaluator.evaluate_incident(incident_state)
+            
+            # Store final incident state
+            await self.persistent_storage.store_incident(incident_state)
+            
+            # Generate response summary
+            response = self._generate_response_summary(
+                incident_state, evaluation_result, historical_context
+            )
+            response["checkpoint_stats"] = self.session_manager.get_checkpoint_stats(incident_id)
+            
+            self.logger.info(
+                f"Successfully processed incident {incident_id}. "
+                f"Quality score: {quality_scores.get('overall', 0):.2f}"
+            )
+            
+            return response
+        
+        else:
+            raise RuntimeError("Workflow did not produce final state")
+    
+    def _park_incident(
+        self,
+        incident_id: str,
+        state: IncidentState,
+        historical_context: Any
+    ) -> Dict[str, Any]:
+        """Index an incident stopped at the approval gate and describe it to the caller."""
+        approvals = state.pending_approvals
+        urgency = most_urgent([approval.urgency.value for approval in approvals])
+        timeouts = [
+            approval.timeout_minutes or URGENCY_TIMEOUT_MINUTES.get(approval.urgency.value, 60)
+            for approval in approvals
+        ]
+        
+        entry = self.approval_index.park(
+            incident_id,
+            [approval.intervention_type for approval in approvals],
+            urgency=urgency,
+            approver_role=approvals[0].approver_role if approvals else "security_analyst",
+            timeout_seconds=min(timeouts) * 60 if timeouts else None,
+            context={"historical_context": historical_context}
+        )
+        
+        self.logger.info(
+            f"Incident {incident_id} parked awaiting approval: {', '.join(entry.intervention_types)}"
+        )
+        
+        return {
+            "incident_id": incident_id,
+            "status": "awaiting_approval",
+            "pending_approvals": entry.intervention_types,
+            "approver_role": entry.approver_role,
+            "escalation_timeout_seconds": entry.timeout_seconds,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    def _snapshot_state(self, snapshot: Any) -> IncidentState:
+        """Incident state held in a workflow checkpoint snapshot."""
+        values = snapshot.values
+        return values if isinstance(values, IncidentState) else IncidentState(**values)
+    
+    async def _restore_parked_incidents(self) -> int:
+        """
+        Re-index incidents whose checkpoint stopped at the approval gate.
+        
+        The approval index lives in memory, so after a restart it is rebuilt
+        from unfinished checkpoint threads interrupted before
+        APPROVAL_INTERRUPT_NODE.
+        
+        Returns:
+            Number of incidents parked again
+        """
+        restored = 0
+        for incident_id in await self.checkpointer.unfinished_threads():
+            if incident_id in self.approval_index:
+                continue
+            try:
+                snapshot = await self.workflow.aget_state({"configurable": {"thread_id": incident_id}})
+                if APPROVAL_INTERRUPT_NODE not in (snapshot.next or ()):
+                    continue
+                await self.checkpointer.mark_parked(incident_id)
+                self._park_incident(incident_id, self._snapshot_state(snapshot), None)
+                restored += 1
+            except Exception as e:
+                self.logger.error(f"Error restoring parked incident {incident_id}: {e}")
+        
+        if restored:
+            self.logger.info(f"Restored {restored} incidents awaiting approval")
+        return restored
+    
+    async def _record_approval_decision(
+        self,
+        incident_id: str,
+        intervention_type: str,
+        approver: str,
+        decision: bool,
+        notes: str
+    ) -> Tuple[bool, Optional[PendingApproval]]:
+        """
+        Apply one decision to a parked incident's checkpoint.
+        
+        Decisions on the same incident are serialized and each re-reads the
+        checkpoint, so concurrent approvals cannot overwrite one another.
+        
+        Returns:
+            Whether the decision was recorded, and the index entry if it
+            was the last pending approval and the incident should resume
+        """
+        lock = self._approval_locks.setdefault(incident_id, asyncio.Lock())
+        async with lock:
+            if incident_id not in self.approval_index:
+                return False, None
+            
+            config = {"configurable": {"thread_id": incident_id}}
+            state = self._snapshot_state(await self.workflow.aget_state(config))
+            if not any(approval.intervention_type == intervention_type for approval in state.pending_approvals):
+                return False, None
+            
+            state.approve_intervention(intervention_type, approver, decision, notes)
+            await self.workflow.aupdate_state(config, {
+                "pending_approvals": state.pending_approvals,
+                "approval_history": state.approval_history,
+                "requires_human_intervention": state.requires_human_intervention,
+                "workflow_paused": state.workflow_paused,
+                "updated_at": state.updated_at
+            })
+            
+            if state.pending_approvals:
+                # Other approvals are still outstanding; stay parked. The
+                # update wrote a checkpoint, which cleared the parked mark.
+                await self.checkpointer.mark_parked(incident_id)
+                entry = self.approval_index.get(incident_id)
+                if entry is not None:
+                    entry.intervention_types = [
+                        approval.intervention_type for approval in state.pending_approvals
+                    ]
+                return True, None
+            
+            self._approval_locks.pop(incident_id, None)
+            return True, self.approval_index.resolve(incident_id)
+    
+    async def _resume_incident(self, incident_id: str, parked: PendingApproval) -> None:
+        """Continue a workflow whose pending approvals have all been decided."""
+        try:
+            response = await self._execute_workflow(
+                incident_id, None, parked.context.get("historical_context")
+            )
+            self.logger.info(f"Resumed incident {incident_id}: {response.get('status', 'completed')}")
+            
+        except Exception as e:
+            self.logger.error(f"Error resuming incident {incident_id}: {e}")
+            await self.metrics_tracker.record_workflow_error(
+                incident_id, "resume_incident", {"error": str(e)}
+            )
+        
+        finally:
+            await self._release_incident(incident_id)
+    
+    async def _release_incident(self, incident_id: str) -> None:
+        """Drop per-run state once the workflow has finished or parked."""
+        # Clean up active incident
+        if incident_id in self.active_incidents:
+            del self.active_incidents[incident_id]
+        
+        # Parked incidents keep their metrics and checkpoints until they resume
+        if incident_id not in self.approval_index:
+            await self.metrics_tracker.finish_incident_tracking(incident_id)
+            await self.checkpointer.mark_finished(incident_id)
+        
+        checkpoint_stats = self.session_manager.finish_workflow_checkpoints(incident_id)
+        if checkpoint_stats:
+            self.logger.debug(
+                f"Checkpoints for {incident_id}: {checkpoint_stats['checkpoints']} written, "
+                f"{checkpoint_stats['bytes_written']} bytes, "
+                f"{checkpoint_stats['serialize_seconds'] * 1000:.2f}ms serializing"
+            )
+    
+    async def _escalate_pending_approval(self, entry: PendingApproval) -> None:
+        """Escalate an approval that has waited past its timeout."""
+        waited_minutes = (self.approval_index.clock() - entry.parked_at) / 60
+        self.logger.warning(
+            f"Approval for incident {entry.incident_id} ({', '.join(entry.intervention_types)}) "
+            f"undecided after {waited_minutes:.0f} minutes; escalation {entry.escalations}"
+        )
+        
+        if self.on_approval_escalation is not None:
+            await self.on_approval_escalation(entry)
+    
+    async def submit_incident(
+        self,
+        title: str,
+        description: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        user_context: Optional[Dict[str, Any]] = None,
+        block: bool = True
+    ) -> asyncio.Future:
+        """
+        Queue an incident for processing by the bounded worker pool.
+        
+        Incidents are ordered by a keyword and metadata pre-score, with
+        per-property fairness. Waits while the queue is full unless the
+        incident pre-scores as critical.
+        
+        Args:
+            title: Incident title
+            description: Detailed incident description
+            metadata: Additional incident metadata
+            user_context: User context information
+            block: Wait for queue capacity; if False raise asyncio.QueueFull instead
+            
+        Returns:
+            Future resolved with the process_incident result
+        """
+        
+        if not self.is_initialized:
+            await self.initialize()
+        
+        return await self.incident_queue.submit(
+            property_code=(metadata or {}).get("property_code") or self.config.property_code,
+            score=pre_score(title, description, metadata),
+            block=block,
+            title=title,
+            description=description,
+            metadata=metadata,
+            user_context=user_context
+        )
+    
+    async def process_incidents_batch(
+        self,
+        incidents: Iterable[Dict[str, Any]]
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Process a batch of incidents through the priority queue.
+        
+        Args:
+            incidents: Dicts with title, description and optional metadata
+                and user_context
+            
+        Yields:
+            (index in the batch, processing result) as each incident completes
+        """
+        
+        completed: asyncio.Queue = asyncio.Queue()
+        
+        async def feed() -> int:
+            count = 0
+            for index, incident in enumerate(incidents):
+                future = await self.submit_incident(
+                    incident["title"],
+                    incident["description"],
+                    metadata=incident.get("metadata"),
+                    user_context=incident.get("user_context")
+                )
+                future.add_done_callback(lambda done, index=index: completed.put_nowait((index, done)))
+                count += 1
+            return count
+        
+        # Submission runs alongside consumption so backpressure cannot deadlock the batch
+        feeder = asyncio.create_task(feed())
+        yielded = 0
+        try:
+            while not feeder.done() or yielded < feeder.result():
+                getter = asyncio.ensure_future(completed.get())
+                waiting = {getter} if feeder.done() else {getter, feeder}
+                await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    continue
+                
+                index, future = getter.result()
+                yielded += 1
+                if future.cancelled():
+                    yield index, {"status": "error", "error": "cancelled",
+                                  "timestamp": datetime.utcnow().isoformat()}
+                elif future.exception() is not None:
+                    yield index, {"status": "error", "error": str(future.exception()),
+                                  "timestamp": datetime.utcnow().isoformat()}
+                else:
+                    yield index, future.result()
+        finally:
+            if not feeder.done():
+                feeder.cancel()
     
     async def get_incident_status(self, incident_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -260,6 +648,14 @@ class SecurityTriageAgent:
             Incident status information
         """
         
+        # Parked incidents are waiting for a human decision
+        entry = self.approval_index.get(incident_id)
+        if entry is not None:
+            return {
+                "status": "awaiting_approval",
+                **entry.to_dict(self.approval_index.clock())
+            }
+        
         # Check active incidents first
         if incident_id in self.active_incidents:
             state = self.active_incidents[incident_id]
@@ -301,6 +697,10 @@ class SecurityTriageAgent:
         """
         Process human approval for intervention request.
         
+        A parked incident is resumed from its checkpoint once its last
+        pending approval is decided; this call returns when the resumed
+        workflow finishes or parks again.
+        
         Args:
             incident_id: Incident identifier
             intervention_type: Type of intervention
@@ -312,6 +712,26 @@ class SecurityTriageAgent:
             Success status
         """
         
+        if incident_id in self.approval_index:
+            recorded, parked = await self._record_approval_decision(
+                incident_id, intervention_type, approver, decision, notes
+            )
+            if not recorded:
+                return False
+            
+            await self.metrics_tracker.record_human_intervention(
+                incident_id, intervention_type, f"Approval: {decision}", None
+            )
+            
+            self.logger.info(
+                f"Intervention {intervention_type} for {incident_id} "
+                f"{'approved' if decision else 'rejected'} by {approver}"
+            )
+            
+            if parked is not None:
+                await self._resume_incident(incident_id, parked)
+            return True
+        
         if incident_id in self.active_incidents:
             state = self.active_incidents[incident_id]
             state.approve_intervention(intervention_type, approver, decision, notes)
@@ -350,13 +770,14 @@ class SecurityTriageAgent:
         start_date = end_date - timedelta(days=days)
         
         # Get performance metrics
+        category_value = category.value if category else None
         performance_metrics = await self.metrics_tracker.get_performance_summary(
-            start_date, end_date
+            start_date, end_date, category=category_value
         )
         
         # Get quality metrics
         quality_metrics = await self.metrics_tracker.get_quality_summary(
-            start_date, end_date
+            start_date, end_date, category=category_value
         )
         
         # Get hallucination metrics
@@ -366,7 +787,7 @@ class SecurityTriageAgent:
         
         # Get incident analytics
         incident_analytics = await self.persistent_storage.get_incident_analytics(
-            start_date, end_date, "daily"
+            start_date, end_date, "daily", category=category_value
         )
         
         # Benchmark comparison
@@ -395,13 +816,15 @@ class SecurityTriageAgent:
             "incident_analytics": incident_analytics,
             "benchmark_comparison": benchmark_report,
             "active_incidents": len(self.active_incidents),
+            "metrics_memory": self.metrics_tracker.get_memory_usage(),
             "generated_at": datetime.utcnow().isoformat()
         }
     
     async def search_incidents(
         self,
         filters: Optional[Dict[str, Any]] = None,
-        limit: int = 50
+        limit: int = 50,
+        text: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Search historical incidents.
@@ -409,14 +832,22 @@ class SecurityTriageAgent:
         Args:
             filters: Search filters
             limit: Maximum results
+            text: Words that must all appear in the title or description;
+                matches are ranked by relevance instead of recency
             
         Returns:
             List of incident records
         """
         
-        incident_records = await self.persistent_storage.search_incidents(
-            filters=filters, limit=limit
-        )
+        if text:
+            incident_records = await self.persistent_storage.search_incidents(
+                filters={**(filters or {}), "text": text}, limit=limit, order_by="relevance"
+            )
+        else:
+            # Summary columns only; the JSON blobs are never read here
+            incident_records, _ = await self.persistent_storage.query_incidents(
+                filters=filters, limit=limit
+            )
         
         return [
             {
@@ -429,7 +860,7 @@ class SecurityTriageAgent:
                 "created_at": record.created_at.isoformat(),
                 "processing_time": record.processing_time_seconds,
                 "human_interventions": record.human_interventions,
-                "requires_followup": record.requires_followup
+                "requires_followup": bool(record.requires_followup)
             }
             for record in incident_records
         ]
@@ -442,16 +873,27 @@ class SecurityTriageAgent:
             # Clean up old metrics
             metrics_cleaned = await self.metrics_tracker.cleanup_old_metrics()
             
-            # Clean up old incident records
-            records_cleaned = await self.persistent_storage.cleanup_old_records(
-                retention_days=self.config.data_retention_days
+            # Archive and clean up old incident records
+            await self.persistent_storage.stop_retention()
+            records_cleaned = await self.persistent_storage.apply_retention(
+                self.config.data_retention_days, **self._retention_options()
             )
             
             # Clean up expired sessions
             sessions_cleaned = await self.session_manager.cleanup_expired_sessions()
             
+            # Finish queued incidents before closing connections
+            await self.incident_queue.stop()
+            await self.approval_index.stop()
+            
             # Close connections
             await self.session_manager.close()
+            await self.metrics_tracker.persist_sketches()
+            await self.metric_sink.close()
+            await self.persistent_storage.close()
+            await self.checkpointer.close()
+            if self.llm_cache:
+                await self.llm_cache.close()
             
             self.logger.info(
                 f"Cleanup completed: {metrics_cleaned} metrics, "
@@ -461,6 +903,13 @@ class SecurityTriageAgent:
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
     
+    def _retention_options(self) -> Dict[str, Any]:
+        """Batching options for PersistentStorage.apply_retention."""
+        return {
+            "batch_size": self.config.retention_batch_size,
+            "vacuum_pages": self.config.retention_vacuum_pages,
+        }
+    
     def _initialize_llm(self, model_name: str, temperature: float):
         """Initialize the language model."""
         if "gpt" in model_name.lower():
@@ -18,8 +18,8 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolExecutor
-from langgraph.checkpoint.sqlite import SqliteSaver
 
+from ..memory.checkpoint_saver import PruningSqliteSaver
 from ..tools.hotel_management_tools import (
     PropertyManagementTool, 
     AccessControlTool, 
@@ -90,7 +90,10 @@ class AgenticSecurityWorkflow:
                  openai_api_key: str,
                  pms_api_url: str = "https://demo-pms.tajhotels.com",
                  access_control_api_url: str = "https://demo-access.tajhotels.com",
-                 notification_config: Dict[str, Any] = None):
+                 notification_config: Dict[str, Any] = None,
+                 checkpoint_db_path: str = "data/agentic_checkpoints.db",
+                 checkpoint_keep_last: int = 5,
+                 finished_checkpoint_grace_seconds: float = 3600.0):
         
         self.logger = logging.getLogger(__name__)
         
@@ -128,8 +131,13 @@ class AgenticSecurityWorkflow:
         # Build the agentic workflow graph
         self.workflow = self._build_workflow_graph()
         
-        # Initialize checkpoint saver for workflow persistence
-        self.checkpointer = SqliteSaver.from_conn_string(":memory:")
+        # Checkpoint saver for workflow persistence; finished incidents are
+        # dropped after the grace period and each keeps its latest checkpoints only
+        self.checkpointer = PruningSqliteSaver(
+            checkpoint_db_path,
+            keep_last=checkpoint_keep_last,
+            finished_grace_seconds=finished_checkpoint_grace_seconds
+        )
         self.compiled_workflow = self.workflow.compile(checkpointer=self.checkpointer)
     
     def _build_workflow_graph(self) -> StateGraph:
@@ -224,6 +232,7 @@ class AgenticSecurityWorkflow:
         
         try:
             self.logger.info(f"Starting autonomous incident response for {incident_id}")
+            self.checkpointer.start_compaction()
             
             # Execute the agentic workflow
             config = {"configurable": {"thread_id": incident_id}}
@@ -290,6 +299,14 @@ class AgenticSecurityWorkflow:
                 "autonomous_actions_taken": 0,
                 "human_intervention_required": True
             }
+        
+        finally:
+            # The run always reaches END, so its checkpoints are only kept for inspection
+            await self.checkpointer.mark_finished(incident_id)
+    
+    async def close(self) -> None:
+        """Stop checkpoint compaction and close the checkpoint database."""
+        await self.checkpointer.close()
     
     # Workflow Node Implementations
     
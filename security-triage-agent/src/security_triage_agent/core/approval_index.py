@@ -0,0 +1,224 @@
+"""
+Pending Approval Index for Security Incident Triage Agent.
+
+Tracks incidents parked at the human approval gate. A parked incident has no
+running task: its workflow state lives in the checkpoint and this index only
+holds what is needed to find it and to escalate it when nobody decides in
+time. All timeouts are served by a single timer task that sleeps until the
+earliest deadline, so waiting incidents cost no CPU.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+# Minutes an approval may wait before escalation, by incident urgency
+URGENCY_TIMEOUT_MINUTES: Dict[str, float] = {
+    "critical": 15,
+    "high": 30,
+    "medium": 60,
+    "low": 240,
+    "info": 480,
+}
+
+_URGENCY_ORDER = list(URGENCY_TIMEOUT_MINUTES)
+
+
+def most_urgent(urgencies: List[str]) -> str:
+    """The most urgent of several urgency levels."""
+    known = [urgency for urgency in urgencies if urgency in URGENCY_TIMEOUT_MINUTES]
+    return min(known, key=_URGENCY_ORDER.index) if known else "medium"
+
+
+class PendingApproval:
+    """An incident parked until a human decides."""
+
+    __slots__ = ("incident_id", "intervention_types", "urgency", "approver_role", "timeout_seconds",
+                 "parked_at", "deadline", "escalations", "context")
+
+    def __init__(self, incident_id: str, intervention_types: List[str], urgency: str,
+                 approver_role: str, timeout_seconds: float, context: Dict[str, Any], now: float):
+        self.incident_id = incident_id
+        self.intervention_types = list(intervention_types)
+        self.urgency = urgency
+        self.approver_role = approver_role
+        self.timeout_seconds = timeout_seconds
+        self.parked_at = now
+        self.deadline = now + timeout_seconds
+        self.escalations = 0
+        self.context = context
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "incident_id": self.incident_id,
+            "intervention_types": list(self.intervention_types),
+            "urgency": self.urgency,
+            "approver_role": self.approver_role,
+            "waiting_seconds": now - self.parked_at,
+            "seconds_to_escalation": self.deadline - now if self.deadline is not None else None,
+            "escalations": self.escalations,
+        }
+
+
+class PendingApprovalIndex:
+    """
+    Incidents awaiting human approval, with timeout-driven escalation.
+
+    When an approval has waited ``timeout_seconds`` the escalation callback
+    is invoked and the timeout re-armed, up to ``max_escalations`` times.
+    Deadlines sit in a min-heap; entries replaced or resolved are skipped
+    lazily when they reach the head.
+    """
+
+    def __init__(
+        self,
+        on_escalate: Optional[Callable[[PendingApproval], Awaitable[None]]] = None,
+        max_escalations: int = 3,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.on_escalate = on_escalate
+        self.max_escalations = max_escalations
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self._entries: Dict[str, PendingApproval] = {}
+        self._deadlines: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._timer: Optional[asyncio.Task] = None
+
+        self.stats: Dict[str, int] = {
+            "parked": 0,
+            "resolved": 0,
+            "escalations": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, incident_id: str) -> bool:
+        return incident_id in self._entries
+
+    def start(self) -> None:
+        """Start the escalation timer."""
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._run_timer(), name="approval-escalation-timer")
+
+    async def stop(self) -> None:
+        """Stop the escalation timer; parked incidents stay indexed."""
+        if self._timer is not None:
+            self._timer.cancel()
+            await asyncio.gather(self._timer, return_exceptions=True)
+            self._timer = None
+
+    def park(
+        self,
+        incident_id: str,
+        intervention_types: List[str],
+        urgency: str = "medium",
+        approver_role: str = "security_analyst",
+        timeout_seconds: Optional[float] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> PendingApproval:
+        """
+        Index an incident waiting for approval, replacing any earlier entry.
+
+        Args:
+            incident_id: Incident identifier, also the workflow thread id
+            intervention_types: Approvals the incident waits for
+            urgency: Incident urgency, selecting the default timeout
+            approver_role: Role expected to decide
+            timeout_seconds: Wait before escalation; defaults by urgency
+            context: Data needed to finish the incident after resuming
+
+        Returns:
+            The index entry
+        """
+        if timeout_seconds is None:
+            timeout_seconds = URGENCY_TIMEOUT_MINUTES.get(urgency, 60) * 60
+        entry = PendingApproval(
+            incident_id, intervention_types, urgency, approver_role,
+            timeout_seconds, context or {}, self.clock()
+        )
+        self._entries[incident_id] = entry
+        self._schedule(entry)
+        self.stats["parked"] += 1
+        return entry
+
+    def get(self, incident_id: str) -> Optional[PendingApproval]:
+        return self._entries.get(incident_id)
+
+    def resolve(self, incident_id: str) -> Optional[PendingApproval]:
+        """Remove an incident whose approvals were decided."""
+        entry = self._entries.pop(incident_id, None)
+        if entry is not None:
+            self.stats["resolved"] += 1
+        return entry
+
+    def list_pending(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Parked incidents, longest waiting first."""
+        now = self.clock()
+        entries = sorted(self._entries.values(), key=lambda entry: entry.parked_at)
+        return [entry.to_dict(now) for entry in entries[:limit]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counts of parked incidents by urgency plus lifetime totals."""
+        by_urgency: Dict[str, int] = {}
+        for entry in self._entries.values():
+            by_urgency[entry.urgency] = by_urgency.get(entry.urgency, 0) + 1
+        return {**self.stats, "pending": len(self._entries), "pending_by_urgency": by_urgency}
+
+    def _schedule(self, entry: PendingApproval) -> None:
+        heapq.heappush(self._deadlines, (entry.deadline, next(self._sequence), entry.incident_id))
+        if self._deadlines[0][2] == entry.incident_id:
+            # New earliest deadline: let the timer recompute its sleep
+            self._wakeup.set()
+
+    def _is_current(self, deadline: float, incident_id: str) -> bool:
+        entry = self._entries.get(incident_id)
+        return entry is not None and entry.deadline == deadline
+
+    async def _run_timer(self) -> None:
+        while True:
+            # Drop heads belonging to resolved or re-armed entries
+            while self._deadlines and not self._is_current(self._deadlines[0][0], self._deadlines[0][2]):
+                heapq.heappop(self._deadlines)
+
+            self._wakeup.clear()
+            if not self._deadlines:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._deadlines[0][0] - self.clock()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+
+            now = self.clock()
+            while self._deadlines and self._deadlines[0][0] <= now:
+                deadline, _, incident_id = heapq.heappop(self._deadlines)
+                if self._is_current(deadline, incident_id):
+                    await self._escalate(self._entries[incident_id], now)
+
+    async def _escalate(self, entry: PendingApproval, now: float) -> None:
+        entry.escalations += 1
+        self.stats["escalations"] += 1
+        if entry.escalations < self.max_escalations:
+            entry.deadline = now + entry.timeout_seconds
+            self._schedule(entry)
+        else:
+            # Stays parked for a decision but is not escalated further
+            entry.deadline = None
+
+        if self.on_escalate is not None:
+            try:
+                await self.on_escalate(entry)
+            except Exception as e:
+                self.logger.error(f"Error escalating approval for {entry.incident_id}: {e}")
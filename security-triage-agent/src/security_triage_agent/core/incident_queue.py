@@ -0,0 +1,330 @@
+"""
+Priority Incident Work Queue for Security Incident Triage Agent.
+
+Admits incidents into a bounded queue ordered by a cheap keyword and metadata
+pre-score, and runs them through a fixed pool of workers, so a flood of
+routine alarms cannot delay the handling of a critical incident.
+"""
+
+import asyncio
+import heapq
+import itertools
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+# Pre-score bands, most urgent first; the queue always serves the lowest band
+BAND_CRITICAL, BAND_HIGH, BAND_NORMAL, BAND_LOW = range(4)
+BAND_NAMES = ("critical", "high", "normal", "low")
+
+_BAND_THRESHOLDS = ((0.75, BAND_CRITICAL), (0.5, BAND_HIGH), (0.25, BAND_NORMAL))
+
+# Weighted phrases signalling urgency (positive) or routine noise (negative)
+URGENCY_KEYWORDS: Dict[str, float] = {
+    # Safety and active threats
+    "weapon": 0.6, "gun": 0.6, "assault": 0.5, "violence": 0.5, "fire": 0.5,
+    "injury": 0.4, "injured": 0.4, "medical": 0.3, "bomb": 0.6, "hostage": 0.6,
+    "active": 0.2, "ongoing": 0.2, "in progress": 0.25, "emergency": 0.4,
+    # Cyber and data
+    "ransomware": 0.6, "malware": 0.4, "breach": 0.4, "exfiltration": 0.5,
+    "data leak": 0.4, "compromised": 0.35, "hacked": 0.4, "unauthorized": 0.25,
+    # Payments and guests
+    "credit card": 0.3, "fraud": 0.3, "skimmer": 0.4, "vip": 0.2,
+    "guest information": 0.25, "pii": 0.3, "forced entry": 0.4, "break-in": 0.4,
+    "theft": 0.2,
+    # Routine noise
+    "test": -0.3, "false alarm": -0.4, "low battery": -0.4, "heartbeat": -0.4,
+    "door held open": -0.2, "door ajar": -0.2, "maintenance": -0.2, "resolved": -0.2,
+}
+
+# Incident categories whose keywords raise the pre-score, by weight
+CATEGORY_KEYWORDS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "pii_breach": (0.2, ("personal data", "privacy", "leak", "exposure", "guest data")),
+    "payment_fraud": (0.2, ("payment", "transaction", "chargeback", "pos", "billing")),
+    "cyber_security": (0.2, ("network", "phishing", "virus", "intrusion", "ddos")),
+    "physical_security": (0.1, ("alarm", "camera", "intruder", "suspicious person")),
+    "guest_access": (0.1, ("key card", "room access", "door", "checkout")),
+}
+
+_IMPACT_SCORES = {"critical": 0.4, "high": 0.25, "medium": 0.1, "low": 0.0}
+_SEVERITY_HINTS = {"critical": 0.5, "high": 0.3, "medium": 0.1, "low": -0.1, "info": -0.2}
+
+
+def _phrase_pattern(phrases) -> "re.Pattern":
+    alternatives = sorted(phrases, key=len, reverse=True)
+    return re.compile(r"\b(" + "|".join(re.escape(phrase) for phrase in alternatives) + r")\b")
+
+
+_URGENCY_PATTERN = _phrase_pattern(URGENCY_KEYWORDS)
+_CATEGORY_PATTERNS = {
+    category: (weight, _phrase_pattern(phrases))
+    for category, (weight, phrases) in CATEGORY_KEYWORDS.items()
+}
+
+
+def pre_score(title: str, description: str, metadata: Optional[Dict[str, Any]] = None) -> float:
+    """
+    Estimate incident urgency without calling the LLM.
+
+    Args:
+        title: Incident title
+        description: Incident description
+        metadata: Incident metadata (business_impact, estimated_cost,
+            affected_guests, affected_systems, severity from the source system)
+
+    Returns:
+        Score between 0 (routine) and 1 (critical)
+    """
+    text = f"{title} {description}".lower()
+    score = 0.2
+
+    # Each phrase counts once, so repetition in a noisy alarm does not inflate it
+    score += sum(URGENCY_KEYWORDS[phrase] for phrase in set(_URGENCY_PATTERN.findall(text)))
+    score += max(
+        (weight for weight, pattern in _CATEGORY_PATTERNS.values() if pattern.search(text)),
+        default=0.0
+    )
+
+    metadata = metadata or {}
+    score += _IMPACT_SCORES.get(str(metadata.get("business_impact") or "").lower(), 0.0)
+    score += _SEVERITY_HINTS.get(str(metadata.get("severity") or "").lower(), 0.0)
+    score += min(0.2, 0.05 * len(metadata.get("affected_guests") or []))
+    score += min(0.2, 0.05 * len(metadata.get("affected_systems") or []))
+    if (metadata.get("estimated_cost") or 0) >= 10000:
+        score += 0.15
+
+    return min(1.0, max(0.0, score))
+
+
+def score_band(score: float) -> int:
+    """Map a pre-score to its scheduling band."""
+    for threshold, band in _BAND_THRESHOLDS:
+        if score >= threshold:
+            return band
+    return BAND_LOW
+
+
+class QueuedIncident:
+    """An admitted incident awaiting a worker."""
+
+    __slots__ = ("kwargs", "property_code", "score", "band", "future", "enqueued_at")
+
+    def __init__(self, kwargs: Dict[str, Any], property_code: str, score: float, future: asyncio.Future):
+        self.kwargs = kwargs
+        self.property_code = property_code
+        self.score = score
+        self.band = score_band(score)
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class IncidentWorkQueue:
+    """
+    Bounded priority queue of incidents served by a fixed worker pool.
+
+    Incidents are scheduled by pre-score band. Within a band, properties are
+    served round-robin so one property's alarm flood cannot starve another,
+    and each property's incidents are served highest score first, then in
+    arrival order. Admission applies backpressure: ``submit`` waits while
+    ``max_pending`` incidents are queued, or while the submitting property
+    already has ``max_pending_per_property`` queued. Critical-band incidents
+    are always admitted so they never wait behind a full queue.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[..., Awaitable[Any]],
+        max_workers: int = 4,
+        max_pending: int = 1000,
+        max_pending_per_property: Optional[int] = None
+    ):
+        self.handler = handler
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self.max_pending_per_property = max_pending_per_property
+
+        # band -> property -> heap of (-score, sequence, incident)
+        self._bands: List["OrderedDict[str, List[Tuple[float, int, QueuedIncident]]]"] = [
+            OrderedDict() for _ in BAND_NAMES
+        ]
+        self._pending = 0
+        self._pending_by_property: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._available = asyncio.Condition()
+        self._workers: List[asyncio.Task] = []
+        self._running = 0
+
+        self.stats: Dict[str, Any] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "backpressure_waits": 0,
+            "max_wait_seconds": {name: 0.0 for name in BAND_NAMES},
+        }
+
+    @property
+    def pending(self) -> int:
+        """Incidents admitted but not yet picked up by a worker."""
+        return self._pending
+
+    @property
+    def running(self) -> int:
+        """Incidents currently being processed."""
+        return self._running
+
+    def start(self) -> None:
+        """Start the worker pool."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"incident-worker-{index}")
+            for index in range(self.max_workers)
+        ]
+
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Stop the worker pool.
+
+        Args:
+            drain: Wait for queued incidents first; otherwise they are cancelled
+        """
+        if drain:
+            async with self._available:
+                await self._available.wait_for(lambda: self._pending == 0 and self._running == 0)
+        else:
+            async with self._available:
+                for band in self._bands:
+                    for heap in band.values():
+                        for _, _, incident in heap:
+                            incident.future.cancel()
+                    band.clear()
+                self._pending = 0
+                self._pending_by_property.clear()
+                self._available.notify_all()
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(
+        self,
+        property_code: Optional[str] = None,
+        score: float = 0.0,
+        block: bool = True,
+        **kwargs: Any
+    ) -> asyncio.Future:
+        """
+        Admit an incident.
+
+        Args:
+            property_code: Property the incident belongs to, for fairness
+            score: Pre-score from pre_score()
+            block: Wait for capacity; if False raise asyncio.QueueFull instead
+            **kwargs: Arguments for the handler
+
+        Returns:
+            Future resolved with the handler result
+        """
+        self.start()
+        incident = QueuedIncident(
+            kwargs, property_code or "", score, asyncio.get_running_loop().create_future()
+        )
+
+        async with self._available:
+            if not self._has_capacity(incident):
+                if not block:
+                    raise asyncio.QueueFull(f"Incident queue full ({self._pending} pending)")
+                self.stats["backpressure_waits"] += 1
+                await self._available.wait_for(lambda: self._has_capacity(incident))
+
+            # Reset the wait clock to admission time
+            incident.enqueued_at = time.perf_counter()
+            heap = self._bands[incident.band].setdefault(incident.property_code, [])
+            heapq.heappush(heap, (-incident.score, next(self._sequence), incident))
+            self._pending += 1
+            self._pending_by_property[incident.property_code] = (
+                self._pending_by_property.get(incident.property_code, 0) + 1
+            )
+            self.stats["submitted"] += 1
+            self._available.notify_all()
+
+        return incident.future
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth per band plus throughput and wait statistics."""
+        return {
+            **self.stats,
+            "pending": self._pending,
+            "running": self._running,
+            "workers": len(self._workers),
+            "pending_by_band": {
+                name: sum(len(heap) for heap in band.values())
+                for name, band in zip(BAND_NAMES, self._bands)
+            },
+        }
+
+    def _has_capacity(self, incident: QueuedIncident) -> bool:
+        if incident.band == BAND_CRITICAL:
+            return True
+        if self._pending >= self.max_pending:
+            return False
+        if self.max_pending_per_property is not None:
+            return self._pending_by_property.get(incident.property_code, 0) < self.max_pending_per_property
+        return True
+
+    def _pop_next(self) -> QueuedIncident:
+        """Take the next incident: most urgent band, round-robin across properties."""
+        for band in self._bands:
+            if not band:
+                continue
+            property_code, heap = next(iter(band.items()))
+            _, _, incident = heapq.heappop(heap)
+            # Rotate the property to the back of its band
+            del band[property_code]
+            if heap:
+                band[property_code] = heap
+
+            self._pending -= 1
+            remaining = self._pending_by_property[property_code] - 1
+            if remaining:
+                self._pending_by_property[property_code] = remaining
+            else:
+                del self._pending_by_property[property_code]
+            return incident
+        raise LookupError("No pending incidents")
+
+    async def _worker(self) -> None:
+        while True:
+            async with self._available:
+                await self._available.wait_for(lambda: self._pending > 0)
+                incident = self._pop_next()
+                self._running += 1
+                # Wake submitters waiting for capacity
+                self._available.notify_all()
+
+            band_name = BAND_NAMES[incident.band]
+            waited = time.perf_counter() - incident.enqueued_at
+            self.stats["max_wait_seconds"][band_name] = max(
+                self.stats["max_wait_seconds"][band_name], waited
+            )
+
+            try:
+                if not incident.future.cancelled():
+                    result = await self.handler(**incident.kwargs)
+                    if not incident.future.done():
+                        incident.future.set_result(result)
+                    self.stats["completed"] += 1
+            except asyncio.CancelledError:
+                incident.future.cancel()
+                raise
+            except Exception as e:
+                self.stats["failed"] += 1
+                if not incident.future.done():
+                    incident.future.set_exception(e)
+            finally:
+                async with self._available:
+                    self._running -= 1
+                    self._available.notify_all()
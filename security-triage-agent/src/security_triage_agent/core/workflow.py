@@ -5,28 +5,98 @@ Implements the multi-step orchestration for incident processing with
 proper state management, error handling, and human-in-the-loop gates.
 """
 
-from typing import Dict, Any, Literal, List
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, Any, Awaitable, Callable, Literal, List, Optional
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
-from .state import IncidentState, IncidentPriority, IncidentCategory
+from .state import IncidentState, IncidentPriority, IncidentCategory, RiskAssessment
 from ..tools.classification import IncidentClassifier
-from ..tools.prioritization import IncidentPrioritizer  
+from ..tools.prioritization import IncidentPrioritizer, PrioritizationResult
+from ..tools.fused_triage import FusedTriageTool
 from ..tools.playbook_selector import PlaybookSelector
 from ..tools.response_generator import ResponseGenerator
 from ..tools.compliance_checker import ComplianceChecker
-from ..tools.safety_guardrails import SafetyGuardrails
+from ..tools.safety_guardrails import SafetyGuardrails, ContentScreeningResult
 from ..memory.session_manager import SessionManager
 from ..evaluation.metrics_tracker import MetricsTracker
 
 
+NodeFunction = Callable[[IncidentState], Awaitable[IncidentState]]
+
+# Node the workflow stops before while human approvals are pending
+APPROVAL_INTERRUPT_NODE = "await_human_approval"
+
+
+def summarize_node_timings(node_timings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarize per-node timings recorded by the workflow.
+    
+    Branches of a parallel node are recorded with the parallel node as their
+    group. The sequential time is what the workflow would take if every
+    branch ran one after another; the critical path is the time actually
+    spent in top-level nodes.
+    
+    Args:
+        node_timings: Entries from processing_metrics["node_timings"]
+        
+    Returns:
+        Dictionary with per-node durations and the critical-path reduction
+    """
+    parallel_nodes = {entry["group"] for entry in node_timings if entry.get("group")}
+    
+    sequential_ms = 0.0
+    critical_path_ms = 0.0
+    nodes: Dict[str, float] = {}
+    for entry in node_timings:
+        group = entry.get("group")
+        if group:
+            # Branch of a parallel node, reported as "<node>/<branch>"
+            name = f"{group}/{entry['node']}"
+            sequential_ms += entry["duration_ms"]
+        else:
+            name = entry["node"]
+            critical_path_ms += entry["duration_ms"]
+            if name not in parallel_nodes:
+                sequential_ms += entry["duration_ms"]
+        nodes[name] = nodes.get(name, 0.0) + entry["duration_ms"]
+    
+    return {
+        "nodes_ms": nodes,
+        "sequential_ms": sequential_ms,
+        "critical_path_ms": critical_path_ms,
+        "critical_path_reduction_ms": sequential_ms - critical_path_ms,
+        "critical_path_reduction_pct": (
+            (sequential_ms - critical_path_ms) / sequential_ms * 100 if sequential_ms else 0.0
+        )
+    }
+
+
 class SecurityTriageWorkflow:
     """
     LangGraph workflow for security incident triage and response.
     
     Implements a comprehensive state machine for processing security incidents
     in hospitality environments with proper safety controls and compliance checks.
+    
+    When a FusedTriageTool is supplied, classification, risk assessment and
+    prioritization come from one LLM call made in the classify step; later
+    steps reuse its validated sections and call their own tool only for
+    sections that failed validation.
+    
+    With parallel_nodes enabled, steps that do not depend on each other run
+    concurrently inside join nodes: rule-based content screening alongside
+    risk assessment, and notification alongside documentation. Compliance
+    checking stays after playbook selection because it assesses the selected
+    playbook. Every node's duration is recorded in
+    processing_metrics["node_timings"].
+    
+    Incidents with pending approvals are not polled: the graph stops before
+    APPROVAL_INTERRUPT_NODE and resumes from the checkpoint once the caller
+    has recorded the decision in the saved state.
     """
     
     def __init__(
@@ -39,7 +109,9 @@ class SecurityTriageWorkflow:
         safety_guardrails: SafetyGuardrails,
         session_manager: SessionManager,
         metrics_tracker: MetricsTracker,
-        checkpointer: SqliteSaver = None
+        checkpointer: Optional[BaseCheckpointSaver] = None,
+        fused_triage: Optional[FusedTriageTool] = None,
+        parallel_nodes: bool = False
     ):
         self.classifier = classifier
         self.prioritizer = prioritizer
@@ -50,6 +122,8 @@ class SecurityTriageWorkflow:
         self.session_manager = session_manager
         self.metrics_tracker = metrics_tracker
         self.checkpointer = checkpointer
+        self.fused_triage = fused_triage
+        self.parallel_nodes = parallel_nodes
         
         self.workflow = self._build_workflow()
     
@@ -59,21 +133,46 @@ class SecurityTriageWorkflow:
         workflow = StateGraph(IncidentState)
         
         # Add workflow nodes
-        workflow.add_node("validate_input", self._validate_input)
-        workflow.add_node("classify_incident", self._classify_incident)
-        workflow.add_node("assess_risk", self._assess_risk)
-        workflow.add_node("safety_check", self._safety_check)
-        workflow.add_node("prioritize_incident", self._prioritize_incident)
-        workflow.add_node("select_playbook", self._select_playbook)
-        workflow.add_node("compliance_check", self._compliance_check)
-        workflow.add_node("human_approval_gate", self._human_approval_gate)
-        workflow.add_node("generate_response", self._generate_response)
-        workflow.add_node("execute_immediate_actions", self._execute_immediate_actions)
-        workflow.add_node("document_incident", self._document_incident)
-        workflow.add_node("notify_stakeholders", self._notify_stakeholders)
-        workflow.add_node("schedule_followup", self._schedule_followup)
-        workflow.add_node("update_metrics", self._update_metrics)
-        workflow.add_node("handle_error", self._handle_error)
+        nodes: Dict[str, NodeFunction] = {
+            "validate_input": self._validate_input,
+            "classify_incident": self._classify_incident,
+            "safety_check": self._safety_check,
+            "prioritize_incident": self._prioritize_incident,
+            "select_playbook": self._select_playbook,
+            "compliance_check": self._compliance_check,
+            "human_approval_gate": self._human_approval_gate,
+            APPROVAL_INTERRUPT_NODE: self._await_human_approval,
+            "generate_response": self._generate_response,
+            "execute_immediate_actions": self._execute_immediate_actions,
+            "schedule_followup": self._schedule_followup,
+            "update_metrics": self._update_metrics,
+            "handle_error": self._handle_error,
+        }
+        
+        if self.parallel_nodes:
+            # Join nodes running independent steps concurrently
+            nodes["assess_risk"] = self._parallel(
+                "assess_risk",
+                assess_risk=self._assess_risk,
+                screen_content=self._screen_content
+            )
+            nodes["document_incident"] = self._parallel(
+                "document_incident",
+                document_incident=self._document_incident,
+                notify_stakeholders=self._notify_stakeholders
+            )
+            notify_node = "document_incident"
+        else:
+            nodes.update({
+                "assess_risk": self._assess_risk,
+                "document_incident": self._document_incident,
+                "notify_stakeholders": self._notify_stakeholders,
+            })
+            notify_node = "notify_stakeholders"
+        
+        self.nodes = {name: self._timed(name, node) for name, node in nodes.items()}
+        for name, node in self.nodes.items():
+            workflow.add_node(name, node)
         
         # Set entry point
         workflow.set_entry_point("validate_input")
@@ -108,16 +207,16 @@ class SecurityTriageWorkflow:
             }
         )
         
-        # Human approval gate routing
-        workflow.add_conditional_edges(
-            "human_approval_gate",
-            self._human_approval_router,
-            {
-                "approved": "generate_response",
-                "rejected": "handle_error",
-                "pending": "human_approval_gate"  # Wait for approval
-            }
-        )
+        # Human approval gate routing. Pending approvals go to the interrupt
+        # node: the graph is compiled to stop before it, so the incident is
+        # checkpointed once and resumed when a decision arrives.
+        approval_routes = {
+            "approved": "generate_response",
+            "rejected": "handle_error",
+            "pending": APPROVAL_INTERRUPT_NODE
+        }
+        workflow.add_conditional_edges("human_approval_gate", self._human_approval_router, approval_routes)
+        workflow.add_conditional_edges(APPROVAL_INTERRUPT_NODE, self._human_approval_router, approval_routes)
         
         workflow.add_edge("generate_response", "execute_immediate_actions")
         
@@ -127,19 +226,71 @@ class SecurityTriageWorkflow:
             self._execution_router,
             {
                 "document": "document_incident",
-                "notify": "notify_stakeholders",
+                "notify": notify_node,
                 "error": "handle_error"
             }
         )
         
-        workflow.add_edge("document_incident", "notify_stakeholders")
-        workflow.add_edge("notify_stakeholders", "schedule_followup")
+        if not self.parallel_nodes:
+            workflow.add_edge("document_incident", "notify_stakeholders")
+        workflow.add_edge(notify_node, "schedule_followup")
         workflow.add_edge("schedule_followup", "update_metrics")
         workflow.add_edge("update_metrics", END)
         workflow.add_edge("handle_error", END)
         
         return workflow
     
+    def _timed(self, node_name: str, node: NodeFunction, group: Optional[str] = None) -> NodeFunction:
+        """Wrap a node so its duration is recorded in processing_metrics."""
+        
+        async def timed_node(state: IncidentState) -> IncidentState:
+            started_at = time.time()
+            start = time.perf_counter()
+            try:
+                return await node(state)
+            finally:
+                state.processing_metrics.setdefault("node_timings", []).append({
+                    "node": node_name,
+                    "group": group,
+                    "started_at": started_at,
+                    "duration_ms": (time.perf_counter() - start) * 1000
+                })
+        
+        return timed_node
+    
+    def _parallel(self, node_name: str, **branches: NodeFunction) -> NodeFunction:
+        """
+        Build a join node running independent branches concurrently.
+        
+        Branches share the state object and must write disjoint fields. The
+        node completes once every branch has finished; the first branch
+        failure is then re-raised. Step bookkeeping is merged at the join, in
+        branch order, so it does not depend on which branch finished first.
+        """
+        
+        async def parallel_node(state: IncidentState) -> IncidentState:
+            completed_steps = list(state.completed_steps)
+            if state.current_step not in completed_steps:
+                completed_steps.append(state.current_step)
+            results = await asyncio.gather(
+                *(self._timed(name, branch, group=node_name)(state)
+                  for name, branch in branches.items()),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            
+            completed_steps.extend(
+                name for name in branches if name != node_name and name not in completed_steps
+            )
+            state.completed_steps = completed_steps
+            state.current_step = node_name
+            state.updated_at = datetime.utcnow()
+            return state
+        
+        return parallel_node
+    
     async def _validate_input(self, state: IncidentState) -> IncidentState:
         """Validate and sanitize input incident data."""
         try:
@@ -175,11 +326,17 @@ class SecurityTriageWorkflow:
         try:
             state.update_step("classify_incident")
             
-            classification_result = await self.classifier.classify(
-                title=state.title,
-                description=state.description,
-                metadata=state.metadata
-            )
+            classification_result = None
+            if self.fused_triage:
+                classification_result = await self._run_fused_triage(state)
+            
+            # Per-tool path, also used when the fused classification is invalid
+            if classification_result is None:
+                classification_result = await self.classifier.classify(
+                    title=state.title,
+                    description=state.description,
+                    metadata=state.metadata
+                )
             
             state.category = classification_result.category
             state.classification_confidence = classification_result.confidence
@@ -197,16 +354,48 @@ class SecurityTriageWorkflow:
             state.mark_step_failed("classify_incident", str(e))
             raise
     
+    async def _run_fused_triage(self, state: IncidentState):
+        """Run the fused triage call and keep its later sections for reuse."""
+        fused_result = await self.fused_triage.triage(
+            title=state.title,
+            description=state.description,
+            metadata=state.metadata
+        )
+        
+        state.add_tool_result("fused_triage", {
+            "risk_assessment": (
+                fused_result.risk_assessment.dict() if fused_result.risk_assessment else None
+            ),
+            "prioritization": (
+                fused_result.prioritization.dict() if fused_result.prioritization else None
+            ),
+            "section_errors": fused_result.section_errors
+        })
+        state.update_metrics("fused_triage_complete", fused_result.complete)
+        
+        return fused_result.classification
+    
+    def _fused_section(self, state: IncidentState, section: str) -> Optional[Dict[str, Any]]:
+        """Get a validated fused triage section, if fused mode produced one."""
+        fused_result = state.tool_results.get("fused_triage")
+        if not fused_result:
+            return None
+        return fused_result.get(section)
+    
     async def _assess_risk(self, state: IncidentState) -> IncidentState:
         """Assess risk level and potential impact."""
         try:
             state.update_step("assess_risk")
             
-            risk_assessment = await self.prioritizer.assess_risk(
-                category=state.category,
-                description=state.description,
-                metadata=state.metadata
-            )
+            fused_section = self._fused_section(state, "risk_assessment")
+            if fused_section is not None:
+                risk_assessment = RiskAssessment.parse_obj(fused_section)
+            else:
+                risk_assessment = await self.prioritizer.assess_risk(
+                    category=state.category,
+                    description=state.description,
+                    metadata=state.metadata
+                )
             
             state.risk_assessment = risk_assessment
             state.add_tool_result("risk_assessment", risk_assessment.dict())
@@ -217,15 +406,33 @@ class SecurityTriageWorkflow:
             state.mark_step_failed("assess_risk", str(e))
             raise
     
+    async def _screen_content(self, state: IncidentState) -> IncidentState:
+        """Run the rule-based safety screening, which needs no risk score."""
+        try:
+            screening = await asyncio.to_thread(
+                self.safety_guardrails.screen_content,
+                state.description,
+                state.category
+            )
+            state.add_tool_result("content_screening", screening.dict())
+            
+            return state
+            
+        except Exception as e:
+            state.mark_step_failed("screen_content", str(e))
+            raise
+    
     async def _safety_check(self, state: IncidentState) -> IncidentState:
         """Perform safety guardrails check."""
         try:
             state.update_step("safety_check")
             
+            screening = state.tool_results.get("content_screening")
             safety_result = await self.safety_guardrails.check_safety(
                 incident_description=state.description,
                 category=state.category,
-                risk_score=state.risk_assessment.risk_score if state.risk_assessment else 0.0
+                risk_score=state.risk_assessment.risk_score if state.risk_assessment else 0.0,
+                screening=ContentScreeningResult.parse_obj(screening) if screening else None
             )
             
             state.safety_guardrails_passed = safety_result.passed
@@ -251,11 +458,15 @@ class SecurityTriageWorkflow:
         try:
             state.update_step("prioritize_incident")
             
-            priority_result = await self.prioritizer.prioritize(
-                category=state.category,
-                risk_assessment=state.risk_assessment,
-                metadata=state.metadata
-            )
+            fused_section = self._fused_section(state, "prioritization")
+            if fused_section is not None:
+                priority_result = PrioritizationResult.parse_obj(fused_section)
+            else:
+                priority_result = await self.prioritizer.prioritize(
+                    category=state.category,
+                    risk_assessment=state.risk_assessment,
+                    metadata=state.metadata
+                )
             
             state.severity = priority_result.priority
             state.add_tool_result("prioritization", priority_result.dict())
@@ -356,6 +567,23 @@ class SecurityTriageWorkflow:
             state.mark_step_failed("human_approval_gate", str(e))
             raise
     
+    async def _await_human_approval(self, state: IncidentState) -> IncidentState:
+        """Resume after a human decision has been written into the checkpoint."""
+        try:
+            state.update_step(APPROVAL_INTERRUPT_NODE)
+            
+            state.add_tool_result("human_approval", {
+                "pending_count": len(state.pending_approvals),
+                "approval_history": state.approval_history,
+                "resumed": True
+            })
+            
+            return state
+            
+        except Exception as e:
+            state.mark_step_failed(APPROVAL_INTERRUPT_NODE, str(e))
+            raise
+    
     async def _generate_response(self, state: IncidentState) -> IncidentState:
         """Generate structured incident response plan."""
         try:
@@ -428,7 +656,8 @@ class SecurityTriageWorkflow:
             await self.metrics_tracker.record_incident_processed(
                 category=state.category,
                 priority=state.severity,
-                processing_time=(state.updated_at - state.created_at).total_seconds()
+                processing_time=(state.updated_at - state.created_at).total_seconds(),
+                incident_id=state.incident_id
             )
             
             state.add_tool_result("documentation", {
@@ -511,6 +740,19 @@ class SecurityTriageWorkflow:
             }
             
             state.processing_metrics.update(final_metrics)
+            node_timings = state.processing_metrics.get("node_timings", [])
+            state.processing_metrics["node_timing_report"] = summarize_node_timings(node_timings)
+            
+            # Feed step durations into the tracker's percentile sketches; join
+            # nodes are skipped since their branches are recorded individually
+            join_nodes = {timing["group"] for timing in node_timings if timing["group"]}
+            category = state.category.value if state.category else None
+            for timing in node_timings:
+                if timing["group"] is None and timing["node"] in join_nodes:
+                    continue
+                await self.metrics_tracker.observe_step_duration(
+                    timing["node"], timing["duration_ms"] / 1000, category
+                )
             
             state.add_message(
                 AIMessage(content=f"Incident processing completed. "
@@ -631,12 +873,16 @@ def create_triage_workflow(
     safety_guardrails: SafetyGuardrails,
     session_manager: SessionManager,
     metrics_tracker: MetricsTracker,
-    checkpointer: SqliteSaver = None
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    fused_triage: Optional[FusedTriageTool] = None,
+    parallel_nodes: bool = False
 ) -> StateGraph:
     """
     Factory function to create the security triage workflow.
     
-    Returns a compiled LangGraph workflow ready for execution.
+    Returns a compiled LangGraph workflow ready for execution. Incidents
+    awaiting human approval stop before APPROVAL_INTERRUPT_NODE; resuming
+    them requires the checkpointer.
     """
     workflow_manager = SecurityTriageWorkflow(
         classifier=classifier,
@@ -647,7 +893,12 @@ def create_triage_workflow(
         safety_guardrails=safety_guardrails,
         session_manager=session_manager,
         metrics_tracker=metrics_tracker,
-        checkpointer=checkpointer
+        checkpointer=checkpointer,
+        fused_triage=fused_triage,
+        parallel_nodes=parallel_nodes
     )
     
-    return workflow_manager.workflow.compile(checkpointer=checkpointer)
\ No newline at end of file
+    return workflow_manager.workflow.compile(
+        checkpointer=checkpointer,
+        interrupt_before=[APPROVAL_INTERRUPT_NODE]
+    )
\ No newline at end of file
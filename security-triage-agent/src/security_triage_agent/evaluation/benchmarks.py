@@ -523,7 +523,7 @@ class HospitalityBenchmarks:
             if metric_name in adjustments:
                 adjustment_factor = adjustments[metric_name]
                 adjusted_target *= adjustment_factor
-                adjusted_threshold *= adjustment_threshold
+                adjusted_threshold *= adjustment_factor
             
             # Apply category-wide adjustments
             category_adjustments = {
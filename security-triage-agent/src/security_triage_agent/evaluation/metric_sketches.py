@@ -0,0 +1,333 @@
+"""
+Streaming Metric Sketches for Security Incident Triage Agent.
+
+Keeps mergeable quantile sketches per metric, per incident category and per
+time bucket, so metric summaries can report percentiles for any window by
+merging a handful of buckets instead of replaying raw events.
+"""
+
+import json
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+# Category under which every value is also recorded
+ALL_CATEGORIES = "all"
+
+SketchKey = Tuple[str, str, str, datetime]  # (metric, category, resolution, bucket_start)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch over non-negative values.
+
+    Values are counted in logarithmically sized bins, so every quantile is
+    returned within ``relative_accuracy`` of the true value and two sketches
+    merge exactly by adding bin counts. Once more than ``max_bins`` bins are
+    in use the lowest ones are collapsed, which bounds memory while keeping
+    the upper percentiles accurate.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        # Values below the smallest representable bin are counted as zero
+        self._min_indexable = math.exp((-(1 << 20) + 1) * self._log_gamma)
+
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Record a value ``count`` times."""
+        if value > self._min_indexable:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + count
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        else:
+            self.zero_count += count
+
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add another sketch with the same relative accuracy into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None for an empty sketch
+        """
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """Estimate several quantiles with one pass over the bins."""
+        if not self.count:
+            return [None] * len(qs)
+
+        results: List[Optional[float]] = [self.max] * len(qs)
+        pending = sorted(range(len(qs)), key=lambda i: qs[i])
+        position = 0
+        seen = self.zero_count
+
+        def resolve(value: float) -> None:
+            nonlocal position
+            while position < len(pending) and qs[pending[position]] * (self.count - 1) < seen:
+                results[pending[position]] = min(max(value, self.min), self.max)
+                position += 1
+
+        resolve(0.0)
+        for key in sorted(self.bins):
+            if position == len(pending):
+                break
+            seen += self.bins[key]
+            resolve(2 * self._gamma ** key / (self._gamma + 1))
+
+        return results
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "zero_count": self.zero_count,
+            "bins": sorted(self.bins.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_bins: int = 2048) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"], max_bins=max_bins)
+        sketch.bins = {int(key): int(count) for key, count in data["bins"]}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+    def _collapse(self) -> None:
+        """Fold the lowest bins into one so at most max_bins remain."""
+        keys = sorted(self.bins)
+        excess = keys[:len(keys) - self.max_bins + 1]
+        target = excess[-1]
+        self.bins[target] = sum(self.bins.pop(key) for key in excess[:-1]) + self.bins[target]
+
+
+class SketchStore:
+    """
+    Time-bucketed quantile sketches keyed by metric and category.
+
+    Each value is recorded in an hourly and a daily bucket, for its category
+    and for ``ALL_CATEGORIES``. Window queries merge hourly buckets at the
+    window edges and daily buckets in between, so their cost depends on the
+    number of buckets, not the number of values. Hourly buckets are kept for
+    ``hourly_retention_hours`` and daily buckets for ``daily_retention_days``;
+    older windows fall back to whole days. Buckets changed since the last
+    ``drain_dirty`` call are tracked for periodic persistence.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_bins: int = 2048,
+        hourly_retention_hours: int = 72,
+        daily_retention_days: int = 365
+    ):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.hourly_retention = timedelta(hours=hourly_retention_hours)
+        self.daily_retention = timedelta(days=daily_retention_days)
+
+        self.sketches: Dict[SketchKey, QuantileSketch] = {}
+        self._dirty: Set[SketchKey] = set()
+        self._pruned_hour: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.sketches)
+
+    def add(
+        self,
+        metric: str,
+        value: float,
+        category: Optional[str] = None,
+        timestamp: Optional[datetime] = None
+    ) -> None:
+        """
+        Record a metric value.
+
+        Args:
+            metric: Metric name
+            value: Non-negative value
+            category: Optional incident category
+            timestamp: Time of the value (defaults to now)
+        """
+        timestamp = timestamp or datetime.utcnow()
+        hour = timestamp.replace(minute=0, second=0, microsecond=0)
+        day = hour.replace(hour=0)
+
+        if self._pruned_hour != hour:
+            self.prune(timestamp)
+            self._pruned_hour = hour
+
+        categories = (ALL_CATEGORIES,) if not category else (ALL_CATEGORIES, category)
+        for bucket_category in categories:
+            for resolution, bucket_start in (("hour", hour), ("day", day)):
+                key = (metric, bucket_category, resolution, bucket_start)
+                sketch = self.sketches.get(key)
+                if sketch is None:
+                    sketch = self.sketches[key] = QuantileSketch(
+                        self.relative_accuracy, self.max_bins
+                    )
+                sketch.add(value)
+                self._dirty.add(key)
+
+    def query(
+        self,
+        metric: str,
+        start: datetime,
+        end: datetime,
+        category: Optional[str] = None
+    ) -> QuantileSketch:
+        """
+        Merge the buckets covering a time window.
+
+        Args:
+            metric: Metric name
+            start: Window start
+            end: Window end
+            category: Optional incident category (all categories if omitted)
+
+        Returns:
+            Sketch of the values recorded in the window, at hour granularity
+        """
+        merged = QuantileSketch(self.relative_accuracy, self.max_bins)
+        category = category or ALL_CATEGORIES
+        for resolution, bucket_start in self._window_buckets(start, end):
+            sketch = self.sketches.get((metric, category, resolution, bucket_start))
+            if sketch is not None:
+                merged.merge(sketch)
+        return merged
+
+    def summary(
+        self,
+        metric: str,
+        start: datetime,
+        end: datetime,
+        category: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Count, mean and p50/p90/p99 of a metric over a window."""
+        sketch = self.query(metric, start, end, category)
+        p50, p90, p99 = sketch.quantiles((0.5, 0.9, 0.99))
+        return {
+            "count": sketch.count,
+            "mean": sketch.mean,
+            "p50": p50,
+            "p90": p90,
+            "p99": p99,
+            "min": sketch.min if sketch.count else None,
+            "max": sketch.max if sketch.count else None,
+        }
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """
+        Drop buckets past their retention.
+
+        Returns:
+            Number of buckets dropped
+        """
+        now = now or datetime.utcnow()
+        cutoffs = {"hour": now - self.hourly_retention, "day": now - self.daily_retention}
+        expired = [
+            key for key in self.sketches
+            if key[3] < cutoffs[key[2]] - (timedelta(hours=1) if key[2] == "hour" else timedelta(days=1))
+        ]
+        for key in expired:
+            del self.sketches[key]
+            self._dirty.discard(key)
+        return len(expired)
+
+    def drain_dirty(self) -> List[Tuple[str, str, str, datetime, str]]:
+        """
+        Serialize buckets changed since the last drain.
+
+        Returns:
+            (metric, category, resolution, bucket_start, sketch_json) rows
+        """
+        rows = [
+            (*key, json.dumps(self.sketches[key].to_dict()))
+            for key in self._dirty if key in self.sketches
+        ]
+        self._dirty.clear()
+        return rows
+
+    def mark_dirty(self, rows: Iterable[Tuple]) -> None:
+        """Mark drained rows as unsaved again, e.g. after a failed write."""
+        self._dirty.update(tuple(row[:4]) for row in rows)
+
+    def load_rows(self, rows: Iterable[Tuple[str, str, str, datetime, str]]) -> None:
+        """Merge persisted buckets into the store."""
+        for metric, category, resolution, bucket_start, sketch_json in rows:
+            key = (metric, category, resolution, bucket_start)
+            sketch = QuantileSketch.from_dict(json.loads(sketch_json), self.max_bins)
+            if key in self.sketches:
+                # Values recorded before loading stay unsaved until the next drain
+                self.sketches[key].merge(sketch)
+                self._dirty.add(key)
+            else:
+                self.sketches[key] = sketch
+        self.prune()
+
+    def _window_buckets(self, start: datetime, end: datetime) -> List[Tuple[str, datetime]]:
+        """Buckets covering [start, end): whole days inside, hours at the edges."""
+        # Hours older than the hourly retention are only available as days
+        hourly_cutoff = datetime.utcnow() - self.hourly_retention
+
+        buckets: List[Tuple[str, datetime]] = []
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day < end:
+            next_day = day + timedelta(days=1)
+            first_hour = max(start, day).replace(minute=0, second=0, microsecond=0)
+            last = min(end, next_day)
+            if (first_hour == day and last == next_day) or first_hour < hourly_cutoff:
+                buckets.append(("day", day))
+            else:
+                hour = first_hour
+                while hour < last:
+                    buckets.append(("hour", hour))
+                    hour += timedelta(hours=1)
+            day = next_day
+        return buckets
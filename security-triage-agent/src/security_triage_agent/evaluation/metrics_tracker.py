@@ -6,23 +6,30 @@ real-time metrics collection with hospitality industry benchmarks.
 """
 
 import json
+import sys
 import asyncio
+from array import array
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from pydantic import BaseModel, Field
 from dataclasses import dataclass
 import numpy as np
-from collections import defaultdict
 
 from ..core.state import IncidentState, IncidentCategory, IncidentPriority
 from ..memory.persistent_storage import PersistentStorage
+from ..memory.metric_sink import WriteBehindMetricSink
+from .metric_sketches import SketchStore
 
 
 class PerformanceMetrics(BaseModel):
     """Performance metrics for incident processing."""
     
     # Timing metrics
+    incidents_processed: int = 0
     total_processing_time: float = 0.0  # seconds
+    processing_time_p50: Optional[float] = None
+    processing_time_p90: Optional[float] = None
+    processing_time_p99: Optional[float] = None
     avg_step_time: float = 0.0
     classification_time: float = 0.0
     prioritization_time: float = 0.0
@@ -63,6 +70,7 @@ class QualityMetrics(BaseModel):
     risk_assessment_accuracy: float = 0.0
     
     # Overall quality
+    assessed_incidents: int = 0
     overall_quality_score: float = 0.0
 
 
@@ -94,29 +102,155 @@ class MetricSnapshot:
     context: Dict[str, Any]
 
 
+class RingBuffer:
+    """Fixed-capacity buffer of the most recent float values, backed by array('d')."""
+    
+    __slots__ = ("values", "capacity", "size", "_next")
+    
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.values = array("d", bytes(8 * self.capacity))
+        self.size = 0
+        self._next = 0
+    
+    def append(self, value: float) -> None:
+        self.values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+    
+    def to_list(self) -> List[float]:
+        """Buffered values, oldest first."""
+        if self.size < self.capacity:
+            return self.values[:self.size].tolist()
+        return (self.values[self._next:] + self.values[:self._next]).tolist()
+    
+    @property
+    def nbytes(self) -> int:
+        return self.values.buffer_info()[1] * self.values.itemsize
+
+
+class CompletedIncidentStats:
+    """Running totals and recent history of incidents whose tracking has finished."""
+    
+    __slots__ = (
+        "count", "total_processing_time", "total_steps", "failed_steps",
+        "total_human_interventions", "total_workflow_errors",
+        "recent_processing_times", "recent_human_interventions"
+    )
+    
+    def __init__(self, history_size: int = 1024):
+        self.count = 0
+        self.total_processing_time = 0.0
+        self.total_steps = 0
+        self.failed_steps = 0
+        self.total_human_interventions = 0
+        self.total_workflow_errors = 0
+        self.recent_processing_times = RingBuffer(history_size)
+        self.recent_human_interventions = RingBuffer(history_size)
+    
+    def add(
+        self,
+        processing_time: float,
+        steps: int,
+        failed_steps: int,
+        human_interventions: int,
+        workflow_errors: int
+    ) -> None:
+        self.count += 1
+        self.total_processing_time += processing_time
+        self.total_steps += steps
+        self.failed_steps += failed_steps
+        self.total_human_interventions += human_interventions
+        self.total_workflow_errors += workflow_errors
+        self.recent_processing_times.append(processing_time)
+        self.recent_human_interventions.append(human_interventions)
+    
+    @property
+    def nbytes(self) -> int:
+        return self.recent_processing_times.nbytes + self.recent_human_interventions.nbytes
+
+
+class DailyIncidentStats:
+    """Incident counts and processing time for one day."""
+    
+    __slots__ = ("incidents", "total_processing_time", "by_category", "by_priority")
+    
+    def __init__(self):
+        self.incidents = 0
+        self.total_processing_time = 0.0
+        self.by_category: Dict[str, int] = {}
+        self.by_priority: Dict[str, int] = {}
+    
+    def add(self, category: str, priority: str, processing_time: float) -> None:
+        self.incidents += 1
+        self.total_processing_time += processing_time
+        self.by_category[category] = self.by_category.get(category, 0) + 1
+        self.by_priority[priority] = self.by_priority.get(priority, 0) + 1
+
+
+def _deep_sizeof(value: Any) -> int:
+    """Approximate memory of a nested structure of containers and scalars."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_sizeof(key) + _deep_sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(_deep_sizeof(item) for item in value)
+    return size
+
+
 class MetricsTracker:
     """
     Comprehensive metrics tracking system for incident processing.
     
     Tracks performance, quality, safety, and compliance metrics with
     real-time monitoring and historical analysis capabilities.
+    
+    Every recorded value is also added to streaming quantile sketches per
+    metric, category and time bucket, which back the summaries and are
+    saved to storage every ``sketch_persist_interval_seconds``.
+    
+    Per-incident detail lives in ``current_metrics`` only while an incident
+    is being processed: ``finish_incident_tracking`` folds it into compact
+    aggregates and drops it. At most ``max_tracked_incidents`` are kept, the
+    oldest being finished first, so abandoned incidents cannot leak memory.
     """
     
     def __init__(
         self,
         storage: Optional[PersistentStorage] = None,
-        metrics_retention_days: int = 365
+        metrics_retention_days: int = 365,
+        metric_sink: Optional[WriteBehindMetricSink] = None,
+        sketch_persist_interval_seconds: float = 60.0,
+        hourly_sketch_retention_hours: int = 72,
+        max_tracked_incidents: int = 10000,
+        history_size: int = 1024
     ):
         self.storage = storage
         self.metrics_retention_days = metrics_retention_days
+        self.max_tracked_incidents = max(1, max_tracked_incidents)
+        self.history_size = history_size
+        
+        # Streaming percentile sketches behind the summaries
+        self.sketches = SketchStore(
+            hourly_retention_hours=hourly_sketch_retention_hours,
+            daily_retention_days=metrics_retention_days
+        )
+        self.sketch_persist_interval = timedelta(seconds=sketch_persist_interval_seconds)
+        self._last_sketch_persist = datetime.utcnow()
+        self._sketch_persist_lock = asyncio.Lock()
+        
+        # Metric writes go through the write-behind sink when one is provided
+        self.metric_sink = metric_sink
+        self.metric_store = metric_sink or storage
         
-        # Real-time metrics storage
-        self.current_metrics = {}
+        # Real-time metrics of incidents in progress, oldest first
+        self.current_metrics: Dict[str, Dict[str, Any]] = {}
         self.metric_snapshots = []
         
         # Aggregated metrics
-        self.daily_metrics = defaultdict(lambda: defaultdict(list))
-        self.category_metrics = defaultdict(lambda: defaultdict(list))
+        self.completed_incidents = CompletedIncidentStats(history_size)
+        self.daily_metrics: Dict[str, DailyIncidentStats] = {}
+        self.category_metrics: Dict[str, RingBuffer] = {}  # recent processing times
         
         # Benchmark values (hospitality industry standards)
         self.benchmarks = self._initialize_benchmarks()
@@ -150,6 +284,10 @@ class MetricsTracker:
     
     async def start_incident_tracking(self, incident_id: str) -> None:
         """Start tracking metrics for an incident."""
+        while (len(self.current_metrics) >= self.max_tracked_incidents
+               and incident_id not in self.current_metrics):
+            await self.finish_incident_tracking(next(iter(self.current_metrics)))
+        
         self.current_metrics[incident_id] = {
             "start_time": datetime.utcnow(),
             "step_times": {},
@@ -161,6 +299,131 @@ class MetricsTracker:
             "workflow_errors": []
         }
     
+    async def finish_incident_tracking(self, incident_id: str) -> bool:
+        """
+        Fold an incident's metrics into the aggregates and stop tracking it.
+        
+        Args:
+            incident_id: Incident identifier
+            
+        Returns:
+            Whether the incident was being tracked
+        """
+        metrics = self.current_metrics.pop(incident_id, None)
+        if metrics is None:
+            return False
+        
+        step_times = metrics["step_times"]
+        end_time = max(
+            (step["timestamp"] for step in step_times.values()), default=datetime.utcnow()
+        )
+        self.completed_incidents.add(
+            processing_time=(end_time - metrics["start_time"]).total_seconds(),
+            steps=len(step_times),
+            failed_steps=sum(1 for step in step_times.values() if not step["success"]),
+            human_interventions=metrics["human_interventions"],
+            workflow_errors=len(metrics["workflow_errors"])
+        )
+        return True
+    
+    def get_memory_usage(self) -> Dict[str, int]:
+        """
+        Memory gauge for the tracker's in-memory state.
+        
+        Returns:
+            Tracked and completed incident counts with approximate byte sizes
+        """
+        return {
+            "tracked_incidents": len(self.current_metrics),
+            "tracked_bytes": _deep_sizeof(self.current_metrics),
+            "completed_incidents": self.completed_incidents.count,
+            "aggregate_bytes": (
+                self.completed_incidents.nbytes
+                + sum(buffer.nbytes for buffer in self.category_metrics.values())
+                + _deep_sizeof(self.daily_metrics)
+            ),
+            "sketches": len(self.sketches),
+            "sketch_bins": sum(len(sketch.bins) for sketch in self.sketches.sketches.values()),
+        }
+    
+    async def observe(self, metric: str, value: float, category: Optional[str] = None) -> None:
+        """
+        Add a value to the metric's streaming sketches.
+        
+        Args:
+            metric: Metric name
+            value: Non-negative metric value
+            category: Optional incident category
+        """
+        self.sketches.add(metric, value, category)
+        
+        if datetime.utcnow() - self._last_sketch_persist >= self.sketch_persist_interval:
+            await self.persist_sketches()
+    
+    async def observe_step_duration(
+        self, step_name: str, duration_seconds: float, category: Optional[str] = None
+    ) -> None:
+        """Add a workflow step duration to the per-step and all-step sketches."""
+        await self.observe(f"step_duration:{step_name}", duration_seconds, category)
+        await self.observe("step_duration", duration_seconds, category)
+    
+    async def persist_sketches(self) -> bool:
+        """
+        Save sketches changed since the last save.
+        
+        Returns:
+            Success status
+        """
+        if not self.storage:
+            return True
+        
+        async with self._sketch_persist_lock:
+            self._last_sketch_persist = datetime.utcnow()
+            rows = self.sketches.drain_dirty()
+            if await self.storage.save_metric_sketches(rows):
+                return True
+            
+            self.sketches.mark_dirty(rows)
+            return False
+    
+    async def load_sketches(self) -> int:
+        """
+        Load persisted sketches within the retention period.
+        
+        Returns:
+            Number of sketches loaded
+        """
+        if not self.storage:
+            return 0
+        
+        since = datetime.utcnow() - timedelta(days=self.metrics_retention_days + 1)
+        rows = await self.storage.load_metric_sketches(since)
+        self.sketches.load_rows(rows)
+        return len(rows)
+    
+    async def get_metric_percentiles(
+        self,
+        metric: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get count, mean and p50/p90/p99 of a metric over a time window.
+        
+        Args:
+            metric: Metric name, e.g. "processing_time" or "step_duration:assess_risk"
+            start_date: Window start (defaults to a week ago)
+            end_date: Window end (defaults to now)
+            category: Optional incident category
+            
+        Returns:
+            Metric summary
+        """
+        end_date = end_date or datetime.utcnow()
+        start_date = start_date or end_date - timedelta(days=7)
+        return self.sketches.summary(metric, start_date, end_date, category)
+    
     async def record_step_completion(
         self,
         incident_id: str,
@@ -188,9 +451,11 @@ class MetricsTracker:
                 "metrics": additional_metrics
             })
         
+        await self.observe_step_duration(step_name, duration_seconds, metrics.get("category"))
+        
         # Store in persistent storage if available
-        if self.storage:
-            await self.storage.record_performance_metric(
+        if self.metric_store:
+            await self.metric_store.record_performance_metric(
                 incident_id, f"step_duration_{step_name}", duration_seconds, {
                     "success": success,
                     "additional_metrics": additional_metrics
@@ -219,9 +484,13 @@ class MetricsTracker:
             "timestamp": datetime.utcnow()
         }
         
+        await self.observe(
+            f"tool_execution_time:{tool_name}", execution_time, metrics.get("category")
+        )
+        
         # Store in persistent storage
-        if self.storage:
-            await self.storage.record_performance_metric(
+        if self.metric_store:
+            await self.metric_store.record_performance_metric(
                 incident_id, f"tool_performance_{tool_name}", execution_time, {
                     "success": success,
                     "output_quality": output_quality,
@@ -247,9 +516,11 @@ class MetricsTracker:
             "timestamp": datetime.utcnow()
         }
         
+        await self.observe(f"quality:{assessment_type}", quality_score, metrics.get("category"))
+        
         # Store in persistent storage
-        if self.storage:
-            await self.storage.record_performance_metric(
+        if self.metric_store:
+            await self.metric_store.record_performance_metric(
                 incident_id, f"quality_{assessment_type}", quality_score, details
             )
     
@@ -275,9 +546,11 @@ class MetricsTracker:
             "timestamp": datetime.utcnow()
         })
         
+        await self.observe("hallucination", confidence, metrics.get("category"))
+        
         # Store in persistent storage
-        if self.storage:
-            await self.storage.record_performance_metric(
+        if self.metric_store:
+            await self.metric_store.record_performance_metric(
                 incident_id, f"hallucination_{hallucination_type}", confidence, details
             )
     
@@ -305,9 +578,13 @@ class MetricsTracker:
             "timestamp": datetime.utcnow()
         })
         
+        await self.observe("human_intervention", 1.0, metrics.get("category"))
+        if resolution_time is not None:
+            await self.observe("intervention_resolution_time", resolution_time, metrics.get("category"))
+        
         # Store in persistent storage
-        if self.storage:
-            await self.storage.record_performance_metric(
+        if self.metric_store:
+            await self.metric_store.record_performance_metric(
                 incident_id, "human_intervention", 1, {
                     "type": intervention_type,
                     "reason": reason,
@@ -319,25 +596,34 @@ class MetricsTracker:
         self,
         category: IncidentCategory,
         priority: IncidentPriority,
-        processing_time: float
+        processing_time: float,
+        incident_id: Optional[str] = None
     ) -> None:
-        """Record incident processing completion for analytics."""
+        """
+        Record incident processing completion for analytics.
+        
+        The incident stays tracked so it can still be scored; its detail is
+        released by finish_incident_tracking once processing has finished.
+        """
         today = datetime.utcnow().date().isoformat()
         
         # Update daily metrics
-        self.daily_metrics[today]["incidents_processed"].append({
-            "category": category.value,
-            "priority": priority.value,
-            "processing_time": processing_time,
-            "timestamp": datetime.utcnow()
-        })
+        if today not in self.daily_metrics:
+            self.daily_metrics[today] = DailyIncidentStats()
+        self.daily_metrics[today].add(category.value, priority.value, processing_time)
         
         # Update category metrics
-        self.category_metrics[category.value]["processing_times"].append(processing_time)
+        if category.value not in self.category_metrics:
+            self.category_metrics[category.value] = RingBuffer(self.history_size)
+        self.category_metrics[category.value].append(processing_time)
+        await self.observe("processing_time", processing_time, category.value)
+        
+        if incident_id in self.current_metrics:
+            self.current_metrics[incident_id]["category"] = category.value
         
         # Store in persistent storage
-        if self.storage:
-            await self.storage.record_performance_metric(
+        if self.metric_store:
+            await self.metric_store.record_performance_metric(
                 f"daily_{today}", "incident_processed", processing_time, {
                     "category": category.value,
                     "priority": priority.value
@@ -361,9 +647,11 @@ class MetricsTracker:
             "timestamp": datetime.utcnow()
         })
         
+        await self.observe("workflow_error", 1.0, metrics.get("category"))
+        
         # Store in persistent storage
-        if self.storage:
-            await self.storage.record_performance_metric(
+        if self.metric_store:
+            await self.metric_store.record_performance_metric(
                 incident_id, f"workflow_error_{error_step}", 1, error_details
             )
     
@@ -377,6 +665,8 @@ class MetricsTracker:
             return {"overall": 0.5}  # Default moderate score
         
         metrics = self.current_metrics[incident_id]
+        if incident_state.category:
+            metrics["category"] = incident_state.category.value
         
         # Response completeness score
         completeness_score = self._calculate_response_completeness(incident_state)
@@ -418,6 +708,10 @@ class MetricsTracker:
         )
         quality_scores["overall"] = overall_score
         
+        for metric, score in quality_scores.items():
+            if metric != "overall":
+                await self.observe(f"quality:{metric}", score, metrics.get("category"))
+        
         # Record quality scores
         await self.record_quality_assessment(
             incident_id, "overall_quality", overall_score, quality_scores
@@ -593,67 +887,68 @@ class MetricsTracker:
     async def get_performance_summary(
         self, 
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None
     ) -> PerformanceMetrics:
-        """Get performance metrics summary."""
+        """Get performance metrics summary for a time window."""
         
         if not start_date:
             start_date = datetime.utcnow() - timedelta(days=7)  # Last week
         if not end_date:
             end_date = datetime.utcnow()
         
-        # This would be enhanced with actual data aggregation from storage
-        # For now, return calculated metrics based on current tracking
-        
         metrics = PerformanceMetrics()
         
-        # Calculate averages from current metrics
-        if self.current_metrics:
-            processing_times = []
-            human_intervention_count = 0
-            total_incidents = len(self.current_metrics)
-            
-            for incident_id, incident_metrics in self.current_metrics.items():
-                if "start_time" in incident_metrics:
-                    # Calculate processing time
-                    end_time = max(
-                        step_data.get("timestamp", incident_metrics["start_time"])
-                        for step_data in incident_metrics.get("step_times", {}).values()
-                    ) if incident_metrics.get("step_times") else datetime.utcnow()
-                    
-                    processing_time = (end_time - incident_metrics["start_time"]).total_seconds()
-                    processing_times.append(processing_time)
-                
-                # Count human interventions
-                human_intervention_count += incident_metrics.get("human_interventions", 0)
-            
-            # Calculate metrics
-            if processing_times:
-                metrics.total_processing_time = sum(processing_times)
-                metrics.avg_step_time = np.mean(processing_times)
+        def window(metric: str):
+            return self.sketches.query(metric, start_date, end_date, category)
+        
+        processing = window("processing_time")
+        if processing.count:
+            metrics.incidents_processed = processing.count
+            metrics.total_processing_time = processing.sum
+            (
+                metrics.processing_time_p50,
+                metrics.processing_time_p90,
+                metrics.processing_time_p99
+            ) = processing.quantiles((0.5, 0.9, 0.99))
             
-            if total_incidents > 0:
-                metrics.automation_rate = (total_incidents - human_intervention_count) / total_incidents
-                metrics.escalation_rate = human_intervention_count / total_incidents
+            human_intervention_count = window("human_intervention").count
+            metrics.automation_rate = max(
+                0.0, (processing.count - human_intervention_count) / processing.count
+            )
+            metrics.escalation_rate = human_intervention_count / processing.count
+        
+        metrics.avg_step_time = window("step_duration").mean
+        metrics.classification_time = window("step_duration:classify_incident").mean
+        metrics.prioritization_time = window("step_duration:prioritize_incident").mean
+        metrics.response_generation_time = window("step_duration:generate_response").mean
         
         return metrics
     
     async def get_quality_summary(
         self,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None
     ) -> QualityMetrics:
-        """Get quality metrics summary."""
+        """Get quality metrics summary for a time window."""
+        
+        if not start_date:
+            start_date = datetime.utcnow() - timedelta(days=7)
+        if not end_date:
+            end_date = datetime.utcnow()
         
-        # This would aggregate quality data from storage
-        # For now, return default metrics
+        def mean(metric: str) -> float:
+            return self.sketches.query(f"quality:{metric}", start_date, end_date, category).mean
+        
+        overall = self.sketches.query("quality:overall_quality", start_date, end_date, category)
         return QualityMetrics(
-            response_completeness=0.85,
-            response_accuracy=0.90,
-            workflow_adherence=0.88,
-            safety_score=0.92,
-            compliance_score=0.89,
-            overall_quality_score=0.89
+            response_completeness=mean("response_completeness"),
+            workflow_adherence=mean("workflow_adherence"),
+            safety_score=mean("safety_compliance"),
+            compliance_score=mean("compliance_adherence"),
+            assessed_incidents=overall.count,
+            overall_quality_score=overall.mean
         )
     
     async def get_hallucination_summary(
@@ -663,13 +958,14 @@ class MetricsTracker:
     ) -> HallucinationMetrics:
         """Get hallucination detection summary."""
         
-        # Count hallucinations from current metrics
-        total_hallucinations = 0
-        total_incidents = len(self.current_metrics)
+        if not start_date:
+            start_date = datetime.utcnow() - timedelta(days=7)
+        if not end_date:
+            end_date = datetime.utcnow()
         
-        for metrics in self.current_metrics.values():
-            hallucinations = metrics.get("hallucinations", [])
-            total_hallucinations += len(hallucinations)
+        # Count hallucinations against incidents processed in the window
+        total_hallucinations = self.sketches.query("hallucination", start_date, end_date).count
+        total_incidents = self.sketches.query("processing_time", start_date, end_date).count
         
         hallucination_rate = total_hallucinations / total_incidents if total_incidents > 0 else 0.0
         
@@ -700,5 +996,10 @@ class MetricsTracker:
         for date in old_dates:
             del self.daily_metrics[date]
         
-        cleaned_count = initial_count - len(self.metric_snapshots) + len(old_dates)
+        # Clean up sketches past their retention
+        cleaned_sketches = self.sketches.prune()
+        if self.storage:
+            await self.storage.cleanup_metric_sketches(cutoff_date)
+        
+        cleaned_count = initial_count - len(self.metric_snapshots) + len(old_dates) + cleaned_sketches
         return cleaned_count
\ No newline at end of file
@@ -6,14 +6,29 @@ for incident tracking and learning.
 """
 
 from .session_manager import SessionManager, SessionContext
+from .ttl_store import TTLStore
 from .persistent_storage import PersistentStorage, IncidentRecord
+from .connection_pool import SQLiteConnectionPool
+from .incident_archive import IncidentArchive
+from .checkpoint_saver import PruningSqliteSaver
+from .metric_sink import WriteBehindMetricSink
+from .similarity_index import IncidentSimilarityIndex
+from .llm_cache import LLMResponseCache, CachedLLM
 from .memory_retriever import MemoryRetriever, HistoricalContext
 
 __all__ = [
     "SessionManager",
     "SessionContext",
+    "TTLStore",
     "PersistentStorage", 
     "IncidentRecord",
+    "SQLiteConnectionPool",
+    "IncidentArchive",
+    "PruningSqliteSaver",
+    "WriteBehindMetricSink",
+    "IncidentSimilarityIndex",
+    "LLMResponseCache",
+    "CachedLLM",
     "MemoryRetriever",
     "HistoricalContext",
 ]
\ No newline at end of file
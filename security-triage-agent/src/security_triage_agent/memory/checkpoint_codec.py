@@ -0,0 +1,267 @@
+"""
+Delta Checkpoint Codec for Security Incident Triage Agent.
+
+Encodes workflow checkpoints as a log of compact binary records: a periodic
+full snapshot of the state followed by deltas holding only the fields that
+changed since the previous checkpoint. Lists that only grew (messages,
+completed steps) are stored as appended items and dicts (tool results,
+processing metrics) as changed keys, so checkpoint size tracks the work done
+by a node rather than the accumulated state.
+"""
+
+import json
+import time
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+# One-byte codec tag prefixed to every record
+_TAG_MSGPACK = b"M"
+_TAG_ORJSON = b"O"
+_TAG_JSON = b"J"
+
+# Delta operations per field
+OP_SET = "s"      # replace the value
+OP_APPEND = "a"   # extend a list
+OP_MERGE = "m"    # update dict keys, then remove listed keys
+OP_DELETE = "d"   # remove the field
+
+_MISSING = object()
+
+
+def to_primitive(value: Any) -> Any:
+    """
+    Convert state values to plain data for encoding.
+
+    Pydantic models become dicts of their fields, enums their values,
+    datetimes ISO strings, and tuples and sets lists.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {
+            (key.value if isinstance(key, Enum) else str(key)): to_primitive(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_primitive(item) for item in value]
+    if hasattr(value, "__fields__"):
+        return {name: to_primitive(getattr(value, name, None)) for name in value.__fields__}
+    return str(value)
+
+
+def encode_record(record: Dict[str, Any], codec: Optional[str] = None) -> bytes:
+    """
+    Encode a checkpoint record with the fastest available codec.
+
+    Args:
+        record: Plain-data record
+        codec: Force "msgpack", "orjson" or "json"
+
+    Returns:
+        Tagged bytes
+    """
+    codec = codec or default_codec()
+    if codec == "msgpack":
+        return _TAG_MSGPACK + msgpack.packb(record, use_bin_type=True)
+    if codec == "orjson":
+        return _TAG_ORJSON + orjson.dumps(record)
+    return _TAG_JSON + json.dumps(record, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def decode_record(blob: bytes) -> Dict[str, Any]:
+    """Decode a record written by encode_record."""
+    tag, payload = blob[:1], blob[1:]
+    if tag == _TAG_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Checkpoint was written with msgpack, which is not installed")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    if tag == _TAG_ORJSON:
+        return orjson.loads(payload) if orjson is not None else json.loads(payload)
+    if tag == _TAG_JSON:
+        return json.loads(payload)
+    raise ValueError(f"Unknown checkpoint codec tag {tag!r}")
+
+
+def default_codec() -> str:
+    if msgpack is not None:
+        return "msgpack"
+    if orjson is not None:
+        return "orjson"
+    return "json"
+
+
+def diff_state(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, list]:
+    """
+    Compute field operations turning ``previous`` into ``current``.
+
+    Args:
+        previous: Last checkpointed plain-data state
+        current: New plain-data state
+
+    Returns:
+        Mapping of field name to [op, *payload]
+    """
+    ops: Dict[str, list] = {}
+    for key, value in current.items():
+        old = previous.get(key, _MISSING)
+        if old is _MISSING:
+            ops[key] = [OP_SET, value]
+        elif old == value:
+            continue
+        elif (isinstance(old, list) and isinstance(value, list)
+              and len(value) > len(old) and value[:len(old)] == old):
+            ops[key] = [OP_APPEND, value[len(old):]]
+        elif isinstance(old, dict) and isinstance(value, dict):
+            changed = {k: v for k, v in value.items() if old.get(k, _MISSING) != v}
+            removed = [k for k in old if k not in value]
+            ops[key] = [OP_MERGE, changed, removed]
+        else:
+            ops[key] = [OP_SET, value]
+
+    for key in previous:
+        if key not in current:
+            ops[key] = [OP_DELETE]
+    return ops
+
+
+def apply_delta(state: Dict[str, Any], ops: Dict[str, list]) -> Dict[str, Any]:
+    """Apply field operations from diff_state to a state, in place."""
+    for key, op in ops.items():
+        kind = op[0]
+        if kind == OP_SET:
+            state[key] = op[1]
+        elif kind == OP_APPEND:
+            state[key] = list(state.get(key) or []) + list(op[1])
+        elif kind == OP_MERGE:
+            merged = dict(state.get(key) or {})
+            merged.update(op[1])
+            for removed in op[2]:
+                merged.pop(removed, None)
+            state[key] = merged
+        elif kind == OP_DELETE:
+            state.pop(key, None)
+        else:
+            raise ValueError(f"Unknown checkpoint operation {kind!r}")
+    return state
+
+
+class DeltaCheckpointWriter:
+    """
+    Produces the checkpoint records of one incident.
+
+    Keeps the last checkpointed state in plain form and emits a full
+    snapshot every ``full_snapshot_every`` checkpoints, a delta otherwise.
+    Bytes written and encoding time are accumulated in ``stats``.
+    """
+
+    def __init__(self, incident_id: str, full_snapshot_every: int = 10, codec: Optional[str] = None):
+        self.incident_id = incident_id
+        self.full_snapshot_every = max(1, full_snapshot_every)
+        self.codec = codec or default_codec()
+
+        self.sequence = 0
+        self._last_state: Optional[Dict[str, Any]] = None
+        self._since_full = 0
+
+        self.stats: Dict[str, Any] = {
+            "codec": self.codec,
+            "checkpoints": 0,
+            "full_snapshots": 0,
+            "bytes_written": 0,
+            "serialize_seconds": 0.0,
+        }
+
+    def encode(self, step_name: str, state: Dict[str, Any]) -> bytes:
+        """
+        Encode the next checkpoint.
+
+        Args:
+            step_name: Workflow step that produced the state
+            state: Checkpoint data
+
+        Returns:
+            Encoded record
+        """
+        started = time.perf_counter()
+        current = to_primitive(state)
+        record: Dict[str, Any] = {
+            "v": CHECKPOINT_FORMAT_VERSION,
+            "seq": self.sequence,
+            "step": step_name,
+            "ts": datetime.utcnow().isoformat(),
+        }
+
+        if self._last_state is None or self._since_full >= self.full_snapshot_every:
+            record["full"] = current
+            self._since_full = 0
+            self.stats["full_snapshots"] += 1
+        else:
+            record["delta"] = diff_state(self._last_state, current)
+        self._since_full += 1
+
+        blob = encode_record(record, self.codec)
+        self._last_state = current
+        self.sequence += 1
+
+        self.stats["checkpoints"] += 1
+        self.stats["bytes_written"] += len(blob)
+        self.stats["serialize_seconds"] += time.perf_counter() - started
+        return blob
+
+
+def replay_checkpoints(
+    blobs: Sequence[bytes],
+    until_step: Optional[str] = None
+) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Reconstruct state from a checkpoint log.
+
+    Replays from the last full snapshot at or before the target record.
+
+    Args:
+        blobs: Encoded records in write order
+        until_step: Reconstruct the state as of the last checkpoint of this
+            step (the latest checkpoint if omitted)
+
+    Returns:
+        (state, header of the target record) or None if nothing matches
+    """
+    records: List[Dict[str, Any]] = [decode_record(blob) for blob in blobs]
+
+    target = len(records) - 1
+    if until_step is not None:
+        target = next(
+            (index for index in range(len(records) - 1, -1, -1) if records[index]["step"] == until_step),
+            -1
+        )
+    if target < 0:
+        return None
+
+    base = next((index for index in range(target, -1, -1) if "full" in records[index]), None)
+    if base is None:
+        raise ValueError("Checkpoint log has no full snapshot before the requested record")
+
+    state = dict(records[base]["full"])
+    for record in records[base + 1:target + 1]:
+        apply_delta(state, record["delta"])
+
+    header = {key: records[target][key] for key in ("v", "seq", "step", "ts")}
+    return state, header
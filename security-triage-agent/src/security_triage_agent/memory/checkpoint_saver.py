@@ -0,0 +1,580 @@
+"""
+Pruning Checkpoint Saver for Security Incident Triage Agent.
+
+Asynchronous LangGraph checkpointer on a pooled SQLite database in WAL mode.
+Checkpoint and pending-write inserts from concurrent workflows are committed
+together, each thread keeps only its most recent checkpoints, and threads of
+finished incidents are dropped after a grace period, so the database and the
+process stay bounded however long the service runs.
+"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+
+from .connection_pool import SQLiteConnectionPool
+
+
+_CHECKPOINT_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS checkpoints (
+        thread_id TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        checkpoint_id TEXT NOT NULL,
+        parent_checkpoint_id TEXT,
+        type TEXT,
+        checkpoint BLOB,
+        metadata_type TEXT,
+        metadata BLOB,
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS writes (
+        thread_id TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        checkpoint_id TEXT NOT NULL,
+        task_id TEXT NOT NULL,
+        idx INTEGER NOT NULL,
+        channel TEXT NOT NULL,
+        type TEXT,
+        value BLOB,
+        task_path TEXT NOT NULL DEFAULT '',
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+    )
+    """,
+    # One row per thread: last write, when its incident finished, and when
+    # it parked waiting for a human decision
+    """
+    CREATE TABLE IF NOT EXISTS checkpoint_threads (
+        thread_id TEXT PRIMARY KEY,
+        updated_at REAL NOT NULL,
+        finished_at REAL,
+        parked_at REAL
+    )
+    """,
+)
+
+_INSERT_CHECKPOINT_SQL = """
+    INSERT OR REPLACE INTO checkpoints
+    (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint,
+     metadata_type, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# A new checkpoint reopens a thread marked finished, e.g. a resumed incident
+_TOUCH_THREAD_SQL = """
+    INSERT INTO checkpoint_threads (thread_id, updated_at, finished_at, parked_at) VALUES (?, ?, NULL, NULL)
+    ON CONFLICT (thread_id) DO UPDATE SET updated_at = excluded.updated_at, finished_at = NULL, parked_at = NULL
+"""
+
+# Checkpoint ids sort by creation time, so everything older than the
+# keep_last-th newest id of the namespace goes; NULL (fewer kept) matches nothing.
+_KEPT_BOUNDARY = """
+    (SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?
+     ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?)
+"""
+_PRUNE_CHECKPOINTS_SQL = f"""
+    DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < {_KEPT_BOUNDARY}
+"""
+_PRUNE_WRITES_SQL = f"""
+    DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < {_KEPT_BOUNDARY}
+"""
+
+_UPSERT_WRITE_SQL = """
+    INSERT OR REPLACE INTO writes
+    (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_WRITE_SQL = _UPSERT_WRITE_SQL.replace("OR REPLACE", "OR IGNORE")
+
+_SELECT_WRITES_SQL = """
+    SELECT task_id, channel, type, value FROM writes
+    WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?
+    ORDER BY task_id, idx
+"""
+
+_EXPIRED_THREADS_SQL = """
+    SELECT thread_id FROM checkpoint_threads
+    WHERE finished_at < ? OR (parked_at IS NULL AND updated_at < ?)
+    LIMIT ?
+"""
+
+# Statement and parameter rows executed with executemany
+_Statement = Tuple[str, Sequence[Sequence[Any]]]
+
+
+class PruningSqliteSaver(BaseCheckpointSaver):
+    """
+    Async SQLite checkpointer with group commit and bounded retention.
+
+    Writes are queued and committed by a single task: every ``aput`` and
+    ``aput_writes`` issued while a commit is in flight joins the next
+    transaction, and each call returns once its transaction has committed.
+    Each new checkpoint trims its namespace to the ``keep_last`` newest
+    checkpoints and their pending writes; graphs using delta channels, which
+    rebuild state from ancestor checkpoints, need ``keep_last=None``.
+    ``compact`` drops threads marked finished more than
+    ``finished_grace_seconds`` ago and, if set, threads without a checkpoint
+    for ``abandoned_after_seconds`` that are not parked at an interrupt (see
+    ``mark_parked``), then returns freed pages to the file system and
+    truncates the WAL.
+
+    The synchronous interface is served from other threads by the event loop
+    the saver was set up on.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        keep_last: Optional[int] = 5,
+        finished_grace_seconds: float = 3600.0,
+        abandoned_after_seconds: Optional[float] = None,
+        max_batch_size: int = 256,
+        vacuum_pages: int = 1000,
+        serde: Any = None
+    ):
+        super().__init__(serde=serde)
+        self.db_path = Path(db_path)
+        self.keep_last = keep_last
+        self.finished_grace_seconds = finished_grace_seconds
+        self.abandoned_after_seconds = abandoned_after_seconds
+        self.max_batch_size = max(1, max_batch_size)
+        self.vacuum_pages = vacuum_pages
+
+        self.pool = SQLiteConnectionPool(self.db_path, reader_connections=2)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._setup_lock = asyncio.Lock()
+        self._is_setup = False
+        self._pending: List[Tuple[List[_Statement], asyncio.Future]] = []
+        self._committer: Optional[asyncio.Task] = None
+        self._compactor: Optional[asyncio.Task] = None
+
+        self.stats: Dict[str, int] = {
+            "checkpoints_written": 0,
+            "write_batches_written": 0,
+            "commits": 0,
+            "failed_commits": 0,
+            "threads_dropped": 0,
+        }
+
+    async def setup(self) -> None:
+        """Open the database and create the schema (idempotent)."""
+        async with self._setup_lock:
+            if self._is_setup:
+                return
+            self.loop = asyncio.get_running_loop()
+            await self.pool.open()
+            await self.pool.enable_incremental_vacuum(new_databases_only=True)
+            async with self.pool.writer() as db:
+                for statement in _CHECKPOINT_SCHEMA:
+                    await db.execute(statement)
+                cursor = await db.execute("PRAGMA table_info(checkpoint_threads)")
+                if "parked_at" not in {row[1] for row in await cursor.fetchall()}:
+                    await db.execute("ALTER TABLE checkpoint_threads ADD COLUMN parked_at REAL")
+            self._is_setup = True
+
+    async def close(self) -> None:
+        """Stop compaction, wait for queued writes and close the database."""
+        await self.stop_compaction()
+        if self._committer is not None:
+            await asyncio.gather(self._committer, return_exceptions=True)
+            self._committer = None
+        await self.pool.close()
+        self._is_setup = False
+
+    def start_compaction(self, interval_seconds: float = 300.0) -> None:
+        """Run compact periodically in the background (idempotent)."""
+        if self._compactor is None or self._compactor.done():
+            self._compactor = asyncio.create_task(
+                self._run_compaction(interval_seconds), name="checkpoint-compaction"
+            )
+
+    async def stop_compaction(self) -> None:
+        """Stop background compaction."""
+        if self._compactor is not None:
+            self._compactor.cancel()
+            await asyncio.gather(self._compactor, return_exceptions=True)
+            self._compactor = None
+
+    async def mark_finished(self, thread_id: str) -> None:
+        """
+        Record that a thread's workflow has finished.
+
+        Its checkpoints stay readable for the grace period and are dropped by
+        the first compaction after it; a new checkpoint reopens the thread.
+
+        Args:
+            thread_id: Workflow thread id
+        """
+        await self.setup()
+        await self._submit([(
+            "UPDATE checkpoint_threads SET finished_at = ? WHERE thread_id = ?",
+            [(time.time(), thread_id)]
+        )])
+
+    async def mark_parked(self, thread_id: str) -> None:
+        """
+        Record that a thread stopped at an interrupt to wait for a decision.
+
+        Parked threads are kept by compaction however long they wait; the
+        next checkpoint of the thread clears the mark.
+
+        Args:
+            thread_id: Workflow thread id
+        """
+        await self.setup()
+        await self._submit([(
+            "UPDATE checkpoint_threads SET parked_at = ? WHERE thread_id = ?",
+            [(time.time(), thread_id)]
+        )])
+
+    async def unfinished_threads(self) -> List[str]:
+        """Ids of threads not marked finished, such as runs stopped at an interrupt."""
+        await self.setup()
+        async with self.pool.reader() as db:
+            cursor = await db.execute(
+                "SELECT thread_id FROM checkpoint_threads WHERE finished_at IS NULL ORDER BY thread_id"
+            )
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def compact(self, batch_size: int = 500) -> int:
+        """
+        Drop finished and abandoned threads, then shrink the database file.
+
+        Args:
+            batch_size: Threads deleted per transaction
+
+        Returns:
+            Number of threads dropped
+        """
+        await self.setup()
+        now = time.time()
+        finished_before = now - self.finished_grace_seconds
+        updated_before = now - self.abandoned_after_seconds if self.abandoned_after_seconds else 0
+
+        dropped = 0
+        while True:
+            async with self.pool.reader() as db:
+                cursor = await db.execute(
+                    _EXPIRED_THREADS_SQL, (finished_before, updated_before, batch_size)
+                )
+                thread_ids = [row[0] for row in await cursor.fetchall()]
+            if not thread_ids:
+                break
+            await self._submit(_delete_threads_statements(thread_ids))
+            dropped += len(thread_ids)
+        self.stats["threads_dropped"] += dropped
+
+        # Free pages in bounded steps so checkpoint writes keep flowing
+        while await self._free_pages() > 0 and self.vacuum_pages > 0:
+            await self.pool.release_free_pages(self.vacuum_pages)
+        async with self.pool.writer() as db:
+            await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return dropped
+
+    async def get_usage(self) -> Dict[str, int]:
+        """Stored threads, checkpoints and writes, and the database size in bytes."""
+        await self.setup()
+        async with self.pool.reader() as db:
+            usage = {}
+            for table in ("checkpoint_threads", "checkpoints", "writes"):
+                cursor = await db.execute(f"SELECT COUNT(*) FROM {table}")
+                usage[table] = (await cursor.fetchone())[0]
+        wal_path = self.db_path.with_name(self.db_path.name + "-wal")
+        usage["database_bytes"] = self.db_path.stat().st_size
+        usage["wal_bytes"] = wal_path.stat().st_size if wal_path.exists() else 0
+        return usage
+
+    # === LangGraph checkpointer interface ===
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Checkpoint named in the config, or the thread's latest checkpoint."""
+        async for checkpoint_tuple in self.alist(config, limit=1):
+            return checkpoint_tuple
+        return None
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Checkpoints matching the config, metadata filter and ``before`` bound, newest first."""
+        await self.setup()
+        clauses, params = [], []
+        if config:
+            configurable = config["configurable"]
+            clauses.append("thread_id = ?")
+            params.append(configurable["thread_id"])
+            if configurable.get("checkpoint_ns") is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(configurable["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+
+        sql = "SELECT * FROM checkpoints"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY thread_id, checkpoint_ns, checkpoint_id DESC"
+        # Metadata is filtered after decoding, so the limit is applied here
+        if limit is not None and not filter:
+            sql += f" LIMIT {int(limit)}"
+
+        # Decoded before yielding so the reader is not held while the caller iterates
+        checkpoint_tuples = []
+        async with self.pool.reader() as db:
+            cursor = await db.execute(sql, params)
+            for row in await cursor.fetchall():
+                if limit is not None and len(checkpoint_tuples) >= limit:
+                    break
+                metadata = self.serde.loads_typed((row["metadata_type"], row["metadata"]))
+                if filter and not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+
+                cursor = await db.execute(
+                    _SELECT_WRITES_SQL,
+                    (row["thread_id"], row["checkpoint_ns"], row["checkpoint_id"])
+                )
+                writes = await cursor.fetchall()
+                checkpoint_tuples.append(self._checkpoint_tuple(row, metadata, writes))
+
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        """Store a checkpoint, trimming older checkpoints of its namespace."""
+        await self.setup()
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_type, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(metadata)
+
+        statements: List[_Statement] = [
+            (_INSERT_CHECKPOINT_SQL, [(
+                thread_id, checkpoint_ns, checkpoint["id"], configurable.get("checkpoint_id"),
+                checkpoint_type, serialized_checkpoint, metadata_type, serialized_metadata
+            )]),
+            (_TOUCH_THREAD_SQL, [(thread_id, time.time())]),
+        ]
+        if self.keep_last:
+            boundary = (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.keep_last - 1)
+            statements.append((_PRUNE_CHECKPOINTS_SQL, [boundary]))
+            statements.append((_PRUNE_WRITES_SQL, [boundary]))
+
+        await self._submit(statements)
+        self.stats["checkpoints_written"] += 1
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        """Store pending writes of a task against a checkpoint."""
+        await self.setup()
+        configurable = config["configurable"]
+        upserts, inserts = [], []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, serialized_value = self.serde.dumps_typed(value)
+            row = (
+                configurable["thread_id"], configurable.get("checkpoint_ns", ""),
+                configurable["checkpoint_id"], task_id, WRITES_IDX_MAP.get(channel, idx),
+                channel, value_type, serialized_value, task_path
+            )
+            # Special channels (errors, interrupts) replace earlier writes; others keep the first
+            (upserts if channel in WRITES_IDX_MAP else inserts).append(row)
+
+        await self._submit([(_UPSERT_WRITE_SQL, upserts), (_INSERT_WRITE_SQL, inserts)])
+        self.stats["write_batches_written"] += 1
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint and write of a thread."""
+        await self.setup()
+        await self._submit(_delete_threads_statements([thread_id]))
+
+    async def aprune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        """Keep only the latest checkpoint of each thread, or with ``strategy="delete"`` drop the threads."""
+        await self.setup()
+        if strategy == "delete":
+            await self._submit(_delete_threads_statements(list(thread_ids)))
+            return
+        if strategy != "keep_latest":
+            raise ValueError(f"Unknown prune strategy: {strategy}")
+
+        async with self.pool.reader() as db:
+            cursor = await db.execute(
+                f"SELECT DISTINCT thread_id, checkpoint_ns FROM checkpoints "
+                f"WHERE thread_id IN ({', '.join('?' for _ in thread_ids)})",
+                list(thread_ids)
+            )
+            namespaces = [(row[0], row[1], row[0], row[1], 0) for row in await cursor.fetchall()]
+        if namespaces:
+            await self._submit([(_PRUNE_CHECKPOINTS_SQL, namespaces), (_PRUNE_WRITES_SQL, namespaces)])
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self._run_sync(self.aget_tuple(config))
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[CheckpointTuple]:
+        async def collect() -> List[CheckpointTuple]:
+            return [item async for item in self.alist(config, filter=filter, before=before, limit=limit)]
+        return iter(self._run_sync(collect()))
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        return self._run_sync(self.aput(config, checkpoint, metadata, new_versions))
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        return self._run_sync(self.aput_writes(config, writes, task_id, task_path))
+
+    def delete_thread(self, thread_id: str) -> None:
+        return self._run_sync(self.adelete_thread(thread_id))
+
+    # === Internals ===
+
+    async def _submit(self, statements: List[_Statement]) -> None:
+        """Queue statements for the next group commit and wait until they are committed."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((statements, future))
+        if self._committer is None or self._committer.done():
+            self._committer = asyncio.create_task(self._commit_pending())
+        await future
+
+    async def _commit_pending(self) -> None:
+        """Commit queued statements, everything queued meanwhile joining the next transaction."""
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            try:
+                await self._execute([statements for statements, _ in batch])
+            except Exception:
+                self.stats["failed_commits"] += 1
+                # Retry one by one so a bad write fails only its own caller
+                for statements, future in batch:
+                    try:
+                        await self._execute([statements])
+                        future.set_result(None)
+                    except Exception as e:
+                        future.set_exception(e)
+            else:
+                for _, future in batch:
+                    future.set_result(None)
+
+    async def _execute(self, groups: List[List[_Statement]]) -> None:
+        async with self.pool.writer() as db:
+            for statements in groups:
+                for sql, rows in statements:
+                    if rows:
+                        await db.executemany(sql, rows)
+        self.stats["commits"] += 1
+
+    async def _free_pages(self) -> int:
+        async with self.pool.writer() as db:
+            cursor = await db.execute("PRAGMA freelist_count")
+            return (await cursor.fetchone())[0]
+
+    async def _run_compaction(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.compact()
+            except Exception as e:
+                print(f"Error compacting checkpoints: {e}")
+
+    def _checkpoint_tuple(self, row: Any, metadata: CheckpointMetadata, writes: List[Any]) -> CheckpointTuple:
+        thread_id, checkpoint_ns = row["thread_id"], row["checkpoint_ns"]
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": row["checkpoint_id"],
+            }},
+            checkpoint=self.serde.loads_typed((row["type"], row["checkpoint"])),
+            metadata=metadata,
+            parent_config=(
+                {"configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": row["parent_checkpoint_id"],
+                }}
+                if row["parent_checkpoint_id"] else None
+            ),
+            pending_writes=[
+                (write["task_id"], write["channel"], self.serde.loads_typed((write["type"], write["value"])))
+                for write in writes
+            ],
+        )
+
+    def _run_sync(self, coroutine: Any) -> Any:
+        """Run a coroutine on the saver's event loop from another thread."""
+        try:
+            on_loop_thread = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            on_loop_thread = False
+        if on_loop_thread or self.loop is None:
+            coroutine.close()
+            raise asyncio.InvalidStateError(
+                "Synchronous PruningSqliteSaver calls must come from a thread other than "
+                "the event loop it was set up on; use the async methods there"
+            )
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+
+def _delete_threads_statements(thread_ids: List[str]) -> List[_Statement]:
+    rows = [(thread_id,) for thread_id in thread_ids]
+    return [
+        (f"DELETE FROM {table} WHERE thread_id = ?", rows)
+        for table in ("checkpoints", "writes", "checkpoint_threads")
+    ]
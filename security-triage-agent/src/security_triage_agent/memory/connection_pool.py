@@ -0,0 +1,195 @@
+"""
+SQLite Connection Management for Security Incident Triage Agent.
+
+Provides a small pool of long-lived aiosqlite connections in WAL mode with
+a single dedicated writer and concurrent readers, so storage operations no
+longer pay for opening and tearing down a connection on every call.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Union
+
+import aiosqlite
+
+
+# Pragmas applied to every pooled connection. WAL lets readers proceed while
+# the writer commits; synchronous=NORMAL is durable across application
+# crashes in WAL mode and avoids an fsync per commit.
+DEFAULT_PRAGMAS: Dict[str, Union[str, int]] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -16000,       # ~16 MB page cache per connection
+    "mmap_size": 268435456,     # 256 MB memory-mapped I/O
+    "busy_timeout": 5000,       # milliseconds
+    "wal_autocheckpoint": 1000,  # pages
+}
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+class SQLiteConnectionPool:
+    """
+    Pool of persistent SQLite connections for a single database file.
+
+    All writes are funnelled through one writer connection guarded by a lock,
+    which matches SQLite's single-writer model and keeps transactions from
+    interleaving. Reads are served by a fixed set of reader connections that
+    run concurrently against the WAL snapshot. Each connection keeps its own
+    prepared-statement cache, so callers reusing constant SQL strings skip
+    re-parsing on every execution.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        reader_connections: int = 4,
+        statement_cache_size: int = 256,
+        pragmas: Optional[Dict[str, Union[str, int]]] = None
+    ):
+        self.db_path = Path(db_path)
+        self.reader_connections = max(1, reader_connections)
+        self.statement_cache_size = statement_cache_size
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue] = None
+        self._write_lock = asyncio.Lock()
+        self._open_lock = asyncio.Lock()
+        self._closed = False
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the pool currently holds open connections."""
+        return self._writer is not None
+
+    async def open(self) -> None:
+        """Open the writer and reader connections (idempotent)."""
+        async with self._open_lock:
+            if self._writer is not None:
+                return
+
+            self._closed = False
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # The writer is opened first so journal_mode=WAL is persisted in
+            # the database header before any reader attaches.
+            self._writer = await self._connect()
+
+            self._idle_readers = asyncio.Queue()
+            for _ in range(self.reader_connections):
+                reader = await self._connect()
+                self._readers.append(reader)
+                self._idle_readers.put_nowait(reader)
+
+    async def close(self) -> None:
+        """Checkpoint the WAL and close every pooled connection."""
+        async with self._open_lock:
+            if self._writer is None:
+                return
+
+            self._closed = True
+
+            # Wait for any in-flight write transaction to finish
+            async with self._write_lock:
+                try:
+                    await self._writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                except Exception as e:
+                    print(f"Error checkpointing WAL on close: {e}")
+
+                for connection in [self._writer, *self._readers]:
+                    try:
+                        await connection.close()
+                    except Exception as e:
+                        print(f"Error closing pooled connection: {e}")
+
+            self._writer = None
+            self._readers = []
+            self._idle_readers = None
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Acquire the writer connection for one transaction.
+
+        Commits when the block exits normally and rolls back on error.
+        """
+        await self._ensure_open()
+
+        async with self._write_lock:
+            try:
+                yield self._writer
+                await self._writer.commit()
+            except BaseException:
+                await self._writer.rollback()
+                raise
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Acquire a reader connection, waiting if all readers are busy."""
+        await self._ensure_open()
+
+        idle_readers = self._idle_readers
+        connection = await idle_readers.get()
+        try:
+            yield connection
+        finally:
+            idle_readers.put_nowait(connection)
+
+    async def enable_incremental_vacuum(self, new_databases_only: bool = False) -> bool:
+        """
+        Switch the database to incremental auto-vacuum so deletes can shrink the file.
+
+        The mode takes effect through a VACUUM, which is instant on a new
+        database but rewrites every page of an existing one and may renumber
+        implicit rowids.
+
+        Args:
+            new_databases_only: Leave databases that already hold tables unchanged
+
+        Returns:
+            Whether incremental auto-vacuum is enabled
+        """
+        async with self.writer() as db:
+            cursor = await db.execute("PRAGMA auto_vacuum")
+            if (await cursor.fetchone())[0] == AUTO_VACUUM_INCREMENTAL:
+                return True
+
+            if new_databases_only:
+                cursor = await db.execute("SELECT EXISTS (SELECT 1 FROM sqlite_master)")
+                if (await cursor.fetchone())[0]:
+                    return False
+
+            await db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            await db.execute("VACUUM")
+            return True
+
+    async def release_free_pages(self, pages: int) -> None:
+        """Return up to ``pages`` free pages to the file system (incremental auto-vacuum only)."""
+        if pages > 0:
+            async with self.writer() as db:
+                # executescript steps the pragma to completion; execute frees a single page
+                await db.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+
+    async def _ensure_open(self) -> None:
+        """Lazily open the pool on first use."""
+        if self._closed:
+            raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+        if self._writer is None:
+            await self.open()
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a single connection with the pool's pragmas applied."""
+        connection = await aiosqlite.connect(
+            self.db_path,
+            cached_statements=self.statement_cache_size
+        )
+        connection.row_factory = aiosqlite.Row
+
+        for name, value in self.pragmas.items():
+            await connection.execute(f"PRAGMA {name} = {value}")
+
+        return connection
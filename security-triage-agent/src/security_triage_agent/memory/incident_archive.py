@@ -0,0 +1,191 @@
+"""
+Incident Archive for Security Incident Triage Agent.
+
+Cold storage for records past retention. Before PersistentStorage deletes
+expired incidents it exports them, with their history, compliance events and
+performance metrics, to compressed JSON Lines files partitioned by the day
+each incident was created. Archived records stay available to compliance
+audits through a reader that only opens the partitions a query can match.
+"""
+
+import gzip
+import io
+import itertools
+import json
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+# Tables exported by retention, incidents first
+ARCHIVE_TABLES = ("incidents", "incident_history", "compliance_events", "performance_metrics")
+
+_SUFFIXES = {"zstd": ".jsonl.zst", "gzip": ".jsonl.gz"}
+
+
+class IncidentArchive:
+    """
+    Date-partitioned archive of expired incident records.
+
+    Each export batch writes one file per table and day, named
+    ``<root>/YYYY/MM/DD/<table>-<batch>.jsonl.zst``. Files are written under a
+    temporary name, synced and renamed, so a file either holds a whole batch
+    or does not exist. Zstandard is used when installed, gzip otherwise; the
+    reader handles both.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        compression: Optional[str] = None,
+        level: Optional[int] = None
+    ):
+        self.root = Path(root)
+        self.compression = compression or ("zstd" if ZSTD_AVAILABLE else "gzip")
+        if self.compression not in _SUFFIXES:
+            raise ValueError(f"Unknown archive compression: {self.compression}")
+        if self.compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ValueError("zstd archive compression requires the zstandard package")
+        self.level = level if level is not None else (10 if self.compression == "zstd" else 6)
+
+        self._sequence = itertools.count()
+
+    def write_batch(self, partitions: Dict[date, Dict[str, List[Dict[str, Any]]]]) -> List[Path]:
+        """
+        Durably write one export batch.
+
+        Args:
+            partitions: Rows per table, keyed by partition day
+
+        Returns:
+            Paths of the files written
+        """
+        batch = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{os.getpid()}-{next(self._sequence)}"
+        written = []
+        for day, tables in sorted(partitions.items()):
+            directory = self._partition_dir(day)
+            directory.mkdir(parents=True, exist_ok=True)
+            for table, rows in tables.items():
+                if not rows:
+                    continue
+                path = directory / f"{table}-{batch}{_SUFFIXES[self.compression]}"
+                self._write_file(path, rows)
+                written.append(path)
+        return written
+
+    def partitions(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> List[Tuple[date, Path]]:
+        """
+        Archived days within an inclusive range, oldest first.
+
+        Args:
+            start: First day to include
+            end: Last day to include
+
+        Returns:
+            (day, directory) pairs
+        """
+        found = []
+        for directory in self.root.glob("[0-9][0-9][0-9][0-9]/[0-9][0-9]/[0-9][0-9]"):
+            try:
+                day = date(int(directory.parent.parent.name), int(directory.parent.name), int(directory.name))
+            except ValueError:
+                continue
+            if (start is None or day >= start) and (end is None or day <= end):
+                found.append((day, directory))
+        return sorted(found)
+
+    def read(
+        self,
+        table: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream archived rows of one table.
+
+        Rows of an incident's history, compliance events and metrics are
+        partitioned by the incident's creation day, so the date range selects
+        incidents rather than event timestamps.
+
+        Args:
+            table: One of ARCHIVE_TABLES
+            start: First partition day to read
+            end: Last partition day to read
+            where: Column values a row must equal
+
+        Returns:
+            Iterator over matching rows
+        """
+        if table not in ARCHIVE_TABLES:
+            raise ValueError(f"Unknown archived table: {table}")
+
+        for _, directory in self.partitions(start, end):
+            for path in sorted(directory.glob(f"{table}-*.jsonl.*")):
+                if not path.name.endswith(tuple(_SUFFIXES.values())):
+                    continue
+                for row in self._read_file(path):
+                    if where and any(row.get(column) != value for column, value in where.items()):
+                        continue
+                    yield row
+
+    def get_incident(
+        self,
+        incident_id: str,
+        created_on: Optional[date] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Everything archived for one incident, as needed for an audit.
+
+        Args:
+            incident_id: Incident identifier
+            created_on: Day the incident was created; every partition is read if unknown
+
+        Returns:
+            Rows per table, empty lists if the incident was never archived
+        """
+        return {
+            table: list(self.read(table, created_on, created_on, {"incident_id": incident_id}))
+            for table in ARCHIVE_TABLES
+        }
+
+    def _partition_dir(self, day: date) -> Path:
+        return self.root / f"{day.year:04d}" / f"{day.month:02d}" / f"{day.day:02d}"
+
+    def _write_file(self, path: Path, rows: List[Dict[str, Any]]) -> None:
+        payload = "".join(json.dumps(row, default=str) + "\n" for row in rows).encode("utf-8")
+        if self.compression == "zstd":
+            data = zstandard.ZstdCompressor(level=self.level).compress(payload)
+        else:
+            data = gzip.compress(payload, compresslevel=self.level)
+
+        temporary = path.with_name(path.name + ".tmp")
+        with open(temporary, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, path)
+
+    def _read_file(self, path: Path) -> Iterator[Dict[str, Any]]:
+        if path.name.endswith(_SUFFIXES["zstd"]):
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError(f"Reading {path} requires the zstandard package")
+            with open(path, "rb") as handle:
+                reader = zstandard.ZstdDecompressor().stream_reader(handle)
+                for line in io.TextIOWrapper(reader, encoding="utf-8"):
+                    yield json.loads(line)
+        else:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                for line in handle:
+                    yield json.loads(line)
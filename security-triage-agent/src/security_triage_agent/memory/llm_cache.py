@@ -0,0 +1,332 @@
+"""
+LLM Response Cache for Security Incident Triage Agent.
+
+Persists LLM responses in SQLite keyed on a hash of the rendered prompt, model
+and temperature, so repeated alarms for the same incident are answered without
+another API call.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from langchain_core.messages import AIMessage
+
+from .connection_pool import SQLiteConnectionPool
+from .ttl_store import TTLStore
+
+
+_SELECT_ENTRY_SQL = """
+    SELECT response, expires_at FROM llm_cache
+    WHERE cache_key = ? AND expires_at > ?
+"""
+
+_TOUCH_ENTRY_SQL = "UPDATE llm_cache SET last_accessed = ?, hit_count = hit_count + 1 WHERE cache_key = ?"
+
+_UPSERT_ENTRY_SQL = """
+    INSERT OR REPLACE INTO llm_cache
+    (cache_key, model, response, created_at, expires_at, last_accessed, hit_count)
+    VALUES (?, ?, ?, ?, ?, ?, 0)
+"""
+
+
+class LLMResponseCache:
+    """
+    Content-addressed, SQLite-backed cache of LLM responses.
+
+    Lookups go to a small in-process TTLStore first, so hot entries are served
+    without leaving the event loop, then to SQLite. Entries expire after
+    ``ttl_seconds``; once the table exceeds ``max_entries`` the least recently
+    used rows are evicted. Concurrent requests for the same key are coalesced
+    so the underlying LLM is called only once.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        ttl_seconds: float = 24 * 3600,
+        max_entries: int = 50000,
+        memory_entries: int = 1000,
+        prune_every: int = 100
+    ):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.prune_every = max(1, prune_every)
+
+        self.pool = SQLiteConnectionPool(self.db_path, reader_connections=2)
+        self._memory = TTLStore(max_entries=memory_entries, default_ttl_seconds=ttl_seconds)
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self._puts_since_prune = 0
+
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "stores": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+
+    async def initialize(self) -> None:
+        """Open the database and create the cache table."""
+        async with self.pool.writer() as db:
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(last_accessed)")
+
+    async def close(self) -> None:
+        """Close pooled database connections."""
+        await self.pool.close()
+
+    @staticmethod
+    def make_key(prompt: Any, model: str, temperature: float) -> str:
+        """
+        Build the cache key for a rendered prompt.
+
+        Args:
+            prompt: Prompt string or list of chat messages
+            model: Model name
+            temperature: Sampling temperature
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        if isinstance(prompt, str):
+            rendered: Any = prompt
+        else:
+            rendered = [
+                [getattr(message, "type", type(message).__name__),
+                 getattr(message, "content", str(message))]
+                for message in prompt
+            ]
+
+        payload = json.dumps(
+            {"model": model, "temperature": temperature, "prompt": rendered},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response text or None
+        """
+        cached = self._memory.get(key)
+        if cached is not None:
+            self.stats["memory_hits"] += 1
+            return cached
+
+        now = time.time()
+        try:
+            async with self.pool.reader() as db:
+                cursor = await db.execute(_SELECT_ENTRY_SQL, (key, now))
+                row = await cursor.fetchone()
+
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            async with self.pool.writer() as db:
+                await db.execute(_TOUCH_ENTRY_SQL, (now, key))
+
+        except Exception as e:
+            print(f"Error reading LLM cache: {e}")
+            self.stats["errors"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        self._memory.set(key, row["response"], ttl_seconds=row["expires_at"] - now)
+        self.stats["disk_hits"] += 1
+        return row["response"]
+
+    async def put(self, key: str, model: str, response: str) -> bool:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key from make_key
+            model: Model name, kept for inspection
+            response: Response text
+
+        Returns:
+            Success status
+        """
+        now = time.time()
+        self._memory.set(key, response)
+
+        try:
+            async with self.pool.writer() as db:
+                await db.execute(
+                    _UPSERT_ENTRY_SQL,
+                    (key, model, response, now, now + self.ttl_seconds, now)
+                )
+        except Exception as e:
+            print(f"Error writing LLM cache: {e}")
+            self.stats["errors"] += 1
+            return False
+
+        self.stats["stores"] += 1
+        self._puts_since_prune += 1
+        if self._puts_since_prune >= self.prune_every:
+            await self.prune()
+        return True
+
+    async def get_or_compute(self, key: str, model: str, compute) -> str:
+        """
+        Return the cached response, or compute and cache it once.
+
+        Concurrent callers with the same key share a single in-flight
+        computation, which keeps running while any of them still waits; a
+        cancelled caller only stops waiting. Failures are propagated to every
+        waiter and not cached.
+
+        Args:
+            key: Cache key from make_key
+            model: Model name
+            compute: Coroutine function producing the response text
+
+        Returns:
+            Response text
+        """
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            cached = await self.get(key)
+            if cached is not None:
+                return cached
+            # Another caller may have started computing while we read the cache
+            in_flight = self._in_flight.get(key)
+
+        if in_flight is not None:
+            self.stats["coalesced"] += 1
+        else:
+            in_flight = asyncio.ensure_future(self._compute_and_store(key, model, compute))
+            self._in_flight[key] = in_flight
+
+        self._waiters[in_flight] = self._waiters.get(in_flight, 0) + 1
+        try:
+            return await asyncio.shield(in_flight)
+        finally:
+            self._waiters[in_flight] -= 1
+            if not self._waiters[in_flight]:
+                del self._waiters[in_flight]
+                if not in_flight.done():
+                    # Every caller was cancelled, so nobody needs the response
+                    in_flight.cancel()
+                    if self._in_flight.get(key) is in_flight:
+                        del self._in_flight[key]
+
+    async def _compute_and_store(self, key: str, model: str, compute) -> str:
+        """Run one shared computation for get_or_compute and cache its result."""
+        try:
+            response = await compute()
+            await self.put(key, model, response)
+            return response
+        finally:
+            if self._in_flight.get(key) is asyncio.current_task():
+                del self._in_flight[key]
+
+    async def prune(self) -> int:
+        """
+        Delete expired entries and evict least recently used rows over capacity.
+
+        Returns:
+            Number of rows removed
+        """
+        self._puts_since_prune = 0
+        try:
+            async with self.pool.writer() as db:
+                cursor = await db.execute(
+                    "DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),)
+                )
+                removed = cursor.rowcount
+
+                cursor = await db.execute("SELECT COUNT(*) FROM llm_cache")
+                excess = (await cursor.fetchone())[0] - self.max_entries
+                if excess > 0:
+                    cursor = await db.execute("""
+                        DELETE FROM llm_cache WHERE cache_key IN (
+                            SELECT cache_key FROM llm_cache
+                            ORDER BY last_accessed ASC LIMIT ?
+                        )
+                    """, (excess,))
+                    removed += cursor.rowcount
+
+        except Exception as e:
+            print(f"Error pruning LLM cache: {e}")
+            self.stats["errors"] += 1
+            return 0
+
+        self.stats["evictions"] += removed
+        return removed
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit rate for monitoring."""
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "in_flight": len(self._in_flight),
+            **self.stats,
+        }
+
+
+class CachedLLM:
+    """
+    Wraps a chat model so ``ainvoke`` is served from an LLMResponseCache.
+
+    Only the response text is cached; hits are returned as an AIMessage,
+    which is all the triage tools read. Every other attribute is delegated
+    to the wrapped model.
+    """
+
+    def __init__(
+        self,
+        llm: Any,
+        cache: LLMResponseCache,
+        model_name: str,
+        temperature: float
+    ):
+        self.llm = llm
+        self.cache = cache
+        self.model_name = model_name
+        self.temperature = temperature
+
+    async def ainvoke(self, prompt: Any, *args, **kwargs) -> AIMessage:
+        """Invoke the wrapped model through the cache."""
+        if args or kwargs:
+            # Per-call options (stop sequences, callbacks, ...) bypass the cache
+            return await self.llm.ainvoke(prompt, *args, **kwargs)
+
+        key = self.cache.make_key(prompt, self.model_name, self.temperature)
+
+        async def compute() -> str:
+            response = await self.llm.ainvoke(prompt)
+            return response.content if hasattr(response, "content") else str(response)
+
+        content = await self.cache.get_or_compute(key, self.model_name, compute)
+        return AIMessage(content=content)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.llm, name)
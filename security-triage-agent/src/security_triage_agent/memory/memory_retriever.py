@@ -9,14 +9,16 @@ import json
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any, Tuple
 from pydantic import BaseModel, Field
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
 from .persistent_storage import PersistentStorage, IncidentRecord
 from ..core.state import IncidentCategory, IncidentPriority
 
 
+# Incident columns read by pattern detection; metadata_json only for location patterns
+_PATTERN_COLUMNS = ("incident_id", "created_at", "human_interventions", "risk_score")
+
+
 class SimilarIncident(BaseModel):
     """Similar incident with relevance score."""
     incident_record: IncidentRecord
@@ -57,22 +59,17 @@ class MemoryRetriever:
         self,
         storage: PersistentStorage,
         similarity_threshold: float = 0.7,
-        max_similar_incidents: int = 5
+        max_similar_incidents: int = 5,
+        prefilter_candidates: int = 0
     ):
         self.storage = storage
         self.similarity_threshold = similarity_threshold
         self.max_similar_incidents = max_similar_incidents
         
-        # Text vectorizer for similarity analysis
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
-        
-        # Cache for vectorized incidents
-        self._incident_vectors = {}
-        self._last_vectorization = None
+        # Best full-text matches scored for similarity; 0 scores every incident.
+        # Prefiltering bounds the work per lookup but may miss the most similar
+        # incidents when they share only common words with the query.
+        self.prefilter_candidates = prefilter_candidates
     
     async def get_historical_context(
         self,
@@ -152,52 +149,57 @@ class MemoryRetriever:
         if limit is None:
             limit = self.max_similar_incidents
         
-        # Get recent incidents for comparison
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=365)  # Last year
-        
-        filters = {"created_after": start_date}
-        if category:
-            filters["category"] = category.value
+        # Only consider incidents from the last year
+        start_date = datetime.utcnow() - timedelta(days=365)
+        text = f"{title} {description}"
+        
+        # Cheap BM25 prefilter so only the best full-text matches are scored;
+        # None when the text is too unspecific and every incident is scored
+        candidates = None
+        if self.prefilter_candidates:
+            filters = {"created_after": start_date}
+            if category:
+                filters["category"] = category.value
+            candidates = await self.storage.similarity_candidates(
+                text, limit=self.prefilter_candidates, filters=filters
+            )
         
-        incidents = await self.storage.search_incidents(
-            filters=filters,
-            limit=1000  # Large limit for comprehensive search
+        # Query the persistent similarity index maintained by storage
+        matches = self.storage.similarity_index.query(
+            text,
+            top_k=limit,
+            category=category.value if category else None,
+            created_after=start_date,
+            min_score=self.similarity_threshold,
+            candidates=candidates
         )
         
-        if not incidents:
+        if not matches:
             return []
         
-        # Vectorize incidents if needed
-        await self._update_incident_vectors(incidents)
-        
-        # Vectorize the query
-        query_text = f"{title} {description}"
-        query_vector = self.vectorizer.transform([query_text])
+        incidents = await self.storage.get_incidents(
+            [incident_id for incident_id, _ in matches]
+        )
         
-        # Calculate similarities
         similar_incidents = []
         
-        for incident in incidents:
-            if incident.incident_id in self._incident_vectors:
-                incident_vector = self._incident_vectors[incident.incident_id]
-                similarity = cosine_similarity(query_vector, incident_vector)[0][0]
-                
-                if similarity >= self.similarity_threshold:
-                    # Determine similarity factors
-                    factors = self._analyze_similarity_factors(
-                        title, description, incident
-                    )
-                    
-                    similar_incidents.append(SimilarIncident(
-                        incident_record=incident,
-                        similarity_score=similarity,
-                        similarity_factors=factors
-                    ))
-        
-        # Sort by similarity and return top results
-        similar_incidents.sort(key=lambda x: x.similarity_score, reverse=True)
-        return similar_incidents[:limit]
+        for incident_id, similarity in matches:
+            incident = incidents.get(incident_id)
+            if incident is None:
+                continue
+            
+            # Determine similarity factors
+            factors = self._analyze_similarity_factors(
+                title, description, incident
+            )
+            
+            similar_incidents.append(SimilarIncident(
+                incident_record=incident,
+                similarity_score=min(1.0, similarity),
+                similarity_factors=factors
+            ))
+        
+        return similar_incidents
     
     async def identify_patterns(
         self,
@@ -227,7 +229,13 @@ class MemoryRetriever:
         if category:
             filters["category"] = category.value
         
-        incidents = await self.storage.search_incidents(filters=filters, limit=500)
+        columns = _PATTERN_COLUMNS
+        if metadata and metadata.get("location"):
+            columns += ("metadata_json",)
+        
+        incidents, _ = await self.storage.query_incidents(
+            filters=filters, columns=columns, limit=500
+        )
         
         if len(incidents) < 5:  # Need minimum incidents for pattern detection
             return patterns
@@ -274,47 +282,50 @@ class MemoryRetriever:
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=180)
         
-        incidents = await self.storage.search_incidents(
+        # Aggregate while streaming; no incident is kept in memory
+        total_incidents = 0
+        resolved_incidents = 0
+        intervened_incidents = 0
+        processing_times = []
+        risk_scores = []
+        priority_dist = {}
+        
+        async for incident in self.storage.stream_incidents(
             filters={
                 "category": category.value,
                 "created_after": start_date
             },
+            columns=("status", "priority", "processing_time_seconds", "risk_score",
+                     "human_interventions"),
             limit=1000
-        )
-        
-        if not incidents:
-            return {}
-        
-        # Calculate statistics
-        total_incidents = len(incidents)
-        resolved_incidents = len([i for i in incidents if i.status == "resolved"])
-        avg_processing_time = np.mean([
-            i.processing_time_seconds for i in incidents 
-            if i.processing_time_seconds is not None
-        ])
-        avg_risk_score = np.mean([
-            i.risk_score for i in incidents 
-            if i.risk_score is not None
-        ])
-        
-        # Priority distribution
-        priority_dist = {}
-        for incident in incidents:
+        ):
+            total_incidents += 1
+            if incident.status == "resolved":
+                resolved_incidents += 1
+            if incident.human_interventions > 0:
+                intervened_incidents += 1
+            if incident.processing_time_seconds is not None:
+                processing_times.append(incident.processing_time_seconds)
+            if incident.risk_score is not None:
+                risk_scores.append(incident.risk_score)
+            
+            # Priority distribution
             priority = incident.priority or "unknown"
             priority_dist[priority] = priority_dist.get(priority, 0) + 1
         
-        # Human intervention rate
-        intervention_rate = len([
-            i for i in incidents if i.human_interventions > 0
-        ]) / total_incidents if total_incidents > 0 else 0
+        if not total_incidents:
+            return {}
+        
+        avg_processing_time = np.mean(processing_times) if processing_times else 0
+        avg_risk_score = np.mean(risk_scores) if risk_scores else 0
         
         return {
             "total_incidents": total_incidents,
-            "resolution_rate": resolved_incidents / total_incidents if total_incidents > 0 else 0,
-            "avg_processing_time_hours": avg_processing_time / 3600 if avg_processing_time else 0,
-            "avg_risk_score": float(avg_risk_score) if not np.isnan(avg_risk_score) else 0,
+            "resolution_rate": resolved_incidents / total_incidents,
+            "avg_processing_time_hours": avg_processing_time / 3600,
+            "avg_risk_score": float(avg_risk_score),
             "priority_distribution": priority_dist,
-            "human_intervention_rate": intervention_rate,
+            "human_intervention_rate": intervened_incidents / total_incidents,
             "period_start": start_date.isoformat(),
             "period_end": end_date.isoformat()
         }
@@ -339,13 +350,15 @@ class MemoryRetriever:
         if category:
             filters["category"] = category.value
         
-        incidents = await self.storage.search_incidents(filters=filters, limit=1000)
-        
         # Group by day
         daily_counts = {}
-        for incident in incidents:
+        total_incidents = 0
+        async for incident in self.storage.stream_incidents(
+            filters=filters, columns=("created_at",), limit=1000
+        ):
             day = incident.created_at.date().isoformat()
             daily_counts[day] = daily_counts.get(day, 0) + 1
+            total_incidents += 1
         
         # Calculate trend
         days = sorted(daily_counts.keys())
@@ -360,7 +373,7 @@ class MemoryRetriever:
         return {
             "daily_counts": daily_counts,
             "trend": trend,
-            "total_incidents": len(incidents),
+            "total_incidents": total_incidents,
             "period_days": (end_date.date() - start_date.date()).days
         }
     
@@ -496,34 +509,6 @@ class MemoryRetriever:
         
         return recommendations
     
-    async def _update_incident_vectors(self, incidents: List[IncidentRecord]):
-        """Update incident text vectors for similarity analysis."""
-        
-        # Check if we need to update vectors
-        if (self._last_vectorization and 
-            datetime.utcnow() - self._last_vectorization < timedelta(hours=1)):
-            return
-        
-        # Prepare text documents
-        documents = []
-        incident_ids = []
-        
-        for incident in incidents:
-            text = f"{incident.title} {incident.description}"
-            documents.append(text)
-            incident_ids.append(incident.incident_id)
-        
-        if documents:
-            # Fit vectorizer and transform documents
-            vectors = self.vectorizer.fit_transform(documents)
-            
-            # Store vectors
-            self._incident_vectors = {}
-            for i, incident_id in enumerate(incident_ids):
-                self._incident_vectors[incident_id] = vectors[i]
-            
-            self._last_vectorization = datetime.utcnow()
-    
     def _analyze_similarity_factors(
         self, title: str, description: str, incident: IncidentRecord
     ) -> List[str]:
@@ -556,7 +541,7 @@ class MemoryRetriever:
         
         return factors
     
-    def _analyze_temporal_patterns(self, incidents: List[IncidentRecord]) -> Optional[IncidentPattern]:
+    def _analyze_temporal_patterns(self, incidents: List[Tuple]) -> Optional[IncidentPattern]:
         """Analyze temporal patterns in incidents."""
         
         if len(incidents) < 10:
@@ -587,7 +572,7 @@ class MemoryRetriever:
         
         return None
     
-    def _analyze_escalation_patterns(self, incidents: List[IncidentRecord]) -> Optional[IncidentPattern]:
+    def _analyze_escalation_patterns(self, incidents: List[Tuple]) -> Optional[IncidentPattern]:
         """Analyze escalation patterns."""
         
         escalated_incidents = [i for i in incidents if i.human_interventions > 0]
@@ -607,7 +592,7 @@ class MemoryRetriever:
         return None
     
     def _analyze_category_patterns(
-        self, incidents: List[IncidentRecord], category: IncidentCategory
+        self, incidents: List[Tuple], category: IncidentCategory
     ) -> List[IncidentPattern]:
         """Analyze category-specific patterns."""
         
@@ -631,7 +616,7 @@ class MemoryRetriever:
         return patterns
     
     async def _analyze_location_patterns(
-        self, incidents: List[IncidentRecord], location: str
+        self, incidents: List[Tuple], location: str
     ) -> Optional[IncidentPattern]:
         """Analyze location-based patterns."""
         
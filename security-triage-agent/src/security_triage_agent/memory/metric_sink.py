@@ -0,0 +1,254 @@
+"""
+Write-Behind Metric Sink for Security Incident Triage Agent.
+
+Buffers performance metrics and compliance events in memory and flushes them
+to persistent storage in batched transactions, keeping telemetry writes off
+the workflow's critical path.
+"""
+
+import asyncio
+import json
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .persistent_storage import PersistentStorage
+
+
+class WriteBehindMetricSink:
+    """
+    Asynchronous write-behind buffer in front of PersistentStorage.
+
+    Exposes the same ``record_performance_metric`` / ``record_compliance_event``
+    interface as PersistentStorage, so it can be handed to MetricsTracker in its
+    place. Events are flushed with ``executemany`` in a single transaction when
+    the buffer reaches ``max_batch_size`` or every ``flush_interval_seconds``.
+    Producers block once ``max_buffered_events`` are pending, which bounds
+    memory if the database falls behind; if no space frees up within
+    ``max_wait_seconds`` (e.g. the database is down) the event is dropped,
+    counted in ``stats["events_dropped"]`` and the record call returns False.
+    """
+
+    def __init__(
+        self,
+        storage: PersistentStorage,
+        max_batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        max_buffered_events: int = 10000,
+        max_wait_seconds: float = 5.0
+    ):
+        self.storage = storage
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffered_events = max(self.max_batch_size, max_buffered_events)
+        self.max_wait_seconds = max_wait_seconds
+
+        self._metrics: Deque[Tuple] = deque()
+        self._compliance_events: Deque[Tuple] = deque()
+
+        self._flush_requested = asyncio.Event()
+        self._space_available = asyncio.Condition()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self.stats: Dict[str, int] = {
+            "events_enqueued": 0,
+            "events_flushed": 0,
+            "batches_flushed": 0,
+            "failed_flushes": 0,
+            "backpressure_waits": 0,
+            "events_dropped": 0,
+        }
+
+    @property
+    def buffered_events(self) -> int:
+        """Number of events waiting to be written."""
+        return len(self._metrics) + len(self._compliance_events)
+
+    async def start(self) -> None:
+        """Start the background flusher task."""
+        if self._flusher is None or self._flusher.done():
+            self._closing = False
+            self._flusher = asyncio.create_task(self._run_flusher())
+
+    async def close(self) -> None:
+        """Stop the flusher and write out everything still buffered."""
+        self._closing = True
+        self._flush_requested.set()
+
+        if self._flusher is not None:
+            await self._flusher
+            self._flusher = None
+
+        await self.flush()
+
+        if self.buffered_events:
+            print(f"Metric sink closed with {self.buffered_events} unwritten events")
+
+    async def record_performance_metric(
+        self,
+        incident_id: str,
+        metric_name: str,
+        metric_value: float,
+        metric_context: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Queue a performance metric for the next flush.
+
+        Args:
+            incident_id: Incident identifier
+            metric_name: Name of the metric
+            metric_value: Metric value
+            metric_context: Additional context
+
+        Returns:
+            False if the buffer stayed full and the metric was dropped
+        """
+        if not await self._wait_for_space():
+            self.stats["events_dropped"] += 1
+            return False
+        self._metrics.append((
+            incident_id, metric_name, metric_value, datetime.utcnow(),
+            json.dumps(metric_context or {}, default=str)
+        ))
+        self._on_enqueued()
+        return True
+
+    async def record_compliance_event(
+        self,
+        incident_id: str,
+        framework: str,
+        event_type: str,
+        event_data: Dict[str, Any],
+        compliance_status: str = "pending"
+    ) -> bool:
+        """
+        Queue a compliance event for the next flush.
+
+        Args:
+            incident_id: Incident identifier
+            framework: Compliance framework (DPDP, PCI_DSS, etc.)
+            event_type: Type of compliance event
+            event_data: Event details
+            compliance_status: Compliance status
+
+        Returns:
+            False if the buffer stayed full and the event was dropped
+        """
+        if not await self._wait_for_space():
+            self.stats["events_dropped"] += 1
+            return False
+        self._compliance_events.append((
+            incident_id, framework, event_type, datetime.utcnow(),
+            json.dumps(event_data, default=str), compliance_status
+        ))
+        self._on_enqueued()
+        return True
+
+    async def flush(self) -> int:
+        """
+        Write all buffered events to storage.
+
+        Returns:
+            Number of events written
+        """
+        flushed = 0
+
+        async with self._flush_lock:
+            while self._metrics or self._compliance_events:
+                metrics = self._take_batch(self._metrics)
+                compliance_events = self._take_batch(self._compliance_events)
+
+                success = await self.storage.record_telemetry_batch(
+                    metrics, compliance_events
+                )
+
+                if not success:
+                    # Put the batch back at the front so ordering is preserved
+                    self._metrics.extendleft(reversed(metrics))
+                    self._compliance_events.extendleft(reversed(compliance_events))
+                    self.stats["failed_flushes"] += 1
+                    break
+
+                written = len(metrics) + len(compliance_events)
+                flushed += written
+                self.stats["batches_flushed"] += 1
+
+                async with self._space_available:
+                    self._space_available.notify(written)
+
+        self.stats["events_flushed"] += flushed
+        return flushed
+
+    async def _run_flusher(self) -> None:
+        """Flush on size or time until the sink is closed."""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+
+            self._flush_requested.clear()
+            failures_before = self.stats["failed_flushes"]
+
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Error flushing metric sink: {e}")
+                self.stats["failed_flushes"] += 1
+
+            if self.stats["failed_flushes"] > failures_before and not self._closing:
+                # Back off instead of retrying a failing database in a tight loop
+                await asyncio.sleep(self.flush_interval_seconds)
+
+    async def _wait_for_space(self) -> bool:
+        """
+        Apply backpressure while the buffer is full.
+
+        Returns:
+            False if the buffer was still full after max_wait_seconds
+        """
+        if self.buffered_events < self.max_buffered_events:
+            return True
+
+        self.stats["backpressure_waits"] += 1
+        self._flush_requested.set()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait_seconds
+
+        if self._flusher is None or self._flusher.done():
+            # No background flusher running; write inline
+            while self.buffered_events >= self.max_buffered_events:
+                if await self.flush():
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                await asyncio.sleep(min(self.flush_interval_seconds, remaining))
+            return True
+
+        async with self._space_available:
+            try:
+                await asyncio.wait_for(
+                    self._space_available.wait_for(
+                        lambda: self.buffered_events < self.max_buffered_events
+                    ),
+                    timeout=max(0.0, deadline - loop.time())
+                )
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def _on_enqueued(self) -> None:
+        """Update counters and trigger a size-based flush."""
+        self.stats["events_enqueued"] += 1
+        if self.buffered_events >= self.max_batch_size:
+            self._flush_requested.set()
+
+    def _take_batch(self, buffer: Deque[Tuple]) -> List[Tuple]:
+        """Pop up to max_batch_size rows from the front of a buffer."""
+        count = min(len(buffer), self.max_batch_size)
+        return [buffer.popleft() for _ in range(count)]
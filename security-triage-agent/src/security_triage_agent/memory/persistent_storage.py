@@ -5,16 +5,342 @@ Provides SQLite-based persistent storage for incident records, analytics,
 and long-term data retention with proper indexing and querying capabilities.
 """
 
+import re
 import sqlite3
 import json
 import asyncio
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any, Tuple
+import argparse
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator, Sequence
 from pathlib import Path
 from pydantic import BaseModel, Field
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 import aiosqlite
 
 from ..core.state import IncidentState, IncidentCategory, IncidentPriority
+from .connection_pool import SQLiteConnectionPool
+from .incident_archive import IncidentArchive
+from .similarity_index import IncidentSimilarityIndex
+
+
+# Hot-path statements kept as module constants so every call hands SQLite the
+# same SQL text and hits the per-connection prepared-statement cache.
+_SELECT_INCIDENT_ROLLUP_SQL = """
+    SELECT category, priority, status, created_at, resolved_at, processing_time_seconds,
+           risk_score, quality_scores_json, requires_followup
+    FROM incidents WHERE incident_id = ?
+"""
+
+_SELECT_INCIDENT_SQL = "SELECT * FROM incidents WHERE incident_id = ?"
+
+_INSERT_COMPLIANCE_EVENT_SQL = """
+    INSERT INTO compliance_events
+    (incident_id, framework, event_type, event_timestamp,
+     event_data, compliance_status)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_PERFORMANCE_METRIC_SQL = """
+    INSERT INTO performance_metrics
+    (incident_id, metric_name, metric_value, metric_timestamp, metric_context)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Rollup upserts add signed deltas to running sums and counts; SQLite evaluates
+# every SET expression against the old row, so the averages use the new totals.
+_UPSERT_ANALYTICS_SQL = """
+    INSERT INTO incident_analytics
+    (date_bucket, bucket_type, category, priority,
+     total_incidents, resolved_incidents, escalated_incidents,
+     processing_time_sum, processing_time_count, risk_score_sum, risk_score_count,
+     quality_score_sum, quality_score_count,
+     avg_processing_time, avg_risk_score, avg_quality_score, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (date_bucket, bucket_type, category, priority) DO UPDATE SET
+        total_incidents = total_incidents + excluded.total_incidents,
+        resolved_incidents = resolved_incidents + excluded.resolved_incidents,
+        escalated_incidents = escalated_incidents + excluded.escalated_incidents,
+        processing_time_sum = processing_time_sum + excluded.processing_time_sum,
+        processing_time_count = processing_time_count + excluded.processing_time_count,
+        risk_score_sum = risk_score_sum + excluded.risk_score_sum,
+        risk_score_count = risk_score_count + excluded.risk_score_count,
+        quality_score_sum = quality_score_sum + excluded.quality_score_sum,
+        quality_score_count = quality_score_count + excluded.quality_score_count,
+        avg_processing_time = CASE WHEN processing_time_count + excluded.processing_time_count > 0
+            THEN (processing_time_sum + excluded.processing_time_sum)
+                 / (processing_time_count + excluded.processing_time_count) END,
+        avg_risk_score = CASE WHEN risk_score_count + excluded.risk_score_count > 0
+            THEN (risk_score_sum + excluded.risk_score_sum)
+                 / (risk_score_count + excluded.risk_score_count) END,
+        avg_quality_score = CASE WHEN quality_score_count + excluded.quality_score_count > 0
+            THEN (quality_score_sum + excluded.quality_score_sum)
+                 / (quality_score_count + excluded.quality_score_count) END,
+        updated_at = excluded.updated_at
+"""
+
+ANALYTICS_BUCKET_TYPES = ("daily", "weekly", "monthly")
+
+# Running totals kept per rollup row, in the order of _UPSERT_ANALYTICS_SQL
+_ANALYTICS_TOTALS = (
+    "total_incidents", "resolved_incidents", "escalated_incidents",
+    "processing_time_sum", "processing_time_count", "risk_score_sum", "risk_score_count",
+    "quality_score_sum", "quality_score_count",
+)
+
+_RESOLVED_STATUSES = ("resolved", "closed")
+_INCIDENT_STATUSES = ("active",) + _RESOLVED_STATUSES
+
+# Closed incidents past retention, oldest first. Keyset pagination on
+# (created_at, incident_id) moves past incidents that could not be removed;
+# the unary + keeps the planner from preferring the barely selective status index.
+_SELECT_EXPIRED_INCIDENTS_SQL = """
+    SELECT incident_id, created_at FROM incidents
+    WHERE created_at < ? AND +status = 'closed' AND (created_at, incident_id) > (?, ?)
+    ORDER BY created_at, incident_id LIMIT ?
+"""
+
+# Tables archived and removed with their incident, with each row's timestamp
+_RETAINED_CHILD_TABLES = {
+    "incident_history": "timestamp",
+    "compliance_events": "event_timestamp",
+    "performance_metrics": "metric_timestamp",
+}
+
+
+def analytics_bucket(moment: datetime, bucket_type: str) -> str:
+    """
+    Rollup key of a timestamp.
+    
+    Args:
+        moment: Timestamp to bucket
+        bucket_type: daily (YYYY-MM-DD), weekly (YYYY-MM-DD of the Monday) or monthly (YYYY-MM)
+        
+    Returns:
+        Bucket key, ordered like the timestamps it covers
+    """
+    if bucket_type == "daily":
+        return moment.date().isoformat()
+    if bucket_type == "weekly":
+        return (moment.date() - timedelta(days=moment.weekday())).isoformat()
+    if bucket_type == "monthly":
+        return moment.strftime("%Y-%m")
+    raise ValueError(f"Unknown analytics bucket type: {bucket_type}")
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def _archive_partitions(
+    records: Dict[str, List[Dict[str, Any]]]
+) -> Dict[date, Dict[str, List[Dict[str, Any]]]]:
+    """Group exported incidents and their dependent rows by incident creation day."""
+    days = {
+        row["incident_id"]: _parse_timestamp(row["created_at"]).date()
+        for row in records["incidents"]
+    }
+    partitions: Dict[date, Dict[str, List[Dict[str, Any]]]] = {}
+    for table, rows in records.items():
+        for row in rows:
+            partitions.setdefault(days[row["incident_id"]], {}).setdefault(table, []).append(row)
+    return partitions
+
+
+def _analytics_contribution(row: Any) -> Tuple:
+    """
+    Rollup key parts and totals one incident adds to each of its buckets.
+    
+    Args:
+        row: Incident row or record with the _SELECT_INCIDENT_ROLLUP_SQL columns
+        
+    Returns:
+        (created_at, category, priority, totals) with totals ordered as _ANALYTICS_TOTALS
+    """
+    quality_scores = json.loads(row["quality_scores_json"] or "{}")
+    quality = quality_scores.get("overall")
+    processing_time = row["processing_time_seconds"]
+    risk_score = row["risk_score"]
+    
+    totals = (
+        1,
+        1 if row["status"] in _RESOLVED_STATUSES else 0,
+        1 if row["requires_followup"] else 0,
+        processing_time or 0.0, 0 if processing_time is None else 1,
+        risk_score or 0.0, 0 if risk_score is None else 1,
+        quality or 0.0, 0 if quality is None else 1,
+    )
+    # NULLs never conflict in a UNIQUE key, so missing values roll up under ""
+    return (
+        _parse_timestamp(row["created_at"]), row["category"] or "",
+        row["priority"] or "", totals
+    )
+
+
+# Columns of the incidents table, in schema order
+INCIDENT_COLUMNS = (
+    "incident_id", "title", "description", "category", "priority", "status",
+    "created_at", "updated_at", "resolved_at", "risk_score", "classification_confidence",
+    "processing_time_seconds", "human_interventions", "workflow_steps_completed",
+    "workflow_steps_failed", "metadata_json", "tool_results_json", "response_plan_json",
+    "quality_scores_json", "compliance_frameworks", "safety_violations", "requires_followup",
+)
+
+# Incident summary without the JSON blobs, the default projection of query_incidents
+INCIDENT_SUMMARY_COLUMNS = (
+    "incident_id", "title", "category", "priority", "status", "created_at",
+    "risk_score", "processing_time_seconds", "human_interventions", "requires_followup",
+)
+
+_TIMESTAMP_COLUMNS = frozenset(("created_at", "updated_at", "resolved_at"))
+
+# Full-text index over incident titles and descriptions. It is an external
+# content table: the text stays in incidents and the FTS rows share its rowid,
+# kept in sync by triggers. Titles weigh twice as much as descriptions in BM25.
+# Words are not stemmed, matching the similarity index, whose postings give
+# the document frequencies used to pick selective prefilter words.
+_INCIDENTS_FTS_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE incidents_fts USING fts5(
+        title, description,
+        content='incidents', content_rowid='rowid', tokenize='unicode61'
+    )
+    """,
+    "INSERT INTO incidents_fts (incidents_fts, rank) VALUES ('rank', 'bm25(2.0, 1.0)')",
+    """
+    CREATE TRIGGER IF NOT EXISTS incidents_fts_insert AFTER INSERT ON incidents BEGIN
+        INSERT INTO incidents_fts (rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS incidents_fts_delete AFTER DELETE ON incidents BEGIN
+        INSERT INTO incidents_fts (incidents_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS incidents_fts_update AFTER UPDATE OF title, description ON incidents
+    WHEN old.title IS NOT new.title OR old.description IS NOT new.description BEGIN
+        INSERT INTO incidents_fts (incidents_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO incidents_fts (rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+)
+
+_TEXT_FILTER_CLAUSE = "incidents.rowid IN (SELECT rowid FROM incidents_fts WHERE incidents_fts MATCH ?)"
+
+# Terms beyond this are dropped from text queries built from long descriptions
+_MAX_QUERY_TERMS = 32
+
+# Index entries a similarity prefilter may read; less selective text is not prefiltered
+DEFAULT_PREFILTER_MAX_POSTINGS = 5000
+
+
+def text_terms(text: str, drop_common: bool = False) -> List[str]:
+    """
+    Distinct lowercase words of a text, split as the full-text index splits them.
+    
+    Args:
+        text: Free text
+        drop_common: Drop English stop words and single characters
+    
+    Returns:
+        Words in order of first appearance, at most _MAX_QUERY_TERMS
+    """
+    terms = []
+    for term in re.findall(r"[^\W_]+", text.lower()):
+        if drop_common and (term in ENGLISH_STOP_WORDS or len(term) < 2):
+            continue
+        if term not in terms:
+            terms.append(term)
+    return terms[:_MAX_QUERY_TERMS]
+
+
+def fts_match_expression(terms: Sequence[str], match_any: bool = False) -> Optional[str]:
+    """
+    FTS5 MATCH expression for words.
+    
+    Every word is quoted, so user text can never be read as query syntax.
+    
+    Args:
+        terms: Words, see text_terms
+        match_any: Match incidents containing any of the words instead of all
+    
+    Returns:
+        Match expression, or None without words
+    """
+    if not terms:
+        return None
+    operator = " OR " if match_any else " AND "
+    return operator.join(f'"{term}"' for term in terms)
+
+
+# Keyset position: the (created_at, incident_id) of the last row returned,
+# as stored, so the next page continues after it
+IncidentCursor = Tuple[Any, str]
+
+
+def _incident_filter_clauses(filters: Optional[Dict[str, Any]]) -> Tuple[List[str], List[Any]]:
+    """
+    WHERE clauses and parameters for incident search filters.
+    
+    Args:
+        filters: Search filters (category, priority, status, created_after,
+            created_before, risk_score_min, risk_score_max, and text matching
+            all its words in title or description); others are ignored
+    
+    Returns:
+        (clauses, params) to join with AND
+    """
+    where_clauses = []
+    params = []
+    
+    if filters:
+        for key, value in filters.items():
+            if key in ["category", "priority", "status"]:
+                where_clauses.append(f"{key} = ?")
+                params.append(value)
+            elif key == "created_after":
+                where_clauses.append("created_at >= ?")
+                params.append(value)
+            elif key == "created_before":
+                where_clauses.append("created_at <= ?")
+                params.append(value)
+            elif key == "risk_score_min":
+                where_clauses.append("risk_score >= ?")
+                params.append(value)
+            elif key == "risk_score_max":
+                where_clauses.append("risk_score <= ?")
+                params.append(value)
+            elif key == "text":
+                match = fts_match_expression(text_terms(value))
+                where_clauses.append(_TEXT_FILTER_CLAUSE if match else "0")
+                params.extend([match] if match else [])
+    
+    return where_clauses, params
+
+
+@lru_cache(maxsize=64)
+def incident_row_type(columns: Tuple[str, ...]) -> type:
+    """
+    Named tuple type for rows of an incident projection.
+    
+    Args:
+        columns: Projected incidents columns
+    
+    Returns:
+        IncidentRow type with one field per column
+    """
+    unknown = [column for column in columns if column not in INCIDENT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown incident columns: {', '.join(unknown)}")
+    return namedtuple("IncidentRow", columns)
 
 
 class IncidentRecord(BaseModel):
@@ -59,16 +385,56 @@ class PersistentStorage:
     querying, analytics, and reporting capabilities.
     """
     
-    def __init__(self, db_path: str = "security_incidents.db"):
+    def __init__(
+        self,
+        db_path: str = "security_incidents.db",
+        reader_connections: int = 4,
+        archive_dir: Optional[str] = None
+    ):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Long-lived WAL connections shared by all storage operations
+        self.pool = SQLiteConnectionPool(
+            self.db_path, reader_connections=reader_connections
+        )
+        
+        # Incrementally maintained text similarity index, persisted alongside the DB
+        self.similarity_index = IncidentSimilarityIndex(
+            self.db_path.with_suffix(".similarity.npz")
+        )
+        self._index_save_lock = asyncio.Lock()
+        
+        # Cleared if this SQLite build lacks FTS5
+        self.text_search_enabled = True
+        
+        # Cold storage for records removed by retention
+        self.archive = IncidentArchive(archive_dir or self.db_path.with_suffix(".archive"))
+        self._retention_task: Optional[asyncio.Task] = None
+        self._retention_lock = asyncio.Lock()
     
     async def initialize(self):
         """Initialize database schema and indexes."""
-        async with aiosqlite.connect(self.db_path) as db:
+        await self.pool.open()
+        await self.pool.enable_incremental_vacuum(new_databases_only=True)
+        async with self.pool.writer() as db:
             await self._create_tables(db)
+            rebuild_analytics = await self._migrate_analytics_table(db)
             await self._create_indexes(db)
-            await db.commit()
+            self.text_search_enabled = await self._create_text_index(db)
+        
+        # Backfill rollups for databases written before they were maintained
+        if rebuild_analytics:
+            await self.rebuild_analytics()
+        
+        await self._load_similarity_index()
+    
+    async def close(self):
+        """Persist the similarity index and close pooled database connections."""
+        await self.stop_retention()
+        if self.similarity_index.unsaved_changes:
+            await self._save_similarity_index()
+        await self.pool.close()
     
     async def _create_tables(self, db: aiosqlite.Connection):
         """Create database tables."""
@@ -141,6 +507,14 @@ class PersistentStorage:
                 avg_risk_score REAL,
                 avg_quality_score REAL,
                 
+                -- Running sums and counts behind the averages
+                processing_time_sum REAL DEFAULT 0,
+                processing_time_count INTEGER DEFAULT 0,
+                risk_score_sum REAL DEFAULT 0,
+                risk_score_count INTEGER DEFAULT 0,
+                quality_score_sum REAL DEFAULT 0,
+                quality_score_count INTEGER DEFAULT 0,
+                
                 -- Updated timestamp
                 updated_at TIMESTAMP NOT NULL,
                 
@@ -174,6 +548,19 @@ class PersistentStorage:
                 FOREIGN KEY (incident_id) REFERENCES incidents (incident_id)
             )
         """)
+        
+        # Quantile sketches per metric, category and time bucket
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS metric_sketches (
+                metric_name TEXT NOT NULL,
+                category TEXT NOT NULL,
+                resolution TEXT NOT NULL,  -- 'hour', 'day'
+                bucket_start TIMESTAMP NOT NULL,
+                sketch_json TEXT NOT NULL,
+                updated_at TIMESTAMP NOT NULL,
+                PRIMARY KEY (metric_name, category, resolution, bucket_start)
+            )
+        """)
     
     async def _create_indexes(self, db: aiosqlite.Connection):
         """Create database indexes for performance."""
@@ -182,7 +569,8 @@ class PersistentStorage:
             "CREATE INDEX IF NOT EXISTS idx_incidents_category ON incidents (category)",
             "CREATE INDEX IF NOT EXISTS idx_incidents_priority ON incidents (priority)",
             "CREATE INDEX IF NOT EXISTS idx_incidents_status ON incidents (status)",
-            "CREATE INDEX IF NOT EXISTS idx_incidents_created_at ON incidents (created_at)",
+            # Serves created_at range filters and keyset pagination
+            "CREATE INDEX IF NOT EXISTS idx_incidents_created_at_id ON incidents (created_at, incident_id)",
             "CREATE INDEX IF NOT EXISTS idx_incidents_updated_at ON incidents (updated_at)",
             "CREATE INDEX IF NOT EXISTS idx_incidents_risk_score ON incidents (risk_score)",
             
@@ -199,11 +587,71 @@ class PersistentStorage:
             
             "CREATE INDEX IF NOT EXISTS idx_metrics_incident ON performance_metrics (incident_id)",
             "CREATE INDEX IF NOT EXISTS idx_metrics_name ON performance_metrics (metric_name)",
-            "CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON performance_metrics (metric_timestamp)"
+            "CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON performance_metrics (metric_timestamp)",
+            
+            "CREATE INDEX IF NOT EXISTS idx_sketches_bucket_start ON metric_sketches (bucket_start)"
         ]
         
         for index_sql in indexes:
             await db.execute(index_sql)
+        
+        # Superseded by idx_incidents_created_at_id
+        await db.execute("DROP INDEX IF EXISTS idx_incidents_created_at")
+    
+    async def _create_text_index(self, db: aiosqlite.Connection) -> bool:
+        """
+        Create the incidents full-text index, populating it for existing incidents.
+        
+        Returns:
+            Whether full-text search is available
+        """
+        cursor = await db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'incidents_fts'"
+        )
+        exists = await cursor.fetchone() is not None
+        
+        try:
+            # Table and rank configuration first, then the sync triggers
+            statements = _INCIDENTS_FTS_SCHEMA if not exists else _INCIDENTS_FTS_SCHEMA[2:]
+            for statement in statements:
+                await db.execute(statement)
+            
+            # Index incidents stored before the full-text index existed
+            if not exists:
+                await db.execute("INSERT INTO incidents_fts (incidents_fts) VALUES ('rebuild')")
+            return True
+            
+        except sqlite3.OperationalError as e:
+            print(f"Full-text incident search unavailable: {e}")
+            return False
+    
+    async def _migrate_analytics_table(self, db: aiosqlite.Connection) -> bool:
+        """
+        Add the running-total columns to an existing analytics table.
+        
+        Returns:
+            Whether the rollups must be rebuilt from the incidents table
+        """
+        cursor = await db.execute("PRAGMA table_info(incident_analytics)")
+        columns = {row["name"] for row in await cursor.fetchall()}
+        
+        added = False
+        for column in _ANALYTICS_TOTALS:
+            if column not in columns:
+                column_type = "REAL" if column.endswith("_sum") else "INTEGER"
+                await db.execute(
+                    f"ALTER TABLE incident_analytics ADD COLUMN {column} {column_type} DEFAULT 0"
+                )
+                added = True
+        
+        if added:
+            return True
+        
+        cursor = await db.execute("""
+            SELECT EXISTS (SELECT 1 FROM incidents)
+            AND NOT EXISTS (SELECT 1 FROM incident_analytics)
+        """)
+        return bool((await cursor.fetchone())[0])
     
     async def store_incident(self, incident_state: IncidentState) -> bool:
         """
@@ -219,16 +667,17 @@ class PersistentStorage:
             # Convert to incident record
             record = self._state_to_record(incident_state)
             
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.pool.writer() as db:
                 # Check if incident exists
                 cursor = await db.execute(
-                    "SELECT incident_id FROM incidents WHERE incident_id = ?",
-                    (record.incident_id,)
+                    _SELECT_INCIDENT_ROLLUP_SQL, (record.incident_id,)
                 )
-                exists = await cursor.fetchone()
+                existing = await cursor.fetchone()
                 
-                if exists:
-                    # Update existing record
+                if existing:
+                    # Update existing record; status is managed by update_incident_status
+                    record.status = existing["status"]
+                    record.resolved_at = _parse_timestamp(existing["resolved_at"])
                     await self._update_incident_record(db, record)
                     change_type = "updated"
                 else:
@@ -236,18 +685,86 @@ class PersistentStorage:
                     await self._insert_incident_record(db, record)
                     change_type = "created"
                 
+                # Move the incident's contribution between rollup buckets
+                await self._apply_analytics_delta(
+                    db,
+                    removed=[_analytics_contribution(existing)] if existing else [],
+                    added=[_analytics_contribution(record.dict())]
+                )
+                
                 # Record change in history
                 await self._record_incident_history(
                     db, record.incident_id, change_type, incident_state.dict()
                 )
-                
-                await db.commit()
-                return True
+            
+            # Index the committed incident for similarity search
+            self.similarity_index.add(
+                record.incident_id,
+                f"{record.title} {record.description}",
+                record.category,
+                record.created_at
+            )
+            if self.similarity_index.unsaved_changes >= self.similarity_index.save_every:
+                await self._save_similarity_index()
+            
+            return True
                 
         except Exception as e:
             print(f"Error storing incident: {e}")
             return False
     
+    async def update_incident_status(self, incident_id: str, status: str) -> bool:
+        """
+        Transition an incident to a new status.
+        
+        Args:
+            incident_id: Incident identifier
+            status: New status (active, resolved, closed)
+            
+        Returns:
+            Success status
+        """
+        try:
+            if status not in _INCIDENT_STATUSES:
+                raise ValueError(f"Unknown incident status: {status}")
+            
+            async with self.pool.writer() as db:
+                cursor = await db.execute(_SELECT_INCIDENT_ROLLUP_SQL, (incident_id,))
+                existing = await cursor.fetchone()
+                if not existing:
+                    return False
+                
+                now = datetime.utcnow()
+                resolved_at = _parse_timestamp(existing["resolved_at"])
+                if status not in _RESOLVED_STATUSES:
+                    resolved_at = None
+                elif resolved_at is None:
+                    resolved_at = now
+                
+                await db.execute("""
+                    UPDATE incidents SET status = ?, resolved_at = ?, updated_at = ?
+                    WHERE incident_id = ?
+                """, (status, resolved_at, now, incident_id))
+                
+                updated = dict(existing)
+                updated["status"] = status
+                await self._apply_analytics_delta(
+                    db,
+                    removed=[_analytics_contribution(existing)],
+                    added=[_analytics_contribution(updated)]
+                )
+                
+                await self._record_incident_history(
+                    db, incident_id, "status_changed",
+                    {"from": existing["status"], "to": status}
+                )
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error updating incident status: {e}")
+            return False
+    
     async def get_incident(self, incident_id: str) -> Optional[IncidentRecord]:
         """
         Retrieve an incident record.
@@ -259,12 +776,8 @@ class PersistentStorage:
             Incident record or None
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
-                cursor = await db.execute(
-                    "SELECT * FROM incidents WHERE incident_id = ?",
-                    (incident_id,)
-                )
+            async with self.pool.reader() as db:
+                cursor = await db.execute(_SELECT_INCIDENT_SQL, (incident_id,))
                 row = await cursor.fetchone()
                 
                 if row:
@@ -275,6 +788,147 @@ class PersistentStorage:
         
         return None
     
+    async def get_incidents(self, incident_ids: List[str]) -> Dict[str, IncidentRecord]:
+        """
+        Retrieve several incident records in one query.
+        
+        Args:
+            incident_ids: Incident identifiers
+            
+        Returns:
+            Mapping of incident ID to record for the incidents that exist
+        """
+        if not incident_ids:
+            return {}
+        
+        try:
+            placeholders = ", ".join("?" for _ in incident_ids)
+            async with self.pool.reader() as db:
+                cursor = await db.execute(
+                    f"SELECT * FROM incidents WHERE incident_id IN ({placeholders})",
+                    list(incident_ids)
+                )
+                rows = await cursor.fetchall()
+                
+                return {row["incident_id"]: IncidentRecord(**dict(row)) for row in rows}
+                
+        except Exception as e:
+            print(f"Error retrieving incidents: {e}")
+            return {}
+    
+    async def query_incidents(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Sequence[str] = INCIDENT_SUMMARY_COLUMNS,
+        limit: int = 100,
+        after: Optional[IncidentCursor] = None,
+        descending: bool = True
+    ) -> Tuple[List[Tuple], Optional[IncidentCursor]]:
+        """
+        Fetch one page of incidents, projecting only the requested columns.
+        
+        Pages are ordered by (created_at, incident_id) and continue from a
+        keyset cursor, so every page is an index range scan however deep it is.
+        
+        Args:
+            filters: Search filters, as for search_incidents
+            columns: Incident columns to fetch, see INCIDENT_COLUMNS
+            limit: Maximum number of rows
+            after: Cursor returned with the previous page
+            descending: Newest first (default) or oldest first
+        
+        Returns:
+            (rows, next_cursor): IncidentRow named tuples with timestamps
+            parsed, and the cursor of the next page or None after the last one
+        """
+        row_type = incident_row_type(tuple(columns))
+        try:
+            where_clauses, params = _incident_filter_clauses(filters)
+            if after is not None:
+                where_clauses.append(
+                    "(created_at, incident_id) < (?, ?)" if descending
+                    else "(created_at, incident_id) > (?, ?)"
+                )
+                params.extend(after)
+            
+            where_clause = ""
+            if where_clauses:
+                where_clause = "WHERE " + " AND ".join(where_clauses)
+            
+            # The cursor columns are fetched after the projected ones
+            direction = "DESC" if descending else "ASC"
+            query = f"""
+                SELECT {", ".join(row_type._fields)}, created_at, incident_id FROM incidents
+                {where_clause}
+                ORDER BY created_at {direction}, incident_id {direction}
+                LIMIT ?
+            """
+            params.append(limit)
+            
+            async with self.pool.reader() as db:
+                cursor = await db.execute(query, params)
+                raw_rows = await cursor.fetchall()
+        
+        except Exception as e:
+            print(f"Error querying incidents: {e}")
+            return [], None
+        
+        width = len(row_type._fields)
+        timestamp_positions = [
+            position for position, column in enumerate(row_type._fields)
+            if column in _TIMESTAMP_COLUMNS
+        ]
+        rows = []
+        for raw in raw_rows:
+            values = list(raw)[:width]
+            for position in timestamp_positions:
+                values[position] = _parse_timestamp(values[position])
+            rows.append(row_type._make(values))
+        
+        next_cursor = None
+        if len(raw_rows) == limit:
+            next_cursor = (raw_rows[-1][width], raw_rows[-1][width + 1])
+        return rows, next_cursor
+    
+    async def stream_incidents(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Sequence[str] = INCIDENT_SUMMARY_COLUMNS,
+        limit: Optional[int] = None,
+        batch_size: int = 500,
+        descending: bool = True
+    ) -> AsyncIterator[Tuple]:
+        """
+        Iterate over matching incidents with ``async for``, newest first.
+        
+        Rows are fetched in keyset-paginated batches, so only one batch is
+        held in memory and a reader connection is only held while fetching.
+        
+        Args:
+            filters: Search filters, as for search_incidents
+            columns: Incident columns to fetch, see INCIDENT_COLUMNS
+            limit: Maximum number of rows, all matching if omitted
+            batch_size: Rows fetched per query
+            descending: Newest first (default) or oldest first
+        
+        Yields:
+            IncidentRow named tuples, as returned by query_incidents
+        """
+        remaining = limit
+        after = None
+        while remaining is None or remaining > 0:
+            page_size = batch_size if remaining is None else min(batch_size, remaining)
+            rows, after = await self.query_incidents(
+                filters, columns, page_size, after, descending
+            )
+            for row in rows:
+                yield row
+            
+            if after is None:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+    
     async def search_incidents(
         self,
         filters: Optional[Dict[str, Any]] = None,
@@ -287,36 +941,39 @@ class PersistentStorage:
         Search incidents with filters.
         
         Args:
-            filters: Search filters (category, priority, status, etc.)
+            filters: Search filters (category, priority, status, text, etc.)
             limit: Maximum number of results
             offset: Result offset for pagination
-            order_by: Column to order by
+            order_by: Incident column to order by, or "relevance" to rank a
+                text filter's matches by BM25 (best first); without a text
+                filter, relevance falls back to created_at
             order_direction: ASC or DESC
             
         Returns:
             List of matching incident records
+            
+        Raises:
+            ValueError: If order_by is not an incident column or order_direction
+                is neither ASC nor DESC
         """
+        if order_by == "relevance":
+            if filters and filters.get("text"):
+                other_filters = {key: value for key, value in filters.items() if key != "text"}
+                ranked = await self.search_text(filters["text"], limit + offset, other_filters)
+                ranked_ids = [incident_id for incident_id, _ in ranked[offset:]]
+                records = await self.get_incidents(ranked_ids)
+                return [records[incident_id] for incident_id in ranked_ids if incident_id in records]
+            order_by = "created_at"
+        
+        # Both are interpolated into the SQL, so only known names are accepted
+        if order_by not in INCIDENT_COLUMNS:
+            raise ValueError(f"Unknown incident column to order by: {order_by}")
+        order_direction = order_direction.upper()
+        if order_direction not in ("ASC", "DESC"):
+            raise ValueError(f"Unknown order direction: {order_direction}")
+        
         try:
-            where_clauses = []
-            params = []
-            
-            if filters:
-                for key, value in filters.items():
-                    if key in ["category", "priority", "status"]:
-                        where_clauses.append(f"{key} = ?")
-                        params.append(value)
-                    elif key == "created_after":
-                        where_clauses.append("created_at >= ?")
-                        params.append(value)
-                    elif key == "created_before":
-                        where_clauses.append("created_at <= ?")
-                        params.append(value)
-                    elif key == "risk_score_min":
-                        where_clauses.append("risk_score >= ?")
-                        params.append(value)
-                    elif key == "risk_score_max":
-                        where_clauses.append("risk_score <= ?")
-                        params.append(value)
+            where_clauses, params = _incident_filter_clauses(filters)
             
             where_clause = ""
             if where_clauses:
@@ -330,8 +987,7 @@ class PersistentStorage:
             """
             params.extend([limit, offset])
             
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self.pool.reader() as db:
                 cursor = await db.execute(query, params)
                 rows = await cursor.fetchall()
                 
@@ -341,38 +997,220 @@ class PersistentStorage:
             print(f"Error searching incidents: {e}")
             return []
     
+    async def search_text(
+        self,
+        text: str,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        match_any: bool = False
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank incidents by BM25 relevance of their title and description to a text.
+        
+        Args:
+            text: Free text query
+            limit: Maximum number of results
+            filters: Further search filters, as for search_incidents
+            match_any: Match incidents containing any word of the text instead
+                of all of them; common English words are then ignored
+            
+        Returns:
+            (incident_id, relevance) pairs, most relevant first; relevance is
+            the negated BM25 rank, higher is better
+        """
+        match = fts_match_expression(text_terms(text, drop_common=match_any), match_any=match_any)
+        if match is None or not self.text_search_enabled:
+            return []
+        return await self._rank_text(match, limit, filters)
+    
+    async def similarity_candidates(
+        self,
+        text: str,
+        limit: int = 300,
+        filters: Optional[Dict[str, Any]] = None,
+        max_postings: int = DEFAULT_PREFILTER_MAX_POSTINGS
+    ) -> Optional[List[str]]:
+        """
+        Cheap BM25 prefilter for similar-incident scoring.
+        
+        Candidates share at least one of the text's most selective words: the
+        rarest words are used as long as their combined document frequency,
+        read from the similarity index, stays within ``max_postings``. This
+        bounds the full-text index entries read.
+        
+        Args:
+            text: Incident title and description
+            limit: Maximum number of candidates
+            filters: Further search filters, as for search_incidents
+            max_postings: Index entries the prefilter may read
+            
+        Returns:
+            Candidate incident IDs, best BM25 match first; an empty list if no
+            incident shares a word with the text; None if no word is selective
+            enough, or none matched, and every incident should be scored
+        """
+        terms = text_terms(text, drop_common=True)
+        if not terms or not self.text_search_enabled:
+            return None
+        
+        frequencies = {
+            term: count
+            for term, count in zip(terms, self.similarity_index.document_frequencies(terms))
+            if count
+        }
+        
+        # No stored incident shares a word with the text
+        if not frequencies:
+            return []
+        
+        selected = []
+        postings = 0
+        for term in sorted(frequencies, key=frequencies.get):
+            if postings + frequencies[term] > max_postings:
+                break
+            selected.append(term)
+            postings += frequencies[term]
+        
+        if not selected:
+            return None
+        
+        ranked = await self._rank_text(fts_match_expression(selected, match_any=True), limit, filters)
+        # Hash collisions can make an absent word look rare; score everything then
+        return [incident_id for incident_id, _ in ranked] or None
+    
+    async def _rank_text(
+        self, match: str, limit: int, filters: Optional[Dict[str, Any]]
+    ) -> List[Tuple[str, float]]:
+        """Incidents matching an FTS5 expression and the filters, by BM25 rank."""
+        try:
+            where_clauses, params = _incident_filter_clauses(filters)
+            where_clauses.insert(0, "incidents_fts MATCH ?")
+            params.insert(0, match)
+            
+            query = f"""
+                SELECT incidents.incident_id, incidents_fts.rank FROM incidents_fts
+                JOIN incidents ON incidents.rowid = incidents_fts.rowid
+                WHERE {" AND ".join(where_clauses)}
+                ORDER BY incidents_fts.rank
+                LIMIT ?
+            """
+            params.append(limit)
+            
+            async with self.pool.reader() as db:
+                cursor = await db.execute(query, params)
+                rows = await cursor.fetchall()
+            
+            return [(row[0], -row[1]) for row in rows]
+            
+        except Exception as e:
+            print(f"Error searching incident text: {e}")
+            return []
+    
+    async def get_classification_examples(
+        self,
+        min_confidence: float = 0.7,
+        exclude_indicators: Tuple[str, ...] = ("fast_path_classification", "fallback_classification"),
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get stored classifications for training a local classifier.
+        
+        Args:
+            min_confidence: Minimum classification confidence to keep
+            exclude_indicators: Skip classifications carrying any of these
+                severity indicators (e.g. not produced by the LLM)
+            limit: Maximum number of most recent examples
+            
+        Returns:
+            Examples with title, description, category, confidence and
+            created_at, oldest first
+        """
+        try:
+            query = """
+                SELECT title, description, category, classification_confidence, created_at,
+                       json_extract(tool_results_json, '$.classification.severity_indicators')
+                           AS severity_indicators
+                FROM incidents
+                WHERE category IS NOT NULL AND classification_confidence >= ?
+                ORDER BY created_at DESC
+            """
+            params: List[Any] = [min_confidence]
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            
+            async with self.pool.reader() as db:
+                cursor = await db.execute(query, params)
+                rows = await cursor.fetchall()
+            
+            examples = []
+            for row in reversed(rows):
+                indicators = json.loads(row["severity_indicators"] or "[]")
+                if any(indicator in indicators for indicator in exclude_indicators):
+                    continue
+                examples.append({
+                    "title": row["title"],
+                    "description": row["description"],
+                    "category": row["category"],
+                    "confidence": row["classification_confidence"],
+                    "created_at": row["created_at"]
+                })
+            
+            return examples
+            
+        except Exception as e:
+            print(f"Error retrieving classification examples: {e}")
+            return []
+    
     async def get_incident_analytics(
         self,
         start_date: datetime,
         end_date: datetime,
-        bucket_type: str = "daily"
+        bucket_type: str = "daily",
+        category: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Get incident analytics for a date range.
         
+        Served from the incrementally maintained rollup table, so the cost
+        depends on the number of buckets rather than the number of incidents.
+        
         Args:
             start_date: Start date for analytics
             end_date: End date for analytics
             bucket_type: Aggregation bucket type (daily, weekly, monthly)
+            category: Optional category filter
             
         Returns:
             List of analytics records
         """
         try:
-            # Generate analytics if not exists
-            await self._generate_analytics(start_date, end_date, bucket_type)
+            query = """
+                SELECT * FROM incident_analytics 
+                WHERE bucket_type = ? 
+                AND date_bucket BETWEEN ? AND ?
+            """
+            params: List[Any] = [
+                bucket_type,
+                analytics_bucket(start_date, bucket_type),
+                analytics_bucket(end_date, bucket_type)
+            ]
+            if category is not None:
+                query += " AND category = ?"
+                params.append(category)
+            query += " ORDER BY date_bucket, category, priority"
             
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
-                cursor = await db.execute("""
-                    SELECT * FROM incident_analytics 
-                    WHERE bucket_type = ? 
-                    AND date_bucket BETWEEN ? AND ?
-                    ORDER BY date_bucket
-                """, (bucket_type, start_date.date().isoformat(), end_date.date().isoformat()))
-                
+            async with self.pool.reader() as db:
+                cursor = await db.execute(query, params)
                 rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
+            
+            analytics = []
+            for row in rows:
+                entry = dict(row)
+                entry["category"] = entry["category"] or None
+                entry["priority"] = entry["priority"] or None
+                analytics.append(entry)
+            return analytics
                 
         except Exception as e:
             print(f"Error getting analytics: {e}")
@@ -400,17 +1238,11 @@ class PersistentStorage:
             Success status
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("""
-                    INSERT INTO compliance_events 
-                    (incident_id, framework, event_type, event_timestamp, 
-                     event_data, compliance_status)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
+            async with self.pool.writer() as db:
+                await db.execute(_INSERT_COMPLIANCE_EVENT_SQL, (
                     incident_id, framework, event_type, datetime.utcnow(),
                     json.dumps(event_data), compliance_status
                 ))
-                await db.commit()
                 return True
                 
         except Exception as e:
@@ -437,22 +1269,133 @@ class PersistentStorage:
             Success status
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("""
-                    INSERT INTO performance_metrics 
-                    (incident_id, metric_name, metric_value, metric_timestamp, metric_context)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
+            async with self.pool.writer() as db:
+                await db.execute(_INSERT_PERFORMANCE_METRIC_SQL, (
                     incident_id, metric_name, metric_value, datetime.utcnow(),
                     json.dumps(metric_context or {})
                 ))
-                await db.commit()
                 return True
                 
         except Exception as e:
             print(f"Error recording performance metric: {e}")
             return False
     
+    async def record_telemetry_batch(
+        self,
+        performance_metrics: List[Tuple],
+        compliance_events: List[Tuple]
+    ) -> bool:
+        """
+        Record buffered metrics and compliance events in one transaction.
+
+        Args:
+            performance_metrics: Rows of (incident_id, metric_name, metric_value,
+                metric_timestamp, metric_context_json)
+            compliance_events: Rows of (incident_id, framework, event_type,
+                event_timestamp, event_data_json, compliance_status)
+
+        Returns:
+            Success status
+        """
+        if not performance_metrics and not compliance_events:
+            return True
+
+        try:
+            async with self.pool.writer() as db:
+                if performance_metrics:
+                    await db.executemany(
+                        _INSERT_PERFORMANCE_METRIC_SQL, performance_metrics
+                    )
+                if compliance_events:
+                    await db.executemany(
+                        _INSERT_COMPLIANCE_EVENT_SQL, compliance_events
+                    )
+                return True
+
+        except Exception as e:
+            print(f"Error recording telemetry batch: {e}")
+            return False
+
+    async def save_metric_sketches(self, sketches: List[Tuple]) -> bool:
+        """
+        Upsert serialized metric sketches.
+
+        Args:
+            sketches: Rows of (metric_name, category, resolution, bucket_start,
+                sketch_json), each replacing the stored sketch for its bucket
+
+        Returns:
+            Success status
+        """
+        if not sketches:
+            return True
+
+        try:
+            now = datetime.utcnow()
+            async with self.pool.writer() as db:
+                await db.executemany("""
+                    INSERT INTO metric_sketches
+                    (metric_name, category, resolution, bucket_start, sketch_json, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (metric_name, category, resolution, bucket_start) DO UPDATE SET
+                        sketch_json = excluded.sketch_json,
+                        updated_at = excluded.updated_at
+                """, [(*row, now) for row in sketches])
+                return True
+
+        except Exception as e:
+            print(f"Error saving metric sketches: {e}")
+            return False
+
+    async def load_metric_sketches(self, since: datetime) -> List[Tuple]:
+        """
+        Load metric sketches for buckets starting at or after a time.
+
+        Args:
+            since: Earliest bucket start to load
+
+        Returns:
+            Rows of (metric_name, category, resolution, bucket_start, sketch_json)
+        """
+        try:
+            async with self.pool.reader() as db:
+                cursor = await db.execute("""
+                    SELECT metric_name, category, resolution, bucket_start, sketch_json
+                    FROM metric_sketches WHERE bucket_start >= ?
+                """, (since,))
+                rows = await cursor.fetchall()
+
+            return [
+                (row["metric_name"], row["category"], row["resolution"],
+                 datetime.fromisoformat(str(row["bucket_start"])), row["sketch_json"])
+                for row in rows
+            ]
+
+        except Exception as e:
+            print(f"Error loading metric sketches: {e}")
+            return []
+
+    async def cleanup_metric_sketches(self, cutoff: datetime) -> int:
+        """
+        Delete metric sketches for buckets starting before a cutoff.
+
+        Args:
+            cutoff: Buckets starting before this time are removed
+
+        Returns:
+            Number of sketches removed
+        """
+        try:
+            async with self.pool.writer() as db:
+                cursor = await db.execute(
+                    "DELETE FROM metric_sketches WHERE bucket_start < ?", (cutoff,)
+                )
+                return cursor.rowcount
+
+        except Exception as e:
+            print(f"Error cleaning up metric sketches: {e}")
+            return 0
+
     async def get_incident_history(self, incident_id: str) -> List[Dict[str, Any]]:
         """
         Get incident change history.
@@ -464,8 +1407,7 @@ class PersistentStorage:
             List of history records
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self.pool.reader() as db:
                 cursor = await db.execute("""
                     SELECT * FROM incident_history 
                     WHERE incident_id = ?
@@ -489,45 +1431,280 @@ class PersistentStorage:
         Returns:
             Number of records cleaned up
         """
+        return await self.apply_retention(retention_days)
+    
+    async def apply_retention(
+        self,
+        retention_days: int = 365,
+        batch_size: int = 500,
+        vacuum_pages: int = 1000,
+        pause_seconds: float = 0.0,
+        archive: bool = True
+    ) -> int:
+        """
+        Archive and remove closed incidents past retention in bounded batches.
+        
+        Each batch is read from a reader snapshot, exported to the archive and
+        then deleted in a short write transaction, so other writers wait for
+        one batch at most instead of the whole backlog. Incidents changed
+        between export and delete are kept until the next run. History,
+        compliance events and metrics whose incident no longer exists are
+        archived and removed once their own timestamp passes retention.
+        
+        Args:
+            retention_days: Number of days to retain records
+            batch_size: Incidents archived and deleted per transaction
+            vacuum_pages: Free pages returned to the file system after each batch
+            pause_seconds: Pause between batches, yielding to other work
+            archive: Export records to the archive before deleting them
+            
+        Returns:
+            Number of incidents removed
+        """
+        removed = 0
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
+            cutoff = datetime.utcnow() - timedelta(days=retention_days)
             
-            async with aiosqlite.connect(self.db_path) as db:
-                # Count records to be deleted
-                cursor = await db.execute("""
-                    SELECT COUNT(*) FROM incidents 
-                    WHERE created_at < ? AND status = 'closed'
-                """, (cutoff_date,))
-                count = (await cursor.fetchone())[0]
-                
-                # Delete old closed incidents
-                await db.execute("""
-                    DELETE FROM incidents 
-                    WHERE created_at < ? AND status = 'closed'
-                """, (cutoff_date,))
-                
-                # Clean up related records
-                await db.execute("""
-                    DELETE FROM incident_history 
-                    WHERE incident_id NOT IN (SELECT incident_id FROM incidents)
-                """)
+            async with self._retention_lock:
+                after: Tuple[Any, str] = ("", "")
+                while True:
+                    async with self.pool.reader() as db:
+                        cursor = await db.execute(
+                            _SELECT_EXPIRED_INCIDENTS_SQL, (cutoff, *after, batch_size)
+                        )
+                        expired = await cursor.fetchall()
+                        if not expired:
+                            break
+                        after = (expired[-1]["created_at"], expired[-1]["incident_id"])
+                        exported = await self._select_incident_records(
+                            db, [row["incident_id"] for row in expired]
+                        )
+                    
+                    if archive:
+                        await asyncio.to_thread(
+                            self.archive.write_batch, _archive_partitions(exported)
+                        )
+                    
+                    deleted_ids = await self._delete_incident_records(exported)
+                    self.similarity_index.remove(deleted_ids)
+                    removed += len(deleted_ids)
+                    
+                    await self.pool.release_free_pages(vacuum_pages)
+                    await asyncio.sleep(pause_seconds)
                 
-                await db.execute("""
-                    DELETE FROM compliance_events 
-                    WHERE incident_id NOT IN (SELECT incident_id FROM incidents)
-                """)
-                
-                await db.execute("""
-                    DELETE FROM performance_metrics 
-                    WHERE incident_id NOT IN (SELECT incident_id FROM incidents)
-                """)
-                
-                await db.commit()
-                return count
+                for table, timestamp_column in _RETAINED_CHILD_TABLES.items():
+                    await self._remove_orphaned_records(
+                        table, timestamp_column, cutoff, batch_size,
+                        vacuum_pages, pause_seconds, archive
+                    )
+            
+            return removed
+            
+        except Exception as e:
+            print(f"Error applying retention: {e}")
+            return removed
+    
+    def start_retention(
+        self,
+        retention_days: int = 365,
+        interval_seconds: float = 3600.0,
+        **options: Any
+    ) -> None:
+        """
+        Run apply_retention periodically in the background (idempotent).
+        
+        Args:
+            retention_days: Number of days to retain records
+            interval_seconds: Wait between retention runs
+            **options: Further apply_retention arguments
+        """
+        if self._retention_task is None or self._retention_task.done():
+            self._retention_task = asyncio.create_task(
+                self._run_retention(retention_days, interval_seconds, options),
+                name="incident-retention"
+            )
+    
+    async def stop_retention(self) -> None:
+        """Stop background retention; an interrupted batch is redone by the next run."""
+        if self._retention_task is not None:
+            self._retention_task.cancel()
+            await asyncio.gather(self._retention_task, return_exceptions=True)
+            self._retention_task = None
+    
+    async def enable_incremental_vacuum(self) -> bool:
+        """
+        Convert an existing database to incremental auto-vacuum.
+        
+        Rewrites the whole database file once, holding the writer meanwhile;
+        run it during maintenance. Databases created by initialize already use
+        incremental auto-vacuum.
+        
+        Returns:
+            Whether incremental auto-vacuum is enabled
+        """
+        try:
+            enabled = await self.pool.enable_incremental_vacuum()
+            # VACUUM may renumber the implicit incident rowids the full-text index refers to
+            if self.text_search_enabled:
+                async with self.pool.writer() as db:
+                    await db.execute("INSERT INTO incidents_fts (incidents_fts) VALUES ('rebuild')")
+            return enabled
                 
         except Exception as e:
-            print(f"Error cleaning up old records: {e}")
-            return 0
+            print(f"Error enabling incremental vacuum: {e}")
+            return False
+    
+    async def _run_retention(
+        self,
+        retention_days: int,
+        interval_seconds: float,
+        options: Dict[str, Any]
+    ) -> None:
+        while True:
+            await self.apply_retention(retention_days, **options)
+            await asyncio.sleep(interval_seconds)
+    
+    async def _select_incident_records(
+        self,
+        db: aiosqlite.Connection,
+        incident_ids: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Incident rows and their dependent rows, per table."""
+        placeholders = ", ".join("?" for _ in incident_ids)
+        records = {}
+        for table in ("incidents", *_RETAINED_CHILD_TABLES):
+            cursor = await db.execute(
+                f"SELECT * FROM {table} WHERE incident_id IN ({placeholders})", incident_ids
+            )
+            records[table] = [dict(row) for row in await cursor.fetchall()]
+        return records
+    
+    async def _delete_incident_records(self, exported: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+        """
+        Delete exported incidents that are unchanged since export, with their exported rows.
+        
+        Returns:
+            Identifiers of the incidents deleted
+        """
+        incidents = exported["incidents"]
+        if not incidents:
+            return []
+        async with self.pool.writer() as db:
+            # The plain IN list lets SQLite look rows up by primary key; the
+            # row-value comparison alone would scan the table
+            cursor = await db.execute(
+                f"""
+                DELETE FROM incidents
+                WHERE incident_id IN ({", ".join("?" for _ in incidents)}) AND status = 'closed'
+                AND (incident_id, updated_at) IN (VALUES {", ".join("(?, ?)" for _ in incidents)})
+                RETURNING incident_id
+                """,
+                [row["incident_id"] for row in incidents]
+                + [value for row in incidents for value in (row["incident_id"], row["updated_at"])]
+            )
+            deleted_ids = [row[0] for row in await cursor.fetchall()]
+            if not deleted_ids:
+                return []
+            
+            # Rows added after the export have higher ids and stay behind as orphans
+            placeholders = ", ".join("?" for _ in deleted_ids)
+            for table in _RETAINED_CHILD_TABLES:
+                if exported[table]:
+                    await db.execute(
+                        f"DELETE FROM {table} WHERE incident_id IN ({placeholders}) AND id <= ?",
+                        [*deleted_ids, max(row["id"] for row in exported[table])]
+                    )
+            return deleted_ids
+    
+    async def _remove_orphaned_records(
+        self,
+        table: str,
+        timestamp_column: str,
+        cutoff: datetime,
+        batch_size: int,
+        vacuum_pages: int,
+        pause_seconds: float,
+        archive: bool
+    ) -> int:
+        """
+        Archive and delete rows of a dependent table whose incident is gone.
+        
+        Returns:
+            Number of rows removed
+        """
+        removed = 0
+        after: Tuple[Any, int] = ("", 0)
+        while True:
+            async with self.pool.reader() as db:
+                cursor = await db.execute(f"""
+                    SELECT * FROM {table}
+                    WHERE {timestamp_column} < ? AND ({timestamp_column}, id) > (?, ?)
+                    AND NOT EXISTS (
+                        SELECT 1 FROM incidents WHERE incidents.incident_id = {table}.incident_id
+                    )
+                    ORDER BY {timestamp_column}, id LIMIT ?
+                """, (cutoff, *after, batch_size))
+                rows = [dict(row) for row in await cursor.fetchall()]
+            if not rows:
+                return removed
+            after = (rows[-1][timestamp_column], rows[-1]["id"])
+            
+            if archive:
+                partitions: Dict[date, Dict[str, List[Dict[str, Any]]]] = {}
+                for row in rows:
+                    day = _parse_timestamp(row[timestamp_column]).date()
+                    partitions.setdefault(day, {}).setdefault(table, []).append(row)
+                await asyncio.to_thread(self.archive.write_batch, partitions)
+            
+            async with self.pool.writer() as db:
+                await db.execute(
+                    f"DELETE FROM {table} WHERE id IN ({', '.join('?' for _ in rows)})",
+                    [row["id"] for row in rows]
+                )
+            removed += len(rows)
+            
+            await self.pool.release_free_pages(vacuum_pages)
+            await asyncio.sleep(pause_seconds)
+    
+    async def _save_similarity_index(self):
+        """Persist the similarity index without blocking the event loop on disk I/O."""
+        async with self._index_save_lock:
+            snapshot = self.similarity_index.snapshot()
+            await asyncio.to_thread(self.similarity_index.write_snapshot, snapshot)
+    
+    async def _load_similarity_index(self, batch_size: int = 500):
+        """Load the persisted similarity index and reconcile it with the incidents table."""
+        index = self.similarity_index
+        await asyncio.to_thread(index.load)
+        
+        async with self.pool.reader() as db:
+            cursor = await db.execute("SELECT incident_id FROM incidents")
+            stored_ids = {row[0] for row in await cursor.fetchall()}
+        
+        # Drop incidents deleted since the index was saved
+        index.remove([incident_id for incident_id in index.incident_ids()
+                      if incident_id not in stored_ids])
+        
+        # Index incidents stored after the last save (or everything on first run)
+        missing_ids = [incident_id for incident_id in stored_ids if incident_id not in index]
+        for start in range(0, len(missing_ids), batch_size):
+            batch = missing_ids[start:start + batch_size]
+            placeholders = ", ".join("?" for _ in batch)
+            async with self.pool.reader() as db:
+                cursor = await db.execute(f"""
+                    SELECT incident_id, title, description, category, created_at
+                    FROM incidents WHERE incident_id IN ({placeholders})
+                """, batch)
+                rows = await cursor.fetchall()
+            
+            index.add_many(
+                (row["incident_id"], f"{row['title']} {row['description']}",
+                 row["category"], datetime.fromisoformat(str(row["created_at"])))
+                for row in rows
+            )
+        
+        if index.unsaved_changes:
+            await self._save_similarity_index()
     
     def _state_to_record(self, state: IncidentState) -> IncidentRecord:
         """Convert incident state to database record."""
@@ -625,13 +1802,149 @@ class PersistentStorage:
             VALUES (?, ?, ?, ?)
         """, (incident_id, datetime.utcnow(), change_type, json.dumps(change_data, default=str)))
     
-    async def _generate_analytics(
+    async def rebuild_analytics(self, batch_size: int = 1000) -> int:
+        """
+        Recompute the analytics rollups from the incidents table.
+        
+        Rollups otherwise outlive incidents removed by apply_retention;
+        a rebuild only covers incidents still stored.
+        
+        Args:
+            batch_size: Incident rows fetched per round trip
+            
+        Returns:
+            Number of incidents rolled up
+        """
+        try:
+            count = 0
+            async with self.pool.writer() as db:
+                await db.execute("DELETE FROM incident_analytics")
+                
+                cursor = await db.execute("""
+                    SELECT category, priority, status, created_at, resolved_at,
+                           processing_time_seconds, risk_score, quality_scores_json,
+                           requires_followup
+                    FROM incidents
+                """)
+                totals: Dict[Tuple[str, str, str, str], List[float]] = {}
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    self._accumulate_analytics(
+                        totals, [_analytics_contribution(row) for row in rows], 1
+                    )
+                    count += len(rows)
+                
+                await self._write_analytics_totals(db, totals)
+            
+            return count
+            
+        except Exception as e:
+            print(f"Error rebuilding analytics: {e}")
+            return 0
+    
+    async def _apply_analytics_delta(
         self,
-        start_date: datetime,
-        end_date: datetime,
-        bucket_type: str
+        db: aiosqlite.Connection,
+        removed: List[Tuple],
+        added: List[Tuple]
     ):
-        """Generate analytics data if not exists."""
-        # This is a simplified implementation
-        # In production, you'd implement comprehensive analytics generation
-        pass
\ No newline at end of file
+        """Subtract and add incident contributions to their rollup buckets."""
+        totals: Dict[Tuple[str, str, str, str], List[float]] = {}
+        self._accumulate_analytics(totals, removed, -1)
+        self._accumulate_analytics(totals, added, 1)
+        await self._write_analytics_totals(db, totals)
+        
+        # Drop buckets whose last incident moved elsewhere
+        emptied = [key for key, values in totals.items() if values[0] < 0]
+        if emptied:
+            await db.executemany("""
+                DELETE FROM incident_analytics
+                WHERE date_bucket = ? AND bucket_type = ? AND category = ? AND priority = ?
+                AND total_incidents <= 0
+            """, emptied)
+    
+    @staticmethod
+    def _accumulate_analytics(
+        totals: Dict[Tuple[str, str, str, str], List[float]],
+        contributions: List[Tuple],
+        sign: int
+    ):
+        for created_at, category, priority, values in contributions:
+            for bucket_type in ANALYTICS_BUCKET_TYPES:
+                key = (analytics_bucket(created_at, bucket_type), bucket_type, category, priority)
+                bucket = totals.setdefault(key, [0] * len(_ANALYTICS_TOTALS))
+                for i, value in enumerate(values):
+                    bucket[i] += sign * value
+    
+    async def _write_analytics_totals(
+        self,
+        db: aiosqlite.Connection,
+        totals: Dict[Tuple[str, str, str, str], List[float]]
+    ):
+        now = datetime.utcnow()
+        rows = []
+        for key, values in totals.items():
+            if not any(values):
+                continue
+            averages = [
+                values[i] / values[i + 1] if values[i + 1] > 0 else None
+                for i in (3, 5, 7)
+            ]
+            rows.append((*key, *values, *averages, now))
+        
+        if rows:
+            await db.executemany(_UPSERT_ANALYTICS_SQL, rows)
+
+
+async def _run_maintenance(args: argparse.Namespace) -> str:
+    storage = PersistentStorage(args.db, archive_dir=getattr(args, "archive_dir", None))
+    await storage.initialize()
+    try:
+        if args.command == "rebuild-analytics":
+            count = await storage.rebuild_analytics()
+            return f"Rolled up {count} incidents into daily, weekly and monthly analytics"
+        if args.command == "retention":
+            count = await storage.apply_retention(
+                args.days, batch_size=args.batch_size, archive=not args.no_archive
+            )
+            return f"Removed {count} closed incidents older than {args.days} days"
+        enabled = await storage.enable_incremental_vacuum()
+        return "Incremental auto-vacuum enabled" if enabled else "Incremental auto-vacuum not enabled"
+    finally:
+        await storage.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incident database maintenance")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    
+    rebuild_parser = subcommands.add_parser(
+        "rebuild-analytics", help="Recompute the analytics rollups from the incidents table"
+    )
+    retention_parser = subcommands.add_parser(
+        "retention", help="Archive and remove closed incidents past retention"
+    )
+    retention_parser.add_argument("--days", type=int, default=365,
+                                  help="Number of days to retain records")
+    retention_parser.add_argument("--batch-size", type=int, default=500,
+                                  help="Incidents archived and deleted per transaction")
+    retention_parser.add_argument("--archive-dir", default=None,
+                                  help="Archive directory (default: next to the database)")
+    retention_parser.add_argument("--no-archive", action="store_true",
+                                  help="Delete without exporting to the archive")
+    vacuum_parser = subcommands.add_parser(
+        "enable-incremental-vacuum",
+        help="Rewrite the database once so retention can return freed space"
+    )
+    for subparser in (rebuild_parser, retention_parser, vacuum_parser):
+        subparser.add_argument("--db", default="data/security_incidents.db",
+                               help="Incident database path")
+    args = parser.parse_args()
+    
+    print(asyncio.run(_run_maintenance(args)))
+
+
+if __name__ == "__main__":
+    main()
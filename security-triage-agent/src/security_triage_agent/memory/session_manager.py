@@ -7,11 +7,14 @@ with Redis-based storage and automatic cleanup.
 
 import json
 import asyncio
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 import redis.asyncio as redis
 from ..core.state import IncidentState
+from .ttl_store import TTLStore
+from .checkpoint_codec import DeltaCheckpointWriter, replay_checkpoints
 
 
 class SessionContext(BaseModel):
@@ -32,25 +35,42 @@ class SessionManager:
     Manages session state and context for incident processing.
     
     Provides Redis-based session storage with automatic expiration,
-    context management, and state synchronization.
+    context management, and state synchronization. Without Redis, sessions
+    are kept in a bounded in-process TTLStore holding at most
+    ``max_sessions`` sessions and ``max_memory_entries`` incident states
+    and workflow checkpoint logs.
+    
+    Workflow checkpoints are appended to a per-incident log of binary
+    records: a full snapshot every ``checkpoint_full_snapshot_every``
+    checkpoints and deltas of the changed fields in between.
     """
     
     def __init__(
         self,
         redis_url: str = "redis://localhost:6379",
         session_ttl_hours: int = 24,
-        max_sessions: int = 10000
+        max_sessions: int = 10000,
+        max_memory_entries: int = 100000,
+        checkpoint_full_snapshot_every: int = 10
     ):
         self.redis_url = redis_url
         self.session_ttl_hours = session_ttl_hours
         self.max_sessions = max_sessions
+        self.max_memory_entries = max_memory_entries
+        self.checkpoint_full_snapshot_every = checkpoint_full_snapshot_every
         self.redis_client = None
+        # Checkpoint records are binary, so they need a client without response decoding
+        self.binary_redis_client = None
+        
+        # Delta writers of incidents being checkpointed, least recently used first
+        self._checkpoint_writers: "OrderedDict[str, DeltaCheckpointWriter]" = OrderedDict()
         
         # Session key prefixes
         self.session_prefix = "security_triage:session:"
         self.incident_prefix = "security_triage:incident:"
         self.context_prefix = "security_triage:context:"
         self.workflow_prefix = "security_triage:workflow:"
+        self.session_index_prefix = "security_triage:session_index:"
     
     async def initialize(self):
         """Initialize Redis connection."""
@@ -61,16 +81,55 @@ class SessionManager:
                 decode_responses=True
             )
             await self.redis_client.ping()
+            self.binary_redis_client = redis.from_url(self.redis_url)
         except Exception as e:
             # Fallback to in-memory storage if Redis is not available
             print(f"Redis not available, using in-memory storage: {e}")
             self.redis_client = None
-            self._memory_storage = {}
+            self._init_memory_storage()
+    
+    def _init_memory_storage(self):
+        """Create the bounded in-memory fallback stores."""
+        ttl_seconds = self.session_ttl_hours * 3600
+        self._memory_sessions = TTLStore(
+            max_entries=self.max_sessions,
+            default_ttl_seconds=ttl_seconds,
+            on_evict=self._on_memory_session_removed
+        )
+        self._memory_storage = TTLStore(
+            max_entries=self.max_memory_entries,
+            default_ttl_seconds=ttl_seconds
+        )
+        self._session_index: Dict[str, str] = {}
+    
+    def _on_memory_session_removed(self, session_key: str, data: Dict[str, Any], reason: str):
+        """Drop the incident index entry when its session expires or is evicted."""
+        incident_id = data.get("incident_id")
+        if self._session_index.get(incident_id) == session_key:
+            del self._session_index[incident_id]
+    
+    def get_memory_metrics(self) -> Dict[str, Any]:
+        """
+        Get size and memory metrics for the in-memory fallback.
+        
+        Returns:
+            Metrics per store, or an empty dict when Redis is in use
+        """
+        if self.redis_client:
+            return {}
+        
+        return {
+            "sessions": self._memory_sessions.get_metrics(),
+            "storage": self._memory_storage.get_metrics(),
+            "indexed_incidents": len(self._session_index),
+        }
     
     async def close(self):
         """Close Redis connection."""
         if self.redis_client:
             await self.redis_client.close()
+        if self.binary_redis_client:
+            await self.binary_redis_client.close()
     
     async def create_session(
         self,
@@ -217,7 +276,7 @@ class SessionManager:
                 return False
         else:
             # In-memory fallback
-            self._memory_storage[incident_key] = state_data
+            self._memory_storage.set(incident_key, state_data)
             return True
     
     async def load_incident_state(
@@ -257,6 +316,9 @@ class SessionManager:
         """
         Store workflow checkpoint for recovery.
         
+        Appends a delta of the fields changed since the incident's previous
+        checkpoint, or a periodic full snapshot, to the incident's log.
+        
         Args:
             incident_id: Incident identifier
             step_name: Current workflow step
@@ -265,60 +327,134 @@ class SessionManager:
         Returns:
             Success status
         """
-        checkpoint_key = f"{self.workflow_prefix}{incident_id}:{step_name}"
+        checkpoint_key = f"{self.workflow_prefix}{incident_id}"
+        
+        writer = self._checkpoint_writers.get(incident_id)
+        if writer is not None and not self.redis_client and checkpoint_key not in self._memory_storage:
+            # The log was evicted, so start it again from a full snapshot
+            writer = None
+        if writer is None:
+            writer = DeltaCheckpointWriter(incident_id, self.checkpoint_full_snapshot_every)
+            self._checkpoint_writers[incident_id] = writer
+            while len(self._checkpoint_writers) > self.max_sessions:
+                self._checkpoint_writers.popitem(last=False)
+        else:
+            self._checkpoint_writers.move_to_end(incident_id)
         
-        checkpoint_record = {
-            "incident_id": incident_id,
-            "step_name": step_name,
-            "timestamp": datetime.utcnow().isoformat(),
-            "data": checkpoint_data
-        }
+        try:
+            full_snapshots = writer.stats["full_snapshots"]
+            record = writer.encode(step_name, checkpoint_data)
+            is_delta = writer.stats["full_snapshots"] == full_snapshots
+        except Exception as e:
+            print(f"Error encoding workflow checkpoint: {e}")
+            return False
         
         if self.redis_client:
             try:
-                await self.redis_client.setex(
-                    checkpoint_key,
-                    timedelta(hours=self.session_ttl_hours),
-                    json.dumps(checkpoint_record, default=str)
-                )
+                async with self.binary_redis_client.pipeline(transaction=False) as pipe:
+                    pipe.rpush(checkpoint_key, record)
+                    pipe.expire(checkpoint_key, timedelta(hours=self.session_ttl_hours))
+                    log_length, _ = await pipe.execute()
+                
+                if log_length == 1 and is_delta:
+                    # The log expired (e.g. a long approval wait), leaving a
+                    # delta with no base; replace it with a full snapshot
+                    writer = DeltaCheckpointWriter(incident_id, self.checkpoint_full_snapshot_every)
+                    self._checkpoint_writers[incident_id] = writer
+                    record = writer.encode(step_name, checkpoint_data)
+                    async with self.binary_redis_client.pipeline(transaction=True) as pipe:
+                        pipe.delete(checkpoint_key)
+                        pipe.rpush(checkpoint_key, record)
+                        pipe.expire(checkpoint_key, timedelta(hours=self.session_ttl_hours))
+                        await pipe.execute()
                 return True
             except Exception as e:
                 print(f"Error storing workflow checkpoint: {e}")
+                # The next checkpoint must not be a delta against a lost record
+                self._checkpoint_writers.pop(incident_id, None)
                 return False
         else:
             # In-memory fallback
-            self._memory_storage[checkpoint_key] = checkpoint_record
+            log = self._memory_storage.get(checkpoint_key)
+            if log is None:
+                log = []
+            log.append(record)
+            self._memory_storage.set(checkpoint_key, log)
             return True
     
     async def load_workflow_checkpoint(
         self,
         incident_id: str,
-        step_name: str
+        step_name: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Load workflow checkpoint for recovery.
         
+        Reconstructs the state by replaying the incident's checkpoint log
+        from the last full snapshot.
+        
         Args:
             incident_id: Incident identifier
-            step_name: Workflow step name
+            step_name: Workflow step name (the latest checkpoint if omitted)
             
         Returns:
             Checkpoint data or None
         """
-        checkpoint_key = f"{self.workflow_prefix}{incident_id}:{step_name}"
+        checkpoint_key = f"{self.workflow_prefix}{incident_id}"
         
-        if self.redis_client:
-            try:
-                checkpoint_json = await self.redis_client.get(checkpoint_key)
-                if checkpoint_json:
-                    return json.loads(checkpoint_json)
-            except Exception as e:
-                print(f"Error loading workflow checkpoint: {e}")
-        else:
-            # In-memory fallback
-            return self._memory_storage.get(checkpoint_key)
+        try:
+            if self.redis_client:
+                log = await self.binary_redis_client.lrange(checkpoint_key, 0, -1)
+            else:
+                # In-memory fallback
+                log = self._memory_storage.get(checkpoint_key)
+            
+            if not log:
+                return None
+            
+            replayed = replay_checkpoints(log, until_step=step_name)
+            if replayed is None:
+                return None
+            
+            state, header = replayed
+            return {
+                "incident_id": incident_id,
+                "step_name": header["step"],
+                "timestamp": header["ts"],
+                "data": state
+            }
+        except Exception as e:
+            print(f"Error loading workflow checkpoint: {e}")
+            return None
+    
+    def get_checkpoint_stats(self, incident_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get checkpoint volume for an incident.
         
-        return None
+        Args:
+            incident_id: Incident identifier
+            
+        Returns:
+            Checkpoints, full snapshots, bytes written and serialization
+            seconds, or None if the incident has no active checkpoint writer
+        """
+        writer = self._checkpoint_writers.get(incident_id)
+        return dict(writer.stats) if writer else None
+    
+    def finish_workflow_checkpoints(self, incident_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Release the checkpoint writer of a finished incident.
+        
+        The stored log stays readable until it expires.
+        
+        Args:
+            incident_id: Incident identifier
+            
+        Returns:
+            Final checkpoint stats, or None if the incident had none
+        """
+        writer = self._checkpoint_writers.pop(incident_id, None)
+        return dict(writer.stats) if writer else None
     
     async def list_active_sessions(self) -> List[Dict[str, Any]]:
         """
@@ -348,14 +484,13 @@ class SessionManager:
                 print(f"Error listing sessions: {e}")
         else:
             # In-memory fallback
-            for key, data in self._memory_storage.items():
-                if key.startswith(self.session_prefix):
-                    sessions.append({
-                        "session_id": data.get("session_id"),
-                        "incident_id": data.get("incident_id"),
-                        "created_at": data.get("created_at"),
-                        "last_accessed": data.get("last_accessed")
-                    })
+            for key, data in self._memory_sessions.items():
+                sessions.append({
+                    "session_id": data.get("session_id"),
+                    "incident_id": data.get("incident_id"),
+                    "created_at": data.get("created_at"),
+                    "last_accessed": data.get("last_accessed")
+                })
         
         return sessions
     
@@ -367,40 +502,32 @@ class SessionManager:
             Number of sessions cleaned up
         """
         if not self.redis_client:
-            # For in-memory storage, implement basic cleanup
-            cutoff_time = datetime.utcnow() - timedelta(hours=self.session_ttl_hours)
-            expired_keys = []
-            
-            for key, data in self._memory_storage.items():
-                if key.startswith(self.session_prefix):
-                    last_accessed = datetime.fromisoformat(data.get("last_accessed", ""))
-                    if last_accessed < cutoff_time:
-                        expired_keys.append(key)
-            
-            for key in expired_keys:
-                del self._memory_storage[key]
-            
-            return len(expired_keys)
+            # Expired entries are also dropped lazily; this purges the rest
+            self._memory_storage.purge_expired()
+            return self._memory_sessions.purge_expired()
         
         # Redis automatically handles expiration
         return 0
     
     async def _store_session_context(self, session_context: SessionContext):
-        """Store session context."""
+        """Store session context and its incident index entry."""
         session_key = f"{self.session_prefix}{session_context.session_id}"
+        index_key = f"{self.session_index_prefix}{session_context.incident_id}"
+        ttl = timedelta(hours=self.session_ttl_hours)
         
         if self.redis_client:
             try:
-                await self.redis_client.setex(
-                    session_key,
-                    timedelta(hours=self.session_ttl_hours),
-                    session_context.json()
-                )
+                # Write both keys in one MULTI so the index and session share a TTL
+                async with self.redis_client.pipeline(transaction=True) as pipe:
+                    pipe.setex(session_key, ttl, session_context.json())
+                    pipe.setex(index_key, ttl, session_key)
+                    await pipe.execute()
             except Exception as e:
                 print(f"Error storing session context: {e}")
         else:
             # In-memory fallback
-            self._memory_storage[session_key] = session_context.dict()
+            self._memory_sessions.set(session_key, session_context.dict())
+            self._session_index[session_context.incident_id] = session_key
     
     async def _load_session_context(self, session_key: str) -> Optional[SessionContext]:
         """Load session context."""
@@ -413,33 +540,24 @@ class SessionManager:
                 print(f"Error loading session context: {e}")
         else:
             # In-memory fallback
-            session_data = self._memory_storage.get(session_key)
+            session_data = self._memory_sessions.get(session_key)
             if session_data:
                 return SessionContext.parse_obj(session_data)
         
         return None
     
     async def _find_session_by_incident(self, incident_id: str) -> Optional[str]:
-        """Find session key by incident ID."""
+        """Find session key by incident ID using the secondary index."""
         if self.redis_client:
             try:
-                # Search through all session keys
-                session_keys = await self.redis_client.keys(f"{self.session_prefix}*")
-                
-                for key in session_keys:
-                    session_data = await self.redis_client.get(key)
-                    if session_data:
-                        session_context = SessionContext.parse_raw(session_data)
-                        if session_context.incident_id == incident_id:
-                            return key
+                return await self.redis_client.get(
+                    f"{self.session_index_prefix}{incident_id}"
+                )
             except Exception as e:
                 print(f"Error finding session by incident: {e}")
         else:
             # In-memory fallback
-            for key, data in self._memory_storage.items():
-                if key.startswith(self.session_prefix):
-                    if data.get("incident_id") == incident_id:
-                        return key
+            return self._session_index.get(incident_id)
         
         return None
     
@@ -0,0 +1,460 @@
+"""
+Incident Similarity Index for Security Incident Triage Agent.
+
+Provides an incrementally maintained, persistent vector index over incident
+text so similar-incident lookups are a single sparse matrix product instead
+of a periodic refit over recent history.
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+
+
+class IncidentSimilarityIndex:
+    """
+    Persistent cosine-similarity index over incident titles and descriptions.
+
+    Text is embedded with a HashingVectorizer, so the feature space never
+    changes and new incidents can be added without refitting. Vectors are
+    L2-normalised, making cosine similarity a plain dot product.
+
+    Rows live in two segments: a merged segment kept both document-major and
+    term-major (an inverted index), and a small pending segment of recent
+    additions. A query multiplies against the term-major matrix, touching only
+    the posting lists of its own terms. The pending segment is folded in once
+    it reaches ``merge_threshold`` rows or a tenth of the merged segment.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        index_path: Union[str, Path],
+        n_features: int = 2 ** 18,
+        merge_threshold: int = 1000,
+        save_every: int = 500
+    ):
+        self.index_path = Path(index_path)
+        self.n_features = n_features
+        self.merge_threshold = merge_threshold
+        self.save_every = save_every
+
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, 2),
+            stop_words="english",
+            alternate_sign=False,
+            norm="l2",
+            dtype=np.float32
+        )
+
+        self._reset()
+
+    @property
+    def size(self) -> int:
+        """Number of live (non-deleted) incidents in the index."""
+        return len(self._row_of)
+
+    @property
+    def unsaved_changes(self) -> int:
+        """Number of adds/removes since the index was last persisted."""
+        return self._unsaved_changes
+
+    def __contains__(self, incident_id: str) -> bool:
+        return incident_id in self._row_of
+
+    def incident_ids(self) -> List[str]:
+        """Identifiers of all live incidents in the index."""
+        return list(self._row_of)
+
+    def add(
+        self,
+        incident_id: str,
+        text: str,
+        category: Optional[str] = None,
+        created_at: Optional[datetime] = None
+    ) -> None:
+        """Add or replace a single incident."""
+        self.add_many([(incident_id, text, category, created_at)])
+
+    def add_many(
+        self,
+        items: Iterable[Tuple[str, str, Optional[str], Optional[datetime]]]
+    ) -> int:
+        """
+        Add or replace incidents in bulk.
+
+        Args:
+            items: (incident_id, text, category, created_at) tuples
+
+        Returns:
+            Number of incidents added
+        """
+        items = list(items)
+        if not items:
+            return 0
+
+        vectors = self.vectorizer.transform([text for _, text, _, _ in items]).tocsr()
+        base_row = self._merged_rows + self._pending_rows
+
+        for offset, (incident_id, _, category, created_at) in enumerate(items):
+            self._deactivate(incident_id)
+            self._row_of[incident_id] = base_row + offset
+            self._pending_ids.append(incident_id)
+            self._pending_categories.append(self._category_code(category))
+            self._pending_created.append(created_at.timestamp() if created_at else 0.0)
+            self._pending_active.append(True)
+
+        self._pending_vectors.append(vectors)
+        self._pending_rows += len(items)
+        self._pending_matrix = None
+        self._unsaved_changes += len(items)
+
+        # Grow the pending segment with the index so merges stay amortised
+        if self._pending_rows >= max(self.merge_threshold, self._merged_rows // 10):
+            self._merge()
+
+        return len(items)
+
+    def remove(self, incident_ids: Iterable[str]) -> int:
+        """Remove incidents from the index, returning how many were present."""
+        removed = 0
+        for incident_id in incident_ids:
+            if self._deactivate(incident_id):
+                del self._row_of[incident_id]
+                removed += 1
+
+        self._unsaved_changes += removed
+        return removed
+
+    def query(
+        self,
+        text: str,
+        top_k: int = 5,
+        category: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        min_score: float = 0.0,
+        candidates: Optional[Iterable[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the incidents most similar to ``text``.
+
+        Args:
+            text: Query text
+            top_k: Maximum number of results
+            category: Only consider incidents in this category
+            created_after: Only consider incidents created after this time
+            min_score: Minimum cosine similarity
+            candidates: Only score these incidents, e.g. the best matches of a
+                full-text prefilter, instead of every indexed incident
+
+        Returns:
+            (incident_id, similarity) pairs, most similar first
+        """
+        if top_k <= 0 or not self._row_of:
+            return []
+
+        query_vector = self.vectorizer.transform([text]).tocsr()
+        if query_vector.nnz == 0:
+            return []
+
+        if candidates is not None:
+            rows, scores = self._score_candidates(query_vector, candidates)
+        else:
+            rows, scores = self._score_all(query_vector)
+        categories, created, active = self._row_attributes(rows)
+
+        # Apply filters before selecting the top-k
+        mask = active & (scores >= min_score)
+        if category is not None:
+            if category not in self._categories:
+                return []
+            mask &= categories == self._categories[category]
+        if created_after is not None:
+            mask &= created >= created_after.timestamp()
+
+        rows = rows[mask]
+        scores = scores[mask]
+        if rows.size == 0:
+            return []
+
+        if rows.size > top_k:
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            rows, scores = rows[top], scores[top]
+
+        order = np.argsort(-scores, kind="stable")
+        return [
+            (self._incident_id_at(int(rows[i])), float(scores[i]))
+            for i in order
+        ]
+
+    def _score_all(self, query_vector: sparse.csr_matrix) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows sharing a term with the query and their similarities."""
+        # Merged segment: one product against the inverted index
+        merged_scores = (query_vector @ self._postings).tocsr()
+        rows = merged_scores.indices.astype(np.int64)
+        scores = merged_scores.data
+
+        # Pending segment: small enough for a direct product
+        if self._pending_rows:
+            pending_scores = np.asarray(
+                (self._get_pending_matrix() @ query_vector.T).todense()
+            ).ravel()
+            pending_rows = np.flatnonzero(pending_scores)
+            rows = np.concatenate([rows, pending_rows + self._merged_rows])
+            scores = np.concatenate([scores, pending_scores[pending_rows]])
+
+        return rows, scores
+
+    def _score_candidates(
+        self,
+        query_vector: sparse.csr_matrix,
+        candidates: Iterable[str]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Candidate rows sharing a term with the query and their similarities."""
+        rows = np.asarray(
+            sorted({self._row_of[incident_id] for incident_id in candidates if incident_id in self._row_of}),
+            dtype=np.int64
+        )
+        merged = rows[rows < self._merged_rows]
+        pending = rows[rows >= self._merged_rows] - self._merged_rows
+
+        scores = np.asarray((self._docs[merged] @ query_vector.T).todense(), dtype=np.float32).ravel()
+        if pending.size:
+            pending_scores = np.asarray(
+                (self._get_pending_matrix()[pending] @ query_vector.T).todense(), dtype=np.float32
+            ).ravel()
+            scores = np.concatenate([scores, pending_scores])
+
+        # Like _score_all, leave out candidates with nothing in common
+        matching = np.flatnonzero(scores)
+        return rows[matching], scores[matching]
+
+    def _row_attributes(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Category codes, creation times and liveness of index rows, merged rows first."""
+        merged = rows < self._merged_rows
+        if merged.all():
+            return self._category_codes[rows], self._created_at[rows], self._active[rows]
+
+        pending = rows[~merged] - self._merged_rows
+        categories = np.concatenate([
+            self._category_codes[rows[merged]],
+            np.asarray(self._pending_categories, dtype=np.int32)[pending]
+        ])
+        created = np.concatenate([
+            self._created_at[rows[merged]],
+            np.asarray(self._pending_created, dtype=np.float64)[pending]
+        ])
+        active = np.concatenate([
+            self._active[rows[merged]],
+            np.asarray(self._pending_active, dtype=bool)[pending]
+        ])
+        return categories, created, active
+
+    def document_frequencies(self, terms: Sequence[str]) -> List[int]:
+        """
+        Approximate number of indexed incidents containing each word.
+
+        Read from the inverted index without scoring anything. Replaced or
+        removed incidents and hash collisions can inflate the counts.
+
+        Args:
+            terms: Single lowercase words
+
+        Returns:
+            Count per word, 0 for words the vectorizer ignores
+        """
+        if not terms:
+            return []
+
+        vectors = self.vectorizer.transform(terms).tocsr()
+        counts = []
+        for position in range(len(terms)):
+            features = vectors.indices[vectors.indptr[position]:vectors.indptr[position + 1]]
+            if features.size == 0:
+                counts.append(0)
+                continue
+            feature = int(features[0])
+            count = int(self._postings.indptr[feature + 1] - self._postings.indptr[feature])
+            if self._pending_rows:
+                count += int(np.count_nonzero(self._get_pending_matrix().indices == feature))
+            counts.append(count)
+        return counts
+
+    def load(self) -> bool:
+        """
+        Load the index from disk.
+
+        Returns:
+            True if a compatible index file was loaded
+        """
+        if not self.index_path.exists():
+            return False
+
+        try:
+            with np.load(self.index_path, allow_pickle=False) as data:
+                if (int(data["format_version"]) != self.FORMAT_VERSION
+                        or int(data["n_features"]) != self.n_features):
+                    return False
+
+                docs = sparse.csr_matrix(
+                    (data["data"], data["indices"], data["indptr"]),
+                    shape=tuple(data["shape"])
+                )
+                ids = data["ids"].tolist()
+                category_names = data["category_names"].tolist()
+                category_codes = data["category_codes"].astype(np.int32)
+                created_at = data["created_at"].astype(np.float64)
+
+        except Exception as e:
+            print(f"Error loading similarity index: {e}")
+            return False
+
+        self._reset()
+        self._categories = {name: code for code, name in enumerate(category_names)}
+        self._set_merged(docs, ids, category_codes, created_at, np.ones(len(ids), dtype=bool))
+        return True
+
+    def save(self) -> None:
+        """Persist the index atomically next to the incident database."""
+        self.write_snapshot(self.snapshot())
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """
+        Capture the index contents for persistence.
+
+        Must run on the thread that mutates the index; the returned arrays
+        are never modified afterwards, so ``write_snapshot`` can run in a
+        worker thread while new incidents keep arriving.
+        """
+        self._merge(force_compaction=True)
+        self._unsaved_changes = 0
+
+        category_names = sorted(self._categories, key=self._categories.get)
+        return {
+            "format_version": np.int64(self.FORMAT_VERSION),
+            "n_features": np.int64(self.n_features),
+            "data": self._docs.data,
+            "indices": self._docs.indices,
+            "indptr": self._docs.indptr,
+            "shape": np.asarray(self._docs.shape, dtype=np.int64),
+            "ids": np.asarray(self._ids, dtype=str),
+            "category_names": np.asarray(category_names, dtype=str),
+            "category_codes": self._category_codes,
+            "created_at": self._created_at,
+        }
+
+    def write_snapshot(self, snapshot: Dict[str, np.ndarray]) -> None:
+        """Write a snapshot to ``index_path`` via an atomic rename."""
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **snapshot)
+        os.replace(tmp_path, self.index_path)
+
+    def _reset(self) -> None:
+        """Clear all index state."""
+        empty = sparse.csr_matrix((0, self.n_features), dtype=np.float32)
+        self._categories: Dict[str, int] = {}
+        self._row_of: Dict[str, int] = {}
+        self._set_merged(
+            empty, [], np.empty(0, dtype=np.int32),
+            np.empty(0, dtype=np.float64), np.empty(0, dtype=bool)
+        )
+        self._clear_pending()
+        self._unsaved_changes = 0
+
+    def _set_merged(
+        self,
+        docs: sparse.csr_matrix,
+        ids: List[str],
+        category_codes: np.ndarray,
+        created_at: np.ndarray,
+        active: np.ndarray
+    ) -> None:
+        """Install a new merged segment and rebuild its inverted index."""
+        self._docs = docs
+        self._postings = docs.T.tocsr()
+        self._ids = ids
+        self._category_codes = category_codes
+        self._created_at = created_at
+        self._active = active
+        self._merged_rows = docs.shape[0]
+        self._row_of = {
+            incident_id: row for row, incident_id in enumerate(ids) if active[row]
+        }
+
+    def _clear_pending(self) -> None:
+        self._pending_vectors: List[sparse.csr_matrix] = []
+        self._pending_ids: List[str] = []
+        self._pending_categories: List[int] = []
+        self._pending_created: List[float] = []
+        self._pending_active: List[bool] = []
+        self._pending_rows = 0
+        self._pending_matrix = None
+
+    def _merge(self, force_compaction: bool = False) -> None:
+        """Fold pending rows into the merged segment, dropping deleted rows."""
+        if not self._pending_rows and not force_compaction:
+            return
+
+        docs = sparse.vstack([self._docs, *self._pending_vectors], format="csr")
+        ids = self._ids + self._pending_ids
+        category_codes = np.concatenate([
+            self._category_codes, np.asarray(self._pending_categories, dtype=np.int32)
+        ])
+        created_at = np.concatenate([
+            self._created_at, np.asarray(self._pending_created, dtype=np.float64)
+        ])
+        active = np.concatenate([
+            self._active, np.asarray(self._pending_active, dtype=bool)
+        ])
+
+        # Compact once deleted/replaced rows make up a meaningful share
+        deleted = len(active) - int(active.sum())
+        if deleted and (force_compaction or deleted > 0.2 * len(active)):
+            keep = np.flatnonzero(active)
+            docs = docs[keep]
+            ids = [ids[row] for row in keep]
+            category_codes = category_codes[keep]
+            created_at = created_at[keep]
+            active = np.ones(len(keep), dtype=bool)
+
+        self._clear_pending()
+        self._set_merged(docs, ids, category_codes, created_at, active)
+
+    def _deactivate(self, incident_id: str) -> bool:
+        """Tombstone the current row for an incident, if any."""
+        row = self._row_of.get(incident_id)
+        if row is None:
+            return False
+
+        if row < self._merged_rows:
+            self._active[row] = False
+        else:
+            self._pending_active[row - self._merged_rows] = False
+        return True
+
+    def _get_pending_matrix(self) -> sparse.csr_matrix:
+        if self._pending_matrix is None:
+            self._pending_matrix = sparse.vstack(self._pending_vectors, format="csr")
+        return self._pending_matrix
+
+    def _incident_id_at(self, row: int) -> str:
+        if row < self._merged_rows:
+            return self._ids[row]
+        return self._pending_ids[row - self._merged_rows]
+
+    def _category_code(self, category: Optional[str]) -> int:
+        if category is None:
+            return -1
+        if category not in self._categories:
+            self._categories[category] = len(self._categories)
+        return self._categories[category]
@@ -0,0 +1,201 @@
+"""
+TTL Store for Security Incident Triage Agent.
+
+Bounded in-process key-value store with per-entry expiry and LRU eviction,
+used as the SessionManager fallback when Redis is unavailable.
+"""
+
+import heapq
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a JSON-like value in bytes."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+class TTLStore:
+    """
+    In-memory store with per-entry TTL and LRU eviction.
+
+    Entries live in an OrderedDict kept in recency order, so get, set and
+    eviction of the least recently used entry are all O(1). Expiry times go
+    into a min-heap; expired entries are removed lazily on access and by
+    popping the heap head on every write, so no full scan is ever needed.
+    Replaced heap items are skipped when popped and the heap is rebuilt
+    once stale items outnumber live ones.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        default_ttl_seconds: Optional[float] = None,
+        on_evict: Optional[Callable[[str, Any, str], None]] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max(1, max_entries)
+        self.default_ttl_seconds = default_ttl_seconds
+        self.on_evict = on_evict
+        self.sizeof = sizeof
+        self.clock = clock
+
+        # key -> (value, expires_at, size_bytes)
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._memory_bytes = 0
+
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "expirations": 0,
+            "evictions": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > self.clock())
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated size of all stored values."""
+        return self._memory_bytes
+
+    def get(self, key: str, default: Any = None, touch: bool = True) -> Any:
+        """
+        Get a value, marking it most recently used.
+
+        Args:
+            key: Entry key
+            default: Value returned for missing or expired entries
+            touch: Whether to update LRU recency
+
+        Returns:
+            Stored value or default
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return default
+
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= self.clock():
+            self._remove(key, "expired")
+            self.stats["misses"] += 1
+            return default
+
+        if touch:
+            self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a value, replacing any existing entry and resetting its TTL.
+
+        Args:
+            key: Entry key
+            value: Value to store
+            ttl_seconds: Time to live; defaults to default_ttl_seconds
+        """
+        if ttl_seconds is None:
+            ttl_seconds = self.default_ttl_seconds
+
+        now = self.clock()
+        expires_at = now + ttl_seconds if ttl_seconds is not None else None
+        size = self.sizeof(value)
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous[2]
+
+        self._entries[key] = (value, expires_at, size)
+        self._memory_bytes += size
+        self.stats["sets"] += 1
+
+        if expires_at is not None:
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+
+        self._expire_due(now)
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key, "evicted")
+
+        if len(self._expiry_heap) > 2 * len(self._entries) + 64:
+            self._rebuild_heap()
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Remove an entry and return its value."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self._memory_bytes -= entry[2]
+        return entry[0]
+
+    def purge_expired(self) -> int:
+        """Remove all expired entries, returning how many were removed."""
+        before = self.stats["expirations"]
+        self._expire_due(self.clock())
+        return self.stats["expirations"] - before
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate over live entries from least to most recently used."""
+        now = self.clock()
+        for key, (value, expires_at, _) in list(self._entries.items()):
+            if expires_at is None or expires_at > now:
+                yield key, value
+
+    def clear(self) -> None:
+        """Remove all entries without invoking eviction callbacks."""
+        self._entries.clear()
+        self._expiry_heap.clear()
+        self._memory_bytes = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Size, memory and hit-rate metrics for monitoring."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "memory_bytes": self._memory_bytes,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            **self.stats,
+        }
+
+    def _expire_due(self, now: float) -> None:
+        """Pop heap items that are due and drop their entries if still current."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == expires_at:
+                self._remove(key, "expired")
+
+    def _rebuild_heap(self) -> None:
+        """Drop heap items for replaced or removed entries."""
+        self._expiry_heap = [
+            (expires_at, key)
+            for key, (_, expires_at, _) in self._entries.items()
+            if expires_at is not None
+        ]
+        heapq.heapify(self._expiry_heap)
+
+    def _remove(self, key: str, reason: str) -> None:
+        value, _, size = self._entries.pop(key)
+        self._memory_bytes -= size
+        self.stats["expirations" if reason == "expired" else "evictions"] += 1
+
+        if self.on_evict:
+            self.on_evict(key, value, reason)
@@ -0,0 +1,376 @@
+"""
+Embedding Backends and Cache for the Hotel Policy Knowledge Base.
+
+Provides a persistent, content-addressed cache in front of any embedding
+function, so repeated policy lookups and re-ingested chunks are embedded once,
+and local CPU-only backends so retrieval works offline without a round trip
+to the OpenAI embeddings API.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+
+
+_CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS embedding_cache (
+        cache_key TEXT PRIMARY KEY,
+        namespace TEXT NOT NULL,
+        dimensions INTEGER NOT NULL,
+        vector BLOB NOT NULL,
+        created_at REAL NOT NULL
+    )
+"""
+
+_INSERT_ENTRY_SQL = """
+    INSERT OR REPLACE INTO embedding_cache (cache_key, namespace, dimensions, vector, created_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_BATCH = 500
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed store of embedding vectors keyed by content hash.
+
+    Vectors are stored as float32 blobs. A small in-process LRU serves hot
+    entries (repeated queries) without touching SQLite. The store is used
+    from executor threads, so access is serialised with a lock.
+    """
+
+    def __init__(self, db_path: Union[str, Path], memory_entries: int = 1024):
+        self.db_path = Path(db_path)
+        self.memory_entries = max(0, memory_entries)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_CREATE_TABLE_SQL)
+        self._conn.commit()
+
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "errors": 0,
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> str:
+        """
+        Build the cache key for a text.
+
+        Args:
+            namespace: Embedding model identity, e.g. "openai:text-embedding-ada-002:document"
+            text: Text to embed
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        return hashlib.sha256(f"{namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors.
+
+        Args:
+            keys: Cache keys from make_key
+
+        Returns:
+            Mapping of found keys to vectors
+        """
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            self.stats["memory_hits"] += len(found)
+
+            try:
+                for start in range(0, len(missing), _LOOKUP_BATCH):
+                    batch = missing[start:start + _LOOKUP_BATCH]
+                    rows = self._conn.execute(
+                        "SELECT cache_key, vector FROM embedding_cache WHERE cache_key IN "
+                        f"({','.join('?' * len(batch))})",
+                        batch
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32).tolist()
+                        found[key] = vector
+                        self._remember(key, vector)
+                        self.stats["disk_hits"] += 1
+            except Exception as e:
+                print(f"Error reading embedding cache: {e}")
+                self.stats["errors"] += 1
+
+            self.stats["misses"] += len(keys) - len(found)
+        return found
+
+    def put_many(self, namespace: str, entries: Sequence[Tuple[str, List[float]]]) -> bool:
+        """
+        Store vectors in one transaction.
+
+        Args:
+            namespace: Embedding model identity, kept for inspection
+            entries: (cache key, vector) pairs
+
+        Returns:
+            Success status
+        """
+        now = time.time()
+        rows = [
+            (key, namespace, len(vector), np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in entries
+        ]
+        with self._lock:
+            for key, vector in entries:
+                self._remember(key, list(vector))
+            try:
+                with self._conn:
+                    self._conn.executemany(_INSERT_ENTRY_SQL, rows)
+            except Exception as e:
+                print(f"Error writing embedding cache: {e}")
+                self.stats["errors"] += 1
+                return False
+
+            self.stats["stores"] += len(rows)
+        return True
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        if not self.memory_entries:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embedding function that consults an EmbeddingCache before its backend.
+
+    Documents are deduplicated, looked up in one pass and only the misses
+    are sent to the backend, in batches of ``batch_size``. Queries and
+    documents are cached under separate namespaces, since some local models
+    embed them differently.
+    """
+
+    def __init__(
+        self,
+        backend: Embeddings,
+        cache: EmbeddingCache,
+        namespace: str,
+        batch_size: int = 64
+    ):
+        self.backend = backend
+        self.cache = cache
+        self.namespace = namespace
+        self.batch_size = max(1, batch_size)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, calling the backend only for uncached texts."""
+        namespace = f"{self.namespace}:document"
+        keys = [EmbeddingCache.make_key(namespace, text) for text in texts]
+        vectors = self.cache.get_many(list(dict.fromkeys(keys)))
+
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                pending.setdefault(key, text)
+
+        pending_items = list(pending.items())
+        for start in range(0, len(pending_items), self.batch_size):
+            batch = pending_items[start:start + self.batch_size]
+            embedded = self.backend.embed_documents([text for _, text in batch])
+            entries = [(key, list(vector)) for (key, _), vector in zip(batch, embedded)]
+            self.cache.put_many(namespace, entries)
+            vectors.update(entries)
+
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, serving repeated queries from the cache."""
+        namespace = f"{self.namespace}:query"
+        key = EmbeddingCache.make_key(namespace, text)
+        cached = self.cache.get_many([key])
+        if key in cached:
+            return cached[key]
+
+        vector = list(self.backend.embed_query(text))
+        self.cache.put_many(namespace, [(key, vector)])
+        return vector
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """
+    Local CPU embedding backend over a sentence-transformers model directory.
+
+    The model is loaded from ``model_path`` only, so no network access is
+    needed. Requires the optional ``sentence-transformers`` package.
+    """
+
+    def __init__(self, model_path: str, batch_size: int = 32, normalize: bool = True):
+        if not os.path.isdir(model_path):
+            raise ValueError(f"Local embedding model not found: {model_path}")
+
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "The local embedding backend requires sentence-transformers "
+                "(pip install sentence-transformers)"
+            ) from e
+
+        self.model_path = model_path
+        self.batch_size = batch_size
+        self.normalize = normalize
+        self.model = SentenceTransformer(model_path, device="cpu")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=self.normalize,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Dependency-light local embedding backend using feature hashing.
+
+    Maps word unigrams and bigrams into ``dimensions`` buckets and
+    L2-normalises the result. It needs no model files, which makes it a
+    deterministic offline fallback, at lower semantic quality than a
+    trained model.
+    """
+
+    def __init__(self, dimensions: int = 1024):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.dimensions = dimensions
+        self.vectorizer = HashingVectorizer(
+            n_features=dimensions,
+            ngram_range=(1, 2),
+            stop_words="english",
+            alternate_sign=False,
+            norm="l2",
+            dtype=np.float32
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self.vectorizer.transform(texts).toarray().tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def _openai_backend(openai_api_key: Optional[str] = None,
+                    embedding_model: str = "text-embedding-ada-002",
+                    **_: object) -> Tuple[Embeddings, str]:
+    from langchain.embeddings import OpenAIEmbeddings
+
+    return (
+        OpenAIEmbeddings(openai_api_key=openai_api_key, model=embedding_model),
+        f"openai:{embedding_model}"
+    )
+
+
+def _local_backend(local_model_path: Optional[str] = None, **_: object) -> Tuple[Embeddings, str]:
+    if not local_model_path:
+        raise ValueError("local_model_path is required for the local embedding backend")
+    backend = SentenceTransformerEmbeddings(local_model_path)
+    return backend, f"local:{os.path.basename(os.path.normpath(local_model_path))}"
+
+
+def _hashing_backend(hashing_dimensions: int = 1024, **_: object) -> Tuple[Embeddings, str]:
+    return HashingEmbeddings(hashing_dimensions), f"hashing:{hashing_dimensions}"
+
+
+# Embedding backends by name; each factory returns (embeddings, cache namespace)
+EMBEDDING_BACKENDS: Dict[str, Callable[..., Tuple[Embeddings, str]]] = {
+    "openai": _openai_backend,
+    "local": _local_backend,
+    "hashing": _hashing_backend,
+}
+
+
+def create_embedding_backend(backend: str = "openai", **options: object) -> Tuple[Embeddings, str]:
+    """
+    Create an uncached embedding backend.
+
+    Args:
+        backend: Name of a registered backend ("openai", "local" or "hashing")
+        **options: Backend options (openai_api_key, embedding_model,
+            local_model_path, hashing_dimensions)
+
+    Returns:
+        (embeddings, namespace) where the namespace identifies the model
+        for caches and snapshots
+    """
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(
+            f"Unknown embedding backend '{backend}'; expected one of {sorted(EMBEDDING_BACKENDS)}"
+        )
+    return EMBEDDING_BACKENDS[backend](**options)
+
+
+def create_embeddings(
+    backend: str = "openai",
+    cache_path: Optional[Union[str, Path]] = None,
+    batch_size: int = 64,
+    **options: object
+) -> Embeddings:
+    """
+    Create an embedding function, optionally behind a persistent cache.
+
+    Args:
+        backend: Name of a registered backend ("openai", "local" or "hashing")
+        cache_path: SQLite file for the embedding cache; no caching if omitted
+        batch_size: Texts per backend call when embedding documents
+        **options: Backend options (openai_api_key, embedding_model,
+            local_model_path, hashing_dimensions)
+
+    Returns:
+        Embeddings instance
+    """
+    embeddings, namespace = create_embedding_backend(backend, **options)
+    if cache_path is None:
+        return embeddings
+    return CachedEmbeddings(embeddings, EmbeddingCache(cache_path), namespace, batch_size)
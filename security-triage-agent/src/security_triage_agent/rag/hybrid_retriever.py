@@ -0,0 +1,247 @@
+"""
+Hybrid Policy Retrieval for the Hotel Policy Knowledge Base.
+
+Combines a local BM25 keyword index over policy chunks with vector similarity
+results through reciprocal-rank fusion, and optionally reranks the fused
+candidates with a cheap local score: the IDF-weighted share of query terms a
+chunk (with its policy title and tags) covers. Retrieval runs in process and
+needs at most one embedding call per query, instead of an LLM call per
+candidate chunk.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Words that carry no retrieval signal in policy text or queries
+STOPWORDS = frozenset("""
+    a an and are as at be by for from has have if in into is it its of on or our
+    please should that the their then there these this to was we were what when
+    which who will with within you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def document_key(document: Any) -> Hashable:
+    """Identify a policy chunk by document id and chunk index, falling back to its text."""
+    metadata = getattr(document, "metadata", None) or {}
+    if "document_id" in metadata:
+        return (metadata["document_id"], metadata.get("chunk_index", 0))
+    return document.page_content
+
+
+class BM25Index:
+    """
+    Okapi BM25 inverted index.
+
+    Postings map each term to the documents containing it with their term
+    frequency, so a query only touches the postings of its own terms.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[Hashable, int]] = {}
+        self.doc_lengths: Dict[Hashable, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.doc_lengths
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index a document, replacing any previous version under the same key."""
+        if key in self.doc_lengths:
+            self.remove(key)
+
+        tokens = tokenize(text)
+        for term, count in Counter(tokens).items():
+            self.postings.setdefault(term, {})[key] = count
+        self.doc_lengths[key] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, key: Hashable) -> None:
+        """Drop a document from the index."""
+        length = self.doc_lengths.pop(key, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in [term for term, docs in self.postings.items() if key in docs]:
+            del self.postings[term][key]
+            if not self.postings[term]:
+                del self.postings[term]
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency, always positive."""
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.doc_lengths) - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[Hashable, float]]:
+        """
+        Score documents against a query.
+
+        Args:
+            query: Free-text query
+            k: Maximum number of results
+
+        Returns:
+            (key, score) pairs, best first
+        """
+        if not self.doc_lengths:
+            return []
+
+        average_length = self._total_length / len(self.doc_lengths) or 1.0
+        scores: Dict[Hashable, float] = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = self.idf(term)
+            for key, tf in docs.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[key] / average_length)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None
+) -> List[Tuple[Hashable, float]]:
+    """
+    Fuse ranked lists with reciprocal-rank fusion.
+
+    Args:
+        rankings: Ranked lists of keys, best first
+        k: Rank offset damping the weight of top positions
+        weights: Optional weight per ranking
+
+    Returns:
+        (key, fused score) pairs, best first
+    """
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[Hashable, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridPolicyRetriever:
+    """
+    BM25 + vector retriever over policy chunks with reciprocal-rank fusion.
+
+    ``vector_search`` is any callable returning documents for (query, k),
+    such as a vector store's ``similarity_search``; without one the
+    retriever runs on keywords alone. With ``rerank`` the fused candidates
+    are reordered by local term coverage, using the fused score as a
+    tie-breaker.
+    """
+
+    def __init__(
+        self,
+        documents: Iterable[Any] = (),
+        vector_search: Optional[Callable[[str, int], List[Any]]] = None,
+        candidates: int = 10,
+        rrf_k: int = 60,
+        rerank: bool = True
+    ):
+        self.vector_search = vector_search
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self.rerank = rerank
+
+        self.index = BM25Index()
+        self.documents: Dict[Hashable, Any] = {}
+        # Chunk tokens plus the policy title and tags, for coverage scoring
+        self._coverage_tokens: Dict[Hashable, frozenset] = {}
+        self.add_documents(documents)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add_documents(self, documents: Iterable[Any]) -> None:
+        """Index policy chunks for keyword retrieval."""
+        for document in documents:
+            key = document_key(document)
+            metadata = document.metadata or {}
+            context = " ".join([metadata.get("title", ""), *metadata.get("tags", [])])
+            self.documents[key] = document
+            self.index.add(key, f"{context} {document.page_content}")
+            self._coverage_tokens[key] = frozenset(tokenize(f"{context} {document.page_content}"))
+
+    def retrieve(self, query: str, max_results: int) -> List[Tuple[Any, float]]:
+        """
+        Retrieve the best policy chunks for a query.
+
+        Args:
+            query: Free-text query
+            max_results: Maximum number of chunks
+
+        Returns:
+            (document, fused score) pairs, best first
+        """
+        keyword_ranking = [key for key, _ in self.index.search(query, self.candidates)]
+        rankings = [keyword_ranking]
+
+        if self.vector_search is not None:
+            vector_ranking = []
+            for document in self.vector_search(query, self.candidates):
+                key = document_key(document)
+                # Chunks only known to the vector store still take part in fusion
+                self.documents.setdefault(key, document)
+                vector_ranking.append(key)
+            rankings.append(vector_ranking)
+
+        fused = reciprocal_rank_fusion(rankings, k=self.rrf_k)
+        if self.rerank:
+            query_terms = set(tokenize(query))
+            fused.sort(
+                key=lambda item: (round(self.coverage(item[0], query_terms), 6), item[1]),
+                reverse=True
+            )
+
+        return [(self.documents[key], score) for key, score in fused[:max_results]]
+
+    def relevance(self, document: Any, query: str) -> float:
+        """
+        Local relevance of a chunk to a query, between 0 and 1.
+
+        Args:
+            document: Policy chunk
+            query: Free-text query
+
+        Returns:
+            Share of query terms the chunk, its policy title or tags contain
+        """
+        return self.coverage(document_key(document), set(tokenize(query)), document, weighted=False)
+
+    def coverage(
+        self,
+        key: Hashable,
+        query_terms: Iterable[str],
+        document: Optional[Any] = None,
+        weighted: bool = True
+    ) -> float:
+        """Share of query terms found in an indexed (or given) chunk, IDF-weighted by default."""
+        tokens = self._coverage_tokens.get(key)
+        if tokens is None:
+            document = document or self.documents[key]
+            tokens = frozenset(tokenize(document.page_content))
+
+        weights = {term: self.index.idf(term) if weighted else 1.0 for term in query_terms}
+        total = sum(weights.values())
+        if not total:
+            return 0.0
+        return sum(weight for term, weight in weights.items() if term in tokens) / total
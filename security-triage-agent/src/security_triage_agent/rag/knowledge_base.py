@@ -6,23 +6,28 @@ the security agent with real-time access to hotel policies, procedures, and
 compliance guidelines for informed decision-making.
 """
 
+import argparse
 import asyncio
 import json
 import logging
 import os
+import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from uuid import uuid4
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.vectorstores import Chroma
-from langchain.embeddings import OpenAIEmbeddings
 from langchain.schema import Document
 from langchain.retrievers import ContextualCompressionRetriever
 from langchain.retrievers.document_compressors import LLMChainExtractor
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
+from .embeddings import CachedEmbeddings, EmbeddingCache, create_embedding_backend
+from .hybrid_retriever import HybridPolicyRetriever
+from .policy_snapshot import PolicySnapshot, SnapshotError, build_snapshot
+
 
 class PolicyDocument(BaseModel):
     """Hotel policy document model"""
@@ -62,44 +67,134 @@ class HotelPolicyKnowledgeBase:
     RAG-powered knowledge base for hotel security policies and procedures.
     
     Provides contextual policy retrieval for autonomous decision-making in
-    security incident response scenarios.
+    security incident response scenarios. Retrieval fuses a local BM25 index
+    with vector similarity results; LLM contextual compression of the
+    retrieved chunks is opt-in through ``use_compression``. Embeddings come
+    from OpenAI or a local CPU backend (``embedding_backend``) and are cached
+    on disk by content hash, unless ``embedding_cache_path`` is empty.
     """
     
     def __init__(self, 
                  openai_api_key: str,
                  vector_store_path: str = "./knowledge_base_store",
-                 embedding_model: str = "text-embedding-ada-002"):
-        
+                 embedding_model: str = "text-embedding-ada-002",
+                 use_compression: bool = False,
+                 rerank: bool = True,
+                 embedding_backend: str = "openai",
+                 local_model_path: Optional[str] = None,
+                 embedding_cache_path: Optional[str] = None,
+                 snapshot_path: Optional[str] = None):
+        
+        # Construction only records settings; stores, models and policies
+        # are loaded by initialize(), on first use at the latest
         self.logger = logging.getLogger(__name__)
+        self.openai_api_key = openai_api_key
         self.vector_store_path = vector_store_path
+        self.embedding_model = embedding_model
+        self.use_compression = use_compression
+        self.embedding_backend = embedding_backend
+        self.local_model_path = local_model_path
+        self.snapshot_path = snapshot_path
+        
+        # Embeddings are cached next to the vector store by default
+        if embedding_cache_path is None:
+            embedding_cache_path = f"{vector_store_path.rstrip('/')}_embedding_cache.sqlite"
+        self.embedding_cache_path = embedding_cache_path
+        
+        self.embeddings = None
+        self.llm = None
+        self.text_splitter = None
+        self.vector_store = None
+        self.retriever = None
+        self.snapshot: Optional[PolicySnapshot] = None
+        self.hybrid_retriever = HybridPolicyRetriever(rerank=rerank)
         
-        # Initialize embeddings and LLM
-        self.embeddings = OpenAIEmbeddings(
-            openai_api_key=openai_api_key,
-            model=embedding_model
-        )
+        self.initialized = False
+        self.startup_seconds: Optional[float] = None
+        self._init_lock = asyncio.Lock()
+    
+    async def initialize(self) -> bool:
+        """
+        Load the knowledge base without blocking the event loop.
+        
+        Uses the prebuilt policy snapshot when one is configured and
+        compatible; otherwise opens the vector store and loads the default
+        policies. Safe to call repeatedly and concurrently.
         
-        self.llm = ChatOpenAI(
-            openai_api_key=openai_api_key,
-            model="gpt-3.5-turbo",
-            temperature=0.0
+        Returns:
+            True if retrieval is served from the snapshot
+        """
+        
+        if self.initialized:
+            return self.snapshot is not None
+        
+        async with self._init_lock:
+            if not self.initialized:
+                started = time.perf_counter()
+                await asyncio.get_event_loop().run_in_executor(None, self._initialize_sync)
+                self.startup_seconds = time.perf_counter() - started
+                self.initialized = True
+                self.logger.info(
+                    f"Knowledge base initialized from "
+                    f"{'snapshot ' + self.snapshot.version if self.snapshot else 'vector store'} "
+                    f"in {self.startup_seconds * 1000:.1f}ms"
+                )
+        
+        return self.snapshot is not None
+    
+    def _initialize_sync(self):
+        """Create embeddings, then load the snapshot or fall back to the vector store"""
+        
+        backend, namespace = create_embedding_backend(
+            self.embedding_backend,
+            openai_api_key=self.openai_api_key,
+            embedding_model=self.embedding_model,
+            local_model_path=self.local_model_path
         )
+        self.embeddings = backend
+        if self.embedding_cache_path:
+            self.embeddings = CachedEmbeddings(backend, EmbeddingCache(self.embedding_cache_path), namespace)
+        
+        # Compression needs the vector store retriever, so it bypasses the snapshot
+        if self.snapshot_path and not self.use_compression:
+            try:
+                self._load_snapshot(namespace)
+                return
+            except SnapshotError as e:
+                self.logger.warning(f"Policy snapshot unavailable, using vector store: {e}")
+        
+        if self.use_compression:
+            self.llm = ChatOpenAI(
+                openai_api_key=self.openai_api_key,
+                model="gpt-3.5-turbo",
+                temperature=0.0
+            )
         
         # Initialize text splitter for document processing
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            separators=["\n\n", "\n", " ", ""]
-        )
+        self.text_splitter = create_policy_text_splitter()
         
-        # Initialize or load vector store
-        self.vector_store = None
-        self.retriever = None
         self._initialize_vector_store()
         
         # Load hotel policies if not already loaded
         self._load_default_policies()
     
+    def _load_snapshot(self, embedding_namespace: str):
+        """Serve retrieval from a memory-mapped policy snapshot"""
+        
+        snapshot = PolicySnapshot.load(self.snapshot_path, embedding_namespace)
+        documents = [
+            Document(page_content=chunk["content"], metadata=chunk["metadata"])
+            for chunk in snapshot.chunks
+        ]
+        
+        def vector_search(query: str, k: int) -> List[Document]:
+            matches = snapshot.search(self.embeddings.embed_query(query), k)
+            return [documents[index] for index, _ in matches]
+        
+        self.hybrid_retriever.add_documents(documents)
+        self.hybrid_retriever.vector_search = vector_search
+        self.snapshot = snapshot
+    
     def _initialize_vector_store(self):
         """Initialize the vector store for policy documents"""
         try:
@@ -118,23 +213,35 @@ class HotelPolicyKnowledgeBase:
                 )
                 self.logger.info("Created new vector store")
             
-            # Set up the retriever with compression
-            base_retriever = self.vector_store.as_retriever(
-                search_type="similarity",
-                search_kwargs={"k": 10}
-            )
+            # Fuse vector similarity with the local BM25 index
+            self.hybrid_retriever.vector_search = self.vector_store.similarity_search
+            self._index_stored_chunks()
             
-            # Add contextual compression for better results
-            compressor = LLMChainExtractor.from_llm(self.llm)
-            self.retriever = ContextualCompressionRetriever(
-                base_compressor=compressor,
-                base_retriever=base_retriever
-            )
+            # Contextual compression costs an LLM call per candidate chunk
+            if self.use_compression:
+                base_retriever = self.vector_store.as_retriever(
+                    search_type="similarity",
+                    search_kwargs={"k": 10}
+                )
+                compressor = LLMChainExtractor.from_llm(self.llm)
+                self.retriever = ContextualCompressionRetriever(
+                    base_compressor=compressor,
+                    base_retriever=base_retriever
+                )
             
         except Exception as e:
             self.logger.error(f"Failed to initialize vector store: {e}")
             raise
     
+    def _index_stored_chunks(self):
+        """Build the BM25 index from chunks already in the vector store"""
+        
+        stored = self.vector_store.get(include=["documents", "metadatas"])
+        self.hybrid_retriever.add_documents(
+            Document(page_content=content, metadata=metadata or {})
+            for content, metadata in zip(stored.get("documents") or [], stored.get("metadatas") or [])
+        )
+    
     def _load_default_policies(self):
         """Load default hotel security policies into the knowledge base"""
         
@@ -146,32 +253,13 @@ class HotelPolicyKnowledgeBase:
             return
         
         # Load policies into vector store
-        documents = []
-        for policy in default_policies:
-            # Split policy content into chunks
-            chunks = self.text_splitter.split_text(policy.content)
-            
-            for i, chunk in enumerate(chunks):
-                doc = Document(
-                    page_content=chunk,
-                    metadata={
-                        "document_id": policy.document_id,
-                        "title": policy.title,
-                        "category": policy.category,
-                        "version": policy.version,
-                        "compliance_level": policy.compliance_level,
-                        "applicable_properties": policy.applicable_properties,
-                        "tags": policy.tags,
-                        "chunk_index": i,
-                        "total_chunks": len(chunks)
-                    }
-                )
-                documents.append(doc)
+        documents = split_policy_documents(default_policies, self.text_splitter)
         
-        # Add documents to vector store
+        # Add documents to vector store and the keyword index
         if documents:
             self.vector_store.add_documents(documents)
             self.vector_store.persist()
+            self.hybrid_retriever.add_documents(documents)
             
             self.logger.info(f"Loaded {len(documents)} policy document chunks into knowledge base")
     
@@ -187,16 +275,22 @@ class HotelPolicyKnowledgeBase:
         """
         
         try:
+            await self.initialize()
+            
             # Enhance query with context
             enhanced_query = self._enhance_query_context(query)
             
             # Retrieve relevant documents
             documents = await self._retrieve_documents(enhanced_query, query.max_results)
             
-            # Filter by similarity threshold
+            # Score each document once and filter by similarity threshold
+            scored_docs = [
+                (doc, self._calculate_relevance_score(doc, query.query_text))
+                for doc in documents
+            ]
             filtered_docs = [
-                doc for doc in documents 
-                if self._calculate_relevance_score(doc, query.query_text) >= query.similarity_threshold
+                (doc, score) for doc, score in scored_docs
+                if score >= query.similarity_threshold
             ]
             
             # Prepare retrieval metadata
@@ -206,16 +300,17 @@ class HotelPolicyKnowledgeBase:
                 "total_candidates": len(documents),
                 "filtered_results": len(filtered_docs),
                 "similarity_threshold": query.similarity_threshold,
-                "retrieval_method": "contextual_compression"
+                "retrieval_method": "contextual_compression" if self.retriever else "hybrid_rrf",
+                "snapshot_version": self.snapshot.version if self.snapshot else None
             }
             
             # Format results
             formatted_docs = []
-            for doc in filtered_docs:
+            for doc, score in filtered_docs:
                 formatted_docs.append({
                     "content": doc.page_content,
                     "metadata": doc.metadata,
-                    "relevance_score": self._calculate_relevance_score(doc, query.query_text)
+                    "relevance_score": score
                 })
             
             self.logger.info(f"Retrieved {len(formatted_docs)} relevant policy documents")
@@ -351,14 +446,21 @@ class HotelPolicyKnowledgeBase:
         return " ".join(enhanced_parts)
     
     async def _retrieve_documents(self, query: str, max_results: int) -> List[Document]:
-        """Retrieve documents using the contextual compression retriever"""
+        """Retrieve documents with hybrid BM25 + vector retrieval, or compression if enabled"""
         
         try:
-            # Use the compressed retriever for better results
-            documents = await asyncio.get_event_loop().run_in_executor(
-                None, 
-                lambda: self.retriever.get_relevant_documents(query)
-            )
+            if self.retriever is not None:
+                documents = await asyncio.get_event_loop().run_in_executor(
+                    None, 
+                    lambda: self.retriever.get_relevant_documents(query)
+                )
+            else:
+                # The vector search embeds the query, so keep it off the event loop
+                ranked = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    lambda: self.hybrid_retriever.retrieve(query, max_results)
+                )
+                documents = [doc for doc, _ in ranked]
             
             return documents[:max_results]
             
@@ -367,16 +469,10 @@ class HotelPolicyKnowledgeBase:
             return []
     
     def _calculate_relevance_score(self, document: Document, query: str) -> float:
-        """Calculate relevance score for a document (simplified implementation)"""
-        
-        # Simple keyword-based relevance scoring
-        # In production, this would use more sophisticated similarity metrics
+        """Calculate relevance score for a document"""
         
-        doc_content = document.page_content.lower()
-        query_terms = query.lower().split()
-        
-        matches = sum(1 for term in query_terms if term in doc_content)
-        score = matches / len(query_terms) if query_terms else 0
+        # IDF-weighted share of query terms covered by the chunk and its policy title/tags
+        score = self.hybrid_retriever.relevance(document, query)
         
         # Boost score for high-compliance documents
         if document.metadata.get("compliance_level") == "mandatory":
@@ -384,7 +480,8 @@ class HotelPolicyKnowledgeBase:
         
         return min(score, 1.0)
     
-    def _get_default_policy_documents(self) -> List[PolicyDocument]:
+    @staticmethod
+    def _get_default_policy_documents() -> List[PolicyDocument]:
         """Get default hotel security policy documents"""
         
         return [
@@ -634,10 +731,128 @@ class HotelPolicyKnowledgeBase:
         ]
 
 
+def create_policy_text_splitter() -> RecursiveCharacterTextSplitter:
+    """Text splitter used to chunk policy documents"""
+    
+    return RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=200,
+        separators=["\n\n", "\n", " ", ""]
+    )
+
+
+def split_policy_documents(policies: List[PolicyDocument],
+                           text_splitter: Optional[RecursiveCharacterTextSplitter] = None) -> List[Document]:
+    """Split policies into chunk documents carrying the policy metadata"""
+    
+    text_splitter = text_splitter or create_policy_text_splitter()
+    documents = []
+    for policy in policies:
+        # Split policy content into chunks
+        chunks = text_splitter.split_text(policy.content)
+        
+        for i, chunk in enumerate(chunks):
+            documents.append(Document(
+                page_content=chunk,
+                metadata={
+                    "document_id": policy.document_id,
+                    "title": policy.title,
+                    "category": policy.category,
+                    "version": policy.version,
+                    "compliance_level": policy.compliance_level,
+                    "applicable_properties": policy.applicable_properties,
+                    "tags": policy.tags,
+                    "chunk_index": i,
+                    "total_chunks": len(chunks)
+                }
+            ))
+    
+    return documents
+
+
 # Factory function for easy initialization
-async def create_hotel_knowledge_base(openai_api_key: str) -> HotelPolicyKnowledgeBase:
+async def create_hotel_knowledge_base(openai_api_key: str, **kwargs: Any) -> HotelPolicyKnowledgeBase:
     """Create and initialize the hotel policy knowledge base"""
     
-    knowledge_base = HotelPolicyKnowledgeBase(openai_api_key=openai_api_key)
+    knowledge_base = HotelPolicyKnowledgeBase(openai_api_key=openai_api_key, **kwargs)
+    await knowledge_base.initialize()
+    
+    return knowledge_base
+
+
+def build_policy_snapshot(snapshot_path: str,
+                          embedding_backend: str = "openai",
+                          openai_api_key: Optional[str] = None,
+                          embedding_model: str = "text-embedding-ada-002",
+                          local_model_path: Optional[str] = None,
+                          embedding_cache_path: Optional[str] = None,
+                          policies: Optional[List[PolicyDocument]] = None) -> Dict[str, Any]:
+    """
+    Chunk and embed policies into a snapshot for fast knowledge base startup.
+    
+    Args:
+        snapshot_path: Snapshot directory to (re)write
+        embedding_backend: Embedding backend the knowledge base will use
+        openai_api_key: API key for the OpenAI backend
+        embedding_model: OpenAI embedding model
+        local_model_path: Model directory for the local backend
+        embedding_cache_path: Optional embedding cache to reuse across builds
+        policies: Policies to include (the default policies if omitted)
+        
+    Returns:
+        The snapshot manifest
+    """
+    
+    backend, namespace = create_embedding_backend(
+        embedding_backend,
+        openai_api_key=openai_api_key,
+        embedding_model=embedding_model,
+        local_model_path=local_model_path
+    )
+    # Batch the chunk embeddings, reusing cached vectors for unchanged chunks
+    embeddings = CachedEmbeddings(
+        backend, EmbeddingCache(embedding_cache_path or ":memory:"), namespace
+    )
     
-    return knowledge_base
\ No newline at end of file
+    documents = split_policy_documents(
+        policies if policies is not None else HotelPolicyKnowledgeBase._get_default_policy_documents()
+    )
+    vectors = embeddings.embed_documents([doc.page_content for doc in documents])
+    chunks = [{"content": doc.page_content, "metadata": doc.metadata} for doc in documents]
+    
+    return build_snapshot(snapshot_path, chunks, vectors, namespace)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hotel policy knowledge base maintenance")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    
+    snapshot_parser = subcommands.add_parser(
+        "build-snapshot", help="Chunk and embed the default policies into a prebuilt snapshot"
+    )
+    snapshot_parser.add_argument("--output", default="data/policy_snapshot",
+                                 help="Snapshot directory")
+    snapshot_parser.add_argument("--backend", default="openai",
+                                 help="Embedding backend (openai, local or hashing)")
+    snapshot_parser.add_argument("--embedding-model", default="text-embedding-ada-002",
+                                 help="OpenAI embedding model")
+    snapshot_parser.add_argument("--local-model-path", default=None,
+                                 help="Model directory for the local backend")
+    snapshot_parser.add_argument("--embedding-cache", default=None,
+                                 help="Embedding cache file to reuse across builds")
+    args = parser.parse_args()
+    
+    manifest = build_policy_snapshot(
+        args.output,
+        embedding_backend=args.backend,
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        embedding_model=args.embedding_model,
+        local_model_path=args.local_model_path,
+        embedding_cache_path=args.embedding_cache
+    )
+    print(f"Wrote snapshot {manifest['snapshot_version']} with {manifest['chunk_count']} chunks "
+          f"({manifest['embedding_namespace']}) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Prebuilt Policy Snapshots for the Hotel Policy Knowledge Base.
+
+A snapshot is a directory holding the chunked policy corpus and its
+embeddings, produced ahead of time by the ``build-snapshot`` command of the
+knowledge base module. Loading one memory-maps the embedding matrix, so the
+knowledge base starts without a vector store, text splitting or any embedding
+of policy text.
+
+Layout:
+    manifest.json    format version, snapshot version, embedding namespace
+    chunks.json      chunk text and metadata, in matrix row order
+    embeddings.npy   float32 matrix of L2-normalised chunk embeddings
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+_MANIFEST_FILE = "manifest.json"
+_CHUNKS_FILE = "chunks.json"
+_EMBEDDINGS_FILE = "embeddings.npy"
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, corrupt or incompatible."""
+
+
+class PolicySnapshot:
+    """
+    Read-only view of a prebuilt policy snapshot.
+
+    Chunk embeddings are L2-normalised at build time, so cosine similarity
+    is a dot product against the memory-mapped matrix.
+    """
+
+    def __init__(self, manifest: Dict[str, Any], chunks: List[Dict[str, Any]], matrix: np.ndarray):
+        self.manifest = manifest
+        self.chunks = chunks
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def version(self) -> str:
+        return self.manifest["snapshot_version"]
+
+    @property
+    def embedding_namespace(self) -> str:
+        return self.manifest["embedding_namespace"]
+
+    @classmethod
+    def load(cls, path: Union[str, Path], embedding_namespace: Optional[str] = None) -> "PolicySnapshot":
+        """
+        Open a snapshot, memory-mapping its embeddings.
+
+        Args:
+            path: Snapshot directory
+            embedding_namespace: Expected embedding model identity; a
+                snapshot built with another model is rejected
+
+        Returns:
+            PolicySnapshot
+        """
+        path = Path(path)
+        try:
+            manifest = json.loads((path / _MANIFEST_FILE).read_text())
+            chunks = json.loads((path / _CHUNKS_FILE).read_text())
+            matrix = np.load(path / _EMBEDDINGS_FILE, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Cannot read policy snapshot at {path}: {e}") from e
+
+        if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError(
+                f"Policy snapshot format {manifest.get('format_version')} is not supported "
+                f"(expected {SNAPSHOT_FORMAT_VERSION})"
+            )
+        if embedding_namespace and manifest.get("embedding_namespace") != embedding_namespace:
+            raise SnapshotError(
+                f"Policy snapshot was embedded with {manifest.get('embedding_namespace')}, "
+                f"not {embedding_namespace}"
+            )
+        if matrix.ndim != 2 or matrix.shape[0] != len(chunks):
+            raise SnapshotError(f"Policy snapshot at {path} has mismatched chunks and embeddings")
+
+        return cls(manifest, chunks, matrix)
+
+    def search(self, query_vector: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        """
+        Find the chunks closest to a query embedding.
+
+        Args:
+            query_vector: Query embedding
+            k: Maximum number of results
+
+        Returns:
+            (chunk index, cosine similarity) pairs, best first
+        """
+        if not len(self.chunks) or k <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if not norm:
+            return []
+
+        scores = self.matrix @ (query / norm)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(index), float(scores[index])) for index in top]
+
+
+def snapshot_version(chunks: Sequence[Dict[str, Any]], embedding_namespace: str) -> str:
+    """Content hash identifying a corpus embedded with a given model."""
+    digest = hashlib.sha256(embedding_namespace.encode("utf-8"))
+    for chunk in chunks:
+        digest.update(json.dumps(chunk, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def build_snapshot(
+    path: Union[str, Path],
+    chunks: Sequence[Dict[str, Any]],
+    vectors: Sequence[Sequence[float]],
+    embedding_namespace: str
+) -> Dict[str, Any]:
+    """
+    Write a snapshot directory, replacing any existing one atomically.
+
+    Args:
+        path: Snapshot directory
+        chunks: Chunk dicts with "content" and "metadata"
+        vectors: Chunk embeddings, in the same order
+        embedding_namespace: Identity of the embedding model
+
+    Returns:
+        The snapshot manifest
+    """
+    if len(chunks) != len(vectors):
+        raise ValueError("Every chunk needs exactly one embedding")
+
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(len(chunks), -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = matrix / np.where(norms == 0, 1, norms)
+
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "snapshot_version": snapshot_version(chunks, embedding_namespace),
+        "embedding_namespace": embedding_namespace,
+        "dimensions": int(matrix.shape[1]),
+        "chunk_count": len(chunks),
+        "documents": sorted({chunk["metadata"].get("document_id", "") for chunk in chunks}),
+        "built_at": datetime.utcnow().isoformat(),
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{path.name}-", dir=path.parent))
+    try:
+        np.save(staging / _EMBEDDINGS_FILE, matrix)
+        (staging / _CHUNKS_FILE).write_text(json.dumps(list(chunks), default=str))
+        (staging / _MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+        # Swap directories so readers never see a half-written snapshot
+        previous = None
+        if path.exists():
+            previous = path.with_name(f".{path.name}-previous")
+            shutil.rmtree(previous, ignore_errors=True)
+            os.replace(path, previous)
+        os.replace(staging, path)
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    return manifest
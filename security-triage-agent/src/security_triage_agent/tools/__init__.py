@@ -10,7 +10,9 @@ from .prioritization import IncidentPrioritizer, PrioritizationResult, RiskAsses
 from .playbook_selector import PlaybookSelector, PlaybookSelectionResult
 from .response_generator import ResponseGenerator, ResponseGenerationResult
 from .compliance_checker import ComplianceChecker, ComplianceResult
-from .safety_guardrails import SafetyGuardrails, SafetyCheckResult
+from .safety_guardrails import SafetyGuardrails, SafetyCheckResult, ContentScreeningResult
+from .fused_triage import FusedTriageTool, FusedTriageResult
+from .local_classifier import LocalIncidentClassifier
 
 __all__ = [
     "IncidentClassifier",
@@ -26,4 +28,8 @@ __all__ = [
     "ComplianceResult",
     "SafetyGuardrails",
     "SafetyCheckResult",
+    "ContentScreeningResult",
+    "FusedTriageTool",
+    "FusedTriageResult",
+    "LocalIncidentClassifier",
 ]
\ No newline at end of file
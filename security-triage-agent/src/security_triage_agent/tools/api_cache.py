@@ -0,0 +1,209 @@
+"""
+Hotel System API Caching for Security Incident Triage Agent.
+
+Provides the HTTP connection pool shared by the hotel system tools and a
+read-through cache for their lookups. A workflow asks for the same room,
+guest and keycard data several times per incident. The cache serves
+repeats within a per-resource TTL. Concurrent identical requests share one
+upstream call, and writes invalidate the entries they affect.
+"""
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+import httpx
+
+from ..memory.ttl_store import TTLStore
+
+try:
+    import h2  # noqa: F401 - HTTP/2 support for httpx
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+
+
+# Seconds a lookup stays fresh, by resource
+DEFAULT_RESOURCE_TTLS: Dict[str, float] = {
+    "guest_info": 60.0,
+    "occupancy_history": 120.0,
+    "access_logs": 30.0,
+}
+
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+_MISSING = object()
+
+# One pool per event loop: httpx clients cannot be used across loops
+_shared_clients: Dict[int, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    HTTP client shared by all hotel system tools on the running event loop.
+
+    Keep-alive connections are reused across tools and, when the h2 package
+    is installed, requests to the same host are multiplexed over HTTP/2.
+    Tools send their own credentials per request.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _shared_clients.get(id(loop))
+    if entry is not None and entry[0] is loop and not entry[1].is_closed:
+        return entry[1]
+
+    # Forget pools of loops that have since closed
+    for key, (other_loop, _) in list(_shared_clients.items()):
+        if other_loop.is_closed():
+            del _shared_clients[key]
+
+    client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+    _shared_clients[id(loop)] = (loop, client)
+    return client
+
+
+async def close_shared_http_client() -> None:
+    """Close the running loop's shared HTTP client."""
+    entry = _shared_clients.pop(id(asyncio.get_running_loop()), None)
+    if entry is not None:
+        await entry[1].aclose()
+
+
+class ReadThroughCache:
+    """
+    TTL cache in front of remote lookups with request coalescing.
+
+    Entries are addressed by resource (e.g. "guest_info"), scope (the room or
+    card the data belongs to) and variant (remaining query parameters), so a
+    write can invalidate every variant of a scope at once. A lookup that is
+    invalidated while in flight is returned to its callers but not cached.
+    Callers get their own copy of cached values.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 5000,
+        default_ttl_seconds: float = 30.0
+    ):
+        """
+        Args:
+            ttls: Resource to TTL in seconds, merged over DEFAULT_RESOURCE_TTLS
+            max_entries: Entries kept before least recently used are evicted
+            default_ttl_seconds: TTL of resources without an entry in ttls
+        """
+        self.ttls = {**DEFAULT_RESOURCE_TTLS, **(ttls or {})}
+        self.default_ttl_seconds = default_ttl_seconds
+        self.store = TTLStore(max_entries, on_evict=self._on_evict)
+
+        # (resource, scope) -> cache keys, for invalidating all variants
+        self._scopes: Dict[Tuple[str, str], Set[str]] = {}
+        self._key_scopes: Dict[str, Tuple[str, str]] = {}
+        # cache key -> (shared upstream call, resource, scope)
+        self._inflight: Dict[str, Tuple[asyncio.Future, str, str]] = {}
+        # In-flight keys invalidated before their result arrived
+        self._stale: Set[str] = set()
+
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "invalidations": 0,
+        }
+
+    async def get_or_fetch(
+        self,
+        resource: str,
+        scope: str,
+        fetch: Callable[[], Awaitable[Any]],
+        variant: str = "",
+        cache_if: Callable[[Any], bool] = lambda value: value is not None
+    ) -> Any:
+        """
+        Return a cached value or fetch it once for all concurrent callers.
+
+        Args:
+            resource: Resource name, selecting the TTL
+            scope: Entity the value belongs to, the unit of invalidation
+            fetch: Coroutine function performing the upstream call; its
+                exceptions propagate to every waiting caller and nothing is cached
+            variant: Further parameters distinguishing values of one scope
+            cache_if: Whether a fetched value may be cached
+
+        Returns:
+            Fetched or cached value
+        """
+        key = f"{resource}\x1f{scope}\x1f{variant}"
+        value = self.store.get(key, _MISSING)
+        if value is not _MISSING:
+            self.stats["hits"] += 1
+            return copy.deepcopy(value)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return copy.deepcopy(await asyncio.shield(inflight[0]))
+
+        self.stats["misses"] += 1
+        future = asyncio.ensure_future(fetch())
+        self._inflight[key] = (future, resource, scope)
+        try:
+            value = await asyncio.shield(future)
+        finally:
+            del self._inflight[key]
+            stale = key in self._stale
+            self._stale.discard(key)
+
+        if cache_if(value) and not stale:
+            self.store.set(key, value, self.ttls.get(resource, self.default_ttl_seconds))
+            self._scopes.setdefault((resource, scope), set()).add(key)
+            self._key_scopes[key] = (resource, scope)
+        return copy.deepcopy(value)
+
+    def invalidate(self, resource: str, scope: Optional[str] = None) -> int:
+        """
+        Drop cached values of a scope, or of the whole resource.
+
+        Args:
+            resource: Resource name
+            scope: Entity whose values changed; all scopes if omitted
+
+        Returns:
+            Number of entries removed
+        """
+        if scope is None:
+            scopes = [cached for cached in self._scopes if cached[0] == resource]
+        else:
+            scopes = [(resource, scope)]
+
+        for key, (_, inflight_resource, inflight_scope) in self._inflight.items():
+            if inflight_resource == resource and scope in (None, inflight_scope):
+                self._stale.add(key)
+
+        removed = 0
+        for cached in scopes:
+            for key in self._scopes.pop(cached, ()):
+                self._key_scopes.pop(key, None)
+                if self.store.pop(key, _MISSING) is not _MISSING:
+                    removed += 1
+
+        self.stats["invalidations"] += removed
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit, miss and coalescing counts plus store metrics."""
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["coalesced"]
+        return {
+            **self.stats,
+            "hit_rate": (self.stats["hits"] + self.stats["coalesced"]) / lookups if lookups else 0.0,
+            "entries": len(self.store),
+            "inflight": len(self._inflight),
+        }
+
+    def _on_evict(self, key: str, value: Any, reason: str) -> None:
+        scope = self._key_scopes.pop(key, None)
+        keys = self._scopes.get(scope) if scope is not None else None
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._scopes[scope]
@@ -6,7 +6,7 @@ categories with confidence scoring and detailed reasoning.
 """
 
 import json
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 from langchain_core.tools import BaseTool
 from langchain_core.prompts import ChatPromptTemplate
@@ -15,6 +15,9 @@ from langchain_anthropic import ChatAnthropic
 
 from ..core.state import IncidentCategory, IncidentMetadata
 
+if TYPE_CHECKING:
+    from .local_classifier import LocalIncidentClassifier
+
 
 class ClassificationResult(BaseModel):
     """Result of incident classification."""
@@ -32,6 +35,10 @@ class IncidentClassifier(BaseTool):
     
     Uses advanced prompting techniques to accurately categorize security incidents
     with proper context understanding and hospitality domain expertise.
+    
+    If a trained LocalIncidentClassifier is supplied as ``fast_path``, it is
+    consulted first and its result returned without an LLM call whenever its
+    calibrated confidence reaches ``fast_path_threshold``.
     """
     
     name: str = "incident_classifier"
@@ -42,10 +49,16 @@ class IncidentClassifier(BaseTool):
         llm: Optional[Any] = None,
         model_name: str = "gpt-4",
         temperature: float = 0.1,
+        fast_path: Optional["LocalIncidentClassifier"] = None,
+        fast_path_threshold: float = 0.9,
         **kwargs
     ):
         super().__init__(**kwargs)
         
+        self.fast_path = fast_path
+        self.fast_path_threshold = fast_path_threshold
+        self.fast_path_stats = {"local": 0, "deferred": 0}
+        
         if llm is None:
             if "gpt" in model_name.lower():
                 self.llm = ChatOpenAI(
@@ -175,6 +188,13 @@ Provide detailed classification analysis in JSON format."""
             ClassificationResult with category, confidence, and reasoning
         """
         
+        if self.fast_path is not None:
+            local_result = self.fast_path.predict(title, description)
+            if local_result.confidence >= self.fast_path_threshold:
+                self.fast_path_stats["local"] += 1
+                return local_result
+            self.fast_path_stats["deferred"] += 1
+        
         # Prepare metadata context
         metadata_context = "None provided"
         if metadata:
@@ -210,31 +230,39 @@ Provide detailed classification analysis in JSON format."""
             else:
                 result_data = json.loads(str(response))
             
-            # Validate and create result
-            category = IncidentCategory(result_data["category"].lower())
-            confidence = max(0.0, min(1.0, float(result_data["confidence"])))
-            
-            # Parse alternative categories
-            alternative_categories = []
-            for alt_cat in result_data.get("alternative_categories", []):
-                try:
-                    alternative_categories.append(IncidentCategory(alt_cat.lower()))
-                except ValueError:
-                    continue  # Skip invalid categories
-            
-            return ClassificationResult(
-                category=category,
-                confidence=confidence,
-                reasoning=result_data.get("reasoning", "No reasoning provided"),
-                alternative_categories=alternative_categories,
-                extracted_entities=result_data.get("extracted_entities", {}),
-                severity_indicators=result_data.get("severity_indicators", [])
-            )
+            return self._build_classification_result(result_data)
             
         except (json.JSONDecodeError, KeyError, ValueError) as e:
             # Fallback classification
             return self._fallback_classification(title, description, str(e))
     
+    def _build_classification_result(self, result_data: Dict[str, Any]) -> ClassificationResult:
+        """
+        Validate parsed LLM output into a ClassificationResult.
+        
+        Raises:
+            KeyError, ValueError: If required fields are missing or invalid
+        """
+        category = IncidentCategory(result_data["category"].lower())
+        confidence = max(0.0, min(1.0, float(result_data["confidence"])))
+        
+        # Parse alternative categories
+        alternative_categories = []
+        for alt_cat in result_data.get("alternative_categories", []):
+            try:
+                alternative_categories.append(IncidentCategory(alt_cat.lower()))
+            except ValueError:
+                continue  # Skip invalid categories
+        
+        return ClassificationResult(
+            category=category,
+            confidence=confidence,
+            reasoning=result_data.get("reasoning", "No reasoning provided"),
+            alternative_categories=alternative_categories,
+            extracted_entities=result_data.get("extracted_entities", {}),
+            severity_indicators=result_data.get("severity_indicators", [])
+        )
+    
     def _fallback_classification(
         self, 
         title: str, 
@@ -0,0 +1,320 @@
+"""
+Content Scanner for Security Triage Agent.
+
+Finds PII, threat indicators and content-policy keywords in one pass over the
+text with a single compiled pattern, returning typed spans that serve both the
+safety checks and redaction. Each PII rule finds what its own regex would,
+including values that overlap a match of another rule, so redaction masks at
+least the characters the separate per-rule passes masked. Large inputs such as
+pasted logs are scanned in fixed-size windows, so they can be streamed from any
+iterable of chunks.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+
+# PII rules, in priority order: where two rules match at the same position
+# the first one wins. Every rule starts with a character class and checks the
+# word boundary with a lookbehind after it, so the combined alternation can
+# reject a rule on its first character.
+PII_RULES: Dict[str, str] = {
+    "email": r"[A-Za-z0-9._%+-](?<=\b.)[A-Za-z0-9._%+-]*@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+    "credit_card": (
+        r"[3-6](?<!\w[3-6])(?:(?<=4)[0-9]{12}(?:[0-9]{3})?|(?<=5)[1-5][0-9]{14}"
+        r"|(?<=3)[47][0-9]{13}|(?<=3)[0-9]{13}|(?<=6)(?:011|5[0-9]{2})[0-9]{12})\b"
+    ),
+    "aadhaar": r"[2-9](?<!\w[2-9])[0-9]{3}\s?[0-9]{4}\s?[0-9]{4}\b",
+    "ip_address": r"[0-9](?<!\w[0-9])[0-9]{0,2}\.(?:[0-9]{1,3}\.){2}[0-9]{1,3}\b",
+    "pan": r"[A-Z](?<!\w[A-Z])[A-Z]{4}[0-9]{4}[A-Z]\b",
+    "passport": r"[A-Z](?<!\w[A-Z])(?:(?<=[A-PR-WY])[1-9]\d\s?\d{4}[1-9]|[A-Z]?[0-9]{6,9})\b",
+    "room_number": (
+        r"[Rr0-9](?<!\w[Rr0-9])(?:(?<=[Rr])[Oo][Oo][Mm]\s*[#:]?\s*\d{3,4}[A-Za-z]?"
+        r"|(?<=[0-9])\d{2,3}[A-Za-z]?\s*[Rr][Oo][Oo][Mm])\b"
+    ),
+    "phone": (
+        r"[+(0-9](?:(?<=\+)[1-9]\d{1,14}|(?<=\()\d{3}\)\s?\d{3}-?\d{4}"
+        r"|(?<=[1-9])\d{1,14}|(?<=0)\d{2}-?\d{3}-?\d{4})"
+    ),
+}
+
+
+class ScanSpan(NamedTuple):
+    """A typed match: kind is "pii", "threat" or "content"."""
+    kind: str
+    label: str
+    start: int
+    end: int
+    text: str
+
+
+def _case_insensitive(text: str) -> str:
+    return "".join(
+        f"[{char.upper()}{char}]" if char.isalpha() else re.escape(char) for char in text
+    )
+
+
+def _keyword_trie_pattern(keywords: Iterable[str]) -> str:
+    """Compile keywords into a prefix-trie regex matching the longest keyword."""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        branches = [_case_insensitive(char) + emit(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+def mask_pii(pii_type: str, text: str) -> str:
+    """
+    Mask a PII value for display.
+
+    Card numbers keep their first and last four digits and emails keep the
+    first character and the domain; everything else is fully masked.
+    """
+    if pii_type == "credit_card" and len(text) >= 8:
+        return text[:4] + "*" * (len(text) - 8) + text[-4:]
+    if pii_type == "email":
+        local, _, domain = text.partition("@")
+        if local and domain:
+            return local[0] + "*" * (len(local) - 1) + "@" + domain
+    return "*" * len(text)
+
+
+class ContentScanner:
+    """
+    Single-pass scanner for PII, threat indicators and content keywords.
+
+    All rules are combined into one alternation: PII rules as written in
+    ``PII_RULES`` and keywords as a case-insensitive prefix trie anchored at
+    word starts, captured in a lookahead so a keyword is found even where a
+    PII value starts at the same character. A keyword match also reports the
+    shorter keywords it contains (e.g. "credit card fraud" implies "fraud").
+    Keywords inside a word are not reported, so "pharmacy" is not a "harm".
+
+    Matches of different rules may overlap: after a match the scan resumes
+    at the next character, and each rule only skips text covered by its own
+    previous match, as a separate ``finditer`` per rule would. Redaction masks
+    the union of overlapping PII spans.
+
+    Text is scanned in windows of ``chunk_size`` characters. A match is only
+    accepted if it starts at least ``overlap`` characters before the end of
+    the buffered text, so no match is cut at a window boundary as long as it
+    is shorter than ``overlap``.
+    """
+
+    # Characters kept before a window for the rules' word-boundary lookbehinds
+    _CONTEXT = 8
+
+    def __init__(
+        self,
+        threat_indicators: Dict[str, List[str]],
+        content_keywords: Sequence[str],
+        pii_rules: Dict[str, str] = PII_RULES,
+        chunk_size: int = 1 << 20,
+        overlap: int = 256
+    ):
+        self.chunk_size = max(1, chunk_size)
+        self.overlap = overlap
+
+        # Keyword (lowercase) -> (kind, label) pairs it reports
+        self._keyword_labels: Dict[str, List[Tuple[str, str]]] = {}
+        for keyword in content_keywords:
+            self._keyword_labels.setdefault(keyword.lower(), []).append(("content", keyword))
+        for threat_type, indicators in threat_indicators.items():
+            for indicator in indicators:
+                self._keyword_labels.setdefault(indicator.lower(), []).append(("threat", threat_type))
+
+        # Keyword -> (offset, keyword) for every keyword starting at a word start within it
+        self._keyword_hits: Dict[str, List[Tuple[int, str]]] = {}
+        for keyword in self._keyword_labels:
+            self._keyword_hits[keyword] = sorted(
+                (match.start(), other)
+                for other in self._keyword_labels
+                for match in re.finditer(rf"\b{re.escape(other)}", keyword)
+            )
+
+        # Each PII rule ends in an empty marker group naming it; the rules appear
+        # twice, after a keyword and on their own, so the markers are numbered
+        self._marker_types: Dict[str, str] = {}
+
+        def pii_alternatives(prefix: str) -> List[str]:
+            alternatives = []
+            for number, (pii_type, rule) in enumerate(pii_rules.items()):
+                marker = f"{prefix}{number}"
+                self._marker_types[marker] = pii_type
+                alternatives.append(f"{rule}(?P<{marker}>)")
+            return alternatives
+
+        pattern = "|".join(pii_alternatives("pii"))
+        if self._keyword_labels:
+            keyword = rf"(?<![A-Za-z0-9_])(?:{_keyword_trie_pattern(self._keyword_labels)})"
+            after_keyword = "|".join(pii_alternatives("keyword_pii") + [keyword])
+            pattern = f"(?=(?P<keyword>{keyword}))(?:{after_keyword})|{pattern}"
+        self.pattern = re.compile(pattern)
+
+    def scan(self, text: str) -> List[ScanSpan]:
+        """
+        Find all typed spans in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Spans ordered by start offset
+        """
+        return list(self.iter_spans([text]))
+
+    def iter_spans(self, chunks: Iterable[str]) -> Iterator[ScanSpan]:
+        """
+        Stream typed spans from text supplied in chunks.
+
+        Args:
+            chunks: Consecutive pieces of the text, of any size
+
+        Yields:
+            Spans with offsets into the concatenated text
+        """
+        for _, _, spans in self._segments(chunks):
+            yield from spans
+
+    def redact(self, text: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Mask PII in a text.
+
+        Args:
+            text: Text to redact
+
+        Returns:
+            Redacted text and a mapping of original values to masks
+        """
+        redacted, replacements, _ = self.redact_and_scan(text)
+        return redacted, replacements
+
+    def redact_and_scan(self, text: str) -> Tuple[str, Dict[str, str], List[ScanSpan]]:
+        """
+        Mask PII and collect every span in the same pass.
+
+        Masks keep the length of the value they replace, so span offsets
+        are valid for both the original and the redacted text.
+
+        Args:
+            text: Text to redact
+
+        Returns:
+            Redacted text, mapping of original values to masks, and spans
+        """
+        replacements: Dict[str, str] = {}
+        spans: List[ScanSpan] = []
+        redacted = "".join(self.redact_stream([text], replacements, spans))
+        return redacted, replacements, spans
+
+    def redact_stream(
+        self,
+        chunks: Iterable[str],
+        replacements: Optional[Dict[str, str]] = None,
+        collected_spans: Optional[List[ScanSpan]] = None
+    ) -> Iterator[str]:
+        """
+        Stream redacted text from text supplied in chunks.
+
+        Args:
+            chunks: Consecutive pieces of the text
+            replacements: Optional dict collecting original values and masks
+            collected_spans: Optional list collecting every span found
+
+        Yields:
+            Consecutive pieces of the redacted text
+        """
+        for offset, segment, spans in self._segments(chunks):
+            if collected_spans is not None:
+                collected_spans.extend(spans)
+            pieces = []
+            position = 0
+            for span in spans:
+                start, end = span.start - offset, span.end - offset
+                if span.kind != "pii" or end <= position:
+                    continue
+                masked = mask_pii(span.label, span.text)
+                if replacements is not None:
+                    replacements[span.text] = masked
+                # A span overlapping text already masked only masks the rest
+                pieces.append(segment[position:max(start, position)])
+                pieces.append(masked[max(0, position - start):])
+                position = end
+            pieces.append(segment[position:])
+            yield "".join(pieces)
+
+    def _segments(self, chunks: Iterable[str]) -> Iterator[Tuple[int, str, List[ScanSpan]]]:
+        """Yield (offset, text, spans) for consecutive, non-overlapping segments of the text."""
+        chunk_iter = iter(chunks)
+        buffer = ""
+        base = 0  # absolute offset of buffer[0]
+        position = 0  # segment start within buffer
+        search_from = 0  # next match start to try within buffer
+        next_starts: Dict[str, int] = {}  # rule -> absolute offset its next match may start at
+        exhausted = False
+
+        while True:
+            pieces = [buffer]
+            buffered = len(buffer) - search_from
+            while not exhausted and buffered < self.chunk_size + self.overlap:
+                chunk = next(chunk_iter, None)
+                if chunk is None:
+                    exhausted = True
+                else:
+                    pieces.append(chunk)
+                    buffered += len(chunk)
+            buffer = "".join(pieces)
+
+            limit = len(buffer) if exhausted else len(buffer) - self.overlap
+            end = max(position, limit)
+            spans: List[ScanSpan] = []
+            while True:
+                match = self.pattern.search(buffer, search_from)
+                if match is None or match.start() >= limit:
+                    break
+                search_from = match.start() + 1
+                for span in self._match_spans(match, base, next_starts):
+                    spans.append(span)
+                    end = max(end, span.end - base)
+            spans.sort(key=lambda span: span.start)
+
+            yield base + position, buffer[position:end], spans
+
+            if exhausted:
+                return
+
+            # Matches starting inside the segment's last span are still to be tried
+            keep = max(0, limit - self._CONTEXT)
+            buffer = buffer[keep:]
+            base += keep
+            position = end - keep
+            search_from = limit - keep
+
+    def _match_spans(self, match: "re.Match", base: int, next_starts: Dict[str, int]) -> List[ScanSpan]:
+        start = base + match.start()
+        spans = []
+
+        pii_type = self._marker_types.get(match.lastgroup)
+        if pii_type is not None and start >= next_starts.get(pii_type, 0):
+            spans.append(ScanSpan("pii", pii_type, start, base + match.end(), match.group()))
+            next_starts[pii_type] = base + match.end()
+
+        matched = match.group("keyword") if self._keyword_labels else None
+        if matched and start >= next_starts.get("keyword", 0):
+            next_starts["keyword"] = start + len(matched)
+            for offset, keyword in self._keyword_hits[matched.lower()]:
+                text = matched[offset:offset + len(keyword)]
+                for kind, label in self._keyword_labels[keyword]:
+                    spans.append(ScanSpan(kind, label, start + offset, start + offset + len(keyword), text))
+        return spans
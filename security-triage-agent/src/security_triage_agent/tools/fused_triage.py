@@ -0,0 +1,213 @@
+"""
+Fused Triage Tool for Security Triage Agent.
+
+Obtains classification, risk assessment and prioritization for an incident in
+a single structured LLM call, validating each section against the models the
+individual tools produce so the workflow can fall back per section.
+"""
+
+import json
+from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from langchain_core.tools import BaseTool
+from langchain_core.prompts import ChatPromptTemplate
+
+from ..core.state import IncidentCategory, IncidentPriority, IncidentMetadata, RiskAssessment
+from .classification import IncidentClassifier, ClassificationResult
+from .prioritization import IncidentPrioritizer, PrioritizationResult
+
+
+class FusedTriageResult(BaseModel):
+    """Validated sections of a fused triage response; invalid sections are None."""
+    classification: Optional[ClassificationResult] = None
+    risk_assessment: Optional[RiskAssessment] = None
+    prioritization: Optional[PrioritizationResult] = None
+    section_errors: Dict[str, str] = Field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every section validated."""
+        return (self.classification is not None
+                and self.risk_assessment is not None
+                and self.prioritization is not None)
+
+
+class FusedTriageTool(BaseTool):
+    """
+    Single-call classification, risk assessment and prioritization.
+
+    Reuses the classifier's LLM and the validation logic of IncidentClassifier
+    and IncidentPrioritizer, so a fused section is accepted only if it would
+    have been accepted from the corresponding per-tool call. Sections depend
+    on each other in order: if classification is invalid nothing is kept, and
+    if the risk assessment is invalid the prioritization is discarded too.
+    """
+
+    name: str = "fused_triage"
+    description: str = "Classify, risk-assess and prioritize a security incident in one call"
+
+    def __init__(
+        self,
+        classifier: IncidentClassifier,
+        prioritizer: IncidentPrioritizer,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+
+        self.classifier = classifier
+        self.prioritizer = prioritizer
+        self.llm = classifier.llm
+        self.triage_prompt = self._create_triage_prompt()
+
+    def _create_triage_prompt(self) -> ChatPromptTemplate:
+        """Create the combined triage prompt."""
+
+        categories = ", ".join(category.value for category in IncidentCategory)
+        priorities = ", ".join(priority.value for priority in IncidentPriority)
+
+        system_message = f"""You are an expert security analyst for hotel and hospitality operations. In one response, classify the incident, assess its risk and assign its priority.
+
+CATEGORIES: {categories}
+PRIORITIES: {priorities}
+- critical: immediate threat to guest safety, active breach or payment compromise (SLA 15 minutes)
+- high: unauthorized access, fraud or compliance violation (SLA 1 hour)
+- medium: policy violations and routine security concerns (SLA 4 hours)
+- low: minor infractions (SLA 24 hours)
+- informational: documentation only (SLA 72 hours)
+
+RISK FRAMEWORK:
+Risk Score = (Impact Score x Likelihood Score) / 10, from 0.1 to 10.0.
+Add hospitality multipliers: guest safety +2, payment systems +1.5, brand reputation +1.5, regulatory +1, peak season +0.5.
+
+RESPONSE FORMAT:
+Respond with a single JSON object with exactly these keys:
+{{{{
+  "classification": {{{{
+    "category": one of the categories,
+    "confidence": 0.0-1.0,
+    "reasoning": string,
+    "alternative_categories": [categories],
+    "extracted_entities": {{{{"entity_type": [values]}}}},
+    "severity_indicators": [strings]
+  }}}},
+  "risk_assessment": {{{{
+    "risk_score": 0.0-10.0,
+    "risk_factors": [strings],
+    "potential_impact": string,
+    "likelihood_score": 0.0-10.0,
+    "confidence_score": 0.0-1.0
+  }}}},
+  "prioritization": {{{{
+    "priority": one of the priorities,
+    "reasoning": string,
+    "business_impact": string,
+    "guest_impact": string,
+    "financial_impact": string,
+    "reputation_impact": string,
+    "operational_impact": string,
+    "time_sensitivity": string,
+    "escalation_triggers": [strings],
+    "recommended_sla": string
+  }}}}
+}}}}"""
+
+        human_message = """Triage this security incident:
+
+TITLE: {title}
+DESCRIPTION: {description}
+
+METADATA:
+{metadata_context}
+
+Provide the classification, risk assessment and prioritization in JSON format."""
+
+        return ChatPromptTemplate.from_messages([
+            ("system", system_message),
+            ("human", human_message)
+        ])
+
+    async def triage(
+        self,
+        title: str,
+        description: str,
+        metadata: Optional[IncidentMetadata] = None
+    ) -> FusedTriageResult:
+        """
+        Classify, assess and prioritize an incident with one LLM call.
+
+        Args:
+            title: Incident title
+            description: Detailed incident description
+            metadata: Additional incident metadata
+
+        Returns:
+            FusedTriageResult with each section that passed validation
+        """
+
+        formatted_prompt = self.triage_prompt.format_messages(
+            title=title,
+            description=description,
+            metadata_context=self.prioritizer._format_metadata_context(metadata)
+        )
+
+        response = await self.llm.ainvoke(formatted_prompt)
+        result = FusedTriageResult()
+
+        try:
+            if hasattr(response, 'content'):
+                result_data = json.loads(response.content)
+            else:
+                result_data = json.loads(str(response))
+            if not isinstance(result_data, dict):
+                raise ValueError("Response is not a JSON object")
+        except (json.JSONDecodeError, ValueError) as e:
+            result.section_errors["response"] = str(e)
+            return result
+
+        try:
+            result.classification = self.classifier._build_classification_result(
+                self._section(result_data, "classification", "category")
+            )
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            result.section_errors["classification"] = str(e)
+            return result
+
+        try:
+            result.risk_assessment = self.prioritizer._build_risk_assessment(
+                self._section(result_data, "risk_assessment", "risk_score")
+            )
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            result.section_errors["risk_assessment"] = str(e)
+            return result
+
+        try:
+            section = self._section(result_data, "prioritization", "priority")
+            IncidentPriority(section["priority"].lower())
+            result.prioritization = self.prioritizer._build_prioritization_result(
+                section, result.classification.category, result.risk_assessment, metadata
+            )
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            result.section_errors["prioritization"] = str(e)
+
+        return result
+
+    @staticmethod
+    def _section(result_data: Dict[str, Any], name: str, required_field: str) -> Dict[str, Any]:
+        """Extract a response section, requiring its key field to be present."""
+        section = result_data[name]
+        if not isinstance(section, dict):
+            raise ValueError(f"Section {name} is not an object")
+        if section.get(required_field) is None:
+            raise KeyError(required_field)
+        return section
+
+    def _run(self, *args, **kwargs) -> str:
+        """Synchronous tool interface (required by BaseTool)."""
+        import asyncio
+        result = asyncio.run(self.triage(*args, **kwargs))
+        return json.dumps(result.dict(), indent=2, default=str)
+
+    async def _arun(self, *args, **kwargs) -> str:
+        """Asynchronous tool interface."""
+        result = await self.triage(*args, **kwargs)
+        return json.dumps(result.dict(), indent=2, default=str)
@@ -10,14 +10,15 @@ import asyncio
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any, Tuple
-from uuid import uuid4
+from typing import Optional, List, Dict, Any, Tuple, ClassVar
 from enum import Enum
 
 from pydantic import BaseModel, Field
 from langchain_core.tools import BaseTool
 import httpx
-import aioredis
+
+from .api_cache import ReadThroughCache, get_shared_http_client
+from .notification_dispatch import Delivery, NotificationDispatcher, NotificationRequest
 
 
 class SystemStatus(str, Enum):
@@ -108,35 +109,63 @@ class TaskAssignment(BaseModel):
 
 # Hotel Management Tools
 
+async def _run_action(tool: BaseTool, action: str, kwargs: Dict[str, Any]) -> str:
+    """Run one of a hotel tool's actions by name and serialize its result as JSON."""
+    if action not in tool.actions:
+        raise ValueError(f"Unknown {tool.name} action {action!r}; expected one of {', '.join(tool.actions)}")
+    
+    result = await getattr(tool, action)(**kwargs)
+    if isinstance(result, BaseModel):
+        result = result.dict()
+    return json.dumps(result, indent=2, default=str)
+
+
 class PropertyManagementTool(BaseTool):
     """
     Direct integration with hotel Property Management System (PMS).
     Provides real-time access to guest information, room management, and incident tracking.
+    
+    Guest and occupancy lookups are served through a read-through cache;
+    room status updates and incident notes invalidate the affected entries.
     """
     
     name: str = "property_management_system"
     description: str = "Interact with hotel PMS for guest data, room status, and incident management"
+    actions: ClassVar[Tuple[str, ...]] = (
+        "get_guest_info", "update_room_status", "create_incident_note", "get_room_occupancy_history"
+    )
     
-    def __init__(self, pms_api_url: str, api_key: str, **kwargs):
+    pms_api_url: str = ""
+    api_key: str = ""
+    headers: Dict[str, str] = Field(default_factory=dict)
+    logger: Any = None
+    cache: Any = None
+    
+    def __init__(self, pms_api_url: str, api_key: str, 
+                 cache: Optional[ReadThroughCache] = None, **kwargs):
         super().__init__(**kwargs)
         self.pms_api_url = pms_api_url.rstrip('/')
         self.api_key = api_key
         self.logger = logging.getLogger(__name__)
         
-        # Connection pool for async HTTP requests
-        self.http_client = None
+        # Requests go through the connection pool shared by all hotel system tools
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self.cache = cache or ReadThroughCache()
         
     async def _get_http_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client"""
-        if self.http_client is None:
-            self.http_client = httpx.AsyncClient(
-                timeout=httpx.Timeout(10.0, connect=5.0),
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-            )
-        return self.http_client
+        """Get the shared HTTP client"""
+        return get_shared_http_client()
+    
+    def _run(self, action: str, **kwargs) -> str:
+        """Synchronous tool interface (required by BaseTool)."""
+        return asyncio.run(self._arun(action, **kwargs))
+    
+    async def _arun(self, action: str, **kwargs) -> str:
+        """Asynchronous tool interface: run the named action with its arguments."""
+        return await _run_action(self, action, kwargs)
     
     async def get_guest_info(self, room_number: str) -> Optional[GuestProfile]:
         """
@@ -148,10 +177,12 @@ class PropertyManagementTool(BaseTool):
         Returns:
             GuestProfile with complete guest information or None if not found
         """
-        try:
+        async def fetch() -> Optional[GuestProfile]:
             client = await self._get_http_client()
             
-            response = await client.get(f"{self.pms_api_url}/api/v1/guests/by-room/{room_number}")
+            response = await client.get(
+                f"{self.pms_api_url}/api/v1/guests/by-room/{room_number}", headers=self.headers
+            )
             response.raise_for_status()
             
             guest_data = response.json()
@@ -159,6 +190,9 @@ class PropertyManagementTool(BaseTool):
                 return None
             
             return GuestProfile(**guest_data)
+        
+        try:
+            return await self.cache.get_or_fetch("guest_info", room_number, fetch)
             
         except httpx.HTTPError as e:
             self.logger.error(f"PMS API error getting guest info: {e}")
@@ -195,7 +229,10 @@ class PropertyManagementTool(BaseTool):
             if duration_hours:
                 payload["expires_at"] = (datetime.utcnow() + timedelta(hours=duration_hours)).isoformat()
             
-            response = await client.post(f"{self.pms_api_url}/api/v1/rooms/status", json=payload)
+            response = await client.post(
+                f"{self.pms_api_url}/api/v1/rooms/status", json=payload, headers=self.headers
+            )
+            self._invalidate_room(room_number)
             response.raise_for_status()
             
             self.logger.info(f"Updated room {room_number} status to {status.value}: {reason}")
@@ -235,7 +272,11 @@ class PropertyManagementTool(BaseTool):
                 "requires_followup": True
             }
             
-            response = await client.post(f"{self.pms_api_url}/api/v1/guests/notes", json=payload)
+            response = await client.post(
+                f"{self.pms_api_url}/api/v1/guests/notes", json=payload, headers=self.headers
+            )
+            # Guest profiles are cached by room, so any of them may carry the note
+            self.cache.invalidate("guest_info")
             response.raise_for_status()
             
             self.logger.info(f"Added security incident note for guest {guest_id}")
@@ -260,18 +301,24 @@ class PropertyManagementTool(BaseTool):
         Returns:
             List of occupancy records
         """
-        try:
+        async def fetch() -> List[Dict[str, Any]]:
             client = await self._get_http_client()
             
             start_time = (datetime.utcnow() - timedelta(hours=hours_back)).isoformat()
             
             response = await client.get(
                 f"{self.pms_api_url}/api/v1/rooms/{room_number}/occupancy-history",
-                params={"start_time": start_time}
+                params={"start_time": start_time},
+                headers=self.headers
             )
             response.raise_for_status()
             
             return response.json().get("occupancy_records", [])
+        
+        try:
+            return await self.cache.get_or_fetch(
+                "occupancy_history", room_number, fetch, variant=str(hours_back)
+            )
             
         except httpx.HTTPError as e:
             self.logger.error(f"PMS API error getting occupancy history: {e}")
@@ -279,35 +326,57 @@ class PropertyManagementTool(BaseTool):
         except Exception as e:
             self.logger.error(f"Unexpected error getting occupancy history: {e}")
             return []
+    
+    def _invalidate_room(self, room_number: str) -> None:
+        """Drop cached lookups for a room after a write"""
+        self.cache.invalidate("guest_info", room_number)
+        self.cache.invalidate("occupancy_history", room_number)
 
 
 class AccessControlTool(BaseTool):
     """
     Real-time integration with hotel access control systems.
     Provides keycard management, area access control, and emergency lockdown capabilities.
+    
+    Access log lookups are served through a read-through cache; revocations
+    and lockdowns invalidate the affected logs.
     """
     
     name: str = "access_control_system"
     description: str = "Manage hotel access control systems, keycards, and security locks"
+    actions: ClassVar[Tuple[str, ...]] = (
+        "revoke_access", "create_temporary_access", "lock_area", "get_access_logs"
+    )
+    
+    api_url: str = ""
+    api_key: str = ""
+    headers: Dict[str, str] = Field(default_factory=dict)
+    logger: Any = None
+    cache: Any = None
     
-    def __init__(self, access_control_api_url: str, api_key: str, **kwargs):
+    def __init__(self, access_control_api_url: str, api_key: str, 
+                 cache: Optional[ReadThroughCache] = None, **kwargs):
         super().__init__(**kwargs)
         self.api_url = access_control_api_url.rstrip('/')
         self.api_key = api_key
         self.logger = logging.getLogger(__name__)
-        self.http_client = None
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self.cache = cache or ReadThroughCache()
     
     async def _get_http_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client"""
-        if self.http_client is None:
-            self.http_client = httpx.AsyncClient(
-                timeout=httpx.Timeout(10.0, connect=5.0),
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-            )
-        return self.http_client
+        """Get the shared HTTP client"""
+        return get_shared_http_client()
+    
+    def _run(self, action: str, **kwargs) -> str:
+        """Synchronous tool interface (required by BaseTool)."""
+        return asyncio.run(self._arun(action, **kwargs))
+    
+    async def _arun(self, action: str, **kwargs) -> str:
+        """Asynchronous tool interface: run the named action with its arguments."""
+        return await _run_action(self, action, kwargs)
     
     async def revoke_access(self, card_id: str, reason: str) -> AccessControlResult:
         """
@@ -331,7 +400,10 @@ class AccessControlTool(BaseTool):
                 "timestamp": datetime.utcnow().isoformat()
             }
             
-            response = await client.post(f"{self.api_url}/api/v1/access/revoke", json=payload)
+            response = await client.post(
+                f"{self.api_url}/api/v1/access/revoke", json=payload, headers=self.headers
+            )
+            self.cache.invalidate("access_logs", card_id)
             response.raise_for_status()
             
             result_data = response.json()
@@ -383,7 +455,9 @@ class AccessControlTool(BaseTool):
                 "reason": "security_incident_response"
             }
             
-            response = await client.post(f"{self.api_url}/api/v1/access/temporary", json=payload)
+            response = await client.post(
+                f"{self.api_url}/api/v1/access/temporary", json=payload, headers=self.headers
+            )
             response.raise_for_status()
             
             result_data = response.json()
@@ -434,7 +508,11 @@ class AccessControlTool(BaseTool):
                 "reason": "security_incident_response"
             }
             
-            response = await client.post(f"{self.api_url}/api/v1/areas/lockdown", json=payload)
+            response = await client.post(
+                f"{self.api_url}/api/v1/areas/lockdown", json=payload, headers=self.headers
+            )
+            # A lockdown changes access for every card in the area
+            self.cache.invalidate("access_logs")
             response.raise_for_status()
             
             result_data = response.json()
@@ -472,18 +550,22 @@ class AccessControlTool(BaseTool):
         Returns:
             List of access log entries
         """
-        try:
+        async def fetch() -> List[Dict[str, Any]]:
             client = await self._get_http_client()
             
             start_time = (datetime.utcnow() - timedelta(hours=hours_back)).isoformat()
             
             response = await client.get(
                 f"{self.api_url}/api/v1/access/logs/{card_id}",
-                params={"start_time": start_time}
+                params={"start_time": start_time},
+                headers=self.headers
             )
             response.raise_for_status()
             
             return response.json().get("access_logs", [])
+        
+        try:
+            return await self.cache.get_or_fetch("access_logs", card_id, fetch, variant=str(hours_back))
             
         except httpx.HTTPError as e:
             self.logger.error(f"Access control API error getting logs: {e}")
@@ -494,10 +576,22 @@ class NotificationOrchestratorTool(BaseTool):
     """
     Multi-channel notification system for coordinated incident response.
     Handles SMS, email, calls, Slack, and push notifications with intelligent routing.
+    
+    Sends go through a NotificationDispatcher: recipients and channels are
+    notified concurrently under per-channel rate limits and a deadline, with
+    email and Slack batched. Optional notification_config keys:
+    rate_limits, max_concurrency, deadline_seconds, dedupe_window_seconds,
+    max_batch_size and mock_latency (channel value to simulated seconds).
     """
     
     name: str = "notification_orchestrator"
     description: str = "Send multi-channel notifications for security incident response coordination"
+    actions: ClassVar[Tuple[str, ...]] = ("notify_security_team", "alert_management", "update_guest")
+    
+    config: Dict[str, Any] = Field(default_factory=dict)
+    logger: Any = None
+    notification_clients: Dict[Any, Any] = Field(default_factory=dict)
+    dispatcher: Any = None
     
     def __init__(self, notification_config: Dict[str, Any], **kwargs):
         super().__init__(**kwargs)
@@ -507,19 +601,41 @@ class NotificationOrchestratorTool(BaseTool):
         # Initialize notification service clients
         self.notification_clients = {}
         self._initialize_clients()
+        
+        self.dispatcher = NotificationDispatcher(
+            self.notification_clients,
+            rate_limits=self.config.get("rate_limits"),
+            max_batch_size=self.config.get("max_batch_size", 50),
+            max_concurrency=self.config.get("max_concurrency", 32),
+            deadline_seconds=self.config.get("deadline_seconds", 30.0),
+            dedupe_window_seconds=self.config.get("dedupe_window_seconds", 300.0)
+        )
+    
+    def _run(self, action: str, **kwargs) -> str:
+        """Synchronous tool interface (required by BaseTool)."""
+        return asyncio.run(self._arun(action, **kwargs))
+    
+    async def _arun(self, action: str, **kwargs) -> str:
+        """Asynchronous tool interface: run the named action with its arguments."""
+        return await _run_action(self, action, kwargs)
     
     def _initialize_clients(self):
         """Initialize notification service clients"""
         # This would initialize actual service clients like Twilio, SendGrid, Slack, etc.
         # For demo purposes, we'll use mock clients
+        latency = self.config.get("mock_latency", {})
+        mock_clients = {
+            NotificationChannel.SMS: MockSMSClient,
+            NotificationChannel.EMAIL: MockEmailClient,
+            NotificationChannel.SLACK: MockSlackClient,
+            NotificationChannel.PHONE_CALL: MockPhoneClient,
+            NotificationChannel.WHATSAPP: MockWhatsAppClient,
+            NotificationChannel.PUSH_NOTIFICATION: MockPushClient
+        }
         
         self.notification_clients = {
-            NotificationChannel.SMS: MockSMSClient(),
-            NotificationChannel.EMAIL: MockEmailClient(),
-            NotificationChannel.SLACK: MockSlackClient(),
-            NotificationChannel.PHONE_CALL: MockPhoneClient(),
-            NotificationChannel.WHATSAPP: MockWhatsAppClient(),
-            NotificationChannel.PUSH_NOTIFICATION: MockPushClient()
+            channel: (client_class(latency[channel.value]) if channel.value in latency else client_class())
+            for channel, client_class in mock_clients.items()
         }
     
     async def notify_security_team(self, incident_id: str, priority: str, 
@@ -542,31 +658,38 @@ class NotificationOrchestratorTool(BaseTool):
         message = self._format_security_alert_message(incident_id, priority, location, summary)
         
         notification_results = []
+        requests = []
         
         for team_member in security_team:
             # Choose notification method based on priority and preferences
             channels = self._select_notification_channels(priority, team_member["preferences"])
+            targets = []
             
             for channel in channels:
-                try:
-                    result = await self._send_notification(
-                        channel=channel,
-                        recipient=team_member["contact_info"][channel.value],
-                        message=message,
-                        priority=priority
-                    )
-                    notification_results.append(result)
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to notify {team_member['name']} via {channel}: {e}")
+                address = team_member["contact_info"].get(channel.value)
+                if address:
+                    targets.append((channel, address))
+                else:
+                    self.logger.error(f"Failed to notify {team_member['name']} via {channel}: no contact address")
                     notification_results.append(NotificationResult(
                         success=False,
                         channel=channel,
-                        recipient=team_member["contact_info"].get(channel.value, "unknown"),
+                        recipient="unknown",
                         message_id="",
                         delivery_status="failed",
                         timestamp=datetime.utcnow()
                     ))
+            
+            requests.append(NotificationRequest(
+                recipient_id=team_member["id"],
+                targets=targets,
+                message=message,
+                priority=priority,
+                dedupe_key=f"security_alert:{incident_id}:{priority}"
+            ))
+        
+        deliveries = await self.dispatcher.dispatch(requests)
+        notification_results.extend(self._to_notification_result(delivery) for delivery in deliveries)
         
         return notification_results
     
@@ -589,33 +712,27 @@ class NotificationOrchestratorTool(BaseTool):
             incident_summary, escalation_level, business_impact
         )
         
-        notification_results = []
+        requests = []
         
         for contact in management_contacts:
             # Management typically prefers phone calls for critical incidents
-            channels = [NotificationChannel.PHONE_CALL, NotificationChannel.EMAIL]
+            channels = [NotificationChannel.PHONE_CALL]
             
             if escalation_level >= 4:  # Critical incidents
                 channels.insert(0, NotificationChannel.SMS)
             
-            for channel in channels:
-                try:
-                    result = await self._send_notification(
-                        channel=channel,
-                        recipient=contact["contact_info"][channel.value],
-                        message=message,
-                        priority="critical" if escalation_level >= 4 else "high"
-                    )
-                    notification_results.append(result)
-                    
-                    # For management, wait for acknowledgment before trying next method
-                    if result.success and channel == NotificationChannel.PHONE_CALL:
-                        break  # Phone call successful, no need for other channels
-                        
-                except Exception as e:
-                    self.logger.error(f"Failed to alert management {contact['name']} via {channel}: {e}")
+            # Email only if the call does not get through
+            requests.append(NotificationRequest(
+                recipient_id=contact["id"],
+                targets=self._contact_targets(contact, channels),
+                fallback=self._contact_targets(contact, [NotificationChannel.EMAIL]),
+                message=message,
+                priority="critical" if escalation_level >= 4 else "high"
+            ))
         
-        return notification_results
+        deliveries = await self.dispatcher.dispatch(requests)
+        
+        return [self._to_notification_result(delivery) for delivery in deliveries]
     
     async def update_guest(self, guest_id: str, message: str, 
                           channel: Optional[NotificationChannel] = None) -> NotificationResult:
@@ -667,7 +784,8 @@ class NotificationOrchestratorTool(BaseTool):
                 channel=selected_channel,
                 recipient=recipient,
                 message=message,
-                priority="normal"
+                priority="normal",
+                recipient_id=guest_id
             )
             
         except Exception as e:
@@ -682,40 +800,50 @@ class NotificationOrchestratorTool(BaseTool):
             )
     
     async def _send_notification(self, channel: NotificationChannel, recipient: str, 
-                               message: str, priority: str) -> NotificationResult:
+                               message: str, priority: str,
+                               recipient_id: Optional[str] = None) -> NotificationResult:
         """Send notification through specified channel"""
         
-        client = self.notification_clients.get(channel)
-        if not client:
+        if channel not in self.notification_clients:
             raise ValueError(f"No client configured for channel: {channel}")
         
-        message_id = str(uuid4())
-        timestamp = datetime.utcnow()
+        deliveries = await self.dispatcher.dispatch([NotificationRequest(
+            recipient_id=recipient_id or recipient,
+            targets=[(channel, recipient)],
+            message=message,
+            priority=priority
+        )])
         
-        try:
-            # Simulate notification sending
-            success = await client.send(recipient, message, priority)
-            
-            return NotificationResult(
-                success=success,
-                channel=channel,
-                recipient=recipient,
-                message_id=message_id,
-                delivery_status="sent" if success else "failed",
-                timestamp=timestamp,
-                estimated_delivery=timestamp + timedelta(seconds=30) if success else None
-            )
-            
-        except Exception as e:
-            self.logger.error(f"Notification sending failed: {e}")
-            return NotificationResult(
-                success=False,
-                channel=channel,
-                recipient=recipient,
-                message_id=message_id,
-                delivery_status="error",
-                timestamp=timestamp
+        return self._to_notification_result(deliveries[0])
+    
+    def _to_notification_result(self, delivery: Delivery) -> NotificationResult:
+        """Convert a dispatcher delivery to a NotificationResult"""
+        if not delivery.success and delivery.status not in ("sent", "failed"):
+            self.logger.error(
+                f"Notification to {delivery.recipient_id} via {delivery.channel} not delivered: {delivery.status}"
             )
+        
+        return NotificationResult(
+            success=delivery.success,
+            channel=delivery.channel,
+            recipient=delivery.address,
+            message_id=delivery.message_id,
+            delivery_status=delivery.status,
+            timestamp=delivery.timestamp,
+            estimated_delivery=delivery.timestamp + timedelta(seconds=30) if delivery.success else None
+        )
+    
+    def _contact_targets(self, contact: Dict[str, Any], 
+                         channels: List[NotificationChannel]) -> List[Tuple[NotificationChannel, str]]:
+        """(channel, address) pairs for the channels a contact can be reached on"""
+        targets = []
+        for channel in channels:
+            address = contact["contact_info"].get(channel.value)
+            if address:
+                targets.append((channel, address))
+            else:
+                self.logger.error(f"Failed to alert management {contact['name']} via {channel}: no contact address")
+        return targets
     
     # Helper methods
     
@@ -828,31 +956,57 @@ Your attention and potential intervention may be required.
 # Mock notification clients for demonstration
 
 class MockSMSClient:
+    def __init__(self, latency: float = 0.1):
+        self.latency = latency
+    
     async def send(self, recipient: str, message: str, priority: str) -> bool:
-        await asyncio.sleep(0.1)  # Simulate API call
+        await asyncio.sleep(self.latency)  # Simulate API call
         return True
 
 class MockEmailClient:
+    def __init__(self, latency: float = 0.2):
+        self.latency = latency
+    
     async def send(self, recipient: str, message: str, priority: str) -> bool:
-        await asyncio.sleep(0.2)  # Simulate API call
+        await asyncio.sleep(self.latency)  # Simulate API call
         return True
+    
+    async def send_batch(self, recipients: List[str], message: str, priority: str) -> List[bool]:
+        await asyncio.sleep(self.latency)  # One API call for the whole batch
+        return [True] * len(recipients)
 
 class MockSlackClient:
+    def __init__(self, latency: float = 0.1):
+        self.latency = latency
+    
     async def send(self, recipient: str, message: str, priority: str) -> bool:
-        await asyncio.sleep(0.1)  # Simulate API call
+        await asyncio.sleep(self.latency)  # Simulate API call
         return True
+    
+    async def send_batch(self, recipients: List[str], message: str, priority: str) -> List[bool]:
+        await asyncio.sleep(self.latency)  # One API call for the whole batch
+        return [True] * len(recipients)
 
 class MockPhoneClient:
+    def __init__(self, latency: float = 1.0):
+        self.latency = latency
+    
     async def send(self, recipient: str, message: str, priority: str) -> bool:
-        await asyncio.sleep(1.0)  # Simulate phone call
+        await asyncio.sleep(self.latency)  # Simulate phone call
         return priority in ["critical", "high"]  # Phone calls more likely to succeed for urgent matters
 
 class MockWhatsAppClient:
+    def __init__(self, latency: float = 0.3):
+        self.latency = latency
+    
     async def send(self, recipient: str, message: str, priority: str) -> bool:
-        await asyncio.sleep(0.3)  # Simulate API call
+        await asyncio.sleep(self.latency)  # Simulate API call
         return True
 
 class MockPushClient:
+    def __init__(self, latency: float = 0.1):
+        self.latency = latency
+    
     async def send(self, recipient: str, message: str, priority: str) -> bool:
-        await asyncio.sleep(0.1)  # Simulate push notification
-        return True
\ No newline at end of file
+        await asyncio.sleep(self.latency)  # Simulate push notification
+        return True
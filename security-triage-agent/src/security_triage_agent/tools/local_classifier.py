@@ -0,0 +1,367 @@
+"""
+Local Fast-Path Classifier for Security Triage Agent.
+
+A linear model over hashed word n-grams, trained from the categories and
+confidences of previously classified incidents. It scores an incident in
+microseconds so routine incidents can be classified without an LLM call;
+IncidentClassifier defers to the LLM whenever its calibrated confidence is
+below a threshold.
+
+Retrain from the incidents table and print an offline evaluation report:
+
+    python -m security_triage_agent.tools.local_classifier retrain \\
+        --db data/security_incidents.db --model data/local_classifier.npz
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ..core.state import IncidentCategory
+from .classification import ClassificationResult
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+FAST_PATH_INDICATOR = "fast_path_classification"
+
+
+def _example_text(example: Dict[str, Any]) -> str:
+    return f"{example['title']} {example['description']}"
+
+
+class LocalIncidentClassifier:
+    """
+    Hashed n-gram logistic regression with temperature-scaled confidences.
+
+    Unigrams and bigrams are hashed with CRC32 into ``n_features`` buckets, so
+    the feature space is fixed and stable across processes. Each incident is a
+    binary, L2-normalised feature vector; scoring is a sum of weight rows plus
+    a bias followed by a softmax. Training uses scikit-learn, which is only
+    needed to fit a model, not to load or apply one.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, n_features: int = 2 ** 18):
+        self.n_features = n_features
+        self.classes: List[IncidentCategory] = []
+        self.weights: Optional[np.ndarray] = None  # (n_features, n_classes)
+        self.bias: Optional[np.ndarray] = None
+        self.temperature = 1.0
+        self.training_info: Dict[str, Any] = {}
+
+    @property
+    def is_trained(self) -> bool:
+        return self.weights is not None
+
+    def _features(self, text: str) -> np.ndarray:
+        """Hash the unigrams and bigrams of a text into unique feature indices."""
+        tokens = _TOKEN_RE.findall(text.lower())
+        grams = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+        return np.unique(np.fromiter(
+            (zlib.crc32(gram.encode("utf-8")) % self.n_features for gram in grams),
+            dtype=np.int64, count=len(grams)
+        ))
+
+    def _logits(self, text: str) -> np.ndarray:
+        indices = self._features(text)
+        if len(indices) == 0:
+            return self.bias.copy()
+        return self.weights[indices].sum(axis=0) / np.sqrt(len(indices)) + self.bias
+
+    @staticmethod
+    def _softmax(logits: np.ndarray) -> np.ndarray:
+        shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return shifted / shifted.sum(axis=-1, keepdims=True)
+
+    def predict_proba(self, title: str, description: str) -> Dict[IncidentCategory, float]:
+        """
+        Calibrated category probabilities for an incident.
+
+        Args:
+            title: Incident title
+            description: Incident description
+
+        Returns:
+            Mapping of category to probability
+        """
+        if not self.is_trained:
+            raise ValueError("Local classifier has not been trained")
+
+        probabilities = self._softmax(self._logits(f"{title} {description}") / self.temperature)
+        return dict(zip(self.classes, probabilities.tolist()))
+
+    def predict(self, title: str, description: str) -> ClassificationResult:
+        """
+        Classify an incident locally.
+
+        Args:
+            title: Incident title
+            description: Incident description
+
+        Returns:
+            ClassificationResult whose confidence is the calibrated probability
+        """
+        probabilities = sorted(
+            self.predict_proba(title, description).items(),
+            key=lambda item: item[1], reverse=True
+        )
+        category, confidence = probabilities[0]
+
+        return ClassificationResult(
+            category=category,
+            confidence=confidence,
+            reasoning=f"Local fast-path classifier matched {category.value} "
+                      f"with calibrated confidence {confidence:.2f}",
+            alternative_categories=[alt for alt, probability in probabilities[1:]
+                                    if probability >= 0.1],
+            extracted_entities={},
+            severity_indicators=[FAST_PATH_INDICATOR]
+        )
+
+    def fit(
+        self,
+        examples: Sequence[Dict[str, Any]],
+        calibration_fraction: float = 0.2,
+        regularization: float = 10.0,
+        seed: int = 0
+    ) -> "LocalIncidentClassifier":
+        """
+        Train on stored classifications, weighting each by its confidence.
+
+        A random ``calibration_fraction`` of the examples is held out to fit
+        the softmax temperature, so reported confidences match observed
+        agreement with the LLM labels.
+
+        Args:
+            examples: Dicts with title, description, category and confidence
+            calibration_fraction: Share of examples used for calibration
+            regularization: Inverse L2 regularization strength
+            seed: Random seed for the calibration split
+
+        Returns:
+            The trained classifier
+        """
+        from sklearn.linear_model import LogisticRegression
+
+        labels = np.array([IncidentCategory(example["category"]).value for example in examples])
+        if len(set(labels)) < 2:
+            raise ValueError("Training requires examples from at least two categories")
+
+        order = np.random.default_rng(seed).permutation(len(examples))
+        calibration_size = int(len(examples) * calibration_fraction)
+        # Too few examples to calibrate reliably: fit on everything, keep T=1
+        if calibration_size < 20:
+            calibration_size = 0
+        calibration, training = order[:calibration_size], order[calibration_size:]
+
+        matrix = self._feature_matrix([_example_text(examples[i]) for i in range(len(examples))])
+        weights = np.array([float(examples[i].get("confidence") or 1.0) for i in range(len(examples))])
+
+        model = LogisticRegression(C=regularization, max_iter=1000)
+        model.fit(matrix[training], labels[training], sample_weight=weights[training])
+
+        self.classes = [IncidentCategory(label) for label in model.classes_]
+        coefficients = model.coef_
+        intercept = model.intercept_
+        if len(self.classes) == 2:
+            # Binary models expose one row for the positive class
+            coefficients = np.vstack([-coefficients[0] / 2, coefficients[0] / 2])
+            intercept = np.array([-intercept[0] / 2, intercept[0] / 2])
+        self.weights = np.ascontiguousarray(coefficients.T, dtype=np.float32)
+        self.bias = intercept.astype(np.float32)
+
+        self.temperature = 1.0
+        if calibration_size:
+            logits = np.asarray(matrix[calibration] @ self.weights) + self.bias
+            targets = np.array([self.classes.index(IncidentCategory(label))
+                                for label in labels[calibration]])
+            self.temperature = self._fit_temperature(logits, targets)
+
+        self.training_info = {
+            "examples": len(training),
+            "calibration_examples": calibration_size,
+            "categories": {category.value: int((labels[training] == category.value).sum())
+                           for category in self.classes}
+        }
+        return self
+
+    def _feature_matrix(self, texts: Sequence[str]):
+        from scipy import sparse
+
+        rows, columns, values = [], [], []
+        for row, text in enumerate(texts):
+            indices = self._features(text)
+            rows.extend([row] * len(indices))
+            columns.extend(indices.tolist())
+            values.extend([1.0 / np.sqrt(len(indices))] * len(indices))
+
+        return sparse.csr_matrix(
+            (values, (rows, columns)), shape=(len(texts), self.n_features), dtype=np.float32
+        )
+
+    def _fit_temperature(self, logits: np.ndarray, targets: np.ndarray) -> float:
+        """Pick the softmax temperature minimising held-out negative log-likelihood."""
+        best_temperature, best_loss = 1.0, float("inf")
+        for temperature in np.geomspace(0.2, 5.0, 60):
+            probabilities = self._softmax(logits / temperature)
+            loss = -np.log(probabilities[np.arange(len(targets)), targets] + 1e-12).mean()
+            if loss < best_loss:
+                best_temperature, best_loss = float(temperature), loss
+        return best_temperature
+
+    def evaluate(
+        self,
+        examples: Sequence[Dict[str, Any]],
+        thresholds: Sequence[float] = (0.7, 0.8, 0.9, 0.95)
+    ) -> Dict[str, Any]:
+        """
+        Offline report of agreement with stored LLM labels per threshold.
+
+        Args:
+            examples: Labelled examples not used for training
+            thresholds: Confidence thresholds to report
+
+        Returns:
+            Report with, per threshold, the share of incidents answered
+            locally (LLM calls avoided) and their agreement rate
+        """
+        predictions = [self.predict(example["title"], example["description"]) for example in examples]
+        agreements = [prediction.category.value == example["category"]
+                      for prediction, example in zip(predictions, examples)]
+
+        report: Dict[str, Any] = {
+            "examples": len(examples),
+            "overall_agreement": float(np.mean(agreements)) if agreements else 0.0,
+            "thresholds": []
+        }
+        for threshold in thresholds:
+            covered = [agreed for prediction, agreed in zip(predictions, agreements)
+                       if prediction.confidence >= threshold]
+            report["thresholds"].append({
+                "threshold": threshold,
+                "llm_calls_avoided": len(covered),
+                "llm_calls_avoided_rate": len(covered) / len(examples) if examples else 0.0,
+                "agreement_rate": sum(covered) / len(covered) if covered else None
+            })
+        return report
+
+    def save(self, model_path: Union[str, Path]) -> None:
+        """Write the model to an ``.npz`` file."""
+        if not self.is_trained:
+            raise ValueError("Local classifier has not been trained")
+
+        model_path = Path(model_path)
+        model_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(model_path, "wb") as handle:
+            np.savez_compressed(
+                handle,
+                format_version=self.FORMAT_VERSION,
+                n_features=self.n_features,
+                classes=np.array([category.value for category in self.classes]),
+                weights=self.weights,
+                bias=self.bias,
+                temperature=self.temperature,
+                training_info=json.dumps(self.training_info)
+            )
+
+    @classmethod
+    def load(cls, model_path: Union[str, Path]) -> "LocalIncidentClassifier":
+        """Load a model written by save()."""
+        with np.load(model_path, allow_pickle=False) as data:
+            if int(data["format_version"]) != cls.FORMAT_VERSION:
+                raise ValueError(f"Unsupported local classifier format in {model_path}")
+
+            classifier = cls(n_features=int(data["n_features"]))
+            classifier.classes = [IncidentCategory(value) for value in data["classes"].tolist()]
+            classifier.weights = np.ascontiguousarray(data["weights"])
+            classifier.bias = data["bias"]
+            classifier.temperature = float(data["temperature"])
+            classifier.training_info = json.loads(str(data["training_info"]))
+        return classifier
+
+
+async def retrain(
+    db_path: str,
+    model_path: str,
+    min_confidence: float = 0.7,
+    holdout_fraction: float = 0.2,
+    thresholds: Sequence[float] = (0.7, 0.8, 0.9, 0.95)
+) -> Dict[str, Any]:
+    """
+    Retrain the local classifier from the incidents table.
+
+    The most recent ``holdout_fraction`` of incidents is held out for the
+    evaluation report; the saved model is trained on the remainder.
+
+    Args:
+        db_path: Incident database path
+        model_path: Output model path
+        min_confidence: Minimum LLM confidence for a training label
+        holdout_fraction: Share of most recent incidents held out
+        thresholds: Confidence thresholds to report
+
+    Returns:
+        Evaluation report
+    """
+    from ..memory.persistent_storage import PersistentStorage
+
+    storage = PersistentStorage(db_path)
+    await storage.pool.open()
+    try:
+        examples = await storage.get_classification_examples(min_confidence=min_confidence)
+    finally:
+        await storage.pool.close()
+
+    holdout_size = int(len(examples) * holdout_fraction)
+    training, holdout = examples[:len(examples) - holdout_size], examples[len(examples) - holdout_size:]
+
+    classifier = LocalIncidentClassifier().fit(training)
+    report = classifier.evaluate(holdout, thresholds) if holdout else {"examples": 0, "thresholds": []}
+    report["training"] = classifier.training_info
+    report["temperature"] = classifier.temperature
+
+    classifier.save(model_path)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local fast-path incident classifier")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    retrain_parser = subcommands.add_parser("retrain", help="Retrain from the incidents table")
+    retrain_parser.add_argument("--db", default="data/security_incidents.db",
+                                help="Incident database path")
+    retrain_parser.add_argument("--model", default="data/local_classifier.npz",
+                                help="Output model path")
+    retrain_parser.add_argument("--min-confidence", type=float, default=0.7,
+                                help="Minimum LLM confidence for a training label")
+    retrain_parser.add_argument("--holdout", type=float, default=0.2,
+                                help="Share of most recent incidents held out for evaluation")
+    retrain_parser.add_argument("--report", help="Also write the evaluation report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(retrain(args.db, args.model, args.min_confidence, args.holdout))
+
+    print(f"Trained on {report['training']['examples']} incidents "
+          f"(temperature {report['temperature']:.2f}), evaluated on {report['examples']}")
+    if report["examples"]:
+        print(f"Overall agreement with LLM labels: {report['overall_agreement']:.1%}")
+    print(f"{'threshold':>9} {'calls avoided':>14} {'agreement':>10}")
+    for row in report["thresholds"]:
+        agreement = f"{row['agreement_rate']:.1%}" if row["agreement_rate"] is not None else "n/a"
+        print(f"{row['threshold']:>9.2f} {row['llm_calls_avoided_rate']:>14.1%} {agreement:>10}")
+
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
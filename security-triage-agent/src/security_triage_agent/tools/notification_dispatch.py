@@ -0,0 +1,368 @@
+"""
+Notification Dispatch Engine for Security Incident Triage Agent.
+
+Fans notifications out to many recipients and channels concurrently. Sends are
+throttled by per-channel token buckets (SMS, WhatsApp and phone providers
+enforce request rates), the same channel address is contacted once per
+message even when a recipient appears several times, channels whose clients
+accept batches (email, Slack) are sent as one call per message, and the whole
+fan-out is bounded by a deadline.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+
+# Sends per second and burst size for rate-limited channels
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "sms": (10.0, 10),
+    "whatsapp": (5.0, 5),
+    "phone_call": (2.0, 2),
+}
+
+# Channels sent as one client call per message when the client has send_batch()
+DEFAULT_BATCH_CHANNELS = ("email", "slack")
+
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+STATUS_ERROR = "error"
+STATUS_DEDUPLICATED = "deduplicated"
+STATUS_RATE_LIMITED = "rate_limited"
+STATUS_DEADLINE_EXCEEDED = "deadline_exceeded"
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Refills ``rate`` tokens per second up to ``capacity``; waiters are served
+    in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(capacity or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, deadline: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting for a refill if necessary.
+
+        Args:
+            deadline: time.monotonic() value after which to give up
+
+        Returns:
+            False if no token becomes available before the deadline
+        """
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    return False
+                await asyncio.sleep(wait)
+                self._refill()
+            self._tokens -= 1
+            return True
+
+
+class NotificationRequest:
+    """
+    Notification to one recipient.
+
+    ``targets`` are (channel, address) pairs sent concurrently. ``fallback``
+    targets are sent only if a primary target was not delivered, after the
+    primaries have finished. ``dedupe_key`` identifies the notification for
+    deduplication (the message text by default).
+    """
+
+    __slots__ = ("recipient_id", "targets", "message", "priority", "fallback", "dedupe_key")
+
+    def __init__(
+        self,
+        recipient_id: str,
+        targets: Sequence[Tuple[Hashable, str]],
+        message: str,
+        priority: str = "normal",
+        fallback: Sequence[Tuple[Hashable, str]] = (),
+        dedupe_key: Optional[str] = None
+    ):
+        self.recipient_id = recipient_id
+        self.targets = list(targets)
+        self.message = message
+        self.priority = priority
+        self.fallback = list(fallback)
+        self.dedupe_key = dedupe_key or hashlib.sha1(message.encode("utf-8")).hexdigest()
+
+
+class Delivery:
+    """Outcome of one send to one channel address."""
+
+    __slots__ = ("recipient_id", "channel", "address", "success", "status",
+                 "message_id", "timestamp", "latency_seconds")
+
+    def __init__(self, recipient_id: str, channel: Hashable, address: str, success: bool,
+                 status: str, message_id: str = "", latency_seconds: float = 0.0):
+        self.recipient_id = recipient_id
+        self.channel = channel
+        self.address = address
+        self.success = success
+        self.status = status
+        self.message_id = message_id
+        self.timestamp = datetime.utcnow()
+        self.latency_seconds = latency_seconds
+
+
+class _Send:
+    """A deduplicated send shared by every request that asked for it."""
+
+    __slots__ = ("key", "recipient_id", "channel", "address", "message", "priority", "delivery")
+
+    def __init__(self, key: Tuple, recipient_id: str, channel: Hashable, address: str,
+                 message: str, priority: str):
+        self.key = key
+        self.recipient_id = recipient_id
+        self.channel = channel
+        self.address = address
+        self.message = message
+        self.priority = priority
+        self.delivery: Optional[Delivery] = None
+
+
+def _channel_name(channel: Hashable) -> str:
+    return str(getattr(channel, "value", channel))
+
+
+class NotificationDispatcher:
+    """
+    Concurrent notification fan-out over a set of channel clients.
+
+    Clients implement ``async send(recipient, message, priority) -> bool``;
+    batch-capable clients also implement ``async send_batch(recipients,
+    message, priority) -> List[bool]``.
+    """
+
+    def __init__(
+        self,
+        clients: Dict[Hashable, Any],
+        rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        batch_channels: Iterable[str] = DEFAULT_BATCH_CHANNELS,
+        max_batch_size: int = 50,
+        max_concurrency: int = 32,
+        deadline_seconds: float = 30.0,
+        dedupe_window_seconds: float = 300.0,
+        max_dedupe_entries: int = 10000
+    ):
+        """
+        Args:
+            clients: Channel to client
+            rate_limits: Channel name to (sends per second, burst), replacing
+                DEFAULT_RATE_LIMITS; channels not listed are not throttled
+            batch_channels: Channel names sent in batches
+            max_batch_size: Recipients per batch call
+            max_concurrency: Client calls in flight at once
+            deadline_seconds: Default time budget of one dispatch
+            dedupe_window_seconds: How long a delivered notification suppresses
+                an identical one to the same address (0 disables)
+            max_dedupe_entries: Bound on remembered deliveries
+        """
+        self.clients = clients
+        limits = DEFAULT_RATE_LIMITS if rate_limits is None else rate_limits
+        self.rate_limiters = {
+            channel: TokenBucket(rate, burst) for channel, (rate, burst) in limits.items()
+        }
+        self.batch_channels = set(batch_channels)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.deadline_seconds = deadline_seconds
+        self.dedupe_window_seconds = dedupe_window_seconds
+        self.max_dedupe_entries = max_dedupe_entries
+
+        # Dedupe key -> (expires at, message id) of recent successful deliveries
+        self._recent: "OrderedDict[Tuple, Tuple[float, str]]" = OrderedDict()
+
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "sent": 0,
+            "failed": 0,
+            "deduplicated": 0,
+            "rate_limited": 0,
+            "deadline_exceeded": 0,
+            "client_calls": 0,
+            "batch_calls": 0,
+        }
+
+    async def dispatch(
+        self,
+        requests: Sequence[NotificationRequest],
+        deadline_seconds: Optional[float] = None
+    ) -> List[Delivery]:
+        """
+        Send notifications concurrently.
+
+        Args:
+            requests: Notifications to send
+            deadline_seconds: Time budget overriding the default; sends not
+                finished in time are cancelled and reported as deadline_exceeded
+
+        Returns:
+            Deliveries in request order, primary targets before fallbacks.
+            A send repeated within this dispatch is reported once.
+        """
+        budget = self.deadline_seconds if deadline_seconds is None else deadline_seconds
+        deadline = time.monotonic() + budget
+        self.stats["requests"] += len(requests)
+
+        seen: Dict[Tuple, _Send] = {}
+        primary = [self._plan(request, request.targets, seen) for request in requests]
+        await self._execute([send for sends in primary for send in sends], deadline)
+
+        fallback: List[List[_Send]] = []
+        for request, sends in zip(requests, primary):
+            delivered = all(send.delivery is not None and send.delivery.success for send in sends)
+            fallback.append([] if delivered else self._plan(request, request.fallback, seen))
+        await self._execute([send for sends in fallback for send in sends], deadline)
+
+        deliveries = []
+        reported = set()
+        for sends in (primary, fallback):
+            for request_sends in sends:
+                for send in request_sends:
+                    if send.key not in reported:
+                        reported.add(send.key)
+                        deliveries.append(send.delivery)
+        return deliveries
+
+    def get_stats(self) -> Dict[str, int]:
+        """Delivery counts since creation."""
+        return dict(self.stats)
+
+    def _plan(self, request: NotificationRequest, targets: Sequence[Tuple[Hashable, str]],
+              seen: Dict[Tuple, _Send]) -> List[_Send]:
+        """Resolve targets to sends, sharing sends already planned in this dispatch."""
+        sends = []
+        for channel, address in targets:
+            key = (_channel_name(channel), address, request.dedupe_key)
+            send = seen.get(key)
+            if send is None:
+                send = _Send(key, request.recipient_id, channel, address, request.message, request.priority)
+                seen[key] = send
+                recent = self._recent_delivery(key)
+                if recent is not None:
+                    send.delivery = Delivery(request.recipient_id, channel, address, True,
+                                             STATUS_DEDUPLICATED, recent)
+                    self.stats["deduplicated"] += 1
+            else:
+                self.stats["deduplicated"] += 1
+            sends.append(send)
+        return sends
+
+    def _batches(self, channel: Hashable) -> bool:
+        return _channel_name(channel) in self.batch_channels and hasattr(self.clients.get(channel), "send_batch")
+
+    def _recent_delivery(self, key: Tuple) -> Optional[str]:
+        entry = self._recent.get(key)
+        if entry is None:
+            return None
+        expires_at, message_id = entry
+        if expires_at < time.monotonic():
+            del self._recent[key]
+            return None
+        return message_id
+
+    def _remember(self, delivery: Delivery, key: Tuple) -> None:
+        if self.dedupe_window_seconds <= 0 or not delivery.success:
+            return
+        self._recent[key] = (time.monotonic() + self.dedupe_window_seconds, delivery.message_id)
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_dedupe_entries:
+            self._recent.popitem(last=False)
+
+    async def _execute(self, sends: List[_Send], deadline: float) -> None:
+        """Run pending sends, batching where possible, until done or the deadline passes."""
+        units: List[List[_Send]] = []
+        batches: Dict[Tuple, List[_Send]] = {}
+        scheduled = set()
+        for send in sends:
+            if send.delivery is not None or send.key in scheduled:
+                continue
+            scheduled.add(send.key)
+            if self._batches(send.channel):
+                batch_key = (_channel_name(send.channel), send.priority, send.message)
+                batch = batches.setdefault(batch_key, [])
+                if len(batch) >= self.max_batch_size:
+                    units.append(batch)
+                    batch = batches[batch_key] = []
+                batch.append(send)
+            else:
+                units.append([send])
+        units.extend(batch for batch in batches.values() if batch)
+        if not units:
+            return
+
+        slots = asyncio.Semaphore(self.max_concurrency)
+        tasks = [asyncio.ensure_future(self._run_unit(unit, slots, deadline)) for unit in units]
+        _, pending = await asyncio.wait(tasks, timeout=max(0.0, deadline - time.monotonic()))
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for unit in units:
+            for send in unit:
+                if send.delivery is None:
+                    send.delivery = Delivery(send.recipient_id, send.channel, send.address, False,
+                                             STATUS_DEADLINE_EXCEEDED)
+                    self.stats["deadline_exceeded"] += 1
+
+    async def _run_unit(self, unit: List[_Send], slots: asyncio.Semaphore, deadline: float) -> None:
+        """Send one message to one address, or one batch call."""
+        first = unit[0]
+        limiter = self.rate_limiters.get(_channel_name(first.channel))
+        if limiter is not None and not await limiter.acquire(deadline):
+            for send in unit:
+                send.delivery = Delivery(send.recipient_id, send.channel, send.address, False,
+                                         STATUS_RATE_LIMITED)
+            self.stats["rate_limited"] += len(unit)
+            return
+
+        client = self.clients.get(first.channel)
+        async with slots:
+            started = time.monotonic()
+            try:
+                if client is None:
+                    raise ValueError(f"No client configured for channel: {first.channel}")
+                self.stats["client_calls"] += 1
+                if self._batches(first.channel):
+                    self.stats["batch_calls"] += 1
+                    outcomes = list(await client.send_batch(
+                        [send.address for send in unit], first.message, first.priority
+                    ))
+                else:
+                    outcomes = [await client.send(first.address, first.message, first.priority)]
+                # A batch reply shorter than the batch leaves the rest undelivered
+                outcomes += [False] * (len(unit) - len(outcomes))
+                statuses = [(bool(ok), STATUS_SENT if ok else STATUS_FAILED) for ok in outcomes]
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                statuses = [(False, STATUS_ERROR)] * len(unit)
+            latency = time.monotonic() - started
+
+        for send, (success, status) in zip(unit, statuses):
+            send.delivery = Delivery(send.recipient_id, send.channel, send.address, success,
+                                     status, str(uuid4()), latency)
+            self.stats["sent" if success else "failed"] += 1
+            self._remember(send.delivery, send.key)
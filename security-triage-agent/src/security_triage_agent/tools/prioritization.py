@@ -240,31 +240,7 @@ Provide comprehensive risk assessment in JSON format."""
             else:
                 result_data = json.loads(str(response))
             
-            # Create risk assessment
-            risk_score = max(0.0, min(10.0, float(result_data.get("risk_score", 5.0))))
-            likelihood_score = max(0.0, min(10.0, float(result_data.get("likelihood_score", 5.0))))
-            confidence_score = max(0.0, min(1.0, float(result_data.get("confidence_score", 0.7))))
-            
-            # Determine mitigation urgency based on risk score
-            if risk_score >= 8.0:
-                mitigation_urgency = IncidentPriority.CRITICAL
-            elif risk_score >= 6.0:
-                mitigation_urgency = IncidentPriority.HIGH
-            elif risk_score >= 4.0:
-                mitigation_urgency = IncidentPriority.MEDIUM
-            elif risk_score >= 2.0:
-                mitigation_urgency = IncidentPriority.LOW
-            else:
-                mitigation_urgency = IncidentPriority.INFORMATIONAL
-            
-            return RiskAssessment(
-                risk_score=risk_score,
-                risk_factors=result_data.get("risk_factors", []),
-                mitigation_urgency=mitigation_urgency,
-                potential_impact=result_data.get("potential_impact", "Moderate impact expected"),
-                likelihood_score=likelihood_score,
-                confidence_score=confidence_score
-            )
+            return self._build_risk_assessment(result_data)
             
         except (json.JSONDecodeError, KeyError, ValueError) as e:
             # Fallback risk assessment
@@ -314,52 +290,101 @@ Confidence: {risk_assessment.confidence_score}"""
             else:
                 result_data = json.loads(str(response))
             
-            # Validate priority
-            try:
-                priority = IncidentPriority(result_data["priority"].lower())
-            except (KeyError, ValueError):
-                priority = risk_assessment.mitigation_urgency
-            
-            # Create detailed risk assessment result
-            risk_assessment_result = RiskAssessmentResult(
-                risk_score=risk_assessment.risk_score,
-                risk_factors=risk_assessment.risk_factors,
-                business_impact=result_data.get("business_impact", "Moderate business impact"),
-                guest_impact=result_data.get("guest_impact", "Potential guest impact"),
-                financial_impact=result_data.get("financial_impact", "Moderate financial impact"),
-                reputation_impact=result_data.get("reputation_impact", "Potential reputation impact"),
-                operational_impact=result_data.get("operational_impact", "Operational impact possible"),
-                likelihood_score=risk_assessment.likelihood_score,
-                confidence_score=risk_assessment.confidence_score,
-                time_sensitivity=result_data.get("time_sensitivity", "Moderate"),
-                escalation_triggers=result_data.get("escalation_triggers", [])
-            )
-            
-            # Determine SLA based on priority
-            sla_mapping = {
-                IncidentPriority.CRITICAL: "15 minutes",
-                IncidentPriority.HIGH: "1 hour",
-                IncidentPriority.MEDIUM: "4 hours",
-                IncidentPriority.LOW: "24 hours",
-                IncidentPriority.INFORMATIONAL: "72 hours"
-            }
-            
-            # Determine stakeholders based on priority and category
-            stakeholders = self._determine_stakeholders(priority, category, metadata)
-            
-            return PrioritizationResult(
-                priority=priority,
-                reasoning=result_data.get("reasoning", f"Prioritized as {priority.value} based on risk assessment"),
-                risk_assessment=risk_assessment_result,
-                recommended_sla=result_data.get("recommended_sla", sla_mapping[priority]),
-                stakeholders_to_notify=stakeholders,
-                immediate_actions_required=priority in [IncidentPriority.CRITICAL, IncidentPriority.HIGH]
+            return self._build_prioritization_result(
+                result_data, category, risk_assessment, metadata
             )
             
         except (json.JSONDecodeError, KeyError, ValueError) as e:
             # Fallback prioritization
             return self._fallback_prioritization(category, risk_assessment, str(e))
     
+    def _build_risk_assessment(self, result_data: Dict[str, Any]) -> RiskAssessment:
+        """
+        Validate parsed LLM output into a RiskAssessment.
+        
+        Raises:
+            KeyError, ValueError: If fields are invalid
+        """
+        risk_score = max(0.0, min(10.0, float(result_data.get("risk_score", 5.0))))
+        likelihood_score = max(0.0, min(10.0, float(result_data.get("likelihood_score", 5.0))))
+        confidence_score = max(0.0, min(1.0, float(result_data.get("confidence_score", 0.7))))
+        
+        # Determine mitigation urgency based on risk score
+        if risk_score >= 8.0:
+            mitigation_urgency = IncidentPriority.CRITICAL
+        elif risk_score >= 6.0:
+            mitigation_urgency = IncidentPriority.HIGH
+        elif risk_score >= 4.0:
+            mitigation_urgency = IncidentPriority.MEDIUM
+        elif risk_score >= 2.0:
+            mitigation_urgency = IncidentPriority.LOW
+        else:
+            mitigation_urgency = IncidentPriority.INFORMATIONAL
+        
+        return RiskAssessment(
+            risk_score=risk_score,
+            risk_factors=result_data.get("risk_factors", []),
+            mitigation_urgency=mitigation_urgency,
+            potential_impact=result_data.get("potential_impact", "Moderate impact expected"),
+            likelihood_score=likelihood_score,
+            confidence_score=confidence_score
+        )
+    
+    def _build_prioritization_result(
+        self,
+        result_data: Dict[str, Any],
+        category: IncidentCategory,
+        risk_assessment: RiskAssessment,
+        metadata: Optional[IncidentMetadata] = None
+    ) -> PrioritizationResult:
+        """
+        Validate parsed LLM output into a PrioritizationResult.
+        
+        Raises:
+            KeyError, ValueError: If fields are invalid
+        """
+        # Validate priority
+        try:
+            priority = IncidentPriority(result_data["priority"].lower())
+        except (KeyError, ValueError):
+            priority = risk_assessment.mitigation_urgency
+        
+        # Create detailed risk assessment result
+        risk_assessment_result = RiskAssessmentResult(
+            risk_score=risk_assessment.risk_score,
+            risk_factors=risk_assessment.risk_factors,
+            business_impact=result_data.get("business_impact", "Moderate business impact"),
+            guest_impact=result_data.get("guest_impact", "Potential guest impact"),
+            financial_impact=result_data.get("financial_impact", "Moderate financial impact"),
+            reputation_impact=result_data.get("reputation_impact", "Potential reputation impact"),
+            operational_impact=result_data.get("operational_impact", "Operational impact possible"),
+            likelihood_score=risk_assessment.likelihood_score,
+            confidence_score=risk_assessment.confidence_score,
+            time_sensitivity=result_data.get("time_sensitivity", "Moderate"),
+            escalation_triggers=result_data.get("escalation_triggers", [])
+        )
+        
+        # Determine SLA based on priority
+        sla_mapping = {
+            IncidentPriority.CRITICAL: "15 minutes",
+            IncidentPriority.HIGH: "1 hour",
+            IncidentPriority.MEDIUM: "4 hours",
+            IncidentPriority.LOW: "24 hours",
+            IncidentPriority.INFORMATIONAL: "72 hours"
+        }
+        
+        # Determine stakeholders based on priority and category
+        stakeholders = self._determine_stakeholders(priority, category, metadata)
+        
+        return PrioritizationResult(
+            priority=priority,
+            reasoning=result_data.get("reasoning", f"Prioritized as {priority.value} based on risk assessment"),
+            risk_assessment=risk_assessment_result,
+            recommended_sla=result_data.get("recommended_sla", sla_mapping[priority]),
+            stakeholders_to_notify=stakeholders,
+            immediate_actions_required=priority in [IncidentPriority.CRITICAL, IncidentPriority.HIGH]
+        )
+    
     def _format_metadata_context(self, metadata: Optional[IncidentMetadata]) -> str:
         """Format metadata into context string."""
         if not metadata:
@@ -7,6 +7,7 @@ secure and appropriate incident processing with hospitality industry focus.
 
 import re
 import json
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any, Set
 from pydantic import BaseModel, Field
 from langchain_core.tools import BaseTool
@@ -15,6 +16,7 @@ from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 
 from ..core.state import IncidentCategory, IncidentPriority
+from .content_scanner import ContentScanner, ScanSpan, PII_RULES
 
 
 class SafetyViolation(BaseModel):
@@ -34,19 +36,34 @@ class SafetyCheckResult(BaseModel):
     content_flags: List[str] = Field(default_factory=list)
     requires_human_review: bool = False
     review_reason: str = ""
-    sanitized_content: Optional[Dict[str, str]] = None
+    sanitized_content: Optional[Dict[str, Any]] = None
     risk_factors: List[str] = Field(default_factory=list)
     recommendations: List[str] = Field(default_factory=list)
 
 
+class ContentScreeningResult(BaseModel):
+    """Rule-based content screening, independent of risk scoring."""
+    content_violations: List[SafetyViolation] = Field(default_factory=list)
+    pii_violations: List[SafetyViolation] = Field(default_factory=list)
+    threat_violations: List[SafetyViolation] = Field(default_factory=list)
+
+
 class SafetyGuardrails(BaseTool):
     """
     Comprehensive safety guardrails for hospitality security incident processing.
     
     Implements multiple layers of safety checks including content validation,
     PII detection, threat assessment, and hospitality-specific safety measures.
+    
+    All rule-based checks share one ContentScanner pass. When sanitize_text
+    finds no PII, the spans from that pass are kept, so screening the same
+    text afterwards does not scan it again.
     """
     
+    # Sanitized texts whose scan results are kept, and the largest kept
+    screening_cache_size: int = 256
+    screening_cache_max_chars: int = 100_000
+    
     name: str = "safety_guardrails"
     description: str = "Perform safety and security validation for incident processing"
     
@@ -76,56 +93,21 @@ class SafetyGuardrails(BaseTool):
         
         self.pii_patterns = self._initialize_pii_patterns()
         self.threat_indicators = self._initialize_threat_indicators()
+        self.content_keywords = self._initialize_content_keywords()
+        self.scanner = ContentScanner(self.threat_indicators, self.content_keywords)
+        self._screening_cache: "OrderedDict[str, List[ScanSpan]]" = OrderedDict()
         self.hospitality_safeguards = self._initialize_hospitality_safeguards()
         self.safety_prompt = self._create_safety_prompt()
     
     def _initialize_pii_patterns(self) -> Dict[str, re.Pattern]:
-        """Initialize PII detection patterns."""
-        
-        patterns = {}
-        
-        # Credit card patterns
-        patterns["credit_card"] = re.compile(
-            r'\b(?:4[0-9]{12}(?:[0-9]{3})?|5[1-5][0-9]{14}|3[47][0-9]{13}|3[0-9]{13}|6(?:011|5[0-9]{2})[0-9]{12})\b'
-        )
-        
-        # Email patterns
-        patterns["email"] = re.compile(
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        )
-        
-        # Phone patterns (international)
-        patterns["phone"] = re.compile(
-            r'(\+?[1-9]\d{1,14}|\(\d{3}\)\s?\d{3}-?\d{4}|\d{3}-?\d{3}-?\d{4})'
-        )
-        
-        # Indian Aadhaar number pattern
-        patterns["aadhaar"] = re.compile(
-            r'\b[2-9]{1}[0-9]{3}\s?[0-9]{4}\s?[0-9]{4}\b'
-        )
-        
-        # Indian PAN number pattern
-        patterns["pan"] = re.compile(
-            r'\b[A-Z]{5}[0-9]{4}[A-Z]{1}\b'
-        )
-        
-        # Passport patterns
-        patterns["passport"] = re.compile(
-            r'\b[A-PR-WY][1-9]\d\s?\d{4}[1-9]\b|\b[A-Z]{1,2}[0-9]{6,9}\b'
-        )
-        
-        # IP address patterns
-        patterns["ip_address"] = re.compile(
-            r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'
-        )
-        
-        # Room number patterns (hotel specific)
-        patterns["room_number"] = re.compile(
-            r'\broom\s*[#:]?\s*(\d{3,4}[a-z]?)\b|\b\d{3,4}[a-z]?\s*room\b',
-            re.IGNORECASE
-        )
+        """
+        Initialize PII detection patterns.
         
-        return patterns
+        Covers credit cards, emails, phone numbers, Aadhaar, PAN, passports,
+        IP addresses and hotel room numbers. The rules are defined in
+        content_scanner.PII_RULES, which the single-pass scanner combines.
+        """
+        return {pii_type: re.compile(rule) for pii_type, rule in PII_RULES.items()}
     
     def _initialize_threat_indicators(self) -> Dict[str, List[str]]:
         """Initialize threat indicator keywords and patterns."""
@@ -164,6 +146,14 @@ class SafetyGuardrails(BaseTool):
         
         return indicators
     
+    def _initialize_content_keywords(self) -> List[str]:
+        """Initialize inappropriate content keywords."""
+        
+        return [
+            "discriminat", "harassment", "threat", "violence", "illegal",
+            "unauthorized", "malicious", "harmful"
+        ]
+    
     def _initialize_hospitality_safeguards(self) -> Dict[str, Any]:
         """Initialize hospitality-specific safety measures."""
         
@@ -290,7 +280,8 @@ Provide comprehensive safety analysis in JSON format."""
         category: IncidentCategory,
         risk_score: float = 5.0,
         processing_context: Optional[Dict[str, Any]] = None,
-        assessment_focus: Optional[List[str]] = None
+        assessment_focus: Optional[List[str]] = None,
+        screening: Optional[ContentScreeningResult] = None
     ) -> SafetyCheckResult:
         """
         Perform comprehensive safety checks on incident processing.
@@ -301,15 +292,18 @@ Provide comprehensive safety analysis in JSON format."""
             risk_score: Risk assessment score
             processing_context: Additional processing context
             assessment_focus: Specific areas to focus assessment on
+            screening: Result of screen_content, if already computed
             
         Returns:
             SafetyCheckResult with detailed safety analysis
         """
         
         # Perform basic content safety checks
-        content_violations = self._check_content_safety(incident_description)
-        pii_violations = self._detect_pii_exposure(incident_description)
-        threat_violations = self._assess_threat_indicators(incident_description, category)
+        if screening is None:
+            screening = self.screen_content(incident_description, category)
+        content_violations = list(screening.content_violations)
+        pii_violations = list(screening.pii_violations)
+        threat_violations = list(screening.threat_violations)
         
         # Combine all violations
         all_violations = content_violations + pii_violations + threat_violations
@@ -397,6 +391,33 @@ Provide comprehensive safety analysis in JSON format."""
             recommendations=recommendations
         )
     
+    def screen_content(
+        self,
+        incident_description: str,
+        category: IncidentCategory
+    ) -> ContentScreeningResult:
+        """
+        Run the rule-based content, PII and threat checks.
+        
+        These checks only need the incident text and category, so they can
+        run before the risk assessment is available.
+        
+        Args:
+            incident_description: Description of the incident
+            category: Incident category
+            
+        Returns:
+            ContentScreeningResult with violations by check
+        """
+        spans = self._screening_cache.get(incident_description)
+        if spans is None:
+            spans = self.scanner.scan(incident_description)
+        return ContentScreeningResult(
+            content_violations=self._check_content_safety(spans),
+            pii_violations=self._detect_pii_exposure(spans),
+            threat_violations=self._assess_threat_indicators(spans, category)
+        )
+    
     async def _get_llm_safety_assessment(
         self,
         incident_description: str,
@@ -474,20 +495,14 @@ Provide comprehensive safety analysis in JSON format."""
                 review_reason="Safety assessment system error - manual review required"
             )
     
-    def _check_content_safety(self, content: str) -> List[SafetyViolation]:
+    def _check_content_safety(self, spans: List[ScanSpan]) -> List[SafetyViolation]:
         """Perform basic content safety checks."""
         
         violations = []
-        content_lower = content.lower()
-        
-        # Check for inappropriate content keywords
-        inappropriate_keywords = [
-            "discriminat", "harassment", "threat", "violence", "illegal",
-            "unauthorized", "malicious", "harmful"
-        ]
+        found = {span.label for span in spans if span.kind == "content"}
         
-        for keyword in inappropriate_keywords:
-            if keyword in content_lower:
+        for keyword in self.content_keywords:
+            if keyword in found:
                 violations.append(SafetyViolation(
                     violation_type="inappropriate_content",
                     severity="medium",
@@ -498,33 +513,39 @@ Provide comprehensive safety analysis in JSON format."""
         
         return violations
     
-    def _detect_pii_exposure(self, content: str) -> List[SafetyViolation]:
+    def _detect_pii_exposure(self, spans: List[ScanSpan]) -> List[SafetyViolation]:
         """Detect potential PII exposure in content."""
         
         violations = []
+        counts: Dict[str, int] = {}
+        for span in spans:
+            if span.kind == "pii":
+                counts[span.label] = counts.get(span.label, 0) + 1
         
-        for pii_type, pattern in self.pii_patterns.items():
-            matches = pattern.findall(content)
-            if matches:
+        for pii_type in self.pii_patterns:
+            if counts.get(pii_type):
                 severity = "high" if pii_type in ["credit_card", "aadhaar", "passport"] else "medium"
                 violations.append(SafetyViolation(
                     violation_type=f"pii_exposure_{pii_type}",
                     severity=severity,
                     description=f"Potential {pii_type.replace('_', ' ')} exposure detected",
-                    detected_content=f"{len(matches)} instances found",
+                    detected_content=f"{counts[pii_type]} instances found",
                     recommendation=f"Redact or mask {pii_type.replace('_', ' ')} information"
                 ))
         
         return violations
     
-    def _assess_threat_indicators(self, content: str, category: IncidentCategory) -> List[SafetyViolation]:
+    def _assess_threat_indicators(self, spans: List[ScanSpan], category: IncidentCategory) -> List[SafetyViolation]:
         """Assess threat indicators in content."""
         
         violations = []
-        content_lower = content.lower()
+        indicators_found: Dict[str, Set[str]] = {}
+        for span in spans:
+            if span.kind == "threat":
+                indicators_found.setdefault(span.label, set()).add(span.text.lower())
         
-        for threat_type, indicators in self.threat_indicators.items():
-            threat_count = sum(1 for indicator in indicators if indicator in content_lower)
+        for threat_type in self.threat_indicators:
+            threat_count = len(indicators_found.get(threat_type, ()))
             
             if threat_count > 0:
                 # Determine severity based on threat type and category
@@ -547,36 +568,10 @@ Provide comprehensive safety analysis in JSON format."""
         
         return violations
     
-    def _sanitize_content(self, content: str) -> Dict[str, str]:
+    def _sanitize_content(self, content: str) -> Dict[str, Any]:
         """Sanitize content by masking PII and sensitive information."""
         
-        sanitized = content
-        replacements = {}
-        
-        for pii_type, pattern in self.pii_patterns.items():
-            def mask_match(match):
-                original = match.group(0)
-                if pii_type == "credit_card":
-                    # Mask credit card: keep first 4 and last 4 digits
-                    if len(original) >= 8:
-                        masked = original[:4] + "*" * (len(original) - 8) + original[-4:]
-                    else:
-                        masked = "*" * len(original)
-                elif pii_type == "email":
-                    # Mask email: keep first char and domain
-                    parts = original.split("@")
-                    if len(parts) == 2:
-                        masked = parts[0][0] + "*" * (len(parts[0]) - 1) + "@" + parts[1]
-                    else:
-                        masked = "*" * len(original)
-                else:
-                    # Generic masking
-                    masked = "*" * len(original)
-                
-                replacements[original] = masked
-                return masked
-            
-            sanitized = pattern.sub(mask_match, sanitized)
+        sanitized, replacements = self.scanner.redact(content)
         
         return {
             "original_content": content,
@@ -624,8 +619,16 @@ Provide comprehensive safety analysis in JSON format."""
     
     def sanitize_text(self, text: str) -> str:
         """Public method to sanitize text content."""
-        result = self._sanitize_content(text)
-        return result.get("sanitized_content", text)
+        sanitized, replacements, spans = self.scanner.redact_and_scan(text)
+        
+        # Unchanged text scans the same again; masked text is rescanned when screened
+        if not replacements and len(sanitized) <= self.screening_cache_max_chars:
+            self._screening_cache[sanitized] = spans
+            self._screening_cache.move_to_end(sanitized)
+            while len(self._screening_cache) > self.screening_cache_size:
+                self._screening_cache.popitem(last=False)
+        
+        return sanitized
     
     def _run(self, *args, **kwargs) -> str:
         """Synchronous tool interface (required by BaseTool)."""
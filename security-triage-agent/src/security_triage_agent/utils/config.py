@@ -64,11 +64,73 @@ class SecurityTriageConfig(BaseSettings):
         description="Path to LangGraph checkpoint database"
     )
     
+    checkpoint_keep_last: int = Field(
+        default=5,
+        ge=1,
+        description="Newest workflow checkpoints kept per incident"
+    )
+    
+    checkpoint_finished_grace_minutes: float = Field(
+        default=60.0,
+        ge=0,
+        description="Minutes a finished incident's checkpoints stay readable before compaction drops them"
+    )
+    
+    checkpoint_abandoned_after_hours: float = Field(
+        default=168.0,
+        ge=0,
+        description="Hours without a new checkpoint before an unfinished incident's checkpoints are dropped; incidents awaiting approval are kept (0 keeps them all)"
+    )
+    
+    checkpoint_compaction_interval_minutes: float = Field(
+        default=5.0,
+        gt=0,
+        description="Minutes between background checkpoint compactions"
+    )
+    
     data_retention_days: int = Field(
         default=365,
         description="Number of days to retain incident data"
     )
     
+    archive_path: str = Field(
+        default="data/archive",
+        description="Directory of compressed, date-partitioned archives of records past retention"
+    )
+    
+    retention_interval_minutes: float = Field(
+        default=60.0,
+        ge=0,
+        description="Minutes between background retention runs (0 runs retention at shutdown only)"
+    )
+    
+    retention_batch_size: int = Field(
+        default=500,
+        ge=1,
+        description="Incidents archived and deleted per retention transaction"
+    )
+    
+    retention_vacuum_pages: int = Field(
+        default=1000,
+        ge=0,
+        description="Free database pages returned to the file system after each retention batch"
+    )
+    
+    database_reader_connections: int = Field(
+        default=4,
+        ge=1,
+        description="Number of pooled SQLite reader connections"
+    )
+    
+    similarity_prefilter_candidates: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Score only this many best full-text matches when finding similar incidents; "
+            "faster on large histories but approximate (0 scores every incident)"
+        )
+    )
+    
     # === REDIS SETTINGS ===
     redis_url: str = Field(
         default="redis://localhost:6379",
@@ -80,6 +142,24 @@ class SecurityTriageConfig(BaseSettings):
         description="Session time-to-live in hours"
     )
     
+    max_sessions: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum sessions kept by the in-memory fallback when Redis is unavailable"
+    )
+    
+    max_memory_session_entries: int = Field(
+        default=100000,
+        ge=1,
+        description="Maximum incident states and workflow checkpoints kept in memory without Redis"
+    )
+    
+    checkpoint_full_snapshot_every: int = Field(
+        default=10,
+        ge=1,
+        description="Workflow checkpoints between full snapshots; the rest store changed fields only"
+    )
+    
     # === LLM SETTINGS ===
     llm_model: str = Field(
         default="gpt-4",
@@ -103,6 +183,35 @@ class SecurityTriageConfig(BaseSettings):
         description="LLM request timeout in seconds"
     )
     
+    # === LLM CACHE SETTINGS ===
+    llm_cache_enabled: bool = Field(
+        default=True,
+        description="Cache LLM responses keyed on rendered prompt, model and temperature"
+    )
+    
+    llm_cache_db_path: str = Field(
+        default="data/llm_cache.db",
+        description="Path to SQLite LLM response cache"
+    )
+    
+    llm_cache_ttl_hours: float = Field(
+        default=24.0,
+        gt=0,
+        description="Time-to-live for cached LLM responses in hours"
+    )
+    
+    llm_cache_max_entries: int = Field(
+        default=50000,
+        ge=1,
+        description="Maximum cached LLM responses before LRU eviction"
+    )
+    
+    llm_cache_memory_entries: int = Field(
+        default=1000,
+        ge=1,
+        description="Cached LLM responses also held in process memory"
+    )
+    
     # === API KEYS (from environment) ===
     openai_api_key: Optional[str] = Field(
         default=None,
@@ -115,6 +224,50 @@ class SecurityTriageConfig(BaseSettings):
     )
     
     # === WORKFLOW SETTINGS ===
+    local_classifier_enabled: bool = Field(
+        default=False,
+        description="Classify routine incidents with the local fast-path model before the LLM"
+    )
+    
+    local_classifier_model_path: str = Field(
+        default="data/local_classifier.npz",
+        description="Path to the trained local classifier"
+    )
+    
+    local_classifier_threshold: float = Field(
+        default=0.9,
+        ge=0.0,
+        le=1.0,
+        description="Calibrated confidence above which the local classification is used"
+    )
+    
+    fused_triage_enabled: bool = Field(
+        default=False,
+        description="Classify, assess risk and prioritize in a single LLM call"
+    )
+    
+    parallel_workflow_nodes: bool = Field(
+        default=False,
+        description="Run independent workflow steps concurrently (opt-in)"
+    )
+    
+    incident_queue_workers: int = Field(
+        default=8,
+        ge=1,
+        description="Incidents processed concurrently by the submission queue"
+    )
+    
+    incident_queue_max_pending: int = Field(
+        default=1000,
+        ge=1,
+        description="Queued incidents before submitters wait (critical incidents are always admitted)"
+    )
+    
+    incident_queue_max_pending_per_property: Optional[int] = Field(
+        default=200,
+        description="Queued incidents per property before that property's submitters wait"
+    )
+    
     max_workflow_steps: int = Field(
         default=20,
         description="Maximum number of workflow steps"
@@ -146,6 +299,12 @@ class SecurityTriageConfig(BaseSettings):
         description="Enable human intervention gates"
     )
     
+    approval_max_escalations: int = Field(
+        default=3,
+        ge=1,
+        description="Times an undecided approval is escalated before it waits without further escalation"
+    )
+    
     max_hallucination_rate: float = Field(
         default=0.05,
         ge=0.0,
@@ -243,6 +402,36 @@ class SecurityTriageConfig(BaseSettings):
         description="Metrics export interval"
     )
     
+    metrics_flush_interval_seconds: float = Field(
+        default=1.0,
+        gt=0.0,
+        description="Maximum delay before buffered metrics are written to storage"
+    )
+    
+    metrics_flush_batch_size: int = Field(
+        default=500,
+        ge=1,
+        description="Buffered metric count that triggers an immediate flush"
+    )
+    
+    metrics_buffer_max_events: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum buffered metric events before writers are throttled"
+    )
+    
+    metrics_buffer_max_wait_seconds: float = Field(
+        default=5.0,
+        ge=0.0,
+        description="Longest a writer waits for buffer space before the event is dropped"
+    )
+    
+    metrics_sketch_persist_interval_seconds: float = Field(
+        default=60.0,
+        gt=0.0,
+        description="Interval between saves of the metric percentile sketches"
+    )
+    
     enable_performance_monitoring: bool = Field(
         default=True,
         description="Enable performance monitoring"
@@ -331,7 +520,7 @@ class SecurityTriageConfig(BaseSettings):
             raise ValueError(f"Privacy level must be one of: {valid_levels}")
         return v
     
-    @validator("database_path", "checkpoint_db_path")
+    @validator("database_path", "checkpoint_db_path", "llm_cache_db_path")
     def validate_database_paths(cls, v):
         """Ensure database directories exist."""
         path = Path(v)
@@ -0,0 +1,56 @@
+"""
+Tests for the pending-approval index holding incidents parked at the human approval gate.
+"""
+
+import asyncio
+import time
+
+from src.security_triage_agent.core.approval_index import PendingApprovalIndex, most_urgent
+
+
+async def test_parked_incidents_use_no_cpu_while_waiting():
+    index = PendingApprovalIndex()
+    index.start()
+    for number in range(10000):
+        index.park(f"inc_{number}", ["legal_review"], urgency="high")
+    assert len(index) == 10000
+
+    cpu_before = time.process_time()
+    await asyncio.sleep(1.0)
+    cpu_used = time.process_time() - cpu_before
+
+    # One timer task sleeping until the earliest deadline, nothing polling
+    assert cpu_used < 0.05
+    assert len([task for task in asyncio.all_tasks() if task.get_name() == "approval-escalation-timer"]) == 1
+    assert index.get_stats()["pending_by_urgency"] == {"high": 10000}
+    await index.stop()
+
+
+async def test_timeouts_escalate_until_decided():
+    escalated = []
+
+    async def on_escalate(entry):
+        escalated.append((entry.incident_id, entry.escalations))
+
+    index = PendingApprovalIndex(on_escalate, max_escalations=2)
+    index.start()
+    index.park("slow", ["legal_review"], timeout_seconds=0.05)
+    index.park("decided", ["safety_review"], timeout_seconds=0.05)
+    index.park("later", ["legal_review"], timeout_seconds=10)
+    index.resolve("decided")
+
+    await asyncio.sleep(0.2)
+    assert escalated == [("slow", 1), ("slow", 2)]
+    assert "slow" in index and "decided" not in index
+
+    # An earlier deadline parked behind a later one wakes the timer
+    index.park("urgent", ["safety_review"], timeout_seconds=0.02)
+    await asyncio.sleep(0.1)
+    assert ("urgent", 1) in escalated
+    assert [entry["incident_id"] for entry in index.list_pending()] == ["slow", "later", "urgent"]
+    await index.stop()
+
+
+def test_most_urgent():
+    assert most_urgent(["low", "critical", "medium"]) == "critical"
+    assert most_urgent([]) == "medium"
@@ -0,0 +1,99 @@
+"""
+Tests for recording approval decisions on incidents parked at the approval gate.
+"""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from src.security_triage_agent.core.agent import SecurityTriageAgent
+from src.security_triage_agent.core.approval_index import PendingApprovalIndex
+from src.security_triage_agent.core.state import IncidentState, IncidentCategory
+from src.security_triage_agent.core.workflow import APPROVAL_INTERRUPT_NODE
+
+
+class _CheckpointedWorkflow:
+    """Compiled-workflow stand-in keeping one saved state per thread."""
+
+    def __init__(self, states, interrupted):
+        self.states = states
+        self.interrupted = interrupted
+
+    async def aget_state(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        await asyncio.sleep(0)
+        next_nodes = (APPROVAL_INTERRUPT_NODE,) if thread_id in self.interrupted else ()
+        return SimpleNamespace(values=self.states[thread_id].copy(deep=True), next=next_nodes)
+
+    async def aupdate_state(self, config, values):
+        # Yield first, as a checkpoint write would, so racing decisions interleave
+        await asyncio.sleep(0)
+        state = self.states[config["configurable"]["thread_id"]]
+        for field, value in values.items():
+            setattr(state, field, value)
+
+
+def _parked_state(incident_id, *intervention_types):
+    state = IncidentState(
+        incident_id=incident_id, title="Card skimmer at front desk",
+        description="Skimmer found on a payment terminal", category=IncidentCategory.PAYMENT_FRAUD
+    )
+    for intervention_type in intervention_types:
+        state.request_human_intervention(intervention_type, reason="Review required")
+    return state
+
+
+def _agent(workflow, unfinished_threads=()):
+    agent = SecurityTriageAgent.__new__(SecurityTriageAgent)
+    agent.logger = logging.getLogger("test_approval_resume")
+    agent.workflow = workflow
+    agent.approval_index = PendingApprovalIndex()
+    agent.metrics_tracker = AsyncMock()
+    agent.checkpointer = SimpleNamespace(
+        unfinished_threads=AsyncMock(return_value=list(unfinished_threads)),
+        mark_parked=AsyncMock()
+    )
+    agent.active_incidents = {}
+    agent._approval_locks = {}
+    agent._resume_incident = AsyncMock()
+    return agent
+
+
+async def test_concurrent_decisions_on_one_incident_are_all_kept():
+    state = _parked_state("inc_1", "legal_review", "safety_review")
+    workflow = _CheckpointedWorkflow({"inc_1": state}, interrupted={"inc_1"})
+    agent = _agent(workflow)
+    agent._park_incident("inc_1", state.copy(deep=True), None)
+
+    results = await asyncio.gather(
+        agent.approve_intervention("inc_1", "legal_review", "counsel", True),
+        agent.approve_intervention("inc_1", "safety_review", "manager", True)
+    )
+
+    assert results == [True, True]
+    assert workflow.states["inc_1"].pending_approvals == []
+    assert len(workflow.states["inc_1"].approval_history) == 2
+    assert "inc_1" not in agent.approval_index
+    agent._resume_incident.assert_awaited_once()
+
+    # A repeated decision after resuming finds nothing to approve
+    assert await agent.approve_intervention("inc_1", "legal_review", "counsel", True) is False
+
+
+async def test_parked_incidents_are_restored_after_restart():
+    states = {
+        "inc_parked": _parked_state("inc_parked", "legal_review"),
+        "inc_interrupted_elsewhere": _parked_state("inc_interrupted_elsewhere"),
+    }
+    workflow = _CheckpointedWorkflow(states, interrupted={"inc_parked"})
+    agent = _agent(workflow, unfinished_threads=states)
+
+    assert await agent._restore_parked_incidents() == 1
+    assert "inc_parked" in agent.approval_index
+    assert "inc_interrupted_elsewhere" not in agent.approval_index
+    # Restored incidents are kept by checkpoint compaction while they wait
+    agent.checkpointer.mark_parked.assert_awaited_once_with("inc_parked")
+
+    assert await agent.approve_intervention("inc_parked", "legal_review", "counsel", True) is True
+    agent._resume_incident.assert_awaited_once()
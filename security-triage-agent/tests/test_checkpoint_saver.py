@@ -0,0 +1,153 @@
+"""
+Tests for the async pruning checkpointer behind the triage workflows.
+"""
+
+import asyncio
+import operator
+import tracemalloc
+from typing import Annotated, List, TypedDict
+
+import pytest
+from langgraph.graph import END, StateGraph
+
+from src.security_triage_agent.memory.checkpoint_saver import PruningSqliteSaver
+
+
+class _StepState(TypedDict):
+    incident_id: str
+    steps: Annotated[List[str], operator.add]
+    notes: str
+
+
+def _compile_graph(saver, steps=4, interrupt_before=None):
+    graph = StateGraph(_StepState)
+    names = [f"step_{number}" for number in range(steps)]
+    for name in names:
+        graph.add_node(name, lambda state, name=name: {"steps": [name], "notes": "x" * 2000})
+    graph.set_entry_point(names[0])
+    for current, following in zip(names, names[1:]):
+        graph.add_edge(current, following)
+    graph.add_edge(names[-1], END)
+    return graph.compile(checkpointer=saver, interrupt_before=interrupt_before)
+
+
+async def _run(workflow, incident_id):
+    config = {"configurable": {"thread_id": incident_id}}
+    await workflow.ainvoke({"incident_id": incident_id, "steps": [], "notes": ""}, config)
+    return config
+
+
+async def test_workflow_state_survives_and_history_is_trimmed(tmp_path):
+    saver = PruningSqliteSaver(tmp_path / "checkpoints.db", keep_last=3)
+    workflow = _compile_graph(saver, steps=6)
+
+    config = await _run(workflow, "inc_1")
+    state = await workflow.aget_state(config)
+    assert state.values["steps"] == [f"step_{number}" for number in range(6)]
+    assert len([snapshot async for snapshot in workflow.aget_state_history(config)]) == 3
+
+    # A fresh saver on the same file sees the same latest state
+    await saver.close()
+    reopened = PruningSqliteSaver(tmp_path / "checkpoints.db", keep_last=3)
+    assert (await _compile_graph(reopened, steps=6).aget_state(config)).values["steps"][-1] == "step_5"
+    await reopened.close()
+
+
+async def test_interrupted_workflow_resumes_from_checkpoint(tmp_path):
+    saver = PruningSqliteSaver(tmp_path / "checkpoints.db", keep_last=2)
+    workflow = _compile_graph(saver, steps=4, interrupt_before=["step_2"])
+
+    config = await _run(workflow, "inc_parked")
+    assert (await workflow.aget_state(config)).next == ("step_2",)
+
+    await workflow.aupdate_state(config, {"notes": "approved"})
+    await workflow.ainvoke(None, config)
+    state = await workflow.aget_state(config)
+    assert state.next == ()
+    assert state.values["steps"] == ["step_0", "step_1", "step_2", "step_3"]
+    await saver.close()
+
+
+async def test_concurrent_workflows_share_commits(tmp_path):
+    saver = PruningSqliteSaver(tmp_path / "checkpoints.db")
+    workflow = _compile_graph(saver)
+
+    await asyncio.gather(*(_run(workflow, f"inc_{number}") for number in range(40)))
+
+    puts = saver.stats["checkpoints_written"] + saver.stats["write_batches_written"]
+    assert saver.stats["commits"] < puts / 4
+    assert (await saver.get_usage())["checkpoint_threads"] == 40
+    await saver.close()
+
+
+async def test_finished_and_abandoned_threads_are_compacted(tmp_path):
+    saver = PruningSqliteSaver(
+        tmp_path / "checkpoints.db", finished_grace_seconds=0, abandoned_after_seconds=3600
+    )
+    workflow = _compile_graph(saver)
+    for incident_id in ("inc_done", "inc_parked", "inc_stale", "inc_awaiting_approval"):
+        await _run(workflow, incident_id)
+    await saver.mark_finished("inc_done")
+    await saver.mark_parked("inc_awaiting_approval")
+    assert await saver.unfinished_threads() == ["inc_awaiting_approval", "inc_parked", "inc_stale"]
+    async with saver.pool.writer() as db:
+        await db.execute(
+            "UPDATE checkpoint_threads SET updated_at = 0 "
+            "WHERE thread_id IN ('inc_stale', 'inc_awaiting_approval')"
+        )
+
+    # Waiting on a human decision is not abandonment, however long it takes
+    assert await saver.compact() == 2
+    assert await saver.aget_tuple({"configurable": {"thread_id": "inc_done"}}) is None
+    assert await saver.aget_tuple({"configurable": {"thread_id": "inc_parked"}}) is not None
+    assert await saver.aget_tuple({"configurable": {"thread_id": "inc_awaiting_approval"}}) is not None
+    assert (await saver.get_usage())["checkpoint_threads"] == 2
+
+    # A thread written after being marked finished is live again
+    await saver.mark_finished("inc_parked")
+    await _run(workflow, "inc_parked")
+    assert await saver.compact() == 0
+    await saver.close()
+
+
+async def test_sync_interface_only_off_the_event_loop(tmp_path):
+    saver = PruningSqliteSaver(tmp_path / "checkpoints.db")
+    config = await _run(_compile_graph(saver), "inc_1")
+
+    checkpoint_tuple = await asyncio.to_thread(saver.get_tuple, config)
+    assert checkpoint_tuple.checkpoint["channel_values"]["steps"][-1] == "step_3"
+    with pytest.raises(asyncio.InvalidStateError):
+        saver.get_tuple(config)
+    await saver.close()
+
+
+async def test_soak_usage_stays_bounded(tmp_path):
+    """Incidents keep arriving and finishing; rows, file size and memory level off."""
+    saver = PruningSqliteSaver(tmp_path / "checkpoints.db", keep_last=2, finished_grace_seconds=0)
+    workflow = _compile_graph(saver, steps=8)
+
+    usage_by_round, memory_by_round = [], []
+    tracemalloc.start()
+    for round_number in range(8):
+        incident_ids = [f"inc_{round_number}_{number}" for number in range(60)]
+        await asyncio.gather(*(_run(workflow, incident_id) for incident_id in incident_ids))
+        # Half finish now, the rest stay parked until the next round
+        for incident_id in incident_ids[:30]:
+            await saver.mark_finished(incident_id)
+        if round_number:
+            for number in range(30, 60):
+                await saver.mark_finished(f"inc_{round_number - 1}_{number}")
+        await saver.compact()
+
+        usage_by_round.append(await saver.get_usage())
+        memory_by_round.append(tracemalloc.get_traced_memory()[0])
+    tracemalloc.stop()
+    await saver.close()
+
+    for usage in usage_by_round:
+        assert usage["checkpoint_threads"] == 30
+        assert usage["checkpoints"] <= 30 * 2
+        assert usage["wal_bytes"] == 0
+    # Disk and memory after the last round stay at the level of the second
+    assert usage_by_round[-1]["database_bytes"] <= usage_by_round[1]["database_bytes"] * 1.1
+    assert memory_by_round[-1] <= memory_by_round[1] * 1.2 + 512 * 1024
@@ -0,0 +1,106 @@
+"""
+Tests for the pooled SQLite connections behind persistent storage.
+"""
+
+import asyncio
+
+import pytest
+
+from src.security_triage_agent.memory.connection_pool import SQLiteConnectionPool
+
+
+@pytest.fixture
+async def pool(temp_dir):
+    pool = SQLiteConnectionPool(temp_dir / "pool.db", reader_connections=2)
+    async with pool.writer() as db:
+        await db.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, name TEXT)")
+    yield pool
+    await pool.close()
+
+
+async def _count(pool):
+    async with pool.reader() as db:
+        cursor = await db.execute("SELECT COUNT(*) FROM events")
+        return (await cursor.fetchone())[0]
+
+
+async def test_writer_transactions_run_one_at_a_time(pool):
+    order = []
+
+    async def write(name, hold):
+        async with pool.writer() as db:
+            order.append(f"{name} start")
+            await db.execute("INSERT INTO events (name) VALUES (?)", (name,))
+            await asyncio.sleep(hold)
+            order.append(f"{name} end")
+
+    await asyncio.gather(write("first", 0.05), write("second", 0))
+
+    assert order == ["first start", "first end", "second start", "second end"]
+    assert await _count(pool) == 2
+
+
+async def test_writer_commits_on_exit_and_rolls_back_on_error(pool):
+    with pytest.raises(ValueError):
+        async with pool.writer() as db:
+            await db.execute("INSERT INTO events (name) VALUES ('lost')")
+            raise ValueError("abort")
+    assert await _count(pool) == 0
+
+    async with pool.writer() as db:
+        await db.execute("INSERT INTO events (name) VALUES ('kept')")
+    assert await _count(pool) == 1
+
+
+async def test_readers_see_the_last_commit_during_a_write(pool):
+    async with pool.writer() as db:
+        await db.execute("INSERT INTO events (name) VALUES ('committed')")
+
+    async with pool.writer() as db:
+        await db.execute("INSERT INTO events (name) VALUES ('pending')")
+        # WAL readers are not blocked by the open write transaction
+        assert await asyncio.wait_for(_count(pool), timeout=1) == 1
+    assert await _count(pool) == 2
+
+
+async def test_readers_wait_for_an_idle_connection(pool):
+    release = asyncio.Event()
+    in_use = []
+
+    async def hold_reader():
+        async with pool.reader() as db:
+            in_use.append(db)
+            await release.wait()
+
+    holders = [asyncio.ensure_future(hold_reader()) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    waiting = asyncio.ensure_future(_count(pool))
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+    assert len(set(map(id, in_use))) == 2
+
+    release.set()
+    await asyncio.gather(*holders)
+    assert await waiting == 0
+
+
+async def test_close_checkpoints_the_wal_and_refuses_further_use(pool):
+    async with pool.writer() as db:
+        cursor = await db.execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+        await db.executemany("INSERT INTO events (name) VALUES (?)", [(str(n),) for n in range(100)])
+
+    wal_path = pool.db_path.with_name(pool.db_path.name + "-wal")
+    assert wal_path.stat().st_size > 0
+
+    await pool.close()
+    assert not pool.is_open
+    assert not wal_path.exists() or wal_path.stat().st_size == 0
+    with pytest.raises(RuntimeError):
+        async with pool.reader():
+            pass
+
+    # A new pool on the same file sees everything that was written
+    reopened = SQLiteConnectionPool(pool.db_path, reader_connections=1)
+    assert await _count(reopened) == 100
+    await reopened.close()
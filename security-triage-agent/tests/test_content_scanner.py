@@ -0,0 +1,130 @@
+"""
+Tests for the single-pass content scanner and the guardrails built on it,
+checked against the separate PII regexes the guardrails used before.
+"""
+
+import random
+import re
+
+import pytest
+
+from src.security_triage_agent.core.state import IncidentCategory
+from src.security_triage_agent.tools.content_scanner import ContentScanner
+from src.security_triage_agent.tools.safety_guardrails import SafetyGuardrails
+
+
+# The previous per-type patterns, each applied over the text separately
+LEGACY_PII_PATTERNS = {
+    "credit_card": re.compile(
+        r'\b(?:4[0-9]{12}(?:[0-9]{3})?|5[1-5][0-9]{14}|3[47][0-9]{13}|3[0-9]{13}|6(?:011|5[0-9]{2})[0-9]{12})\b'
+    ),
+    "email": re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    "phone": re.compile(r'(\+?[1-9]\d{1,14}|\(\d{3}\)\s?\d{3}-?\d{4}|\d{3}-?\d{3}-?\d{4})'),
+    "aadhaar": re.compile(r'\b[2-9]{1}[0-9]{3}\s?[0-9]{4}\s?[0-9]{4}\b'),
+    "room_number": re.compile(
+        r'\broom\s*[#:]?\s*(\d{3,4}[a-z]?)\b|\b\d{3,4}[a-z]?\s*room\b', re.IGNORECASE
+    ),
+}
+
+TOKENS = [
+    "4111111111111111", "5500000000000004", "378282246310005", "6011111111111117",
+    "bob.smith@example.com", "a@b.co", "+919876543210", "(555) 123-4567", "555-123-4567",
+    "2345 6789 0123", "234567890123", "room 1204", "Room#305b", "1204 room",
+    "threat", "guest", "x", "9", "_",
+]
+SEPARATORS = ["", "", " ", "-", ".", "+", "@", ":", "\n"]
+
+GLUED = [
+    "+919876543210a@b.co",
+    "4111111111111111@x.co",
+    "a@b.co+a@b.cothreat",
+    "room 12044111111111111111-378282246310005",
+    "555-123-4567+234567890123bob.smith@example.com",
+    "Room#305ba@b.co+threata@b.co-room 1204",
+    "(555) 123-45679:a@b.co-+919876543210-",
+]
+
+
+@pytest.fixture(scope="module")
+def guardrails():
+    return SafetyGuardrails(llm=object())
+
+
+def _corpus(count, seed=0):
+    rng = random.Random(seed)
+    texts = list(GLUED)
+    for _ in range(count):
+        texts.append("".join(
+            rng.choice(TOKENS) + rng.choice(SEPARATORS) for _ in range(rng.randint(1, 5))
+        ))
+    return texts
+
+
+def _pii_coverage(spans):
+    covered = set()
+    for span in spans:
+        if span.kind == "pii":
+            covered.update(range(span.start, span.end))
+    return covered
+
+
+def test_pii_spans_cover_every_legacy_match(guardrails):
+    for text in _corpus(2000):
+        covered = _pii_coverage(guardrails.scanner.scan(text))
+        for pii_type, pattern in LEGACY_PII_PATTERNS.items():
+            for match in pattern.finditer(text):
+                missed = set(range(match.start(), match.end())) - covered
+                assert not missed, (text, pii_type, match.group())
+
+
+def test_glued_values_are_all_masked(guardrails):
+    assert guardrails.sanitize_text("+919876543210a@b.co") == "**************@b.co"
+    assert guardrails.sanitize_text("a@b.co+a@b.cothreat") == "a@b.co+*@b.cothreat"
+    assert guardrails.sanitize_text("Call 555-123-4567 re room 1204") == "Call ***-***-**** re *********"
+    assert guardrails.sanitize_text("Card 4111111111111111") == "Card 4111********1111"
+
+
+def test_streamed_scan_matches_single_scan_across_chunk_boundaries(guardrails):
+    streaming = ContentScanner(
+        guardrails.threat_indicators, guardrails.content_keywords, chunk_size=3, overlap=64
+    )
+    rng = random.Random(1)
+    for text in _corpus(300, seed=1):
+        chunk = rng.randint(1, 5)
+        chunks = [text[start:start + chunk] for start in range(0, len(text), chunk)]
+
+        assert list(streaming.iter_spans(chunks)) == guardrails.scanner.scan(text), text
+        assert "".join(streaming.redact_stream(chunks)) == guardrails.scanner.redact(text)[0], text
+
+
+def test_keywords_are_matched_at_word_starts(guardrails):
+    labels = lambda text: {(span.kind, span.label) for span in guardrails.scanner.scan(text)}
+
+    assert ("threat", "violence") in labels("Guest made a threat at the bar")
+    assert ("content", "discriminat") in labels("Complaint about discrimination")
+    # Mid-word occurrences are not keywords: no "harm" in a pharmacy
+    assert ("threat", "violence") not in labels("Delivered by the pharmacy")
+    assert ("content", "threat") not in labels("xthreat")
+    # A keyword is still found where a PII value starts at the same character
+    assert labels("Mail threat@hotel.com") >= {("pii", "email"), ("content", "threat")}
+
+
+def test_screen_content_reports_pii_threats_and_keywords(guardrails):
+    description = "Guest bob.smith@example.com reported credit card fraud and a threat in room 1204"
+    result = guardrails.screen_content(description, IncidentCategory.PAYMENT_FRAUD)
+
+    pii = {violation.violation_type for violation in result.pii_violations}
+    assert {"pii_exposure_email", "pii_exposure_room_number"} <= pii
+    threats = {violation.violation_type: violation for violation in result.threat_violations}
+    assert threats["threat_indicator_fraud"].detected_content == "2 indicators found"
+    assert threats["threat_indicator_violence"].severity == "critical"
+    assert [violation.detected_content for violation in result.content_violations] == ["threat"]
+
+
+def test_sanitized_text_screens_the_same_from_cache(guardrails):
+    description = "Unauthorized access to the minibar, guest reported harassment"
+    assert guardrails.sanitize_text(description) == description
+    cached = guardrails.screen_content(description, IncidentCategory.GUEST_ACCESS)
+
+    guardrails._screening_cache.clear()
+    assert guardrails.screen_content(description, IncidentCategory.GUEST_ACCESS) == cached
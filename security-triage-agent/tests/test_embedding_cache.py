@@ -0,0 +1,64 @@
+"""
+Tests for the policy knowledge base embedding cache and local backends.
+"""
+
+from src.security_triage_agent.rag.embeddings import (
+    CachedEmbeddings, EmbeddingCache, HashingEmbeddings, create_embeddings
+)
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    """Local backend that records every batch it is asked to embed."""
+
+    def __init__(self):
+        super().__init__(dimensions=64)
+        self.batches = []
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        return super().embed_documents(texts)
+
+
+async def test_documents_are_embedded_once_in_batches(tmp_path):
+    backend = CountingEmbeddings()
+    embeddings = CachedEmbeddings(
+        backend, EmbeddingCache(tmp_path / "cache.sqlite"), "test", batch_size=2
+    )
+    texts = ["key card revoked", "payment fraud", "key card revoked", "data breach", "theft"]
+
+    first = embeddings.embed_documents(texts)
+    assert backend.batches == [["key card revoked", "payment fraud"], ["data breach", "theft"]]
+    assert first[0] == first[2]
+
+    # A fresh cache over the same file serves everything from disk
+    reopened = CachedEmbeddings(backend, EmbeddingCache(tmp_path / "cache.sqlite"), "test")
+    assert reopened.embed_documents(texts) == first
+    assert len(backend.batches) == 2
+    assert reopened.cache.stats["disk_hits"] == 4
+
+
+async def test_queries_are_cached_per_namespace(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite")
+    backend = CountingEmbeddings()
+    embeddings = CachedEmbeddings(backend, cache, "test")
+
+    vector = embeddings.embed_query("escalation procedures for critical unauthorized access")
+    assert embeddings.embed_query("escalation procedures for critical unauthorized access") == vector
+    assert cache.stats["memory_hits"] == 1
+
+    other_model = CachedEmbeddings(backend, cache, "other-model")
+    other_model.embed_query("escalation procedures for critical unauthorized access")
+    assert len(cache) == 2
+
+
+async def test_hashing_backend_works_offline(tmp_path):
+    embeddings = create_embeddings("hashing", cache_path=tmp_path / "cache.sqlite")
+
+    query = embeddings.embed_query("payment fraud pci")
+    related, unrelated = embeddings.embed_documents(["pci payment fraud response", "guest wifi"])
+
+    def dot(a, b):
+        return sum(x * y for x, y in zip(a, b))
+
+    assert len(query) == 1024
+    assert dot(query, related) > dot(query, unrelated)
@@ -0,0 +1,195 @@
+"""
+Tests for the fused triage call and the workflow's per-section fallback to
+the individual classification and prioritization tools.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from src.security_triage_agent.core.state import (
+    IncidentState, IncidentCategory, IncidentPriority, RiskAssessment
+)
+from src.security_triage_agent.core.workflow import SecurityTriageWorkflow
+from src.security_triage_agent.tools.classification import IncidentClassifier, ClassificationResult
+from src.security_triage_agent.tools.fused_triage import FusedTriageTool
+from src.security_triage_agent.tools.prioritization import IncidentPrioritizer, PrioritizationResult
+
+
+class FakeLLM:
+    """Chat model returning a fixed response and counting its calls."""
+
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return SimpleNamespace(content=self.content)
+
+
+def _response(**overrides):
+    response = {
+        "classification": {
+            "category": "payment_fraud",
+            "confidence": 0.92,
+            "reasoning": "Skimmer found on the lobby terminal",
+            "alternative_categories": ["cyber_security", "not_a_category"],
+        },
+        "risk_assessment": {
+            "risk_score": 8.5,
+            "risk_factors": ["card data exposure"],
+            "potential_impact": "Guest card data compromised",
+            "likelihood_score": 7.0,
+            "confidence_score": 0.8,
+        },
+        "prioritization": {
+            "priority": "critical",
+            "reasoning": "Active payment compromise",
+            "escalation_triggers": ["more terminals affected"],
+        },
+    }
+    response.update(overrides)
+    return json.dumps(response)
+
+
+def _tool(content):
+    llm = FakeLLM(content)
+    return FusedTriageTool(IncidentClassifier(llm=llm), IncidentPrioritizer(llm=llm)), llm
+
+
+async def _triage(content):
+    tool, llm = _tool(content)
+    result = await tool.triage("Skimmer on terminal", "Card skimmer found on the lobby payment terminal")
+    assert llm.calls == 1
+    return result
+
+
+async def test_complete_response_fills_every_section():
+    result = await _triage(_response())
+
+    assert result.complete
+    assert result.section_errors == {}
+    assert result.classification.category == IncidentCategory.PAYMENT_FRAUD
+    assert result.classification.alternative_categories == [IncidentCategory.CYBER_SECURITY]
+    assert result.risk_assessment.mitigation_urgency == IncidentPriority.CRITICAL
+    assert result.prioritization.priority == IncidentPriority.CRITICAL
+    assert result.prioritization.recommended_sla == "15 minutes"
+    assert result.prioritization.risk_assessment.risk_score == 8.5
+
+
+async def test_unparseable_response_keeps_no_sections():
+    for content in ("not json", "[1, 2]"):
+        result = await _triage(content)
+        assert not result.complete
+        assert result.classification is None
+        assert set(result.section_errors) == {"response"}
+
+
+async def test_invalid_classification_discards_every_section():
+    result = await _triage(_response(classification={"category": "alien_invasion", "confidence": 0.9}))
+
+    assert result.classification is None
+    assert result.risk_assessment is None
+    assert result.prioritization is None
+    assert set(result.section_errors) == {"classification"}
+
+
+async def test_invalid_risk_assessment_discards_prioritization():
+    result = await _triage(_response(risk_assessment={"risk_factors": ["no score"]}))
+
+    assert result.classification.category == IncidentCategory.PAYMENT_FRAUD
+    assert result.risk_assessment is None
+    assert result.prioritization is None
+    assert set(result.section_errors) == {"risk_assessment"}
+
+
+async def test_invalid_prioritization_keeps_earlier_sections():
+    # The per-tool path would default an unknown priority; the fused path defers instead
+    result = await _triage(_response(prioritization={"priority": "whenever"}))
+
+    assert result.classification is not None
+    assert result.risk_assessment.risk_score == 8.5
+    assert result.prioritization is None
+    assert set(result.section_errors) == {"prioritization"}
+
+
+def _fallback_tools():
+    classifier = AsyncMock()
+    classifier.classify.return_value = ClassificationResult(
+        category=IncidentCategory.GUEST_ACCESS, confidence=0.6, reasoning="per-tool"
+    )
+    prioritizer = AsyncMock()
+    prioritizer.assess_risk.return_value = RiskAssessment(
+        risk_score=3.0, mitigation_urgency=IncidentPriority.LOW, potential_impact="per-tool",
+        likelihood_score=3.0, confidence_score=0.5
+    )
+    prioritizer.prioritize.return_value = PrioritizationResult.parse_obj({
+        "priority": "low", "reasoning": "per-tool", "recommended_sla": "24 hours",
+        "risk_assessment": {
+            "risk_score": 3.0, "business_impact": "", "guest_impact": "", "financial_impact": "",
+            "reputation_impact": "", "operational_impact": "", "likelihood_score": 3.0,
+            "confidence_score": 0.5, "time_sensitivity": "Low"
+        }
+    })
+    return classifier, prioritizer
+
+
+async def _run_triage_steps(content):
+    fused_tool, _ = _tool(content)
+    classifier, prioritizer = _fallback_tools()
+    workflow = SecurityTriageWorkflow(
+        classifier=classifier, prioritizer=prioritizer, playbook_selector=None,
+        response_generator=None, compliance_checker=None, safety_guardrails=None,
+        session_manager=None, metrics_tracker=None, fused_triage=fused_tool
+    )
+    state = IncidentState(
+        incident_id="inc_1", title="Skimmer on terminal",
+        description="Card skimmer found on the lobby payment terminal"
+    )
+    state = await workflow._classify_incident(state)
+    state = await workflow._assess_risk(state)
+    state = await workflow._prioritize_incident(state)
+    return state, classifier, prioritizer
+
+
+async def test_workflow_uses_every_fused_section_when_complete():
+    state, classifier, prioritizer = await _run_triage_steps(_response())
+
+    classifier.classify.assert_not_called()
+    prioritizer.assess_risk.assert_not_called()
+    prioritizer.prioritize.assert_not_called()
+    assert state.category == IncidentCategory.PAYMENT_FRAUD
+    assert state.risk_assessment.risk_score == 8.5
+    assert state.severity == IncidentPriority.CRITICAL
+    assert state.processing_metrics["fused_triage_complete"] is True
+
+
+async def test_workflow_falls_back_only_for_invalid_sections():
+    state, classifier, prioritizer = await _run_triage_steps(
+        _response(risk_assessment={"risk_score": "high"})
+    )
+
+    classifier.classify.assert_not_called()
+    prioritizer.assess_risk.assert_awaited_once()
+    prioritizer.prioritize.assert_awaited_once()
+    assert state.category == IncidentCategory.PAYMENT_FRAUD
+    assert state.risk_assessment.risk_score == 3.0
+    assert state.severity == IncidentPriority.LOW
+    assert state.processing_metrics["fused_triage_complete"] is False
+
+    state, classifier, prioritizer = await _run_triage_steps(_response(prioritization={}))
+    prioritizer.assess_risk.assert_not_called()
+    prioritizer.prioritize.assert_awaited_once()
+    assert state.risk_assessment.risk_score == 8.5
+    assert state.severity == IncidentPriority.LOW
+
+
+async def test_workflow_falls_back_to_every_tool_without_a_classification():
+    state, classifier, prioritizer = await _run_triage_steps("not json")
+
+    classifier.classify.assert_awaited_once()
+    prioritizer.assess_risk.assert_awaited_once()
+    prioritizer.prioritize.assert_awaited_once()
+    assert state.category == IncidentCategory.GUEST_ACCESS
+    assert state.tool_results["fused_triage"]["section_errors"].keys() == {"response"}
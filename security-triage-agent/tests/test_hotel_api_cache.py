@@ -0,0 +1,121 @@
+"""
+Tests for read-through caching and request coalescing in the PMS and access control tools.
+
+The tools run against a local stand-in HTTP server that adds latency to every
+request and counts how often each path is hit.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+
+from src.security_triage_agent.tools.api_cache import ReadThroughCache, close_shared_http_client
+from src.security_triage_agent.tools.hotel_management_tools import (
+    AccessControlTool, PropertyManagementTool, RoomStatus
+)
+
+
+GUEST = {
+    "guest_id": "G-1", "first_name": "Asha", "last_name": "Rao", "email": "asha@example.com",
+    "phone": "+91-90000-00000", "room_number": "1205", "check_in_date": "2024-01-01T12:00:00",
+    "check_out_date": "2024-01-04T11:00:00", "guest_type": "VIP",
+}
+
+
+@pytest.fixture
+def hotel_api():
+    hits = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, body):
+            path = urlparse(self.path).path
+            hits[(self.command, path)] += 1
+            time.sleep(0.05)
+            payload = json.dumps(body(path)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._reply(lambda path: (
+                GUEST if "/guests/by-room/" in path
+                else {"occupancy_records": [{"guest_id": "G-1"}]} if "occupancy-history" in path
+                else {"access_logs": [{"card_id": path.rsplit("/", 1)[-1], "door": "1205"}]}
+            ))
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self._reply(lambda path: {"affected_areas": ["floor_12"]})
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    server.shutdown()
+    server.server_close()
+
+
+async def test_pms_lookups_are_cached_coalesced_and_invalidated(hotel_api):
+    url, hits = hotel_api
+    pms = PropertyManagementTool(url, "key")
+    guest_path = ("GET", "/api/v1/guests/by-room/1205")
+
+    # Concurrent identical lookups share one request
+    guests = await asyncio.gather(*(pms.get_guest_info("1205") for _ in range(5)))
+    assert all(guest.guest_id == "G-1" for guest in guests)
+    assert hits[guest_path] == 1
+
+    await pms.get_guest_info("1205")
+    await pms.get_room_occupancy_history("1205")
+    await pms.get_room_occupancy_history("1205")
+    assert hits[guest_path] == 1
+    assert hits[("GET", "/api/v1/rooms/1205/occupancy-history")] == 1
+
+    # A status change makes the next lookups go upstream again
+    assert await pms.update_room_status("1205", RoomStatus.SECURITY_HOLD, "investigation")
+    await pms.get_guest_info("1205")
+    await pms.get_room_occupancy_history("1205")
+    assert hits[guest_path] == 2
+    assert hits[("GET", "/api/v1/rooms/1205/occupancy-history")] == 2
+
+    stats = pms.cache.get_stats()
+    assert stats["coalesced"] == 4
+
+    # The tool interface dispatches to the same cached lookups
+    assert json.loads(await pms._arun("get_guest_info", room_number="1205"))["guest_id"] == "G-1"
+    assert hits[guest_path] == 2
+    with pytest.raises(ValueError):
+        await pms._arun("delete_guest", guest_id="G-1")
+    await close_shared_http_client()
+
+
+async def test_access_logs_expire_and_revocation_invalidates(hotel_api):
+    url, hits = hotel_api
+    access = AccessControlTool(url, "key", cache=ReadThroughCache(ttls={"access_logs": 0.2}))
+    logs_path = ("GET", "/api/v1/access/logs/CARD-7")
+
+    logs = await access.get_access_logs("CARD-7")
+    logs[0]["door"] = "changed by caller"
+    assert (await access.get_access_logs("CARD-7"))[0]["door"] == "1205"
+    assert hits[logs_path] == 1
+
+    await asyncio.sleep(0.25)
+    await access.get_access_logs("CARD-7")
+    assert hits[logs_path] == 2
+
+    result = await access.revoke_access("CARD-7", "lost card")
+    assert result.success
+    await access.get_access_logs("CARD-7")
+    assert hits[logs_path] == 3
+    await close_shared_http_client()
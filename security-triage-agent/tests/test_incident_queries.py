@@ -0,0 +1,179 @@
+"""
+Tests for projected, keyset-paginated and streamed incident queries.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.security_triage_agent.core.state import IncidentState, IncidentCategory, IncidentPriority
+from src.security_triage_agent.memory.memory_retriever import MemoryRetriever
+
+
+async def _store_incidents(storage, count=25):
+    base = datetime.utcnow() - timedelta(days=1)
+    for number in range(count):
+        # Pairs share a timestamp so the incident_id tie-break is exercised
+        await storage.store_incident(IncidentState(
+            incident_id=f"inc_{number:03d}",
+            title=f"Incident {number}",
+            description="Key card used after checkout",
+            category=IncidentCategory.GUEST_ACCESS if number % 2 else IncidentCategory.PAYMENT_FRAUD,
+            severity=IncidentPriority.HIGH if number % 3 else IncidentPriority.LOW,
+            created_at=base + timedelta(minutes=number // 2),
+            approval_history=[{"approved": True}] if number % 5 == 0 else []
+        ))
+
+
+async def test_keyset_pages_cover_every_incident_once(storage):
+    await _store_incidents(storage)
+    expected = [
+        record.incident_id
+        for record in sorted(
+            (await storage.get_incidents([f"inc_{n:03d}" for n in range(25)])).values(),
+            key=lambda record: (record.created_at, record.incident_id), reverse=True
+        )
+    ]
+
+    seen, after = [], None
+    while True:
+        rows, after = await storage.query_incidents(limit=10, after=after)
+        seen.extend(row.incident_id for row in rows)
+        if after is None:
+            break
+    assert seen == expected
+
+    rows, _ = await storage.query_incidents(limit=30, descending=False)
+    assert [row.incident_id for row in rows] == expected[::-1]
+
+
+async def test_projection_returns_only_requested_columns(storage):
+    await _store_incidents(storage, count=3)
+    rows, after = await storage.query_incidents(columns=("incident_id", "created_at", "priority"))
+
+    assert after is None
+    assert rows[0]._fields == ("incident_id", "created_at", "priority")
+    assert isinstance(rows[0].created_at, datetime)
+
+    with pytest.raises(ValueError):
+        await storage.query_incidents(columns=("incident_id", "tool_results_json; DROP TABLE incidents"))
+
+
+async def test_stream_applies_filters_and_limit(storage):
+    await _store_incidents(storage)
+
+    streamed = [
+        row.incident_id async for row in storage.stream_incidents(
+            filters={"category": IncidentCategory.GUEST_ACCESS.value},
+            columns=("incident_id",), batch_size=4
+        )
+    ]
+    assert sorted(streamed) == [f"inc_{n:03d}" for n in range(1, 25, 2)]
+
+    limited = [row async for row in storage.stream_incidents(limit=7, batch_size=3)]
+    assert len(limited) == 7
+
+
+async def test_category_statistics_from_streamed_rows(storage):
+    await _store_incidents(storage)
+    retriever = MemoryRetriever(storage)
+
+    stats = await retriever.get_category_statistics(IncidentCategory.PAYMENT_FRAUD)
+    assert stats["total_incidents"] == 13
+    assert stats["human_intervention_rate"] == pytest.approx(3 / 13)
+    assert sum(stats["priority_distribution"].values()) == 13
+
+    trends = await retriever.get_temporal_trends()
+    assert trends["total_incidents"] == 25
+
+
+async def test_text_index_follows_inserts_updates_and_deletes(storage):
+    state = IncidentState(
+        incident_id="inc_text", title="Skimmer found on lobby terminal",
+        description="Card skimming device attached to the POS terminal"
+    )
+    await storage.store_incident(state)
+    await _store_incidents(storage, count=5)
+
+    assert [incident_id for incident_id, _ in await storage.search_text("skimmer")] == ["inc_text"]
+    # Words are quoted, so query syntax in user text is matched literally
+    assert await storage.search_text('terminal" OR "key') == []
+
+    state.title = "Tailgating at staff entrance"
+    state.description = "Visitor followed an employee through the staff door"
+    await storage.store_incident(state)
+    assert await storage.search_text("skimmer") == []
+    assert [record.incident_id for record in await storage.search_incidents(
+        filters={"text": "staff door"}, order_by="relevance"
+    )] == ["inc_text"]
+
+    async with storage.pool.writer() as db:
+        await db.execute("DELETE FROM incidents WHERE incident_id = 'inc_text'")
+    assert await storage.search_text("tailgating") == []
+
+
+async def test_text_search_ranks_and_combines_with_filters(storage):
+    await _store_incidents(storage, count=6)
+    for incident_id, title, category in (
+        ("inc_wifi", "Rogue wifi access point in conference room", IncidentCategory.CYBER_SECURITY),
+        ("inc_wifi_2", "Guest wifi outage", IncidentCategory.OPERATIONAL_SECURITY),
+    ):
+        await storage.store_incident(IncidentState(
+            incident_id=incident_id, title=title, description="Reported by the network team",
+            category=category
+        ))
+
+    ranked = await storage.search_text("rogue wifi access point", match_any=True)
+    assert [incident_id for incident_id, _ in ranked][:2] == ["inc_wifi", "inc_wifi_2"]
+    assert ranked[0][1] > ranked[1][1]
+
+    filtered = await storage.search_text(
+        "wifi", filters={"category": IncidentCategory.OPERATIONAL_SECURITY.value}
+    )
+    assert [incident_id for incident_id, _ in filtered] == ["inc_wifi_2"]
+
+    rows, _ = await storage.query_incidents(filters={"text": "wifi outage"}, columns=("incident_id",))
+    assert [row.incident_id for row in rows] == ["inc_wifi_2"]
+
+
+async def test_similar_incidents_are_scored_from_text_candidates(storage):
+    await _store_incidents(storage, count=20)
+    await storage.store_incident(IncidentState(
+        incident_id="inc_card", title="Key card used after checkout",
+        description="Former guest key card still opened room 1205 after checkout",
+        category=IncidentCategory.GUEST_ACCESS
+    ))
+    text = "Old key card opens room 1205 after checkout"
+
+    # The rarest words are matched first; "1205" and "room" appear once each
+    assert await storage.similarity_candidates(text, limit=5, max_postings=2) == ["inc_card"]
+    # Nothing selective enough within the budget: score every incident
+    assert await storage.similarity_candidates("key card checkout", max_postings=5) is None
+    assert await storage.similarity_candidates("zebra") == []
+    # Filters apply to candidates; if none remain, every incident is scored
+    assert await storage.similarity_candidates(
+        text, limit=5, filters={"category": IncidentCategory.PAYMENT_FRAUD.value}, max_postings=2
+    ) is None
+
+    retriever = MemoryRetriever(storage, similarity_threshold=0.1, prefilter_candidates=3)
+    similar = await retriever.find_similar_incidents(
+        "Old key card opens room", "Key card still opened room 1205 after checkout"
+    )
+    assert similar[0].incident_record.incident_id == "inc_card"
+    assert len(similar) <= 3
+
+
+async def test_search_ordering_is_validated(storage):
+    await _store_incidents(storage, count=4)
+    by_recency = [record.incident_id for record in await storage.search_incidents()]
+
+    # Relevance needs a text filter; without one the newest come first
+    assert [record.incident_id for record in await storage.search_incidents(order_by="relevance")] == by_recency
+    assert [record.incident_id for record in await storage.search_incidents(
+        order_by="created_at", order_direction="asc"
+    )][-1] in by_recency[:2]
+
+    with pytest.raises(ValueError):
+        await storage.search_incidents(order_by="created_at; DROP TABLE incidents")
+    with pytest.raises(ValueError):
+        await storage.search_incidents(order_direction="DESC, title")
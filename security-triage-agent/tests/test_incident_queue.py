@@ -0,0 +1,77 @@
+"""
+Tests for the priority incident work queue behind SecurityTriageAgent.submit_incident.
+"""
+
+import asyncio
+
+import pytest
+
+from src.security_triage_agent.core.incident_queue import (
+    BAND_CRITICAL, BAND_LOW, IncidentWorkQueue, pre_score, score_band
+)
+
+
+def test_pre_score_separates_critical_from_noise():
+    critical = pre_score(
+        "Armed intruder in lobby", "Guest reports a weapon, active situation",
+        {"business_impact": "critical"}
+    )
+    noise = pre_score("Door sensor heartbeat", "Low battery on door sensor, test event")
+
+    assert score_band(critical) == BAND_CRITICAL
+    assert score_band(noise) == BAND_LOW
+
+
+async def test_critical_incidents_jump_the_queue_and_properties_alternate():
+    order = []
+    release = asyncio.Event()
+
+    async def handler(name):
+        await release.wait()
+        order.append(name)
+        return name
+
+    queue = IncidentWorkQueue(handler, max_workers=1)
+    blocker = await queue.submit("P0", 0.0, name="blocker")
+    await asyncio.sleep(0)
+
+    futures = [await queue.submit("FLOOD", 0.1, name=f"flood-{i}") for i in range(3)]
+    futures.append(await queue.submit("QUIET", 0.1, name="quiet"))
+    futures.append(await queue.submit("FLOOD", 0.9, name="critical"))
+
+    release.set()
+    await asyncio.gather(blocker, *futures)
+    await queue.stop()
+
+    assert order == ["blocker", "critical", "flood-0", "quiet", "flood-1", "flood-2"]
+
+
+async def test_backpressure_admits_only_critical_when_full():
+    release = asyncio.Event()
+
+    async def handler():
+        await release.wait()
+
+    queue = IncidentWorkQueue(handler, max_workers=1, max_pending=2, max_pending_per_property=1)
+    await queue.submit("A", 0.1)
+    await asyncio.sleep(0)
+    await queue.submit("A", 0.1)
+
+    with pytest.raises(asyncio.QueueFull):
+        await queue.submit("A", 0.1, block=False)
+    await queue.submit("B", 0.1, block=False)
+    with pytest.raises(asyncio.QueueFull):
+        await queue.submit("C", 0.1, block=False)
+
+    critical = await queue.submit("C", 0.95, block=False)
+    assert queue.pending == 3
+
+    # A blocked submitter is admitted once a worker frees capacity
+    waiting = asyncio.ensure_future(queue.submit("C", 0.1))
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+    release.set()
+    await asyncio.wait_for(waiting, 1)
+    await critical
+    await queue.stop()
+    assert queue.get_stats()["completed"] == 5
@@ -0,0 +1,158 @@
+"""
+Tests for the SQLite-backed LLM response cache.
+"""
+
+import asyncio
+
+import pytest
+
+from src.security_triage_agent.memory.llm_cache import LLMResponseCache
+
+
+@pytest.fixture
+async def cache(temp_dir):
+    cache = LLMResponseCache(temp_dir / "llm_cache.db", memory_entries=1)
+    await cache.initialize()
+    yield cache
+    await cache.close()
+
+
+class GatedCompute:
+    """Compute function that blocks until released and counts its calls."""
+
+    def __init__(self, response="classified: theft"):
+        self.response = response
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.response
+
+
+async def _wait_for(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+async def test_responses_are_served_from_memory_then_disk(cache):
+    await cache.put("a", "gpt-4", "response a")
+    assert await cache.get("a") == "response a"
+    assert cache.stats["memory_hits"] == 1
+
+    # The single memory slot now holds "b", so "a" is read back from SQLite
+    await cache.put("b", "gpt-4", "response b")
+    assert await cache.get("a") == "response a"
+    assert cache.stats["disk_hits"] == 1
+    assert await cache.get("missing") is None
+    assert cache.stats["misses"] == 1
+
+
+async def test_entries_expire_after_ttl(temp_dir):
+    cache = LLMResponseCache(temp_dir / "llm_cache.db", ttl_seconds=0.05)
+    await cache.initialize()
+    try:
+        await cache.put("a", "gpt-4", "response a")
+        await asyncio.sleep(0.1)
+        assert await cache.get("a") is None
+
+        assert await cache.prune() == 1
+    finally:
+        await cache.close()
+
+
+async def test_prune_evicts_least_recently_used_over_capacity(temp_dir):
+    cache = LLMResponseCache(temp_dir / "llm_cache.db", max_entries=2, memory_entries=1)
+    await cache.initialize()
+    try:
+        for key in ("a", "b"):
+            await cache.put(key, "gpt-4", f"response {key}")
+            await asyncio.sleep(0.01)
+        # Reading "a" from disk makes "b" the least recently used row
+        assert await cache.get("a") == "response a"
+        await asyncio.sleep(0.01)
+        await cache.put("c", "gpt-4", "response c")
+
+        assert await cache.prune() == 1
+        assert cache.stats["evictions"] == 1
+        assert await cache.get("b") is None
+        assert await cache.get("a") == "response a"
+    finally:
+        await cache.close()
+
+
+async def test_concurrent_misses_share_one_computation(cache):
+    compute = GatedCompute()
+    callers = [asyncio.ensure_future(cache.get_or_compute("k", "gpt-4", compute)) for _ in range(5)]
+    await _wait_for(lambda: sum(cache._waiters.values()) == 5)
+    compute.release.set()
+
+    assert await asyncio.gather(*callers) == ["classified: theft"] * 5
+    assert compute.calls == 1
+    assert cache.stats["coalesced"] == 4
+    assert await cache.get_or_compute("k", "gpt-4", compute) == "classified: theft"
+    assert compute.calls == 1
+
+
+async def test_failures_reach_every_waiter_and_are_not_cached(cache):
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        raise RuntimeError("rate limited")
+
+    results = await asyncio.gather(
+        *(cache.get_or_compute("k", "gpt-4", failing) for _ in range(3)),
+        return_exceptions=True
+    )
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.get_metrics()["in_flight"] == 0
+
+    async def succeeding():
+        return "classified: theft"
+
+    assert await cache.get_or_compute("k", "gpt-4", succeeding) == "classified: theft"
+
+
+async def test_cancelled_first_caller_does_not_cancel_waiters(cache):
+    compute = GatedCompute()
+    first = asyncio.ensure_future(cache.get_or_compute("k", "gpt-4", compute))
+    await _wait_for(lambda: "k" in cache._in_flight)
+    waiter = asyncio.ensure_future(cache.get_or_compute("k", "gpt-4", compute))
+    await _wait_for(lambda: sum(cache._waiters.values()) == 2)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    compute.release.set()
+
+    assert await waiter == "classified: theft"
+    assert first.cancelled()
+    assert compute.calls == 1
+    assert not compute.cancelled
+    assert await cache.get("k") == "classified: theft"
+
+
+async def test_computation_is_cancelled_when_every_caller_is(cache):
+    compute = GatedCompute()
+    callers = [asyncio.ensure_future(cache.get_or_compute("k", "gpt-4", compute)) for _ in range(2)]
+    await _wait_for(lambda: sum(cache._waiters.values()) == 2)
+
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await _wait_for(lambda: compute.cancelled)
+
+    assert cache.get_metrics()["in_flight"] == 0
+    assert await cache.get("k") is None
@@ -0,0 +1,179 @@
+"""
+Tests for the local fast-path classifier, the classifier's decision to
+answer locally or defer to the LLM, and the retrain command.
+"""
+
+import asyncio
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.security_triage_agent.core.state import IncidentState, IncidentCategory
+from src.security_triage_agent.memory.persistent_storage import PersistentStorage
+from src.security_triage_agent.tools.classification import IncidentClassifier
+from src.security_triage_agent.tools.local_classifier import (
+    LocalIncidentClassifier, FAST_PATH_INDICATOR, main
+)
+
+
+VOCABULARY = {
+    "payment_fraud": "card skimmer terminal chargeback refund invoice payment pos",
+    "guest_access": "keycard door lock suite unauthorized entry lobby elevator",
+    "cyber_security": "phishing malware wifi server ransomware password laptop login",
+}
+NOISE = "guest staff reported night shift hotel floor manager".split()
+
+
+def _examples(count, seed=0):
+    rng = random.Random(seed)
+    examples = []
+    for number in range(count):
+        category = list(VOCABULARY)[number % len(VOCABULARY)]
+        words = VOCABULARY[category].split()
+        examples.append({
+            "title": " ".join(rng.sample(words, 2)),
+            "description": " ".join(rng.sample(words, 3) + rng.sample(NOISE, 3)),
+            "category": category,
+            "confidence": rng.uniform(0.7, 1.0),
+        })
+    return examples
+
+
+@pytest.fixture(scope="module")
+def trained():
+    return LocalIncidentClassifier(n_features=2 ** 12).fit(_examples(240))
+
+
+class FakeLLM:
+    """Chat model returning a fixed classification and counting its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return SimpleNamespace(content=json.dumps({
+            "category": "cyber_security", "confidence": 0.8, "reasoning": "from the LLM"
+        }))
+
+
+def test_fit_learns_categories_with_calibrated_confidences(trained):
+    assert trained.training_info["calibration_examples"] == 48
+    assert trained.training_info["examples"] == 192
+    assert trained.temperature != 1.0
+
+    report = trained.evaluate(_examples(60, seed=1), thresholds=(0.5, 0.999))
+    assert report["overall_agreement"] > 0.9
+    loose, strict = report["thresholds"]
+    assert loose["llm_calls_avoided"] >= strict["llm_calls_avoided"]
+    assert loose["agreement_rate"] > 0.9
+
+    probabilities = trained.predict_proba("Skimmer on the pos terminal", "Chargeback after card payment")
+    assert abs(sum(probabilities.values()) - 1.0) < 1e-6
+    result = trained.predict("Skimmer on the pos terminal", "Chargeback after card payment")
+    assert result.category == IncidentCategory.PAYMENT_FRAUD
+    assert result.confidence == max(probabilities.values())
+    assert result.severity_indicators == [FAST_PATH_INDICATOR]
+
+
+def test_small_training_sets_skip_calibration_and_need_two_categories():
+    classifier = LocalIncidentClassifier(n_features=2 ** 10).fit(_examples(30))
+    assert classifier.training_info["calibration_examples"] == 0
+    assert classifier.temperature == 1.0
+
+    with pytest.raises(ValueError):
+        LocalIncidentClassifier().fit([example for example in _examples(30)
+                                       if example["category"] == "guest_access"])
+    with pytest.raises(ValueError):
+        LocalIncidentClassifier().predict("Lost keycard", "")
+
+
+def test_save_and_load_round_trip(trained, temp_dir):
+    path = temp_dir / "models" / "local.npz"
+    trained.save(path)
+    loaded = LocalIncidentClassifier.load(path)
+
+    assert loaded.classes == trained.classes
+    assert loaded.training_info == trained.training_info
+    for example in _examples(15, seed=2):
+        expected = trained.predict_proba(example["title"], example["description"])
+        actual = loaded.predict_proba(example["title"], example["description"])
+        assert np.allclose([actual[c] for c in trained.classes], [expected[c] for c in trained.classes])
+
+
+async def test_classifier_answers_locally_above_threshold_and_defers_below(trained):
+    title, description = "Skimmer on the pos terminal", "Chargeback after card payment"
+    confidence = trained.predict(title, description).confidence
+
+    llm = FakeLLM()
+    classifier = IncidentClassifier(llm=llm, fast_path=trained, fast_path_threshold=confidence)
+    result = await classifier.classify(title, description)
+    assert result.category == IncidentCategory.PAYMENT_FRAUD
+    assert llm.calls == 0
+    assert classifier.fast_path_stats == {"local": 1, "deferred": 0}
+
+    classifier.fast_path_threshold = min(1.0, confidence + 1e-6)
+    result = await classifier.classify(title, description)
+    assert result.category == IncidentCategory.CYBER_SECURITY
+    assert result.reasoning == "from the LLM"
+    assert llm.calls == 1
+    assert classifier.fast_path_stats == {"local": 1, "deferred": 1}
+
+    # Without a fast path every incident goes to the LLM and nothing is counted
+    plain = IncidentClassifier(llm=llm)
+    await plain.classify(title, description)
+    assert llm.calls == 2
+    assert plain.fast_path_stats == {"local": 0, "deferred": 0}
+
+
+async def _store_examples(db_path, examples):
+    storage = PersistentStorage(db_path)
+    await storage.initialize()
+    start = datetime(2024, 1, 1)
+    try:
+        for number, example in enumerate(examples):
+            indicators = example.get("indicators", [])
+            state = IncidentState(
+                incident_id=f"inc_{number}", title=example["title"],
+                description=example["description"],
+                category=IncidentCategory(example["category"]),
+                classification_confidence=example["confidence"],
+                created_at=start + timedelta(minutes=number)
+            )
+            state.add_tool_result("classification", {"severity_indicators": indicators})
+            assert await storage.store_incident(state)
+    finally:
+        await storage.close()
+
+
+def test_retrain_command_trains_on_llm_labels_and_reports(temp_dir, monkeypatch, capsys):
+    examples = _examples(150)
+    # Low-confidence and fast-path labels must not feed back into training
+    examples += [dict(example, confidence=0.3) for example in _examples(9, seed=3)]
+    examples += [dict(example, indicators=[FAST_PATH_INDICATOR]) for example in _examples(9, seed=4)]
+    db_path = temp_dir / "incidents.db"
+    asyncio.run(_store_examples(db_path, examples))
+
+    model_path = temp_dir / "local.npz"
+    report_path = temp_dir / "report.json"
+    monkeypatch.setattr(sys, "argv", [
+        "local_classifier", "retrain", "--db", str(db_path), "--model", str(model_path),
+        "--holdout", "0.2", "--report", str(report_path)
+    ])
+    main()
+
+    report = json.loads(report_path.read_text())
+    assert report["examples"] == 30
+    assert report["training"]["examples"] + report["training"]["calibration_examples"] == 120
+    assert [row["threshold"] for row in report["thresholds"]] == [0.7, 0.8, 0.9, 0.95]
+    assert report["overall_agreement"] > 0.9
+
+    output = capsys.readouterr().out
+    assert "evaluated on 30" in output
+    assert "calls avoided" in output
+    assert LocalIncidentClassifier.load(model_path).training_info == report["training"]
@@ -0,0 +1,142 @@
+"""
+Tests for the write-behind metric sink.
+"""
+
+import asyncio
+import time
+
+from src.security_triage_agent.memory.metric_sink import WriteBehindMetricSink
+
+
+class FakeStorage:
+    """Telemetry store recording batches; writes can fail or block on a gate."""
+
+    def __init__(self):
+        self.batches = []
+        self.fail = False
+        self.gate = None
+
+    async def record_telemetry_batch(self, metrics, compliance_events):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail:
+            return False
+        self.batches.append((list(metrics), list(compliance_events)))
+        return True
+
+    @property
+    def metric_names(self):
+        return [row[1] for metrics, _ in self.batches for row in metrics]
+
+
+async def _wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+async def test_full_batch_is_flushed_without_waiting_for_the_interval():
+    storage = FakeStorage()
+    sink = WriteBehindMetricSink(storage, max_batch_size=3, flush_interval_seconds=60)
+    await sink.start()
+
+    for number in range(3):
+        assert await sink.record_performance_metric("inc_1", f"m{number}", 1.0)
+    await _wait_for(lambda: storage.batches)
+
+    assert storage.metric_names == ["m0", "m1", "m2"]
+    assert sink.stats["batches_flushed"] == 1
+    await sink.close()
+
+
+async def test_partial_batch_is_flushed_after_the_interval():
+    storage = FakeStorage()
+    sink = WriteBehindMetricSink(storage, max_batch_size=100, flush_interval_seconds=0.05)
+    await sink.start()
+
+    await sink.record_compliance_event("inc_1", "pci_dss", "card_data_masked", {"fields": 2})
+    await _wait_for(lambda: storage.batches)
+
+    assert storage.batches[0][1][0][:3] == ("inc_1", "pci_dss", "card_data_masked")
+    assert sink.buffered_events == 0
+    await sink.close()
+
+
+async def test_failed_batches_are_put_back_in_order():
+    storage = FakeStorage()
+    storage.fail = True
+    sink = WriteBehindMetricSink(storage, max_batch_size=2, flush_interval_seconds=60)
+
+    for number in range(3):
+        await sink.record_performance_metric("inc_1", f"m{number}", 1.0)
+    assert await sink.flush() == 0
+    assert sink.stats["failed_flushes"] == 1
+    assert sink.buffered_events == 3
+
+    storage.fail = False
+    assert await sink.flush() == 3
+    assert storage.metric_names == ["m0", "m1", "m2"]
+
+
+async def test_writers_wait_for_space_while_a_flush_is_in_progress():
+    storage = FakeStorage()
+    storage.gate = asyncio.Event()
+    sink = WriteBehindMetricSink(
+        storage, max_batch_size=2, flush_interval_seconds=60, max_buffered_events=2
+    )
+    await sink.start()
+
+    for number in range(2):
+        await sink.record_performance_metric("inc_1", f"m{number}", 1.0)
+    # The flusher takes the full buffer and blocks writing it
+    blocked = asyncio.ensure_future(sink.record_performance_metric("inc_1", "m2", 1.0))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+    assert sink.stats["backpressure_waits"] == 1
+
+    storage.gate.set()
+    assert await blocked is True
+    await sink.close()
+    assert storage.metric_names == ["m0", "m1", "m2"]
+    assert sink.stats["events_dropped"] == 0
+
+
+async def test_full_buffer_with_failing_database_drops_after_timeout():
+    for with_flusher in (True, False):
+        storage = FakeStorage()
+        storage.fail = True
+        sink = WriteBehindMetricSink(
+            storage, max_batch_size=2, flush_interval_seconds=0.01,
+            max_buffered_events=2, max_wait_seconds=0.1
+        )
+        if with_flusher:
+            await sink.start()
+
+        for number in range(2):
+            assert await sink.record_performance_metric("inc_1", f"m{number}", 1.0)
+        started = time.monotonic()
+        assert await sink.record_performance_metric("inc_1", "dropped", 1.0) is False
+        assert time.monotonic() - started < 1.0
+        assert sink.stats["events_dropped"] == 1
+
+        # Once the database recovers, close() drains what was kept
+        storage.fail = False
+        await sink.close()
+        assert storage.metric_names == ["m0", "m1"]
+        assert sink.buffered_events == 0
+
+
+async def test_close_drains_the_buffer():
+    storage = FakeStorage()
+    sink = WriteBehindMetricSink(storage, max_batch_size=2, flush_interval_seconds=60)
+    await sink.start()
+
+    for number in range(5):
+        await sink.record_performance_metric("inc_1", f"m{number}", float(number))
+    await sink.close()
+
+    assert storage.metric_names == ["m0", "m1", "m2", "m3", "m4"]
+    assert sink.stats["events_flushed"] == 5
+    assert sink._flusher is None
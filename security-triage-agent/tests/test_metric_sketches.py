@@ -0,0 +1,192 @@
+"""
+Tests for the mergeable quantile sketches behind metric summaries, checked
+against exact percentiles of the recorded values.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.security_triage_agent.evaluation.metric_sketches import (
+    QuantileSketch, SketchStore, ALL_CATEGORIES
+)
+
+
+QUANTILES = [0.0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0]
+
+
+def _values(count, seed=0):
+    rng = np.random.default_rng(seed)
+    # Heavy-tailed like processing times, with some exact zeros
+    values = rng.lognormal(mean=0.0, sigma=2.0, size=count)
+    values[rng.random(count) < 0.05] = 0.0
+    return values
+
+
+def _sketch(values, relative_accuracy=0.01, max_bins=2048):
+    sketch = QuantileSketch(relative_accuracy, max_bins)
+    for value in values:
+        sketch.add(float(value))
+    return sketch
+
+
+def _assert_accurate(sketch, values, quantiles=QUANTILES, relative_accuracy=0.01):
+    estimates = sketch.quantiles(quantiles)
+    for q, estimate in zip(quantiles, estimates):
+        exact = float(np.quantile(values, q, method="lower"))
+        assert abs(estimate - exact) <= relative_accuracy * exact + 1e-12, (q, estimate, exact)
+
+
+def test_quantiles_are_within_relative_accuracy():
+    for relative_accuracy in (0.01, 0.05):
+        values = _values(5000)
+        sketch = _sketch(values, relative_accuracy)
+
+        _assert_accurate(sketch, values, relative_accuracy=relative_accuracy)
+        assert sketch.count == 5000
+        assert sketch.mean == pytest.approx(values.mean())
+        assert (sketch.min, sketch.max) == (values.min(), values.max())
+        assert sketch.quantile(0.0) == 0.0
+
+
+def test_empty_and_single_value_sketches():
+    assert QuantileSketch().quantiles([0.5, 0.9]) == [None, None]
+    assert QuantileSketch().mean == 0.0
+
+    sketch = _sketch([3.7])
+    # Bin estimates are clamped to the observed range
+    assert sketch.quantiles(QUANTILES) == [3.7] * len(QUANTILES)
+
+
+def test_merge_equals_a_sketch_of_all_values():
+    values = _values(3000, seed=1)
+    parts = [_sketch(part) for part in np.array_split(values, 3)]
+    merged = QuantileSketch()
+    for part in parts:
+        merged.merge(part)
+    direct = _sketch(values)
+
+    assert merged.bins == direct.bins
+    assert merged.zero_count == direct.zero_count
+    assert (merged.count, merged.min, merged.max) == (direct.count, direct.min, direct.max)
+    assert merged.sum == pytest.approx(direct.sum)
+    assert merged.quantiles(QUANTILES) == direct.quantiles(QUANTILES)
+    _assert_accurate(merged, values)
+
+    # Merging an empty sketch changes nothing
+    merged.merge(QuantileSketch())
+    assert merged.quantiles(QUANTILES) == direct.quantiles(QUANTILES)
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+def test_collapsing_bins_keeps_upper_quantiles_accurate():
+    values = _values(5000, seed=2)
+    sketch = _sketch(values, max_bins=300)
+    assert len(sketch.bins) == 300
+    _assert_accurate(sketch, values, quantiles=[0.9, 0.99, 1.0])
+    # The collapsed low bins no longer resolve the lower quantiles
+    assert sketch.quantile(0.1) > 2 * np.quantile(values, 0.1, method="lower")
+
+    # Merging bounded sketches stays bounded and accurate at the top
+    other_values = _values(5000, seed=3)
+    sketch.merge(_sketch(other_values, max_bins=300))
+    assert len(sketch.bins) <= 300
+    _assert_accurate(sketch, np.concatenate([values, other_values]), quantiles=[0.9, 0.99, 1.0])
+
+
+def test_dict_round_trip_preserves_quantiles():
+    sketch = _sketch(_values(1000, seed=4))
+    restored = QuantileSketch.from_dict(sketch.to_dict())
+
+    assert restored.quantiles(QUANTILES) == sketch.quantiles(QUANTILES)
+    assert (restored.count, restored.sum, restored.min, restored.max) == (
+        sketch.count, sketch.sum, sketch.min, sketch.max
+    )
+    assert QuantileSketch.from_dict(QuantileSketch().to_dict()).quantile(0.5) is None
+
+
+def _recorded(now, hours=60, per_hour=20, seed=5):
+    """Values spread over the last ``hours`` hours, alternating categories."""
+    rng = np.random.default_rng(seed)
+    start = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours - 1)
+    events = []
+    for hour in range(hours):
+        for number in range(per_hour):
+            timestamp = start + timedelta(hours=hour, minutes=int(rng.integers(0, 60)))
+            category = "payment_fraud" if number % 2 else "guest_access"
+            events.append((timestamp, category, float(rng.lognormal(0.0, 1.5))))
+    return start, events
+
+
+def test_store_window_queries_match_exact_percentiles():
+    now = datetime.utcnow()
+    start, events = _recorded(now)
+    store = SketchStore()
+    for timestamp, category, value in events:
+        store.add("processing_time", value, category, timestamp)
+
+    windows = [
+        (start, now + timedelta(hours=1)),
+        (start + timedelta(hours=5), now - timedelta(hours=3)),
+        (start + timedelta(hours=30), start + timedelta(hours=31)),
+    ]
+    for window_start, window_end in windows:
+        for category in (None, "payment_fraud"):
+            expected = [
+                value for timestamp, event_category, value in events
+                # Windows are resolved to whole hours
+                if window_start.replace(minute=0) <= timestamp.replace(minute=0) < window_end
+                and category in (None, event_category)
+            ]
+            sketch = store.query("processing_time", window_start, window_end, category)
+            assert sketch.count == len(expected)
+            _assert_accurate(sketch, np.array(expected))
+
+    summary = store.summary("processing_time", start, now + timedelta(hours=1), ALL_CATEGORIES)
+    assert summary["count"] == len(events)
+    assert summary["p50"] <= summary["p90"] <= summary["p99"] <= summary["max"]
+    assert store.summary("missing_metric", start, now)["p50"] is None
+
+
+def test_drained_buckets_reload_into_a_new_store():
+    now = datetime.utcnow()
+    start, events = _recorded(now, hours=30)
+    store = SketchStore()
+    for timestamp, category, value in events:
+        store.add("processing_time", value, category, timestamp)
+
+    rows = store.drain_dirty()
+    assert len(rows) == len(store)
+    assert store.drain_dirty() == []
+
+    # Values recorded before loading are merged with the persisted buckets
+    reloaded = SketchStore()
+    late = (now, "payment_fraud", 1000.0)
+    reloaded.add("processing_time", late[2], late[1], late[0])
+    reloaded.load_rows(rows)
+
+    window = (start, now + timedelta(hours=1))
+    expected = [value for _, _, value in events] + [late[2]]
+    sketch = reloaded.query("processing_time", *window)
+    assert sketch.count == len(expected)
+    _assert_accurate(sketch, np.array(expected))
+    assert {row[:4] for row in reloaded.drain_dirty()} >= {
+        ("processing_time", "payment_fraud", "hour", now.replace(minute=0, second=0, microsecond=0))
+    }
+
+
+def test_buckets_past_retention_are_pruned():
+    store = SketchStore(hourly_retention_hours=2, daily_retention_days=1)
+    now = datetime(2024, 6, 10, 12)
+    store.add("processing_time", 1.0, timestamp=now - timedelta(hours=5))
+    assert len(store) == 2
+
+    assert store.prune(now) == 1
+    # Recording in a new hour prunes as a side effect
+    store.add("processing_time", 1.0, timestamp=now + timedelta(days=3))
+    assert sorted(store.sketches) == [
+        ("processing_time", ALL_CATEGORIES, "day", datetime(2024, 6, 13)),
+        ("processing_time", ALL_CATEGORIES, "hour", datetime(2024, 6, 13, 12)),
+    ]
@@ -0,0 +1,68 @@
+"""
+Tests for the MetricsTracker per-incident lifecycle.
+
+Finished incidents must be folded into compact aggregates so a long-running
+agent's memory stays flat.
+"""
+
+from src.security_triage_agent.core.state import IncidentCategory, IncidentPriority
+from src.security_triage_agent.evaluation.metrics_tracker import MetricsTracker
+
+
+async def _process(tracker: MetricsTracker, incident_id: str, finish: bool = True):
+    await tracker.start_incident_tracking(incident_id)
+    await tracker.record_step_completion(incident_id, "classify_incident", 0.2)
+    await tracker.record_step_completion(incident_id, "assess_risk", 0.3, success=False)
+    await tracker.record_human_intervention(incident_id, "approval", "high risk")
+    await tracker.record_incident_processed(
+        IncidentCategory.GUEST_ACCESS, IncidentPriority.HIGH, 12.0, incident_id=incident_id
+    )
+    if finish:
+        await tracker.finish_incident_tracking(incident_id)
+
+
+async def test_finished_incidents_are_folded_and_evicted():
+    tracker = MetricsTracker()
+
+    for i in range(50):
+        await _process(tracker, f"INC-{i}")
+
+    assert tracker.current_metrics == {}
+    stats = tracker.completed_incidents
+    assert stats.count == 50
+    assert stats.total_steps == 100
+    assert stats.failed_steps == 50
+    assert stats.total_human_interventions == 50
+    assert tracker.daily_metrics[next(iter(tracker.daily_metrics))].incidents == 50
+    assert tracker.category_metrics["guest_access"].to_list() == [12.0] * 50
+
+    assert await tracker.finish_incident_tracking("INC-0") is False
+
+
+async def test_abandoned_incidents_are_bounded():
+    tracker = MetricsTracker(max_tracked_incidents=100, history_size=64)
+
+    for i in range(5000):
+        await _process(tracker, f"INC-{i}", finish=False)
+
+    usage = tracker.get_memory_usage()
+    assert usage["tracked_incidents"] == 100
+    assert usage["completed_incidents"] == 4900
+    assert "INC-4999" in tracker.current_metrics
+    assert tracker.completed_incidents.recent_processing_times.size == 64
+
+
+async def test_memory_gauge_is_flat_over_a_soak():
+    tracker = MetricsTracker(max_tracked_incidents=50)
+
+    for i in range(2000):
+        await _process(tracker, f"INC-{i}", finish=i % 10 != 0)
+    warm = tracker.get_memory_usage()
+
+    for i in range(2000, 20000):
+        await _process(tracker, f"INC-{i}", finish=i % 10 != 0)
+    usage = tracker.get_memory_usage()
+
+    assert warm["tracked_incidents"] <= 50 and usage["tracked_incidents"] <= 50
+    assert usage["aggregate_bytes"] == warm["aggregate_bytes"]
+    assert usage["sketch_bins"] == warm["sketch_bins"]
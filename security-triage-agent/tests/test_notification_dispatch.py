@@ -0,0 +1,95 @@
+"""
+Tests for the concurrent notification dispatcher behind NotificationOrchestratorTool.
+"""
+
+import asyncio
+import time
+
+from src.security_triage_agent.tools.notification_dispatch import (
+    NotificationDispatcher, NotificationRequest, TokenBucket
+)
+
+
+class RecordingClient:
+    def __init__(self, latency=0.05, succeed=True, batch=False):
+        self.latency = latency
+        self.succeed = succeed
+        self.calls = []
+        if batch:
+            self.send_batch = self._send_batch
+
+    async def send(self, recipient, message, priority):
+        self.calls.append([recipient])
+        await asyncio.sleep(self.latency)
+        return self.succeed
+
+    async def _send_batch(self, recipients, message, priority):
+        self.calls.append(list(recipients))
+        await asyncio.sleep(self.latency)
+        return [self.succeed] * len(recipients)
+
+
+async def test_fan_out_is_concurrent_deduplicated_and_batched():
+    clients = {"sms": RecordingClient(), "email": RecordingClient(batch=True),
+               "phone_call": RecordingClient()}
+    dispatcher = NotificationDispatcher(clients, rate_limits={})
+
+    requests = [
+        NotificationRequest(f"staff-{i}", [("sms", f"+91-{i}"), ("email", f"s{i}@hotel.com"),
+                                           ("phone_call", f"+91-{i}")], "Fire on floor 3", "critical")
+        for i in range(10)
+    ]
+    # The same person listed twice only gets one SMS
+    requests.append(NotificationRequest("staff-0-again", [("sms", "+91-0")], "Fire on floor 3", "critical"))
+
+    started = time.perf_counter()
+    deliveries = await dispatcher.dispatch(requests)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5  # 30 sequential sends would take 1.5s
+    assert len(deliveries) == 30
+    assert all(delivery.success for delivery in deliveries)
+    assert len(clients["sms"].calls) == 10
+    assert len(clients["email"].calls) == 1 and len(clients["email"].calls[0]) == 10
+
+    # Within the dedupe window an identical notification is not resent
+    repeat = await dispatcher.dispatch(requests[:1])
+    assert [delivery.status for delivery in repeat] == ["deduplicated"] * 3
+    assert len(clients["sms"].calls) == 10
+
+
+async def test_fallback_only_when_primary_fails():
+    clients = {"phone_call": RecordingClient(succeed=False), "sms": RecordingClient(),
+               "email": RecordingClient()}
+    dispatcher = NotificationDispatcher(clients, rate_limits={})
+
+    deliveries = await dispatcher.dispatch([
+        NotificationRequest("gm", [("phone_call", "+91-1")], "Escalation", fallback=[("email", "gm@hotel.com")]),
+        NotificationRequest("cso", [("sms", "+91-2")], "Escalation", fallback=[("email", "cso@hotel.com")]),
+    ])
+
+    assert [(d.channel, d.status) for d in deliveries] == [
+        ("phone_call", "failed"), ("sms", "sent"), ("email", "sent")
+    ]
+    assert clients["email"].calls == [["gm@hotel.com"]]
+
+
+async def test_rate_limit_and_deadline():
+    bucket = TokenBucket(rate=20, capacity=2)
+    started = time.perf_counter()
+    for _ in range(4):
+        assert await bucket.acquire()
+    assert time.perf_counter() - started >= 0.09
+    assert not await bucket.acquire(deadline=time.monotonic() + 0.01)
+
+    clients = {"sms": RecordingClient(latency=0.01), "phone_call": RecordingClient(latency=1.0)}
+    dispatcher = NotificationDispatcher(clients, rate_limits={"sms": (1.0, 2)})
+    deliveries = await dispatcher.dispatch(
+        [NotificationRequest(f"r{i}", [("sms", f"+91-{i}"), ("phone_call", f"+91-{i}")], "Alert")
+         for i in range(3)],
+        deadline_seconds=0.2
+    )
+
+    statuses = sorted(delivery.status for delivery in deliveries)
+    assert statuses == ["deadline_exceeded"] * 3 + ["rate_limited"] + ["sent"] * 2
+    assert dispatcher.get_stats()["rate_limited"] == 1
@@ -0,0 +1,39 @@
+"""
+Tests for the agent's performance dashboard.
+"""
+
+from datetime import datetime, timedelta
+
+from src.security_triage_agent.core.agent import SecurityTriageAgent
+from src.security_triage_agent.core.state import IncidentState, IncidentCategory
+from src.security_triage_agent.evaluation.benchmarks import HospitalityBenchmarks
+
+
+def _agent(storage, metrics_tracker):
+    agent = SecurityTriageAgent.__new__(SecurityTriageAgent)
+    agent.persistent_storage = storage
+    agent.metrics_tracker = metrics_tracker
+    agent.benchmarks = HospitalityBenchmarks()
+    agent.active_incidents = {}
+    return agent
+
+
+async def test_dashboard_covers_requested_period_and_category(storage, metrics_tracker):
+    await storage.store_incident(IncidentState(
+        incident_id="inc_1", title="Skimmer on front desk terminal",
+        description="Card skimmer found on a payment terminal",
+        category=IncidentCategory.PAYMENT_FRAUD, created_at=datetime.utcnow() - timedelta(days=1)
+    ))
+    agent = _agent(storage, metrics_tracker)
+
+    dashboard = await agent.get_performance_dashboard(days=7)
+    assert dashboard["period"]["days"] == 7
+    start = datetime.fromisoformat(dashboard["period"]["start_date"])
+    end = datetime.fromisoformat(dashboard["period"]["end_date"])
+    assert end - start == timedelta(days=7)
+    for section in ("performance_metrics", "quality_metrics", "hallucination_metrics",
+                    "incident_analytics", "benchmark_comparison", "metrics_memory"):
+        assert section in dashboard
+
+    by_category = await agent.get_performance_dashboard(days=30, category=IncidentCategory.PAYMENT_FRAUD)
+    assert by_category["period"]["days"] == 30
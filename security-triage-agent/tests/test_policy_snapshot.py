@@ -0,0 +1,44 @@
+"""
+Tests for knowledge base startup from a prebuilt policy snapshot.
+"""
+
+import pytest
+
+from src.security_triage_agent.rag.knowledge_base import (
+    HotelPolicyKnowledgeBase, KnowledgeQuery, build_policy_snapshot
+)
+from src.security_triage_agent.rag.policy_snapshot import PolicySnapshot, SnapshotError
+
+
+async def test_knowledge_base_serves_queries_from_snapshot(tmp_path):
+    snapshot_path = tmp_path / "policy_snapshot"
+    manifest = build_policy_snapshot(str(snapshot_path), embedding_backend="hashing")
+    assert manifest["documents"] == [f"SEC-POL-00{i}" for i in range(1, 6)]
+
+    knowledge_base = HotelPolicyKnowledgeBase(
+        openai_api_key="unused",
+        vector_store_path=str(tmp_path / "store"),
+        embedding_backend="hashing",
+        embedding_cache_path="",
+        snapshot_path=str(snapshot_path)
+    )
+    # Construction is lazy: nothing is loaded until first use
+    assert knowledge_base.embeddings is None and not knowledge_base.initialized
+
+    result = await knowledge_base.query_policies(
+        KnowledgeQuery(query_text="payment fraud pci dss payment processor")
+    )
+    assert knowledge_base.snapshot is not None and knowledge_base.vector_store is None
+    assert result.retrieval_metadata["snapshot_version"] == manifest["snapshot_version"]
+    assert result.documents[0]["metadata"]["document_id"] == "SEC-POL-002"
+    assert await knowledge_base.initialize() is True
+
+
+async def test_snapshot_rejects_other_embedding_model(tmp_path):
+    build_policy_snapshot(str(tmp_path / "snapshot"), embedding_backend="hashing")
+
+    assert len(PolicySnapshot.load(tmp_path / "snapshot", "hashing:1024")) > 0
+    with pytest.raises(SnapshotError):
+        PolicySnapshot.load(tmp_path / "snapshot", "openai:text-embedding-ada-002")
+    with pytest.raises(SnapshotError):
+        PolicySnapshot.load(tmp_path / "missing")
@@ -0,0 +1,120 @@
+"""
+Tests for batched retention with cold archiving of expired incident records.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from src.security_triage_agent.core.state import IncidentState, IncidentCategory
+from src.security_triage_agent.memory.incident_archive import IncidentArchive
+
+
+async def _store_incident(storage, incident_id, days_old, status="closed", description="Key card used after checkout"):
+    await storage.store_incident(IncidentState(
+        incident_id=incident_id,
+        title=f"Skimmer found {incident_id}",
+        description=description,
+        category=IncidentCategory.PAYMENT_FRAUD,
+        created_at=datetime.utcnow() - timedelta(days=days_old)
+    ))
+    await storage.update_incident_status(incident_id, status)
+
+
+async def _count(storage, table):
+    async with storage.pool.reader() as db:
+        cursor = await db.execute(f"SELECT COUNT(*) FROM {table}")
+        return (await cursor.fetchone())[0]
+
+
+async def test_expired_incidents_are_archived_before_removal(storage):
+    for number in range(12):
+        await _store_incident(storage, f"old_{number:02d}", days_old=400 + number)
+    await _store_incident(storage, "old_active", days_old=400, status="active")
+    await _store_incident(storage, "recent", days_old=10)
+    await storage.record_compliance_event("old_03", "PCI_DSS", "notification_sent", {"to": "bank"})
+    await storage.record_performance_metric("old_03", "processing_time", 12.5)
+    async with storage.pool.writer() as db:
+        await db.execute("""
+            INSERT INTO performance_metrics (incident_id, metric_name, metric_value, metric_timestamp)
+            VALUES ('never_stored', 'processing_time', 1.0, ?)
+        """, (datetime.utcnow() - timedelta(days=500),))
+
+    removed = await storage.apply_retention(365, batch_size=5)
+
+    assert removed == 12
+    assert await _count(storage, "incidents") == 2
+    assert await _count(storage, "performance_metrics") == 0
+    assert await storage.search_text("skimmer old_03") == []
+    assert "old_03" not in storage.similarity_index
+
+    archived = storage.archive.get_incident("old_03")
+    assert archived["incidents"][0]["title"] == "Skimmer found old_03"
+    assert [event["framework"] for event in archived["compliance_events"]] == ["PCI_DSS"]
+    assert len(archived["incident_history"]) == 2
+    assert len(archived["performance_metrics"]) == 1
+    assert len(list(storage.archive.read("incidents"))) == 12
+
+    # Partitions are days of incident creation; a range only opens matching days
+    created_on = (datetime.utcnow() - timedelta(days=403)).date()
+    assert [row["incident_id"] for row in storage.archive.read("incidents", created_on, created_on)] == ["old_03"]
+    # Orphans are partitioned by their own timestamp, here older than old_03
+    assert [row["incident_id"] for row in storage.archive.read("performance_metrics")] == ["never_stored", "old_03"]
+
+    # Nothing left to remove
+    assert await storage.apply_retention(365) == 0
+
+
+async def test_incident_changed_after_export_is_kept(storage):
+    await _store_incident(storage, "old_reopened", days_old=400)
+    async with storage.pool.reader() as db:
+        exported = await storage._select_incident_records(db, ["old_reopened"])
+
+    await storage.update_incident_status("old_reopened", "active")
+    await storage.update_incident_status("old_reopened", "closed")
+
+    assert await storage._delete_incident_records(exported) == []
+    assert await storage.get_incident("old_reopened") is not None
+
+
+async def test_incremental_vacuum_returns_freed_pages(storage):
+    for number in range(40):
+        await _store_incident(storage, f"old_{number:02d}", days_old=400, description="x" * 20000)
+
+    # Readers opened on the empty file report its old mode; ask the writer
+    async with storage.pool.writer() as db:
+        assert (await (await db.execute("PRAGMA auto_vacuum")).fetchone())[0] == 2
+        pages_before = (await (await db.execute("PRAGMA page_count")).fetchone())[0]
+
+    assert await storage.apply_retention(365, batch_size=10, vacuum_pages=10000, archive=False) == 40
+
+    async with storage.pool.reader() as db:
+        assert (await (await db.execute("PRAGMA freelist_count")).fetchone())[0] == 0
+        assert (await (await db.execute("PRAGMA page_count")).fetchone())[0] < pages_before / 4
+    assert storage.archive.partitions() == []
+
+
+async def test_background_retention_runs_until_stopped(storage):
+    await _store_incident(storage, "old_00", days_old=400)
+
+    storage.start_retention(365, interval_seconds=3600, batch_size=10)
+    storage.start_retention(365, interval_seconds=3600, batch_size=10)
+    assert len([task for task in asyncio.all_tasks() if task.get_name() == "incident-retention"]) == 1
+    for _ in range(50):
+        if await storage.get_incident("old_00") is None:
+            break
+        await asyncio.sleep(0.02)
+
+    assert await storage.get_incident("old_00") is None
+    await storage.stop_retention()
+    assert not [task for task in asyncio.all_tasks() if task.get_name() == "incident-retention"]
+
+
+def test_gzip_archive_round_trip(tmp_path):
+    archive = IncidentArchive(tmp_path / "archive", compression="gzip")
+    day = datetime(2024, 3, 1).date()
+    paths = archive.write_batch({day: {"compliance_events": [{"id": 1, "incident_id": "inc_1", "framework": "DPDP"}]}})
+
+    assert paths[0].name.endswith(".jsonl.gz")
+    assert list(archive.read("compliance_events", where={"framework": "DPDP"}))[0]["incident_id"] == "inc_1"
+    assert list(archive.read("compliance_events", start=datetime(2024, 3, 2).date())) == []
+    assert not list((tmp_path / "archive").rglob("*.tmp"))
@@ -0,0 +1,193 @@
+"""
+Tests for SessionManager incident-to-session lookups.
+
+Runs against fakeredis so the Redis backend is exercised without a server.
+"""
+
+import json
+import time
+
+import pytest
+from fakeredis import aioredis as fakeredis
+
+from src.security_triage_agent.memory.session_manager import SessionManager
+
+
+SESSION_COUNT = 100_000
+
+
+@pytest.fixture
+async def redis_session_manager():
+    """Session manager backed by an in-process Redis stand-in."""
+    manager = SessionManager(session_ttl_hours=1)
+    manager.redis_client = fakeredis.FakeRedis(decode_responses=True)
+    yield manager
+    await manager.close()
+
+
+@pytest.fixture
+def memory_session_manager():
+    """Session manager using the in-memory fallback."""
+    manager = SessionManager(redis_url="redis://127.0.0.1:1", session_ttl_hours=1)
+    manager.redis_client = None
+    manager._init_memory_storage()
+    return manager
+
+
+async def _create_sessions(manager: SessionManager, count: int):
+    for i in range(count):
+        await manager.create_session(f"INC-{i:06d}", {"shift": i % 3})
+
+
+async def test_redis_lookup_uses_index_at_scale(redis_session_manager):
+    manager = redis_session_manager
+    await _create_sessions(manager, SESSION_COUNT)
+
+    async def no_keys(*args, **kwargs):
+        raise AssertionError("lookup must not scan the keyspace")
+
+    manager.redis_client.keys = no_keys
+
+    start = time.perf_counter()
+    for i in range(0, SESSION_COUNT, SESSION_COUNT // 100):
+        context = await manager.get_session_context(f"INC-{i:06d}")
+        assert context["session_id"].startswith(f"session_INC-{i:06d}_")
+        assert context["user_context"] == {"shift": i % 3}
+    elapsed = time.perf_counter() - start
+
+    # 100 lookups over 100k sessions; a keyspace scan would take minutes
+    assert elapsed < 5.0
+
+    assert await manager.get_session_context("INC-missing") == {}
+
+
+async def test_redis_index_shares_session_ttl(redis_session_manager):
+    manager = redis_session_manager
+    await manager.create_session("INC-ttl")
+
+    index_key = f"{manager.session_index_prefix}INC-ttl"
+    session_key = await manager.redis_client.get(index_key)
+
+    assert session_key.startswith(manager.session_prefix)
+    assert 0 < await manager.redis_client.ttl(index_key) <= 3600
+    assert 0 < await manager.redis_client.ttl(session_key) <= 3600
+
+    # Expiry of both keys removes the mapping
+    await manager.redis_client.delete(index_key, session_key)
+    assert await manager.update_session_context("INC-ttl", {"user_context": {}}) is False
+
+
+async def test_redis_update_refreshes_index(redis_session_manager):
+    manager = redis_session_manager
+    await manager.create_session("INC-update")
+
+    assert await manager.update_session_context(
+        "INC-update", {"workflow_state": {"step": "assess_risk"}}
+    )
+    context = await manager.get_session_context("INC-update")
+    assert context["workflow_state"] == {"step": "assess_risk"}
+
+
+async def test_memory_lookup_uses_index(memory_session_manager):
+    manager = memory_session_manager
+    await _create_sessions(manager, 1000)
+
+    assert len(manager._session_index) == 1000
+    context = await manager.get_session_context("INC-000500")
+    assert context["user_context"] == {"shift": 500 % 3}
+
+
+async def test_memory_cleanup_drops_index_entries(memory_session_manager):
+    manager = memory_session_manager
+    await manager.create_session("INC-expired")
+
+    clock = manager._memory_sessions.clock
+    manager._memory_sessions.clock = lambda: clock() + 2 * 3600
+
+    assert await manager.cleanup_expired_sessions() == 1
+    assert "INC-expired" not in manager._session_index
+    assert await manager.get_session_context("INC-expired") == {}
+
+
+async def test_memory_sessions_are_bounded(memory_session_manager):
+    manager = memory_session_manager
+    manager.max_sessions = 100
+    manager._init_memory_storage()
+
+    await _create_sessions(manager, 1000)
+
+    metrics = manager.get_memory_metrics()
+    assert metrics["sessions"]["entries"] == 100
+    assert metrics["sessions"]["evictions"] == 900
+    assert metrics["indexed_incidents"] == 100
+    assert metrics["sessions"]["memory_bytes"] > 0
+
+    # Oldest sessions were evicted, newest are still reachable
+    assert await manager.get_session_context("INC-000000") == {}
+    assert (await manager.get_session_context("INC-000999"))["user_context"] == {"shift": 0}
+
+
+def _workflow_states(steps: int):
+    """Checkpoint data that grows every step, like astream updates."""
+    state = {"incident_id": "INC-1", "messages": [], "completed_steps": [], "tool_results": {}}
+    for step in range(steps):
+        state = {
+            **state,
+            "current_step": f"step_{step}",
+            "messages": state["messages"] + [{"type": "ai", "content": f"result {step} " * 20}],
+            "completed_steps": state["completed_steps"] + [f"step_{step}"],
+            "tool_results": {**state["tool_results"], f"step_{step}": {"score": step}},
+        }
+        yield f"step_{step}", state
+
+
+async def test_memory_checkpoints_store_deltas_and_replay(memory_session_manager):
+    manager = memory_session_manager
+    manager.checkpoint_full_snapshot_every = 4
+
+    states = list(_workflow_states(10))
+    for step_name, state in states:
+        assert await manager.store_workflow_checkpoint("INC-1", step_name, state)
+
+    stats = manager.get_checkpoint_stats("INC-1")
+    assert stats["checkpoints"] == 10 and stats["full_snapshots"] == 3
+    full_size = sum(len(json.dumps(state)) for _, state in states)
+    assert stats["bytes_written"] < full_size / 2
+
+    latest = await manager.load_workflow_checkpoint("INC-1")
+    assert latest["step_name"] == "step_9" and latest["data"] == states[-1][1]
+    middle = await manager.load_workflow_checkpoint("INC-1", "step_6")
+    assert middle["data"] == states[6][1]
+    assert await manager.load_workflow_checkpoint("INC-1", "unknown") is None
+
+    assert manager.finish_workflow_checkpoints("INC-1")["checkpoints"] == 10
+    assert manager.get_checkpoint_stats("INC-1") is None
+
+
+async def test_redis_checkpoints_replay(redis_session_manager):
+    manager = redis_session_manager
+    manager.binary_redis_client = fakeredis.FakeRedis()
+
+    states = list(_workflow_states(5))
+    for step_name, state in states:
+        assert await manager.store_workflow_checkpoint("INC-1", step_name, state)
+
+    assert await manager.binary_redis_client.llen(f"{manager.workflow_prefix}INC-1") == 5
+    assert (await manager.load_workflow_checkpoint("INC-1", "step_3"))["data"] == states[3][1]
+
+
+async def test_redis_checkpoints_restart_after_log_expires(redis_session_manager):
+    manager = redis_session_manager
+    manager.binary_redis_client = fakeredis.FakeRedis()
+    checkpoint_key = f"{manager.workflow_prefix}INC-1"
+
+    states = list(_workflow_states(4))
+    for step_name, state in states[:3]:
+        await manager.store_workflow_checkpoint("INC-1", step_name, state)
+    # The incident waited past the session TTL while the writer stayed cached
+    await manager.binary_redis_client.delete(checkpoint_key)
+
+    step_name, state = states[3]
+    assert await manager.store_workflow_checkpoint("INC-1", step_name, state)
+    assert await manager.binary_redis_client.llen(checkpoint_key) == 1
+    assert (await manager.load_workflow_checkpoint("INC-1"))["data"] == state
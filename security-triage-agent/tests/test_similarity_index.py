@@ -0,0 +1,158 @@
+"""
+Tests for the incremental incident similarity index, checked against
+brute-force cosine similarity over the live incidents.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.security_triage_agent.memory.similarity_index import IncidentSimilarityIndex
+
+
+VOCABULARY = (
+    "guest keycard lobby elevator payment terminal skimmer laptop stolen suite "
+    "camera breach vendor contractor badge minibar safe wifi phishing invoice "
+    "pool parking valet luggage alarm fire smoke balcony"
+).split()
+CATEGORIES = ["guest_access", "payment_fraud", "cyber_security"]
+START = datetime(2024, 1, 1)
+
+
+class BruteForce:
+    """Reference scores: every live incident vectorized and compared directly."""
+
+    def __init__(self, index):
+        self.index = index
+        self.incidents = {}
+
+    def add(self, incident_id, text, category, created_at):
+        self.incidents[incident_id] = (text, category, created_at)
+
+    def remove(self, incident_id):
+        self.incidents.pop(incident_id, None)
+
+    def query(self, text, top_k=5, category=None, created_after=None, min_score=0.0, candidates=None):
+        ids = [
+            incident_id for incident_id, (_, incident_category, created_at) in self.incidents.items()
+            if (category is None or incident_category == category)
+            and (created_after is None or created_at >= created_after)
+            and (candidates is None or incident_id in candidates)
+        ]
+        if not ids:
+            return []
+        vectors = self.index.vectorizer.transform([self.incidents[i][0] for i in ids])
+        query = self.index.vectorizer.transform([text])
+        scores = np.asarray((vectors @ query.T).todense()).ravel()
+        ranked = sorted(
+            ((incident_id, float(score)) for incident_id, score in zip(ids, scores)
+             if score > 0 and score >= min_score),
+            key=lambda pair: -pair[1]
+        )
+        return ranked[:top_k]
+
+
+def _text(rng):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(4, 10)))
+
+
+def _assert_same(actual, expected):
+    assert len(actual) == len(expected)
+    assert np.allclose([score for _, score in actual], [score for _, score in expected], atol=1e-5)
+    # Ties may be returned in either order; every returned score must be the true one
+    scores = dict(expected)
+    for incident_id, score in actual:
+        if incident_id in scores:
+            assert abs(scores[incident_id] - score) < 1e-5
+
+
+def _populate(index, reference, rng, count, start=0):
+    items = []
+    for number in range(start, start + count):
+        item = (f"inc_{number}", _text(rng), rng.choice(CATEGORIES), START + timedelta(hours=number))
+        items.append(item)
+        reference.add(*item)
+    index.add_many(items)
+
+
+def _check_queries(index, reference, rng):
+    for _ in range(20):
+        text = _text(rng)
+        _assert_same(index.query(text, top_k=7), reference.query(text, top_k=7))
+        _assert_same(
+            index.query(text, top_k=3, category="payment_fraud"),
+            reference.query(text, top_k=3, category="payment_fraud")
+        )
+        after = START + timedelta(hours=rng.randint(0, 60))
+        _assert_same(
+            index.query(text, created_after=after, min_score=0.2),
+            reference.query(text, created_after=after, min_score=0.2)
+        )
+        candidates = set(rng.sample(sorted(reference.incidents), k=min(10, len(reference.incidents))))
+        candidates.add("inc_unknown")
+        _assert_same(
+            index.query(text, top_k=4, candidates=candidates),
+            reference.query(text, top_k=4, candidates=candidates)
+        )
+
+
+def test_queries_match_brute_force_across_segments_and_tombstones(temp_dir):
+    rng = random.Random(0)
+    index = IncidentSimilarityIndex(temp_dir / "index.npz", n_features=2 ** 12, merge_threshold=25)
+    reference = BruteForce(index)
+
+    _populate(index, reference, rng, 30)
+    _populate(index, reference, rng, 10, start=30)
+    assert index._merged_rows == 30 and index._pending_rows == 10
+    _check_queries(index, reference, rng)
+
+    # Replacing and removing leave tombstones in both segments
+    for incident_id in ("inc_3", "inc_33"):
+        text = _text(rng)
+        index.add(incident_id, text, "cyber_security", START)
+        reference.add(incident_id, text, "cyber_security", START)
+    assert index.remove(["inc_5", "inc_35", "inc_missing"]) == 2
+    reference.remove("inc_5")
+    reference.remove("inc_35")
+    assert index.size == len(reference.incidents) == 38
+    assert "inc_5" not in index
+    _check_queries(index, reference, rng)
+
+    # Crossing the threshold folds the pending rows into the merged segment
+    _populate(index, reference, rng, 20, start=40)
+    assert index._pending_rows == 0
+    _check_queries(index, reference, rng)
+
+
+def test_save_and_load_round_trip(temp_dir):
+    rng = random.Random(1)
+    path = temp_dir / "index.npz"
+    index = IncidentSimilarityIndex(path, n_features=2 ** 12, merge_threshold=25)
+    reference = BruteForce(index)
+    _populate(index, reference, rng, 40)
+    index.remove(["inc_7"])
+    reference.remove("inc_7")
+    index.save()
+    assert index.unsaved_changes == 0
+
+    loaded = IncidentSimilarityIndex(path, n_features=2 ** 12)
+    assert loaded.load()
+    assert sorted(loaded.incident_ids()) == sorted(reference.incidents)
+    reference.index = loaded
+    _check_queries(loaded, reference, rng)
+
+    # Files written with a different feature space are ignored
+    assert not IncidentSimilarityIndex(path, n_features=2 ** 10).load()
+    assert not IncidentSimilarityIndex(temp_dir / "missing.npz").load()
+
+
+def test_unknown_category_and_empty_queries_return_nothing(temp_dir):
+    index = IncidentSimilarityIndex(temp_dir / "index.npz", n_features=2 ** 12)
+    assert index.query("stolen laptop") == []
+
+    index.add("inc_1", "stolen laptop in the lobby", "guest_access")
+    assert index.query("stolen laptop", category="payment_fraud") == []
+    assert index.query("the and of") == []
+    assert index.query("stolen laptop", candidates=[]) == []
+    assert [incident_id for incident_id, _ in index.query("stolen laptop")] == ["inc_1"]
@@ -0,0 +1,97 @@
+"""
+Tests for the bounded TTL/LRU store used as the in-memory session fallback.
+"""
+
+from src.security_triage_agent.memory.ttl_store import TTLStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    store = TTLStore(max_entries=10, default_ttl_seconds=60, clock=clock)
+
+    store.set("a", {"value": 1})
+    clock.now += 59
+    assert store.get("a") == {"value": 1}
+
+    clock.now += 1
+    assert store.get("a") is None
+    assert len(store) == 0
+    assert store.memory_bytes == 0
+    assert store.stats["expirations"] == 1
+
+
+def test_set_resets_ttl():
+    clock = FakeClock()
+    store = TTLStore(max_entries=10, default_ttl_seconds=60, clock=clock)
+
+    store.set("a", 1)
+    clock.now += 50
+    store.set("a", 2)
+    clock.now += 50
+
+    # The stale heap item from the first set must not expire the entry
+    assert store.purge_expired() == 0
+    assert store.get("a") == 2
+
+
+def test_lru_eviction_at_capacity():
+    evicted = []
+    store = TTLStore(
+        max_entries=3, on_evict=lambda key, value, reason: evicted.append((key, reason))
+    )
+
+    for key in ("a", "b", "c"):
+        store.set(key, key)
+    store.get("a")
+    store.set("d", "d")
+
+    assert evicted == [("b", "evicted")]
+    assert "a" in store and "b" not in store
+    assert [key for key, _ in store.items()] == ["c", "a", "d"]
+
+
+def test_expired_entries_purged_on_write():
+    clock = FakeClock()
+    removed = []
+    store = TTLStore(
+        max_entries=100, default_ttl_seconds=10, clock=clock,
+        on_evict=lambda key, value, reason: removed.append(reason)
+    )
+
+    for i in range(50):
+        store.set(f"old-{i}", i)
+    clock.now += 11
+    store.set("new", 1)
+
+    assert len(store) == 1
+    assert removed == ["expired"] * 50
+
+
+def test_heap_stays_bounded_under_rewrites():
+    store = TTLStore(max_entries=10, default_ttl_seconds=60)
+
+    for i in range(10000):
+        store.set(f"k{i % 5}", i)
+
+    assert len(store) == 5
+    assert len(store._expiry_heap) <= 2 * len(store) + 64
+
+
+def test_metrics():
+    store = TTLStore(max_entries=10)
+    store.set("a", "x" * 1000)
+    store.get("a")
+    store.get("missing")
+
+    metrics = store.get_metrics()
+    assert metrics["entries"] == 1
+    assert metrics["memory_bytes"] >= 1000
+    assert metrics["hit_rate"] == 0.5
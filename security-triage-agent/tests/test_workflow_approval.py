@@ -0,0 +1,184 @@
+"""
+Tests for parking the compiled triage workflow at the approval interrupt and
+resuming it from the checkpoint once a decision has been written.
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.security_triage_agent.core.state import (
+    IncidentState, IncidentCategory, IncidentPriority, IncidentResponse,
+    RiskAssessment, SecurityPlaybook, ComplianceFramework
+)
+from src.security_triage_agent.core.workflow import APPROVAL_INTERRUPT_NODE, create_triage_workflow
+from src.security_triage_agent.memory.checkpoint_saver import PruningSqliteSaver
+from src.security_triage_agent.tools.classification import ClassificationResult
+from src.security_triage_agent.tools.compliance_checker import ComplianceResult
+from src.security_triage_agent.tools.playbook_selector import PlaybookSelectionResult
+from src.security_triage_agent.tools.prioritization import PrioritizationResult
+from src.security_triage_agent.tools.safety_guardrails import SafetyCheckResult
+
+
+PLAYBOOK = SecurityPlaybook(
+    playbook_id="pb_payment_fraud", name="Payment fraud", description="Contain card skimming",
+    applicable_categories=[IncidentCategory.PAYMENT_FRAUD], required_actions=["isolate terminal"],
+    action_requirements={}, escalation_criteria={}, compliance_frameworks=[ComplianceFramework.PCI_DSS]
+)
+
+
+def _tools():
+    """Mocked tools whose compliance check asks for a legal review of a high-priority incident."""
+    classifier = Mock()
+    classifier.classify = AsyncMock(return_value=ClassificationResult(
+        category=IncidentCategory.PAYMENT_FRAUD, confidence=0.95, reasoning="skimmer"
+    ))
+    prioritizer = Mock()
+    prioritizer.assess_risk = AsyncMock(return_value=RiskAssessment(
+        risk_score=8.0, mitigation_urgency=IncidentPriority.HIGH, potential_impact="card data",
+        likelihood_score=7.0, confidence_score=0.9
+    ))
+    prioritizer.prioritize = AsyncMock(return_value=PrioritizationResult.parse_obj({
+        "priority": "high", "reasoning": "payment compromise", "recommended_sla": "1 hour",
+        "risk_assessment": {
+            "risk_score": 8.0, "business_impact": "", "guest_impact": "", "financial_impact": "",
+            "reputation_impact": "", "operational_impact": "", "likelihood_score": 7.0,
+            "confidence_score": 0.9, "time_sensitivity": "High"
+        }
+    }))
+    playbook_selector = Mock()
+    playbook_selector.select_playbooks = AsyncMock(return_value=PlaybookSelectionResult(
+        recommended_playbook=PLAYBOOK, applicable_playbooks=[PLAYBOOK],
+        selection_reasoning="category match", estimated_completion_time="2 hours"
+    ))
+    compliance_checker = Mock()
+    compliance_checker.check_compliance = AsyncMock(return_value=ComplianceResult(
+        framework_checks={ComplianceFramework.PCI_DSS: True}, requires_legal_review=True
+    ))
+    safety_guardrails = Mock(sanitize_text=lambda text: text)
+    safety_guardrails.check_safety = AsyncMock(return_value=SafetyCheckResult(
+        passed=True, overall_risk_level="high"
+    ))
+    response_generator = Mock()
+    response_generator.generate_response = AsyncMock(return_value=IncidentResponse(
+        immediate_actions=["isolate terminal"], notification_requirements=["pci_acquirer"],
+        follow_up_actions=["audit terminals"]
+    ))
+    session_manager = Mock(
+        get_session_context=AsyncMock(return_value={}), store_incident=AsyncMock()
+    )
+    metrics_tracker = Mock(
+        calculate_quality_scores=AsyncMock(return_value={"overall": 0.9}),
+        record_incident_processed=AsyncMock(),
+        record_workflow_error=AsyncMock(),
+        observe_step_duration=AsyncMock()
+    )
+    return dict(
+        classifier=classifier, prioritizer=prioritizer, playbook_selector=playbook_selector,
+        response_generator=response_generator, compliance_checker=compliance_checker,
+        safety_guardrails=safety_guardrails, session_manager=session_manager,
+        metrics_tracker=metrics_tracker
+    )
+
+
+@pytest.fixture
+async def saver(tmp_path):
+    saver = PruningSqliteSaver(tmp_path / "checkpoints.db", keep_last=3)
+    yield saver
+    await saver.close()
+
+
+def _state(snapshot):
+    values = snapshot.values
+    return values if isinstance(values, IncidentState) else IncidentState(**values)
+
+
+async def _park(workflow, incident_id):
+    config = {"configurable": {"thread_id": incident_id}}
+    incident = IncidentState(
+        incident_id=incident_id, title="Skimmer on lobby terminal",
+        description="A card skimmer was found attached to the lobby payment terminal"
+    )
+    async for _ in workflow.astream(incident, config):
+        pass
+    return config
+
+
+async def _decide(workflow, config, intervention_type, decision):
+    """Write a decision into the checkpoint the way the agent does, without as_node."""
+    state = _state(await workflow.aget_state(config))
+    state.approve_intervention(intervention_type, "duty_manager", decision, "reviewed")
+    await workflow.aupdate_state(config, {
+        "pending_approvals": state.pending_approvals,
+        "approval_history": state.approval_history,
+        "requires_human_intervention": state.requires_human_intervention,
+        "workflow_paused": state.workflow_paused,
+        "updated_at": state.updated_at
+    })
+
+
+async def test_incident_parks_before_the_approval_node(saver):
+    tools = _tools()
+    workflow = create_triage_workflow(**tools, checkpointer=saver)
+
+    config = await _park(workflow, "inc_parked")
+    snapshot = await workflow.aget_state(config)
+    state = _state(snapshot)
+
+    assert snapshot.next == (APPROVAL_INTERRUPT_NODE,)
+    assert state.current_step == "human_approval_gate"
+    assert state.severity == IncidentPriority.HIGH
+    assert [approval.intervention_type for approval in state.pending_approvals] == ["legal_review"]
+    tools["response_generator"].generate_response.assert_not_called()
+
+    # A fresh saver on the same file sees the parked incident
+    reopened = PruningSqliteSaver(saver.db_path, keep_last=3)
+    try:
+        restored = create_triage_workflow(**_tools(), checkpointer=reopened)
+        assert (await restored.aget_state(config)).next == (APPROVAL_INTERRUPT_NODE,)
+    finally:
+        await reopened.close()
+
+
+async def test_approved_incident_resumes_through_response_generation(saver):
+    tools = _tools()
+    workflow = create_triage_workflow(**tools, checkpointer=saver)
+    config = await _park(workflow, "inc_approved")
+
+    await _decide(workflow, config, "legal_review", True)
+    # The update is applied as the gate node, so its router now sends the incident on
+    assert (await workflow.aget_state(config)).next == ("generate_response",)
+
+    async for _ in workflow.astream(None, config):
+        pass
+    snapshot = await workflow.aget_state(config)
+    state = _state(snapshot)
+
+    assert snapshot.next == ()
+    assert state.current_step == "update_metrics"
+    assert {"generate_response", "document_incident", "notify_stakeholders"} <= set(state.completed_steps)
+    assert state.incident_response.immediate_actions == ["isolate terminal"]
+    assert state.approval_history[-1]["decision"] is True
+    assert not state.pending_approvals
+    tools["response_generator"].generate_response.assert_awaited_once()
+    # Steps before the interrupt are not re-run on resume
+    tools["classifier"].classify.assert_awaited_once()
+    tools["compliance_checker"].check_compliance.assert_awaited_once()
+
+
+async def test_rejected_incident_ends_in_error_handling(saver):
+    tools = _tools()
+    workflow = create_triage_workflow(**tools, checkpointer=saver)
+    config = await _park(workflow, "inc_rejected")
+
+    await _decide(workflow, config, "legal_review", False)
+    assert (await workflow.aget_state(config)).next == ("handle_error",)
+
+    async for _ in workflow.astream(None, config):
+        pass
+    snapshot = await workflow.aget_state(config)
+
+    assert snapshot.next == ()
+    assert _state(snapshot).current_step == "handle_error"
+    tools["response_generator"].generate_response.assert_not_called()
+    tools["metrics_tracker"].record_workflow_error.assert_awaited_once()
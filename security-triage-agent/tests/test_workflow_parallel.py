@@ -0,0 +1,57 @@
+"""
+Tests for join nodes running independent workflow steps concurrently.
+"""
+
+import asyncio
+
+from src.security_triage_agent.core.state import IncidentState, IncidentCategory
+from src.security_triage_agent.core.workflow import SecurityTriageWorkflow
+
+
+def _workflow(parallel_nodes):
+    return SecurityTriageWorkflow(
+        classifier=None, prioritizer=None, playbook_selector=None,
+        response_generator=None, compliance_checker=None, safety_guardrails=None,
+        session_manager=None, metrics_tracker=None, parallel_nodes=parallel_nodes
+    )
+
+
+def _branch(name, delay):
+    async def branch(state):
+        state.update_step(name)
+        await asyncio.sleep(delay)
+        return state
+    return branch
+
+
+async def test_join_step_bookkeeping_does_not_depend_on_branch_timing():
+    workflow = _workflow(parallel_nodes=True)
+    results = []
+    for document_delay, notify_delay in ((0.0, 0.02), (0.02, 0.0)):
+        state = IncidentState(
+            incident_id="inc_1", title="Lost master key", description="Master key missing",
+            category=IncidentCategory.PHYSICAL_SECURITY
+        )
+        state.update_step("execute_immediate_actions")
+        join = workflow._parallel(
+            "document_incident",
+            document_incident=_branch("document_incident", document_delay),
+            notify_stakeholders=_branch("notify_stakeholders", notify_delay)
+        )
+        state = await join(state)
+        results.append((state.current_step, list(state.completed_steps)))
+
+    assert results[0] == results[1]
+    assert results[0][0] == "document_incident"
+    assert results[0][1][-2:] == ["execute_immediate_actions", "notify_stakeholders"]
+
+
+def test_parallel_nodes_are_opt_in_and_keep_compliance_separate():
+    default = SecurityTriageWorkflow(
+        classifier=None, prioritizer=None, playbook_selector=None,
+        response_generator=None, compliance_checker=None, safety_guardrails=None,
+        session_manager=None, metrics_tracker=None
+    )
+    assert default.parallel_nodes is False
+    # Compliance assesses the selected playbook, so it stays its own node
+    assert "compliance_check" in _workflow(parallel_nodes=True).nodes